@@ -0,0 +1,83 @@
+import { NextResponse } from "next/server";
+import { prisma } from "@/lib/prisma";
+import { requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import { handleApiError } from "@/lib/api/error-handler";
+import { jsonWithETag } from "@/lib/api/etag";
+
+/**
+ * Compact workspace bootstrap for page navigation.
+ *
+ * Returns workspace summaries (with member counts instead of member lists)
+ * and, when `?slug=` is given, that workspace's projects. Supports
+ * If-None-Match so unchanged payloads cost a 304.
+ */
+export async function GET(req: Request) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const user = await requireUser();
+
+    const { searchParams } = new URL(req.url);
+    const slug = searchParams.get("slug")?.trim() || null;
+
+    const memberships = await prisma.workspaceMember.findMany({
+      where: { userId: user.id },
+      select: {
+        role: true,
+        workspace: {
+          select: {
+            id: true,
+            name: true,
+            slug: true,
+            createdAt: true,
+            _count: { select: { members: true, projects: true } },
+          },
+        },
+      },
+      orderBy: { workspace: { createdAt: "desc" } },
+    });
+
+    const workspaces = memberships.map(({ role, workspace }) => ({
+      id: workspace.id,
+      name: workspace.name,
+      slug: workspace.slug,
+      role,
+      memberCount: workspace._count.members,
+      projectCount: workspace._count.projects,
+    }));
+
+    let current = null;
+    if (slug) {
+      const workspace = workspaces.find((w) => w.slug === slug);
+      if (!workspace) {
+        return NextResponse.json(
+          { error: "Workspace not found" },
+          { status: 404 },
+        );
+      }
+
+      const projects = await prisma.project.findMany({
+        where: { workspaceId: workspace.id },
+        select: { id: true, name: true, status: true },
+        orderBy: { createdAt: "desc" },
+      });
+
+      current = { ...workspace, projects };
+    }
+
+    return jsonWithETag(
+      req,
+      { workspaces, current },
+      rateLimitResult.headers,
+    );
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
@@ -0,0 +1,77 @@
+import { readPrisma } from "@/lib/prisma";
+import { requireUser, assertProjectMember } from "@/lib/auth/guards";
+import { handleApiError } from "@/lib/api/error-handler";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import { paginate } from "@/lib/api/stream-json";
+import {
+  MAX_EXPORT_DAYS,
+  calendarOrderBy,
+  calendarWhere,
+  parseCalendarRange,
+  streamICalendar,
+} from "@/lib/calendar";
+
+/**
+ * iCalendar (.ics) export of the same feed as GET /api/calendar, streamed
+ * in batches. Without `from`/`to` it covers the last month and the next
+ * eleven.
+ */
+export async function GET(req: Request) {
+  const db = readPrisma(req);
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const user = await requireUser();
+    const url = new URL(req.url);
+    const { searchParams } = url;
+    const projectId = searchParams.get("projectId");
+
+    if (!searchParams.has("from") && !searchParams.has("to")) {
+      const now = new Date();
+      const from = new Date(Date.UTC(now.getUTCFullYear(), now.getUTCMonth() - 1, 1));
+      const to = new Date(Date.UTC(now.getUTCFullYear(), now.getUTCMonth() + 11, 1));
+      searchParams.set("from", from.toISOString());
+      searchParams.set("to", to.toISOString());
+    }
+    const range = parseCalendarRange(searchParams, MAX_EXPORT_DAYS);
+
+    let name = "My tasks";
+    if (projectId) {
+      await assertProjectMember(user.id, projectId);
+      const project = await db.project.findUnique({
+        where: { id: projectId },
+        select: { name: true },
+      });
+      name = project?.name ?? "Project";
+    }
+
+    // dueDate is never null inside the range, so cursor paging is stable
+    const tasks = paginate((page) =>
+      db.task.findMany({
+        where: calendarWhere(user.id, projectId, range),
+        select: {
+          id: true,
+          title: true,
+          status: true,
+          priority: true,
+          dueDate: true,
+          project: {
+            select: { id: true, name: true, workspace: { select: { slug: true } } },
+          },
+        },
+        orderBy: calendarOrderBy,
+        ...page,
+      }),
+    );
+
+    return await streamICalendar(tasks, { name, origin: url.origin });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
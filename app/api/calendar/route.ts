@@ -0,0 +1,61 @@
+import { NextResponse } from "next/server";
+import { readPrisma } from "@/lib/prisma";
+import { requireUser, assertProjectMember } from "@/lib/auth/guards";
+import { handleApiError } from "@/lib/api/error-handler";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import {
+  MAX_FEED_DAYS,
+  calendarOrderBy,
+  calendarTaskSelect,
+  calendarWhere,
+  parseCalendarRange,
+} from "@/lib/calendar";
+
+/**
+ * Tasks due in `[from, to)`: `?projectId=` for a project calendar, or
+ * omitted for the user's own tasks across projects. `?include=members`
+ * adds the project's members (for the assignee filter) to the response.
+ */
+export async function GET(req: Request) {
+  const db = readPrisma(req);
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const user = await requireUser();
+    const { searchParams } = new URL(req.url);
+    const projectId = searchParams.get("projectId");
+    const range = parseCalendarRange(searchParams, MAX_FEED_DAYS);
+
+    if (projectId) {
+      await assertProjectMember(user.id, projectId);
+    }
+
+    const [tasks, members] = await Promise.all([
+      db.task.findMany({
+        where: calendarWhere(user.id, projectId, range),
+        select: calendarTaskSelect,
+        orderBy: calendarOrderBy,
+      }),
+      projectId && searchParams.get("include") === "members"
+        ? db.projectMember.findMany({
+            where: { projectId },
+            select: {
+              userId: true,
+              user: { select: { name: true, image: true } },
+            },
+            orderBy: { joinedAt: "asc" },
+          })
+        : undefined,
+    ]);
+
+    return NextResponse.json(members ? { tasks, members } : { tasks });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
@@ -1,5 +1,6 @@
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import type { Prisma } from "@prisma/client";
+import { prisma, readPrisma } from "@/lib/prisma";
 import {
   requireUser,
   assertWorkspaceMember,
@@ -15,8 +16,45 @@ import {
   checkBurstSpam,
 } from "@/lib/middleware/rate-limit";
 import { messageCreateSchema } from "@/lib/validation/schemas";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { getMessageChannel } from "@/lib/realtime";
+import { withReactionSummaries } from "@/lib/reactions";
+import { indexSearchDocs } from "@/lib/search-index";
+import {
+  findArchivedMessage,
+  listArchivedMessages,
+  listArchivedReplies,
+  type ArchiveHistoryContext,
+} from "@/lib/message-archive";
+
+const PAGE_SIZE = 50;
+
+/**
+ * Render a channel page (hot rows newest first, at most PAGE_SIZE) oldest
+ * first. When the hot table ran out before filling the page, the rest
+ * comes from the archive: the hot rows are then every hot message before
+ * `before`, so the newest PAGE_SIZE of both sets is the correct page.
+ */
+async function historyPage<
+  T extends { id: string; createdAt: Date; reactionCounts: Prisma.JsonValue },
+>(
+  hot: T[],
+  context: ArchiveHistoryContext,
+  before: Date | undefined,
+  userId: string,
+) {
+  const messages = await withReactionSummaries(hot, userId);
+  if (hot.length >= PAGE_SIZE) return messages.reverse();
+
+  const archived = await listArchivedMessages(context, before, PAGE_SIZE);
+  return [...messages, ...archived]
+    .sort((a, b) => b.createdAt.getTime() - a.createdAt.getTime())
+    .slice(0, PAGE_SIZE)
+    .reverse();
+}
 
 export async function GET(req: Request) {
+  const db = readPrisma(req);
   try {
     // 1. Rate limiting
     const rateLimitResult = await rateLimitChat(req);
@@ -53,21 +91,6 @@ export async function GET(req: Request) {
           image: true,
         },
       },
-      reactions: {
-        select: {
-          id: true,
-          emoji: true,
-          userId: true,
-          createdAt: true,
-          user: {
-            select: {
-              id: true,
-              name: true,
-              email: true,
-            },
-          },
-        },
-      },
       _count: {
         select: {
           replies: true,
@@ -76,12 +99,23 @@ export async function GET(req: Request) {
     };
 
     const orderBy = { createdAt: "asc" as const };
-    const take = 50;
+
+    // Channel pages: the newest 50 messages, or the 50 before `?before=`.
+    // Fetched newest-first so the time-ordered indexes stop after one page;
+    // older history continues in the archive (historyPage).
+    const take = PAGE_SIZE;
+    const newestFirst = { createdAt: "desc" as const };
+    const before = searchParams.get("before");
+    if (before && Number.isNaN(Date.parse(before))) {
+      return NextResponse.json({ error: "Invalid before" }, { status: 400 });
+    }
+    const createdAt = before ? { lt: new Date(before) } : undefined;
 
     // Thread messages (check parent message access)
     if (parentId) {
-      // Verify access to parent message's context
-      const parentMessage = await prisma.message.findUnique({
+      // Verify access to parent message's context. Threads are archived
+      // whole, so an archived parent means archived replies.
+      const hotParent = await db.message.findUnique({
         where: { id: parentId },
         select: {
           workspaceId: true,
@@ -91,6 +125,7 @@ export async function GET(req: Request) {
           conversationId: true,
         },
       });
+      const parentMessage = hotParent ?? (await findArchivedMessage(parentId));
 
       if (!parentMessage) {
         return NextResponse.json(
@@ -119,13 +154,18 @@ export async function GET(req: Request) {
         }
       }
 
-      const messages = await prisma.message.findMany({
-        where: { parentId },
-        include,
-        orderBy,
-      });
-
-      const response = NextResponse.json(messages);
+      const response = NextResponse.json(
+        hotParent
+          ? await withReactionSummaries(
+              await db.message.findMany({
+                where: { parentId },
+                include,
+                orderBy,
+              }),
+              user.id,
+            )
+          : await listArchivedReplies(parentId),
+      );
       Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
         response.headers.set(key, value);
       });
@@ -136,14 +176,16 @@ export async function GET(req: Request) {
     if (workspaceId) {
       await assertWorkspaceMember(user.id, workspaceId);
 
-      const messages = await prisma.message.findMany({
-        where: { workspaceId, parentId: null },
+      const messages = await db.message.findMany({
+        where: { workspaceId, parentId: null, createdAt },
         include,
-        orderBy,
+        orderBy: newestFirst,
         take,
       });
 
-      const response = NextResponse.json(messages);
+      const response = NextResponse.json(
+        await historyPage(messages, { workspaceId }, createdAt?.lt, user.id),
+      );
       Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
         response.headers.set(key, value);
       });
@@ -154,14 +196,16 @@ export async function GET(req: Request) {
     if (projectId) {
       await assertProjectMember(user.id, projectId);
 
-      const messages = await prisma.message.findMany({
-        where: { projectId, parentId: null },
+      const messages = await db.message.findMany({
+        where: { projectId, parentId: null, createdAt },
         include,
-        orderBy,
+        orderBy: newestFirst,
         take,
       });
 
-      const response = NextResponse.json(messages);
+      const response = NextResponse.json(
+        await historyPage(messages, { projectId }, createdAt?.lt, user.id),
+      );
       Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
         response.headers.set(key, value);
       });
@@ -172,14 +216,21 @@ export async function GET(req: Request) {
     if (conversationId) {
       await assertConversationMember(user.id, conversationId);
 
-      const messages = await prisma.message.findMany({
-        where: { conversationId, parentId: null },
+      const messages = await db.message.findMany({
+        where: { conversationId, parentId: null, createdAt },
         include,
-        orderBy,
+        orderBy: newestFirst,
         take,
       });
 
-      const response = NextResponse.json(messages);
+      const response = NextResponse.json(
+        await historyPage(
+          messages,
+          { conversationId },
+          createdAt?.lt,
+          user.id,
+        ),
+      );
       Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
         response.headers.set(key, value);
       });
@@ -191,10 +242,10 @@ export async function GET(req: Request) {
       // Verify users share a workspace (DM authorization)
       await assertCanDirectMessage(user.id, receiverId);
 
-      const messages = await prisma.message.findMany({
+      const messages = await db.message.findMany({
         where: {
           AND: [
-            { parentId: null },
+            { parentId: null, createdAt },
             {
               OR: [
                 { senderId: user.id, receiverId },
@@ -204,11 +255,18 @@ export async function GET(req: Request) {
           ],
         },
         include,
-        orderBy,
+        orderBy: newestFirst,
         take,
       });
 
-      const response = NextResponse.json(messages);
+      const response = NextResponse.json(
+        await historyPage(
+          messages,
+          { userId: user.id, receiverId },
+          createdAt?.lt,
+          user.id,
+        ),
+      );
       Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
         response.headers.set(key, value);
       });
@@ -333,7 +391,7 @@ export async function POST(req: Request) {
     }
 
     // 8. Create message
-    const message = await prisma.message.create({
+    const created = await prisma.message.create({
       data: {
         ...sanitized,
         senderId,
@@ -341,83 +399,43 @@ export async function POST(req: Request) {
       },
       include: {
         sender: { select: { id: true, name: true, image: true } },
-        reactions: {
-          include: { user: { select: { id: true, name: true, email: true } } },
-        },
         _count: { select: { replies: true } },
       },
     });
+    const [message] = await withReactionSummaries([created], senderId);
+
+    // 9. Broadcast (background job)
+    const channelId = getMessageChannel(message);
+    if (channelId) {
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
+        event: "new-message",
+        payload: message,
+      });
+    }
+    if (created.projectId) {
+      indexSearchDocs([
+        {
+          type: "MESSAGE",
+          id: created.id,
+          text: created.content,
+          projectId: created.projectId,
+          sender: created.sender.name,
+        },
+      ]);
+    }
 
-    // 9. Broadcast (non-blocking)
-    (async () => {
-      try {
-        const { createClient } = await import("@/lib/supabase/server");
-        const supabase = await createClient();
-
-        // Determine channel ID
-        const channelId = sanitized.parentId
-          ? `thread:${sanitized.parentId}`
-          : sanitized.workspaceId
-            ? `workspace:${sanitized.workspaceId}`
-            : sanitized.projectId
-              ? `project:${sanitized.projectId}`
-              : sanitized.conversationId
-                ? `conversation:${sanitized.conversationId}`
-                : sanitized.receiverId
-                  ? `dm:${[senderId, sanitized.receiverId].sort().join(":")}`
-                  : null;
-
-        if (channelId) {
-          const channel = supabase.channel(channelId);
-          await channel.subscribe();
-          await channel.send({
-            type: "broadcast",
-            event: "new-message",
-            payload: message,
-          });
-        }
-
-        // If it's a reply, update parent message reply count
-        if (sanitized.parentId) {
-          const parentMessage = await prisma.message.findUnique({
-            where: { id: sanitized.parentId },
-            include: {
-              sender: { select: { id: true, name: true, image: true } },
-              reactions: {
-                include: {
-                  user: { select: { id: true, name: true, email: true } },
-                },
-              },
-              _count: { select: { replies: true } },
-            },
-          });
-
-          if (parentMessage) {
-            const parentChannelId = parentMessage.workspaceId
-              ? `workspace:${parentMessage.workspaceId}`
-              : parentMessage.projectId
-                ? `project:${parentMessage.projectId}`
-                : parentMessage.conversationId
-                  ? `conversation:${parentMessage.conversationId}`
-                  : parentMessage.receiverId
-                    ? `dm:${[parentMessage.senderId, parentMessage.receiverId].sort().join(":")}`
-                    : null;
-
-            if (parentChannelId) {
-              const parentChannel = supabase.channel(parentChannelId);
-              await parentChannel.subscribe();
-              await parentChannel.send({
-                type: "broadcast",
-                event: "message-updated",
-                payload: parentMessage,
-              });
-            }
-          }
-        }
-      } catch (e) {
-        console.error("[CHAT_BROADCAST_ERROR]", e);
-      }
-    })();
+    // If it's a reply, refresh the parent's reply count in the conversation;
+    // otherwise bump the recipients' unread counters
+    if (sanitized.parentId) {
+      await enqueueJob("message.broadcast", {
+        messageId: sanitized.parentId,
+        event: "message-updated",
+        context: true,
+      });
+    } else {
+      await enqueueJob("unread.increment", { messageId: message.id });
+    }
 
     const response = NextResponse.json(message, { status: 201 });
     Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
@@ -1,9 +1,17 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { readPrisma } from "@/lib/prisma";
 import { Prisma } from "@prisma/client";
+import { withReactionSummaries } from "@/lib/reactions";
+import {
+  searchArchivedMessages,
+  type ArchiveSearchContext,
+} from "@/lib/message-archive";
+
+const SEARCH_LIMIT = 20;
 
 export async function GET(req: Request) {
+  const db = readPrisma(req);
   try {
     const user = await getCurrentUser();
     if (!user) {
@@ -20,7 +28,8 @@ export async function GET(req: Request) {
       return NextResponse.json({ error: "Query required" }, { status: 400 });
     }
 
-    // Context filter construction
+    // Context filter construction (live table and archive)
+    let archiveContext: ArchiveSearchContext;
     const whereClause: Prisma.MessageWhereInput = {
       content: {
         contains: query,
@@ -30,10 +39,13 @@ export async function GET(req: Request) {
 
     if (workspaceId) {
       whereClause.workspaceId = workspaceId;
+      archiveContext = { workspaceId };
     } else if (projectId) {
       whereClause.projectId = projectId;
+      archiveContext = { projectId };
     } else if (receiverId) {
       const currentUserId = user.id;
+      archiveContext = { userId: currentUserId, receiverId };
       whereClause.OR = [
         { senderId: currentUserId, receiverId },
         { senderId: receiverId, receiverId: currentUserId },
@@ -45,17 +57,12 @@ export async function GET(req: Request) {
       );
     }
 
-    const messages = await prisma.message.findMany({
+    const messages = await db.message.findMany({
       where: whereClause,
       include: {
         sender: {
           select: { id: true, name: true, image: true },
         },
-        reactions: {
-          include: {
-            user: { select: { id: true, name: true, email: true } },
-          },
-        },
         _count: {
           select: { replies: true },
         },
@@ -63,10 +70,20 @@ export async function GET(req: Request) {
       orderBy: {
         createdAt: "desc",
       },
-      take: 20,
+      take: SEARCH_LIMIT,
     });
 
-    return NextResponse.json(messages);
+    // Fill the page from cold storage once recent history is exhausted
+    const archived = await searchArchivedMessages(
+      query,
+      archiveContext,
+      SEARCH_LIMIT - messages.length,
+    );
+
+    return NextResponse.json([
+      ...(await withReactionSummaries(messages, user.id)),
+      ...archived,
+    ]);
   } catch (error) {
     console.error("[SEARCH_ERROR]", error);
     return NextResponse.json(
@@ -0,0 +1,28 @@
+import { NextResponse } from "next/server";
+import {
+  QUERY_DEBUG_ENABLED,
+  getRouteQueryStats,
+  resetRouteQueryStats,
+} from "@/lib/query-metrics";
+
+/**
+ * Per-route query counts, DB time, N+1 shapes and Prisma operation counts
+ * collected by server.ts.
+ * Only available when QUERY_DEBUG is enabled (default outside production).
+ */
+export async function GET() {
+  if (!QUERY_DEBUG_ENABLED) {
+    return NextResponse.json({ error: "Not found" }, { status: 404 });
+  }
+
+  return NextResponse.json({ routes: getRouteQueryStats() });
+}
+
+export async function DELETE() {
+  if (!QUERY_DEBUG_ENABLED) {
+    return NextResponse.json({ error: "Not found" }, { status: 404 });
+  }
+
+  resetRouteQueryStats();
+  return NextResponse.json({ success: true });
+}
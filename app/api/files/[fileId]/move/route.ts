@@ -18,6 +18,7 @@ export async function PATCH(
 
     const file = await prisma.file.findUnique({
       where: { id: fileId },
+      select: { projectId: true },
     });
 
     if (!file) {
@@ -28,6 +29,7 @@ export async function PATCH(
     if (folderId) {
       const folder = await prisma.folder.findUnique({
         where: { id: folderId },
+        select: { projectId: true },
       });
 
       if (!folder || folder.projectId !== file.projectId) {
@@ -35,6 +37,7 @@ export async function PATCH(
       }
     }
 
+    // Folder file counts and sizes are updated by a trigger on "File"
     const updatedFile = await prisma.file.update({
       where: { id: fileId },
       data: {
@@ -1,6 +1,7 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
 import { prisma } from "@/lib/prisma";
+import { indexSearchDocs } from "@/lib/search-index";
 
 export async function POST(
   req: Request,
@@ -66,6 +67,14 @@ export async function POST(
         createdAt: new Date(),
       },
     });
+    indexSearchDocs([
+      {
+        type: "FILE",
+        id: fileId,
+        text: updatedFile.originalName,
+        projectId: updatedFile.projectId,
+      },
+    ]);
 
     // 5. Delete the historical version record that was restored (optional, but clean since it's now current)
     // Actually, keeping it as a "point in time" is fine too.
@@ -1,7 +1,8 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { prisma, readPrisma } from "@/lib/prisma";
 import { uploadFile, getDownloadUrl } from "@/lib/storage";
+import { indexSearchDocs } from "@/lib/search-index";
 
 interface FileVersionWithUploader {
   id: string;
@@ -20,6 +21,7 @@ export async function GET(
   req: Request,
   { params }: { params: Promise<{ fileId: string }> },
 ) {
+  const db = readPrisma(req);
   const user = await getCurrentUser();
   if (!user)
     return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
@@ -28,7 +30,7 @@ export async function GET(
 
   try {
     // eslint-disable-next-line @typescript-eslint/no-explicit-any
-    const versions = await (prisma as any).fileVersion.findMany({
+    const versions = await (db as any).fileVersion.findMany({
       where: { fileId },
       include: { uploadedBy: { select: { name: true } } },
       orderBy: { versionNumber: "desc" },
@@ -115,6 +117,14 @@ export async function POST(
         createdAt: new Date(),
       },
     });
+    indexSearchDocs([
+      {
+        type: "FILE",
+        id: fileId,
+        text: updatedFile.originalName,
+        projectId: updatedFile.projectId,
+      },
+    ]);
 
     return NextResponse.json(updatedFile);
   } catch (error) {
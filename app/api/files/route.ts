@@ -1,6 +1,6 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { prisma, readPrisma } from "@/lib/prisma";
 import { uploadFile, getDownloadUrl } from "@/lib/storage";
 import {
   rateLimit,
@@ -8,8 +8,10 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { indexSearchDocs } from "@/lib/search-index";
 
 export async function GET(req: Request) {
+  const db = readPrisma(req);
   try {
     // Apply default rate limiting
     const rateLimitResult = await rateLimit(req);
@@ -31,7 +33,7 @@ export async function GET(req: Request) {
         where.folderId = folderId === "root" ? null : folderId;
       }
 
-      const files = await prisma.file.findMany({
+      const files = await db.file.findMany({
         where,
         include: { uploadedBy: { select: { name: true } } },
         orderBy: { createdAt: "desc" },
@@ -101,6 +103,9 @@ export async function POST(req: Request) {
         uploadedById: user.id,
       },
     });
+    indexSearchDocs([
+      { type: "FILE", id: fileRecord.id, text: fileName, projectId },
+    ]);
 
     return NextResponse.json(fileRecord, { status: 201 });
   } catch (error) {
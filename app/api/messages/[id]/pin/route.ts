@@ -1,6 +1,8 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
 import { prisma } from "@/lib/prisma";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { getMessageChannel } from "@/lib/realtime";
 
 export async function POST(
   req: Request,
@@ -31,46 +33,15 @@ export async function POST(
       data: { isPinned: !message.isPinned },
     });
 
-    // Broadcast pinning status change (non-blocking)
-    (async () => {
-      try {
-        const { createClient } = await import("@/lib/supabase/server");
-        const supabase = await createClient();
-        const channelId = message.workspaceId
-          ? `workspace:${message.workspaceId}`
-          : message.parentId
-            ? `thread:${message.parentId}`
-            : message.projectId
-              ? `project:${message.projectId}`
-              : `user:${message.receiverId}`;
-
-        if (channelId) {
-          const channel = supabase.channel(channelId);
-          await channel.subscribe();
-          await channel.send({
-            type: "broadcast",
-            event: "message-pinned-toggled",
-            payload: { id, isPinned: updatedMessage.isPinned },
-          });
-
-          if (
-            !message.workspaceId &&
-            !message.projectId &&
-            message.receiverId
-          ) {
-            const senderChannel = supabase.channel(`user:${message.senderId}`);
-            await senderChannel.subscribe();
-            await senderChannel.send({
-              type: "broadcast",
-              event: "message-pinned-toggled",
-              payload: { id, isPinned: updatedMessage.isPinned },
-            });
-          }
-        }
-      } catch (e) {
-        console.error("[PIN_BROADCAST_ERROR]", e);
-      }
-    })();
+    // Broadcast pinning status change (background job)
+    const channelId = getMessageChannel(message);
+    if (channelId) {
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
+        event: "message-pinned-toggled",
+        payload: { id, isPinned: updatedMessage.isPinned },
+      });
+    }
 
     return NextResponse.json(updatedMessage);
   } catch (error) {
@@ -1,133 +1,120 @@
-import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
 import { prisma } from "@/lib/prisma";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { getMessageChannel } from "@/lib/realtime";
+import { toggleReaction } from "@/lib/reactions";
+import {
+  requireUser,
+  assertWorkspaceMember,
+  assertProjectMember,
+  assertConversationMember,
+  ForbiddenError,
+  NotFoundError,
+} from "@/lib/auth/guards";
+import { handleApiError } from "@/lib/api/error-handler";
 
-export async function POST(
+const DETAILS_LIMIT = 100;
+
+/**
+ * The user must be able to read the message's context: its workspace,
+ * project or conversation, or be a party to the direct message
+ */
+async function assertMessageAccess(userId: string, messageId: string) {
+  const message = await prisma.message.findUnique({
+    where: { id: messageId },
+    select: {
+      workspaceId: true,
+      projectId: true,
+      conversationId: true,
+      receiverId: true,
+      senderId: true,
+    },
+  });
+
+  if (!message) {
+    throw new NotFoundError("Message not found");
+  }
+
+  if (message.workspaceId) {
+    await assertWorkspaceMember(userId, message.workspaceId);
+  } else if (message.projectId) {
+    await assertProjectMember(userId, message.projectId);
+  } else if (message.conversationId) {
+    await assertConversationMember(userId, message.conversationId);
+  } else if (userId !== message.senderId && userId !== message.receiverId) {
+    throw new ForbiddenError("Not authorized");
+  }
+}
+
+/**
+ * List who reacted to a message (loaded on demand; chat payloads only
+ * carry per-emoji counts)
+ */
+export async function GET(
   req: Request,
   { params }: { params: Promise<{ id: string }> },
 ) {
   try {
-    const user = await getCurrentUser();
-    if (!user) {
-      return new NextResponse("Unauthorized", { status: 401 });
-    }
-
+    const user = await requireUser();
     const { id: messageId } = await params;
-    const { emoji } = await req.json();
+    const emoji = new URL(req.url).searchParams.get("emoji") || undefined;
 
-    if (!emoji) {
-      return new NextResponse("Emoji is required", { status: 400 });
-    }
+    await assertMessageAccess(user.id, messageId);
 
-    // Toggle reaction
-    const existingReaction = await prisma.reaction.findUnique({
-      where: {
-        messageId_userId_emoji: {
-          messageId,
-          userId: user.id,
-          emoji,
-        },
+    const reactions = await prisma.reaction.findMany({
+      where: { messageId, emoji },
+      select: {
+        emoji: true,
+        createdAt: true,
+        user: { select: { id: true, name: true, email: true } },
       },
+      orderBy: { createdAt: "asc" },
+      take: DETAILS_LIMIT,
     });
 
-    if (existingReaction) {
-      await prisma.reaction.delete({
-        where: {
-          id: existingReaction.id,
-        },
-      });
-
-      // Broadcast removal (non-blocking)
-      (async () => {
-        try {
-          const { createClient } = await import("@/lib/supabase/server");
-          const supabase = await createClient();
-          const message = await prisma.message.findUnique({
-            where: { id: messageId },
-            select: {
-              parentId: true,
-              workspaceId: true,
-              projectId: true,
-              receiverId: true,
-            },
-          });
-
-          const channelId = message?.parentId
-            ? `thread:${message.parentId}`
-            : message?.workspaceId
-              ? `workspace:${message.workspaceId}`
-              : message?.projectId
-                ? `project:${message.projectId}`
-                : `user:${message?.receiverId}`;
-
-          if (channelId) {
-            const channel = supabase.channel(channelId);
-            await channel.subscribe();
-            await channel.send({
-              type: "broadcast",
-              event: "reaction-removed",
-              payload: { messageId, userId: user.id, emoji },
-            });
-          }
-        } catch (e) {
-          console.error("[REACTION_REMOVE_BROADCAST]", e);
-        }
-      })();
+    return NextResponse.json(reactions);
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
 
-      return NextResponse.json({ action: "removed" });
-    } else {
-      const reaction = await prisma.reaction.create({
-        data: {
-          messageId,
-          userId: user.id,
-          emoji,
-        },
-        include: {
-          user: { select: { id: true, email: true } },
-        },
-      });
+export async function POST(
+  req: Request,
+  { params }: { params: Promise<{ id: string }> },
+) {
+  try {
+    const user = await requireUser();
+    const { id: messageId } = await params;
+    const { emoji } = await req.json();
 
-      // Broadcast addition (non-blocking)
-      (async () => {
-        try {
-          const { createClient } = await import("@/lib/supabase/server");
-          const supabase = await createClient();
-          const message = await prisma.message.findUnique({
-            where: { id: messageId },
-            select: {
-              parentId: true,
-              workspaceId: true,
-              projectId: true,
-              receiverId: true,
-            },
-          });
+    if (!emoji) {
+      return new NextResponse("Emoji is required", { status: 400 });
+    }
 
-          const channelId = message?.parentId
-            ? `thread:${message.parentId}`
-            : message?.workspaceId
-              ? `workspace:${message.workspaceId}`
-              : message?.projectId
-                ? `project:${message.projectId}`
-                : `user:${message?.receiverId}`;
+    await assertMessageAccess(user.id, messageId);
 
-          if (channelId) {
-            const channel = supabase.channel(channelId);
-            await channel.subscribe();
-            await channel.send({
-              type: "broadcast",
-              event: "reaction-added",
-              payload: { messageId, reaction },
-            });
-          }
-        } catch (e) {
-          console.error("[REACTION_ADD_BROADCAST]", e);
-        }
-      })();
+    // Toggle reaction and update the message's counts in one statement
+    const result = await toggleReaction(messageId, user.id, emoji);
+    if (!result) {
+      return new NextResponse("Message not found", { status: 404 });
+    }
 
-      return NextResponse.json(reaction);
+    // Broadcast the new count (background job)
+    const channelId = getMessageChannel(result.message);
+    if (channelId) {
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
+        event: result.action === "added" ? "reaction-added" : "reaction-removed",
+        payload: { messageId, userId: user.id, emoji, count: result.count },
+      });
     }
+
+    return NextResponse.json({
+      action: result.action,
+      emoji,
+      count: result.count,
+    });
   } catch (error) {
-    console.error("[REACTION_POST]", error);
-    return new NextResponse("Internal Error", { status: 500 });
+    return handleApiError(error);
   }
 }
@@ -6,7 +6,10 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { messageUpdateSchema } from "@/lib/validation/schemas";
-import { createClient } from "@/lib/supabase/server";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { getMessageChannel } from "@/lib/realtime";
+import { withoutReactionCounts } from "@/lib/reactions";
+import { indexSearchDocs, removeSearchDocs } from "@/lib/search-index";
 import { NextResponse } from "next/server";
 
 export async function PATCH(
@@ -62,7 +65,7 @@ export async function PATCH(
     }
 
     // 7. Update message
-    const updatedMessage = await prisma.message.update({
+    const updated = await prisma.message.update({
       where: { id },
       data: {
         content,
@@ -77,30 +80,28 @@ export async function PATCH(
         },
       },
     });
+    const updatedMessage = withoutReactionCounts(updated);
 
-    // 8. Broadcast update to appropriate channel
-    const supabase = await createClient();
-    const channelId = message.parentId
-      ? `thread:${message.parentId}`
-      : message.workspaceId
-        ? `workspace:${message.workspaceId}`
-        : message.projectId
-          ? `project:${message.projectId}`
-          : message.conversationId
-            ? `conversation:${message.conversationId}`
-            : message.receiverId
-              ? `dm:${[message.senderId, message.receiverId].sort().join(":")}`
-              : null;
-
+    // 8. Broadcast update to appropriate channel (background job)
+    const channelId = getMessageChannel(message);
     if (channelId) {
-      const channel = supabase.channel(channelId);
-      await channel.subscribe();
-      await channel.send({
-        type: "broadcast",
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
         event: "message-updated",
         payload: updatedMessage,
       });
     }
+    if (message.projectId) {
+      indexSearchDocs([
+        {
+          type: "MESSAGE",
+          id,
+          text: updated.content,
+          projectId: message.projectId,
+          sender: updated.sender.name,
+        },
+      ]);
+    }
 
     const response = NextResponse.json(updatedMessage);
     Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
@@ -174,29 +175,16 @@ export async function DELETE(
       });
     }
 
-    // 7. Broadcast deletion
-    const supabase = await createClient();
-    const channelId = message.parentId
-      ? `thread:${message.parentId}`
-      : message.workspaceId
-        ? `workspace:${message.workspaceId}`
-        : message.projectId
-          ? `project:${message.projectId}`
-          : message.conversationId
-            ? `conversation:${message.conversationId}`
-            : message.receiverId
-              ? `dm:${[message.senderId, message.receiverId].sort().join(":")}`
-              : null;
-
+    // 7. Broadcast deletion (background job)
+    const channelId = getMessageChannel(message);
     if (channelId) {
-      const channel = supabase.channel(channelId);
-      await channel.subscribe();
-      await channel.send({
-        type: "broadcast",
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
         event: "message-deleted",
         payload: { id, softDeleted: message._count.replies > 0 },
       });
     }
+    removeSearchDocs("MESSAGE", [id]);
 
     const response = new NextResponse(null, { status: 204 });
     Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
@@ -12,7 +12,8 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { z } from "zod";
-import { createClient } from "@/lib/supabase/server";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { getMessageChannel } from "@/lib/realtime";
 import { NextResponse } from "next/server";
 
 const deliveredSchema = z.object({
@@ -89,40 +90,20 @@ export async function POST(req: Request) {
       },
     });
 
-    // 7. Broadcast delivery status to sender (non-blocking)
-    (async () => {
-      try {
-        const supabase = await createClient();
-        const channelId = message.parentId
-          ? `thread:${message.parentId}`
-          : message.workspaceId
-            ? `workspace:${message.workspaceId}`
-            : message.projectId
-              ? `project:${message.projectId}`
-              : message.conversationId
-                ? `conversation:${message.conversationId}`
-                : message.receiverId
-                  ? `dm:${[message.senderId, message.receiverId].sort().join(":")}`
-                  : null;
-
-        if (channelId) {
-          const channel = supabase.channel(channelId);
-          await channel.subscribe();
-          await channel.send({
-            type: "broadcast",
-            event: "message-delivered",
-            payload: {
-              id: updatedMessage.id,
-              status: updatedMessage.status,
-              deliveredAt: updatedMessage.deliveredAt,
-              userId: user.id,
-            },
-          });
-        }
-      } catch (e) {
-        console.error("[DELIVERED_BROADCAST_ERROR]", e);
-      }
-    })();
+    // 7. Broadcast delivery status to sender (background job)
+    const channelId = getMessageChannel(message);
+    if (channelId) {
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
+        event: "message-delivered",
+        payload: {
+          id: updatedMessage.id,
+          status: updatedMessage.status,
+          deliveredAt: updatedMessage.deliveredAt,
+          userId: user.id,
+        },
+      });
+    }
 
     const response = NextResponse.json({
       success: true,
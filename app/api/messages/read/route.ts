@@ -13,7 +13,9 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { z } from "zod";
-import { createClient } from "@/lib/supabase/server";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { getContextChannel, getMessageChannel } from "@/lib/realtime";
+import { markChannelRead } from "@/lib/unread";
 import { NextResponse } from "next/server";
 
 const readSchema = z.object({
@@ -51,6 +53,7 @@ export async function POST(req: Request) {
         conversationId: true,
         parentId: true,
         status: true,
+        createdAt: true,
       },
     });
 
@@ -74,7 +77,18 @@ export async function POST(req: Request) {
       throw new ForbiddenError("Message has no valid context");
     }
 
-    // 6. Determine unique constraint based on context
+    // 6. Reset the unread badge for the channel (threads are not counted)
+    const contextChannel = getContextChannel(message);
+    if (!message.parentId && contextChannel) {
+      await markChannelRead(user.id, contextChannel, message.createdAt);
+      await enqueueJob("realtime.broadcast", {
+        channel: `unread:${user.id}`,
+        event: "unread-updated",
+        payload: { channel: contextChannel, count: 0 },
+      });
+    }
+
+    // 7. Determine unique constraint based on context
     let where;
     if (workspaceId) {
       where = { userId_workspaceId: { userId: user.id, workspaceId } };
@@ -89,7 +103,7 @@ export async function POST(req: Request) {
       );
     }
 
-    // 7. Upsert the read status
+    // 8. Upsert the read status
     const messageRead = await prisma.messageRead.upsert({
       where,
       create: {
@@ -106,7 +120,7 @@ export async function POST(req: Request) {
       },
     });
 
-    // 8. Update message status to READ (only if user is receiver)
+    // 9. Update message status to READ (only if user is receiver)
     if (user.id === message.receiverId) {
       await prisma.message.update({
         where: { id: messageId },
@@ -114,40 +128,20 @@ export async function POST(req: Request) {
       });
     }
 
-    // 9. Broadcast read status (non-blocking)
-    (async () => {
-      try {
-        const supabase = await createClient();
-        const channelId = message.parentId
-          ? `thread:${message.parentId}`
-          : message.workspaceId
-            ? `workspace:${message.workspaceId}`
-            : message.projectId
-              ? `project:${message.projectId}`
-              : message.conversationId
-                ? `conversation:${message.conversationId}`
-                : message.receiverId
-                  ? `dm:${[message.senderId, message.receiverId].sort().join(":")}`
-                  : null;
-
-        if (channelId) {
-          const channel = supabase.channel(channelId);
-          await channel.subscribe();
-          await channel.send({
-            type: "broadcast",
-            event: "message-read",
-            payload: {
-              id: message.id,
-              status: "READ",
-              readBy: user.id,
-              lastReadAt: messageRead.lastReadAt,
-            },
-          });
-        }
-      } catch (e) {
-        console.error("[READ_BROADCAST_ERROR]", e);
-      }
-    })();
+    // 10. Broadcast read status (background job)
+    const channelId = getMessageChannel(message);
+    if (channelId) {
+      await enqueueJob("realtime.broadcast", {
+        channel: channelId,
+        event: "message-read",
+        payload: {
+          id: message.id,
+          status: "READ",
+          readBy: user.id,
+          lastReadAt: messageRead.lastReadAt,
+        },
+      });
+    }
 
     const response = NextResponse.json(messageRead);
     Object.entries(rateLimitResult.headers).forEach(([key, value]) => {
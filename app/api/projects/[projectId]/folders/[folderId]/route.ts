@@ -0,0 +1,100 @@
+import { NextResponse } from "next/server";
+import { prisma } from "@/lib/prisma";
+import { z } from "zod";
+import {
+  requireUser,
+  assertProjectMember,
+  NotFoundError,
+} from "@/lib/auth/guards";
+import {
+  handleApiError,
+  createErrorResponse,
+} from "@/lib/api/error-handler";
+import {
+  deleteFolderTree,
+  getFolder,
+  isInSubtree,
+  moveFolder,
+} from "@/lib/folder-tree";
+
+const updateFolderSchema = z.object({
+  name: z.string().min(1).optional(),
+  // null moves the folder to the project root
+  parentId: z.string().nullable().optional(),
+});
+
+type Params = { params: Promise<{ projectId: string; folderId: string }> };
+
+/**
+ * Rename and/or move a folder. Moving rewrites the materialized path of
+ * the whole subtree in one statement.
+ */
+export async function PATCH(req: Request, { params }: Params) {
+  try {
+    const { projectId, folderId } = await params;
+    const user = await requireUser();
+    await assertProjectMember(user.id, projectId);
+
+    const { name, parentId } = updateFolderSchema.parse(await req.json());
+
+    const folder = await getFolder(prisma, projectId, folderId);
+    if (!folder) {
+      throw new NotFoundError("Folder not found");
+    }
+
+    if (parentId !== undefined && parentId !== folder.parentId) {
+      const newParent = parentId
+        ? await getFolder(prisma, projectId, parentId)
+        : null;
+      if (parentId && !newParent) {
+        throw new NotFoundError("Destination folder not found");
+      }
+      if (newParent && isInSubtree(folder, newParent)) {
+        return createErrorResponse(
+          "Cannot move a folder into itself or one of its subfolders",
+        );
+      }
+      const moved = await moveFolder(projectId, folder.id, parentId);
+      if (moved === "not_found") {
+        throw new NotFoundError("Folder not found");
+      }
+      if (moved === "cycle") {
+        return createErrorResponse(
+          "Cannot move a folder into itself or one of its subfolders",
+        );
+      }
+    }
+
+    const updated = await prisma.folder.update({
+      where: { id: folder.id },
+      data: name ? { name } : {},
+    });
+
+    return NextResponse.json({ ...updated, fileSize: Number(updated.fileSize) });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
+
+/**
+ * Delete a folder and its subfolders. Files inside are kept and moved up
+ * to the deleted folder's parent.
+ */
+export async function DELETE(req: Request, { params }: Params) {
+  try {
+    const { projectId, folderId } = await params;
+    const user = await requireUser();
+    await assertProjectMember(user.id, projectId);
+
+    const folder = await getFolder(prisma, projectId, folderId);
+    if (!folder) {
+      throw new NotFoundError("Folder not found");
+    }
+
+    const deleted = await deleteFolderTree(folder);
+
+    return NextResponse.json({ deleted });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
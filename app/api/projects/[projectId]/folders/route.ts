@@ -1,41 +1,65 @@
-import { createClient } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { prisma, readPrisma } from "@/lib/prisma";
 import { z } from "zod";
+import {
+  requireUser,
+  assertProjectMember,
+  NotFoundError,
+} from "@/lib/auth/guards";
+import { handleApiError } from "@/lib/api/error-handler";
+import {
+  getAncestors,
+  getFolder,
+  listFolderLevel,
+  searchFolders,
+} from "@/lib/folder-tree";
 
 const folderSchema = z.object({
   name: z.string().min(1),
   parentId: z.string().optional().nullable(),
 });
 
+/**
+ * One level of the folder tree: `?parentId=<id>` lists that folder's
+ * children (default: top-level folders) along with its breadcrumb;
+ * `?q=` searches folder names across the whole project instead.
+ */
 export async function GET(
   req: Request,
   { params }: { params: Promise<{ projectId: string }> },
 ) {
+  const db = readPrisma(req);
   try {
     const { projectId } = await params;
-    const supabase = await createClient();
-    const {
-      data: { user },
-    } = await supabase.auth.getUser();
+    const user = await requireUser();
+    await assertProjectMember(user.id, projectId);
 
-    if (!user) {
-      return new NextResponse("Unauthorized", { status: 401 });
+    const { searchParams } = new URL(req.url);
+    const query = searchParams.get("q")?.trim();
+    if (query) {
+      const folders = await searchFolders(db, projectId, query);
+      return NextResponse.json({ folders, ancestors: [] });
     }
 
-    const folders = await prisma.folder.findMany({
-      where: { projectId },
-      include: {
-        files: true,
-        children: true,
-      },
-      orderBy: { createdAt: "asc" },
-    });
+    const parentId = searchParams.get("parentId");
+    if (!parentId || parentId === "root") {
+      const folders = await listFolderLevel(db, projectId, null);
+      return NextResponse.json({ folders, ancestors: [] });
+    }
+
+    const parent = await getFolder(db, projectId, parentId);
+    if (!parent) {
+      throw new NotFoundError("Folder not found");
+    }
+
+    const [folders, ancestors] = await Promise.all([
+      listFolderLevel(db, projectId, parent.id),
+      getAncestors(db, parent),
+    ]);
 
-    return NextResponse.json(folders);
+    return NextResponse.json({ folders, ancestors });
   } catch (error) {
-    console.error("[FOLDERS_GET]", error);
-    return new NextResponse("Internal Error", { status: 500 });
+    return handleApiError(error);
   }
 }
 
@@ -45,18 +69,16 @@ export async function POST(
 ) {
   try {
     const { projectId } = await params;
-    const supabase = await createClient();
-    const {
-      data: { user },
-    } = await supabase.auth.getUser();
-
-    if (!user) {
-      return new NextResponse("Unauthorized", { status: 401 });
-    }
+    const user = await requireUser();
+    await assertProjectMember(user.id, projectId);
 
     const body = await req.json();
     const { name, parentId } = folderSchema.parse(body);
 
+    if (parentId && !(await getFolder(prisma, projectId, parentId))) {
+      throw new NotFoundError("Parent folder not found");
+    }
+
     const folder = await prisma.folder.create({
       data: {
         name,
@@ -65,12 +87,8 @@ export async function POST(
       },
     });
 
-    return NextResponse.json(folder);
+    return NextResponse.json({ ...folder, fileSize: Number(folder.fileSize) });
   } catch (error) {
-    if (error instanceof z.ZodError) {
-      return new NextResponse(JSON.stringify(error.issues), { status: 400 });
-    }
-    console.error("[FOLDERS_POST]", error);
-    return new NextResponse("Internal Error", { status: 500 });
+    return handleApiError(error);
   }
 }
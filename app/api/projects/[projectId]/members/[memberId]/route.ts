@@ -1,6 +1,7 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
 import { prisma } from "@/lib/prisma";
+import { refreshSearchMember } from "@/lib/search-index";
 
 export async function DELETE(
   req: Request,
@@ -61,6 +62,7 @@ export async function DELETE(
     await prisma.projectMember.delete({
       where: { id: memberId },
     });
+    refreshSearchMember(memberToRemove.user.supabaseId);
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -1,6 +1,7 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
 import { prisma } from "@/lib/prisma";
+import { refreshSearchMember } from "@/lib/search-index";
 import { z } from "zod";
 
 const addMemberSchema = z.object({
@@ -169,6 +170,8 @@ export async function POST(
       },
     });
 
+    refreshSearchMember(userToAdd.supabaseId);
+
     return NextResponse.json(newMember, { status: 201 });
   } catch (error) {
     if (error instanceof z.ZodError) {
@@ -0,0 +1,54 @@
+import { NextResponse } from "next/server";
+import { requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import { handleApiError } from "@/lib/api/error-handler";
+import { taskBatchSchema } from "@/lib/validation/schemas";
+import {
+  announceTaskChanges,
+  createTasks,
+  deleteTasks,
+  loadProjectContext,
+  updateTasks,
+} from "@/lib/task-batch";
+
+type Params = { params: Promise<{ projectId: string }> };
+
+/**
+ * Create, update and delete up to 500 tasks of a project in one request:
+ * `{ create: [...], update: [{ id, ...fields }], delete: [id] }`.
+ *
+ * Returns one result per row under the same keys; invalid rows are
+ * reported without failing the others. Operations run in that order.
+ */
+export async function POST(req: Request, { params }: Params) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const { projectId } = await params;
+    const user = await requireUser();
+    const batch = taskBatchSchema.parse(await req.json());
+    const ctx = await loadProjectContext(user.id, projectId);
+
+    const created = await createTasks(ctx, batch.create);
+    const updated = await updateTasks(ctx, batch.update);
+    const deleted = await deleteTasks(ctx, batch.delete);
+
+    const results = { create: created, update: updated, delete: deleted };
+    const changed = [created, updated, deleted].some((rows) =>
+      rows.some((row) => row.status !== "error"),
+    );
+    if (changed) {
+      await announceTaskChanges(projectId);
+    }
+
+    return NextResponse.json(results);
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
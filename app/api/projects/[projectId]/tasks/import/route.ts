@@ -0,0 +1,70 @@
+import { requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import {
+  handleApiError,
+  createErrorResponse,
+} from "@/lib/api/error-handler";
+import { streamJsonArray } from "@/lib/api/stream-json";
+import {
+  announceTaskChanges,
+  createTasks,
+  loadProjectContext,
+  type RowResult,
+} from "@/lib/task-batch";
+import { readImportRows } from "@/lib/task-import";
+
+type Params = { params: Promise<{ projectId: string }> };
+
+/**
+ * Import tasks from a CSV, NDJSON or JSON body (see lib/task-import.ts).
+ *
+ * The body is read and written in chunks of 500 rows, each created with a
+ * single createMany, and the per-row results are streamed back as a JSON
+ * array while later chunks are still being read.
+ */
+export async function POST(req: Request, { params }: Params) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const { projectId } = await params;
+    const user = await requireUser();
+    const ctx = await loadProjectContext(user.id, projectId);
+
+    const chunks = readImportRows(req);
+    if (!chunks) {
+      return createErrorResponse(
+        "Send text/csv, application/x-ndjson or application/json",
+        415,
+      );
+    }
+
+    async function* results(): AsyncGenerator<RowResult[]> {
+      let index = 0;
+      let created = 0;
+      try {
+        for await (const rows of chunks) {
+          const chunkResults = await createTasks(ctx, rows, index);
+          index += rows.length;
+          created += chunkResults.filter((r) => r.status === "created").length;
+          yield chunkResults;
+        }
+      } finally {
+        if (created > 0) await announceTaskChanges(projectId);
+      }
+    }
+
+    return await streamJsonArray(results());
+  } catch (error) {
+    // Unreadable body or CSV header, raised while reading the first chunk
+    if (error instanceof SyntaxError) {
+      return createErrorResponse(error.message);
+    }
+    return handleApiError(error);
+  }
+}
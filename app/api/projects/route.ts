@@ -7,6 +7,7 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { indexSearchDocs, refreshSearchMember } from "@/lib/search-index";
 
 const projectSchema = z.object({
   name: z.string().min(2, "Name must be at least 2 characters"),
@@ -126,6 +127,10 @@ export async function POST(req: Request) {
         },
       },
     });
+    indexSearchDocs([
+      { type: "PROJECT", id: project.id, text: project.name, workspaceId },
+    ]);
+    refreshSearchMember(user.supabaseId);
 
     return NextResponse.json(project, { status: 201 });
   } catch (error) {
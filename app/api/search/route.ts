@@ -1,25 +1,30 @@
 import { createClient } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
 import {
   rateLimitSearch,
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { searchWorkspace } from "@/lib/search-index";
 
+/**
+ * Command-palette search, served from the per-workspace in-memory index
+ * (lib/search-index.ts). Matches task titles, project names, file names
+ * and recent messages of the user's projects in the given workspace.
+ */
 export async function GET(req: Request) {
   try {
-    // Apply search rate limiting (20 req/min)
+    // Apply search rate limiting (60 req/min)
     const rateLimitResult = await rateLimitSearch(req);
     if (!rateLimitResult.success) {
       return createRateLimitResponse(rateLimitResult);
     }
 
     const { searchParams } = new URL(req.url);
-    const query = searchParams.get("q");
+    const query = searchParams.get("q")?.trim();
     const workspaceSlug = searchParams.get("workspaceSlug");
 
-    if (!query || query.length < 2) {
+    if (!query || query.length < 2 || !workspaceSlug) {
       return NextResponse.json([]);
     }
 
@@ -32,115 +37,17 @@ export async function GET(req: Request) {
       return new NextResponse("Unauthorized", { status: 401 });
     }
 
-    // Determine current workspace ID if slug is provided
-    let workspaceId: string | undefined;
-    if (workspaceSlug) {
-      const workspace = await prisma.workspace.findUnique({
-        where: { slug: workspaceSlug },
-      });
-      workspaceId = workspace?.id;
+    const results = await searchWorkspace(workspaceSlug, user.id, query);
+    if (!results) {
+      return NextResponse.json(
+        { error: "Workspace not found" },
+        { status: 404 },
+      );
     }
 
-    // Search Tasks
-    const tasks = await prisma.task.findMany({
-      where: {
-        AND: [
-          workspaceId ? { project: { workspaceId } } : {},
-          {
-            OR: [
-              { title: { contains: query, mode: "insensitive" } },
-              { description: { contains: query, mode: "insensitive" } },
-            ],
-          },
-        ],
-      },
-      include: {
-        project: {
-          select: { name: true, workspace: { select: { slug: true } } },
-        },
-      },
-      take: 5,
+    return NextResponse.json(results, {
+      headers: { "Cache-Control": "private, max-age=10" },
     });
-
-    // Search Projects
-    const projects = await prisma.project.findMany({
-      where: {
-        AND: [
-          workspaceId ? { workspaceId } : {},
-          { name: { contains: query, mode: "insensitive" } },
-        ],
-      },
-      include: {
-        workspace: { select: { slug: true } },
-      },
-      take: 3,
-    });
-
-    // Search Files
-    const files = await prisma.file.findMany({
-      where: {
-        AND: [
-          workspaceId ? { project: { workspaceId } } : {},
-          { originalName: { contains: query, mode: "insensitive" } },
-        ],
-      },
-      include: {
-        project: { select: { name: true } },
-      },
-      take: 3,
-    });
-
-    // Search Messages
-    const messages = await prisma.message.findMany({
-      where: {
-        AND: [
-          workspaceId ? { project: { workspaceId } } : {},
-          { content: { contains: query, mode: "insensitive" } },
-        ],
-      },
-      include: {
-        project: {
-          select: { name: true, workspace: { select: { slug: true } } },
-        },
-        sender: { select: { name: true } },
-      },
-      take: 5,
-    });
-
-    // Format results for Command Palette
-    const results = [
-      ...tasks.map((t) => ({
-        id: t.id,
-        type: "TASK",
-        title: t.title,
-        subtitle: `in ${t.project.name}`,
-        url: `/app/${t.project.workspace.slug}/projects/${t.projectId}?task=${t.id}`,
-      })),
-      ...projects.map((p) => ({
-        id: p.id,
-        type: "PROJECT",
-        title: p.name,
-        subtitle: "Project",
-        url: `/app/${p.workspace.slug}/projects/${p.id}`,
-      })),
-      ...files.map((f) => ({
-        id: f.id,
-        type: "FILE",
-        title: f.originalName,
-        subtitle: `File in ${f.project.name}`,
-        url: `/app/${workspaceSlug || "default"}/files`,
-      })),
-      ...messages.map((m) => ({
-        id: m.id,
-        type: "MESSAGE",
-        title:
-          m.content.substring(0, 50) + (m.content.length > 50 ? "..." : ""),
-        subtitle: `from ${m.sender.name || "User"} in ${m.project?.name || "DM"}`,
-        url: `/app/${m.project?.workspace.slug || workspaceSlug}/chat?channel=${m.projectId || "personal"}`,
-      })),
-    ];
-
-    return NextResponse.json(results);
   } catch (error) {
     return handleApiError(error);
   }
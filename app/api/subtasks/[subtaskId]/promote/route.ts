@@ -6,6 +6,7 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { indexSearchDocs } from "@/lib/search-index";
 
 export async function POST(
   req: Request,
@@ -50,6 +51,14 @@ export async function POST(
     await prisma.subtask.delete({
       where: { id: subtaskId },
     });
+    indexSearchDocs([
+      {
+        type: "TASK",
+        id: newTask.id,
+        text: newTask.title,
+        projectId: newTask.projectId,
+      },
+    ]);
 
     return NextResponse.json(newTask);
   } catch (error) {
@@ -1,6 +1,7 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { prisma, readPrisma } from "@/lib/prisma";
+import { enqueueJob } from "@/lib/jobs/queue";
 import { Prisma } from "@prisma/client";
 import { z } from "zod";
 import { notifyTaskAssigned } from "@/lib/notifications";
@@ -9,6 +10,8 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { assertProjectMember, NotFoundError } from "@/lib/auth/guards";
+import { indexSearchDocs, removeSearchDocs } from "@/lib/search-index";
 
 const updateTaskSchema = z.object({
   title: z.string().min(1).optional(),
@@ -20,6 +23,51 @@ const updateTaskSchema = z.object({
   position: z.number().optional(),
 });
 
+/**
+ * One task with the fields the task modal edits. Views that list slim
+ * tasks (e.g. the calendar feed) load this before opening the modal.
+ */
+export async function GET(
+  req: Request,
+  { params }: { params: Promise<{ taskId: string }> },
+) {
+  const db = readPrisma(req);
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const user = await getCurrentUser();
+    if (!user)
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+
+    const { taskId } = await params;
+    const task = await db.task.findUnique({
+      where: { id: taskId },
+      include: {
+        assignee: {
+          select: { id: true, name: true, email: true, image: true },
+        },
+        tags: {
+          select: { id: true, name: true, color: true },
+        },
+        _count: {
+          select: { comments: true, subtasks: true },
+        },
+      },
+    });
+    if (!task) {
+      throw new NotFoundError("Task not found");
+    }
+    await assertProjectMember(user.id, task.projectId);
+
+    return NextResponse.json(task);
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
+
 export async function PATCH(
   req: Request,
   { params }: { params: Promise<{ taskId: string }> },
@@ -112,11 +160,9 @@ export async function PATCH(
       },
     });
 
-    // Broadcast via Supabase Realtime
-    const { createClient } = await import("@/lib/supabase/server");
-    const supabase = await createClient();
-    await supabase.channel(`project:${updatedTask.projectId}`).send({
-      type: "broadcast",
+    // Broadcast via Supabase Realtime (background job)
+    await enqueueJob("realtime.broadcast", {
+      channel: `project:${updatedTask.projectId}`,
       event: "task-updated",
       payload: {
         projectId: updatedTask.projectId,
@@ -124,6 +170,16 @@ export async function PATCH(
         type: "UPDATED",
       },
     });
+    if (data.title !== undefined) {
+      indexSearchDocs([
+        {
+          type: "TASK",
+          id,
+          text: updatedTask.title,
+          projectId: updatedTask.projectId,
+        },
+      ]);
+    }
 
     if (
       assigneeChanged &&
@@ -190,14 +246,13 @@ export async function DELETE(
       where: { id },
     });
 
-    // Broadcast via Supabase Realtime
-    const { createClient } = await import("@/lib/supabase/server");
-    const supabase = await createClient();
-    await supabase.channel(`project:${task.projectId}`).send({
-      type: "broadcast",
+    // Broadcast via Supabase Realtime (background job)
+    await enqueueJob("realtime.broadcast", {
+      channel: `project:${task.projectId}`,
       event: "task-updated",
       payload: { projectId: task.projectId, taskId: id, type: "DELETED" },
     });
+    removeSearchDocs("TASK", [id]);
 
     return NextResponse.json({ success: true });
   } catch (error) {
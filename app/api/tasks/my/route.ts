@@ -1,13 +1,15 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { readPrisma } from "@/lib/prisma";
 import {
   rateLimit,
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { paginate, streamJsonArray } from "@/lib/api/stream-json";
 
 export async function GET(req: Request) {
+  const db = readPrisma(req);
   try {
     const rateLimitResult = await rateLimit(req);
     if (!rateLimitResult.success) {
@@ -39,33 +41,44 @@ export async function GET(req: Request) {
       };
     }
 
-    const tasks = await prisma.task.findMany({
-      where: whereClause,
-      include: {
-        project: {
-          select: {
-            id: true,
-            name: true,
-            workspace: {
+    // Streamed in batches; offset paging because dueDate is nullable
+    const tasks = paginate(
+      (page) =>
+        db.task.findMany({
+          where: whereClause,
+          include: {
+            project: {
               select: {
                 id: true,
                 name: true,
-                slug: true,
+                workspace: {
+                  select: {
+                    id: true,
+                    name: true,
+                    slug: true,
+                  },
+                },
               },
             },
+            assignee: {
+              select: { id: true, name: true, email: true, image: true },
+            },
+            _count: {
+              select: { comments: true },
+            },
           },
-        },
-        assignee: {
-          select: { id: true, name: true, email: true, image: true },
-        },
-        _count: {
-          select: { comments: true },
-        },
-      },
-      orderBy: [{ status: "asc" }, { priority: "desc" }, { dueDate: "asc" }],
-    });
+          orderBy: [
+            { status: "asc" },
+            { priority: "desc" },
+            { dueDate: "asc" },
+            { id: "asc" },
+          ],
+          ...page,
+        }),
+      { mode: "offset" },
+    );
 
-    return NextResponse.json(tasks);
+    return await streamJsonArray(tasks);
   } catch (error) {
     return handleApiError(error);
   }
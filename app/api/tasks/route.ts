@@ -1,6 +1,7 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { prisma, readPrisma } from "@/lib/prisma";
+import { enqueueJob } from "@/lib/jobs/queue";
 import { z } from "zod";
 import { notifyTaskAssigned } from "@/lib/notifications";
 import {
@@ -8,6 +9,8 @@ import {
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import { paginate, streamJsonArray } from "@/lib/api/stream-json";
+import { indexSearchDocs } from "@/lib/search-index";
 
 const taskSchema = z.object({
   title: z.string().min(1, "Title is required"),
@@ -21,6 +24,7 @@ const taskSchema = z.object({
 });
 
 export async function GET(req: Request) {
+  const db = readPrisma(req);
   try {
     // Apply rate limiting
     const rateLimitResult = await rateLimit(req);
@@ -43,7 +47,7 @@ export async function GET(req: Request) {
     }
 
     // Check project membership
-    const membership = await prisma.projectMember.findFirst({
+    const membership = await db.projectMember.findFirst({
       where: {
         projectId,
         userId: user.id,
@@ -54,27 +58,31 @@ export async function GET(req: Request) {
       return NextResponse.json({ error: "Forbidden" }, { status: 403 });
     }
 
-    const tasks = await prisma.task.findMany({
-      where: { projectId },
-      include: {
-        assignee: {
-          select: { id: true, name: true, email: true, image: true },
-        },
-        tags: {
-          select: { id: true, name: true, color: true },
-        },
-        subtasks: true,
-        _count: {
-          select: {
-            comments: true,
-            subtasks: true,
+    // Whole board, streamed in batches
+    const tasks = paginate((page) =>
+      db.task.findMany({
+        where: { projectId },
+        include: {
+          assignee: {
+            select: { id: true, name: true, email: true, image: true },
+          },
+          tags: {
+            select: { id: true, name: true, color: true },
+          },
+          subtasks: true,
+          _count: {
+            select: {
+              comments: true,
+              subtasks: true,
+            },
           },
         },
-      },
-      orderBy: { position: "asc" },
-    });
+        orderBy: [{ position: "asc" }, { id: "asc" }],
+        ...page,
+      }),
+    );
 
-    return NextResponse.json(tasks);
+    return await streamJsonArray(tasks);
   } catch (error) {
     return handleApiError(error);
   }
@@ -145,14 +153,20 @@ export async function POST(req: Request) {
       },
     });
 
-    // Broadcast via Supabase Realtime
-    const { createClient } = await import("@/lib/supabase/server");
-    const supabase = await createClient();
-    await supabase.channel(`project:${data.projectId}`).send({
-      type: "broadcast",
+    // Broadcast via Supabase Realtime (background job)
+    await enqueueJob("realtime.broadcast", {
+      channel: `project:${data.projectId}`,
       event: "task-updated",
       payload: { projectId: data.projectId, taskId: task.id, type: "CREATED" },
     });
+    indexSearchDocs([
+      {
+        type: "TASK",
+        id: task.id,
+        text: task.title,
+        projectId: task.projectId,
+      },
+    ]);
 
     // Send notification if task has assignee
     if (data.assigneeId && data.assigneeId !== user.id) {
@@ -243,11 +257,9 @@ export async function PATCH(req: Request) {
         });
       }
 
-      // Broadcast via Supabase Realtime
-      const { createClient } = await import("@/lib/supabase/server");
-      const supabase = await createClient();
-      await supabase.channel(`project:${task.projectId}`).send({
-        type: "broadcast",
+      // Broadcast via Supabase Realtime (background job)
+      await enqueueJob("realtime.broadcast", {
+        channel: `project:${task.projectId}`,
         event: "task-updated",
         payload: { projectId: task.projectId, taskId, type: "UPDATED" },
       });
@@ -285,14 +297,22 @@ export async function PATCH(req: Request) {
       },
     });
 
-    // Broadcast via Supabase Realtime
-    const { createClient } = await import("@/lib/supabase/server");
-    const supabase = await createClient();
-    await supabase.channel(`project:${task.projectId}`).send({
-      type: "broadcast",
+    // Broadcast via Supabase Realtime (background job)
+    await enqueueJob("realtime.broadcast", {
+      channel: `project:${task.projectId}`,
       event: "task-updated",
       payload: { projectId: task.projectId, taskId, type: "UPDATED" },
     });
+    if (updateData.title !== undefined || updateData.projectId !== undefined) {
+      indexSearchDocs([
+        {
+          type: "TASK",
+          id: taskId,
+          text: updatedTask.title,
+          projectId: updatedTask.projectId,
+        },
+      ]);
+    }
 
     return NextResponse.json(updatedTask);
   } catch (error) {
@@ -0,0 +1,37 @@
+import { getCurrentUser } from "@/lib/supabase/server";
+import { NextResponse } from "next/server";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import { handleApiError } from "@/lib/api/error-handler";
+import { timeEntryBulkCreateSchema } from "@/lib/validation/schemas";
+import { createTimeEntries } from "@/lib/time-tracking";
+
+/**
+ * Create up to 500 time entries in one request, e.g. when an offline
+ * client syncs what it recorded. Entries carrying an `idempotencyKey` that
+ * was already synced come back under `duplicates` rather than being
+ * inserted again, so a client can safely resend a batch after a failure.
+ */
+export async function POST(req: Request) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const user = await getCurrentUser();
+    if (!user)
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+
+    const { entries } = timeEntryBulkCreateSchema.parse(await req.json());
+    const result = await createTimeEntries(user.id, entries);
+
+    return NextResponse.json(result, {
+      status: result.created.length ? 201 : 200,
+    });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
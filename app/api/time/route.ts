@@ -1,22 +1,26 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
-import { z } from "zod";
+import { readPrisma } from "@/lib/prisma";
 import {
   rateLimit,
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
-
-const timeEntrySchema = z.object({
-  taskId: z.string().min(1),
-  startTime: z.string(),
-  endTime: z.string(),
-  note: z.string().optional(),
-  isBillable: z.boolean().default(true),
-});
+import { paginate, streamJsonArray } from "@/lib/api/stream-json";
+import {
+  idempotencyKeySchema,
+  timeEntryCreateSchema,
+  timerActionSchema,
+} from "@/lib/validation/schemas";
+import {
+  createTimeEntries,
+  startTimer,
+  stopTimer,
+  switchTimer,
+} from "@/lib/time-tracking";
 
 export async function GET(req: Request) {
+  const db = readPrisma(req);
   try {
     const rateLimitResult = await rateLimit(req);
     if (!rateLimitResult.success) {
@@ -34,7 +38,7 @@ export async function GET(req: Request) {
     const startDate = searchParams.get("startDate");
     const endDate = searchParams.get("endDate");
 
-    const activeTimer = await prisma.timer.findUnique({
+    const activeTimer = await db.timer.findUnique({
       where: { userId },
       include: { task: true },
     });
@@ -62,30 +66,43 @@ export async function GET(req: Request) {
       }
     }
 
-    const entries = await prisma.timeEntry.findMany({
-      where,
-      include: {
-        user: {
-          select: {
-            name: true,
-            email: true,
+    // Streamed in batches; only the project's name is shown per entry
+    const entries = paginate((page) =>
+      db.timeEntry.findMany({
+        where,
+        include: {
+          user: {
+            select: {
+              name: true,
+              email: true,
+            },
           },
-        },
-        task: {
-          include: {
-            project: true,
+          task: {
+            include: {
+              project: { select: { id: true, name: true } },
+            },
           },
         },
-      },
-      orderBy: { startTime: "desc" },
-    });
+        orderBy: [{ startTime: "desc" }, { id: "asc" }],
+        ...page,
+      }),
+    );
 
-    return NextResponse.json({ entries, activeTimer });
+    return await streamJsonArray(entries, {
+      envelope: { key: "entries", data: { activeTimer } },
+    });
   } catch (error) {
     return handleApiError(error);
   }
 }
 
+/**
+ * Timer actions (`{ action: "start" | "stop" | "switch" }`) or a manual
+ * time entry. Each write is a single statement (lib/time-tracking.ts).
+ *
+ * Stop, switch and manual entries accept an `Idempotency-Key` header: a
+ * retry with the same key returns the entry recorded the first time.
+ */
 export async function POST(req: Request) {
   try {
     const rateLimitResult = await rateLimit(req);
@@ -98,87 +115,67 @@ export async function POST(req: Request) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
 
     const userId = user.id;
+    const idempotencyKey =
+      idempotencyKeySchema
+        .optional()
+        .parse(req.headers.get("Idempotency-Key") ?? undefined) ?? null;
 
     const body = await req.json();
-    const { action, taskId, note } = body;
 
-    if (action === "start") {
-      const existingTimer = await prisma.timer.findUnique({
-        where: { userId },
-      });
-
-      if (existingTimer) {
+    if (body.action !== undefined) {
+      const command = timerActionSchema.parse(body);
+
+      if (command.action === "start") {
+        const result = await startTimer(userId, command.taskId);
+        if (result.status === "started") {
+          return NextResponse.json(result.timer, { status: 201 });
+        }
+        // A retried start finds its own timer already running
+        if (result.timer.taskId === command.taskId) {
+          return NextResponse.json(result.timer);
+        }
         return NextResponse.json(
-          { error: "You already have an active timer" },
-          { status: 400 },
+          { error: "You already have an active timer", activeTimer: result.timer },
+          { status: 409 },
         );
       }
 
-      const timer = await prisma.timer.create({
-        data: {
-          userId,
-          taskId: taskId as string,
-        },
-      });
-
-      return NextResponse.json(timer, { status: 201 });
-    }
-
-    if (action === "stop") {
-      const timer = await prisma.timer.findUnique({
-        where: { userId },
-      });
-
-      if (!timer) {
-        return NextResponse.json(
-          { error: "No active timer found" },
-          { status: 400 },
-        );
+      if (command.action === "stop") {
+        const result = await stopTimer(userId, {
+          note: command.note,
+          idempotencyKey,
+        });
+        if (!result) {
+          return NextResponse.json(
+            { error: "No active timer found" },
+            { status: 400 },
+          );
+        }
+        return NextResponse.json(result.entry);
       }
 
-      const startTime = timer.startTime;
-      const endTime = new Date();
-      const duration = Math.floor(
-        (endTime.getTime() - startTime.getTime()) / 1000,
+      const result = await switchTimer(userId, command.taskId, {
+        note: command.note,
+        idempotencyKey,
+      });
+      return NextResponse.json(
+        { timer: result.timer, entry: result.entry },
+        { status: result.replayed ? 200 : 201 },
       );
-
-      const [entry] = await prisma.$transaction([
-        prisma.timeEntry.create({
-          data: {
-            userId,
-            taskId: timer.taskId,
-            startTime,
-            endTime,
-            duration,
-            note: note as string | undefined,
-          },
-        }),
-        prisma.timer.delete({
-          where: { userId },
-        }),
-      ]);
-
-      return NextResponse.json(entry);
     }
 
-    const data = timeEntrySchema.parse(body);
-    const startTime = new Date(data.startTime);
-    const endTime = new Date(data.endTime);
-    const duration = Math.floor(
-      (endTime.getTime() - startTime.getTime()) / 1000,
-    );
-
-    const entry = await prisma.timeEntry.create({
-      data: {
-        ...data,
-        userId,
-        startTime,
-        endTime,
-        duration,
-      },
-    });
+    const data = timeEntryCreateSchema.parse(body);
+    const { created, duplicates } = await createTimeEntries(userId, [
+      { ...data, idempotencyKey: idempotencyKey ?? undefined },
+    ]);
 
-    return NextResponse.json(entry, { status: 201 });
+    if (created.length) {
+      return NextResponse.json(created[0], { status: 201 });
+    }
+    if (duplicates.length) {
+      return NextResponse.json(duplicates[0]);
+    }
+    return NextResponse.json({ error: "Task not found" }, { status: 404 });
   } catch (error) {
     return handleApiError(error);
   }
@@ -0,0 +1,31 @@
+import { requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import { handleApiError } from "@/lib/api/error-handler";
+import { jsonWithETag } from "@/lib/api/etag";
+import { getUnreadCounts } from "@/lib/unread";
+
+/**
+ * Unread badges for every chat channel of the current user.
+ *
+ * Returns `{ counts: { [channel]: count } }` with only non-zero channels,
+ * read from the user's counter rows in one indexed query. Supports
+ * If-None-Match so polling an unchanged state costs a 304.
+ */
+export async function GET(req: Request) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const user = await requireUser();
+    const counts = await getUnreadCounts(user.id);
+
+    return jsonWithETag(req, { counts }, rateLimitResult.headers);
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
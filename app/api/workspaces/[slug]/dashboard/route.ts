@@ -1,17 +1,52 @@
 import { getCurrentUser } from "@/lib/supabase/server";
 import { NextResponse } from "next/server";
-import { prisma } from "@/lib/prisma";
+import { readPrisma } from "@/lib/prisma";
 import { startOfDay, endOfDay, addDays } from "date-fns";
 import {
   rateLimit,
   createRateLimitResponse,
 } from "@/lib/middleware/rate-limit";
 import { handleApiError } from "@/lib/api/error-handler";
+import type { ActivityType, TaskPriority, TaskStatus } from "@prisma/client";
+
+interface DashboardTask {
+  id: string;
+  title: string;
+  status: TaskStatus;
+  priority: TaskPriority;
+  dueDate?: string;
+}
+
+// Shape returned by the get_workspace_dashboard() SQL function.
+// Dates arrive as ISO strings.
+interface DashboardRow {
+  stats: { projects: number; members: number; tasks: number; seconds: number };
+  taskStatusStats: Record<TaskStatus, number>;
+  todaysTasks: DashboardTask[];
+  overdueTasks: DashboardTask[];
+  upcomingTasks: DashboardTask[];
+  activeTimer: {
+    id: string;
+    taskId: string;
+    userId: string;
+    startTime: string;
+    task: { title: string };
+  } | null;
+  recentActivity: {
+    id: string;
+    type: ActivityType;
+    createdAt: string;
+    userName: string | null;
+    taskTitle: string;
+    projectName: string;
+  }[];
+}
 
 export async function GET(
   req: Request,
   { params }: { params: Promise<{ slug: string }> },
 ) {
+  const db = readPrisma(req);
   try {
     const rateLimitResult = await rateLimit(req);
     if (!rateLimitResult.success) {
@@ -26,161 +61,61 @@ export async function GET(
     const { slug } = await params;
 
     try {
-      const workspace = await prisma.workspace.findUnique({
-        where: { slug },
-        include: {
-          projects: {
-            select: { id: true, name: true },
-          },
-          members: {
-            select: { id: true },
-          },
-        },
-      });
+      const now = new Date();
+      const todayStart = startOfDay(now);
+      const todayEnd = endOfDay(now);
+      const sevenDaysLater = endOfDay(addDays(now, 7));
+
+      // Membership, project set, stats, task lists, timer and activity are
+      // resolved by one SQL function (see migration dashboard_single_query)
+      const [{ dashboard }] = await db.$queryRaw<
+        [{ dashboard: DashboardRow | { forbidden: true } | null }]
+      >`
+        SELECT get_workspace_dashboard(
+          ${slug},
+          ${user.id},
+          ${todayStart}::timestamp,
+          ${todayEnd}::timestamp,
+          ${sevenDaysLater}::timestamp
+        ) AS dashboard
+      `;
 
-      if (!workspace) {
+      if (!dashboard) {
         return NextResponse.json(
           { error: "Workspace not found" },
           { status: 404 },
         );
       }
 
-      // Check membership
-      const membership = await prisma.workspaceMember.findFirst({
-        where: {
-          workspaceId: workspace.id,
-          userId: user.id,
-        },
-      });
-
-      if (!membership) {
+      if ("forbidden" in dashboard) {
         return NextResponse.json({ error: "Forbidden" }, { status: 403 });
       }
 
-      const projectIds = workspace.projects.map((p) => p.id);
-      const now = new Date();
-      const todayStart = startOfDay(now);
-      const todayEnd = endOfDay(now);
-      const sevenDaysLater = endOfDay(addDays(now, 7));
-
-      // Parallelize queries for efficiency
-      const [
-        taskCount,
-        timeEntries,
-        activities,
-        todaysTasks,
-        overdueTasks,
-        upcomingTasks,
-        activeTimer,
-        statusCounts,
-      ] = await Promise.all([
-        prisma.task.count({ where: { projectId: { in: projectIds } } }),
-        prisma.timeEntry.findMany({
-          where: { task: { projectId: { in: projectIds } } },
-          select: { duration: true },
-        }),
-        prisma.activity.findMany({
-          where: { task: { projectId: { in: projectIds } } },
-          include: {
-            user: { select: { name: true, image: true } },
-            task: {
-              select: {
-                title: true,
-                project: { select: { name: true } },
-              },
-            },
-          },
-          orderBy: { createdAt: "desc" },
-          take: 10,
-        }),
-        prisma.task.findMany({
-          where: {
-            projectId: { in: projectIds },
-            assigneeId: user.id,
-            dueDate: { gte: todayStart, lte: todayEnd },
-            status: { not: "DONE" },
-          },
-          select: { id: true, title: true, status: true, priority: true },
-          take: 5,
-        }),
-        prisma.task.findMany({
-          where: {
-            projectId: { in: projectIds },
-            assigneeId: user.id,
-            dueDate: { lt: todayStart },
-            status: { not: "DONE" },
-          },
-          select: {
-            id: true,
-            title: true,
-            status: true,
-            priority: true,
-            dueDate: true,
-          },
-          take: 5,
-        }),
-        prisma.task.findMany({
-          where: {
-            projectId: { in: projectIds },
-            assigneeId: user.id,
-            dueDate: { gt: todayEnd, lte: sevenDaysLater },
-            status: { not: "DONE" },
-          },
-          select: {
-            id: true,
-            title: true,
-            status: true,
-            priority: true,
-            dueDate: true,
-          },
-          take: 5,
-        }),
-        prisma.timer.findUnique({
-          where: { userId: user.id },
-          include: { task: { select: { title: true } } },
-        }),
-        prisma.task.groupBy({
-          by: ["status"],
-          where: { projectId: { in: projectIds } },
-          _count: { _all: true },
-        }),
-      ]);
-
-      const totalHours = timeEntries.reduce(
-        (acc, curr) => acc + curr.duration / 3600,
-        0,
-      );
-
-      const taskStatusStats = {
-        TODO: statusCounts.find((s) => s.status === "TODO")?._count._all || 0,
-        IN_PROGRESS:
-          statusCounts.find((s) => s.status === "IN_PROGRESS")?._count._all ||
-          0,
-        DONE: statusCounts.find((s) => s.status === "DONE")?._count._all || 0,
-      };
+      const { stats, activeTimer } = dashboard;
 
       return NextResponse.json({
         stats: {
-          projects: workspace.projects.length,
-          tasks: taskCount,
-          members: workspace.members.length,
-          hours: Math.round(totalHours * 10) / 10,
+          projects: stats.projects,
+          tasks: stats.tasks,
+          members: stats.members,
+          hours: Math.round((stats.seconds / 3600) * 10) / 10,
         },
-        todaysTasks,
-        overdueTasks,
-        upcomingTasks,
+        todaysTasks: dashboard.todaysTasks,
+        overdueTasks: dashboard.overdueTasks,
+        upcomingTasks: dashboard.upcomingTasks,
         activeTimer: activeTimer
           ? {
               ...activeTimer,
               duration: Math.floor(
-                (now.getTime() - activeTimer.startTime.getTime()) / 1000,
+                (now.getTime() - new Date(activeTimer.startTime).getTime()) /
+                  1000,
               ),
             }
           : null,
-        taskStatusStats,
-        recentActivity: activities.map((a) => ({
+        taskStatusStats: dashboard.taskStatusStats,
+        recentActivity: dashboard.recentActivity.map((a) => ({
           id: a.id,
-          user: a.user.name || "Unknown",
+          user: a.userName || "Unknown",
           action:
             a.type === "CREATED"
               ? "created task"
@@ -189,10 +124,10 @@ export async function GET(
                 : a.type === "COMMENT_ADDED"
                   ? "commented on"
                   : "modified",
-          target: a.task.title,
-          project: a.task.project.name,
-          time: formatTimeAgo(a.createdAt),
-          color: getRandomColor(a.task.project.name),
+          target: a.taskTitle,
+          project: a.projectName,
+          time: formatTimeAgo(new Date(a.createdAt)),
+          color: getRandomColor(a.projectName),
         })),
       });
     } catch (error) {
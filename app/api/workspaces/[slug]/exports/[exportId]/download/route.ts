@@ -0,0 +1,84 @@
+import { NotFoundError, requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import {
+  handleApiError,
+  createErrorResponse,
+} from "@/lib/api/error-handler";
+import { prisma } from "@/lib/prisma";
+import {
+  exportSize,
+  getExportableWorkspace,
+  streamExportArchive,
+} from "@/lib/workspace-export";
+
+type Params = { params: Promise<{ slug: string; exportId: string }> };
+
+/**
+ * Download a completed export as one zip file.
+ *
+ * The archive is stored as parts and streamed through part by part, so
+ * the server holds only the chunk in transit. A single `Range: bytes=`
+ * range is honoured (206), which lets download managers resume.
+ */
+export async function GET(req: Request, { params }: Params) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const { slug, exportId } = await params;
+    const user = await requireUser();
+    const workspace = await getExportableWorkspace(user.id, slug);
+
+    const exportRow = await prisma.workspaceExport.findFirst({
+      where: { id: exportId, workspaceId: workspace.id },
+    });
+    if (!exportRow) throw new NotFoundError("Export not found");
+    if (exportRow.status !== "COMPLETED") {
+      return createErrorResponse("Export is not ready yet", 409);
+    }
+
+    const size = exportSize(exportRow);
+    const date = exportRow.createdAt.toISOString().slice(0, 10);
+    const filename = `${slug}-export-${date}.zip`;
+    const headers: Record<string, string> = {
+      "Content-Type": "application/zip",
+      "Content-Disposition": `attachment; filename="${filename}"`,
+      "Accept-Ranges": "bytes",
+      "Cache-Control": "private, no-store",
+    };
+
+    let start = 0;
+    let end = size - 1;
+    const range = req.headers.get("range");
+    const match = range?.match(/^bytes=(\d*)-(\d*)$/);
+    if (range && match && (match[1] || match[2])) {
+      if (match[1]) {
+        start = parseInt(match[1]);
+        if (match[2]) end = Math.min(parseInt(match[2]), size - 1);
+      } else {
+        // Suffix range: the last N bytes
+        start = Math.max(size - parseInt(match[2]), 0);
+      }
+      if (start > end) {
+        return new Response(null, {
+          status: 416,
+          headers: { ...headers, "Content-Range": `bytes */${size}` },
+        });
+      }
+      headers["Content-Range"] = `bytes ${start}-${end}/${size}`;
+    }
+    headers["Content-Length"] = String(end - start + 1);
+
+    return new Response(streamExportArchive(exportRow, start, end), {
+      status: headers["Content-Range"] ? 206 : 200,
+      headers,
+    });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
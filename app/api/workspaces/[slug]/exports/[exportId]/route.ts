@@ -0,0 +1,39 @@
+import { NextResponse } from "next/server";
+import { NotFoundError, requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import { handleApiError } from "@/lib/api/error-handler";
+import { prisma } from "@/lib/prisma";
+import {
+  describeExport,
+  getExportableWorkspace,
+} from "@/lib/workspace-export";
+
+type Params = { params: Promise<{ slug: string; exportId: string }> };
+
+/**
+ * Status and progress of one export; `downloadUrl` once it is COMPLETED
+ */
+export async function GET(req: Request, { params }: Params) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const { slug, exportId } = await params;
+    const user = await requireUser();
+    const workspace = await getExportableWorkspace(user.id, slug);
+
+    const exportRow = await prisma.workspaceExport.findFirst({
+      where: { id: exportId, workspaceId: workspace.id },
+    });
+    if (!exportRow) throw new NotFoundError("Export not found");
+
+    return NextResponse.json({ export: describeExport(exportRow, slug) });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
@@ -0,0 +1,86 @@
+import { NextResponse } from "next/server";
+import { requireUser } from "@/lib/auth/guards";
+import {
+  rateLimit,
+  rateLimitStrict,
+  createRateLimitResponse,
+} from "@/lib/middleware/rate-limit";
+import {
+  handleApiError,
+  createErrorResponse,
+} from "@/lib/api/error-handler";
+import { prisma } from "@/lib/prisma";
+import { workspaceExportSchema } from "@/lib/validation/schemas";
+import {
+  describeExport,
+  getExportableWorkspace,
+  startWorkspaceExport,
+} from "@/lib/workspace-export";
+
+type Params = { params: Promise<{ slug: string }> };
+
+/**
+ * Start an export of the workspace (owners only): `{ includeFiles?: bool }`.
+ *
+ * Returns 202 with the export; poll its status route or listen for
+ * `export-updated` on the user channel. An export already queued or
+ * running is returned instead of starting a second one.
+ */
+export async function POST(req: Request, { params }: Params) {
+  try {
+    const rateLimitResult = await rateLimitStrict(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const { slug } = await params;
+    const user = await requireUser();
+    const workspace = await getExportableWorkspace(user.id, slug);
+    const body = await req.text();
+    const { includeFiles } = workspaceExportSchema.parse(
+      body ? JSON.parse(body) : {},
+    );
+
+    const { exportRow, created } = await startWorkspaceExport(
+      workspace.id,
+      user.id,
+      includeFiles,
+    );
+    return NextResponse.json(
+      { export: describeExport(exportRow, slug), created },
+      { status: 202 },
+    );
+  } catch (error) {
+    if (error instanceof SyntaxError) {
+      return createErrorResponse("Invalid JSON body");
+    }
+    return handleApiError(error);
+  }
+}
+
+/**
+ * Recent exports of the workspace, newest first
+ */
+export async function GET(req: Request, { params }: Params) {
+  try {
+    const rateLimitResult = await rateLimit(req);
+    if (!rateLimitResult.success) {
+      return createRateLimitResponse(rateLimitResult);
+    }
+
+    const { slug } = await params;
+    const user = await requireUser();
+    const workspace = await getExportableWorkspace(user.id, slug);
+
+    const exports = await prisma.workspaceExport.findMany({
+      where: { workspaceId: workspace.id },
+      orderBy: { createdAt: "desc" },
+      take: 20,
+    });
+    return NextResponse.json({
+      exports: exports.map((row) => describeExport(row, slug)),
+    });
+  } catch (error) {
+    return handleApiError(error);
+  }
+}
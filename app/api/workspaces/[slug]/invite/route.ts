@@ -3,7 +3,8 @@ import { NextResponse } from "next/server";
 import { prisma } from "@/lib/prisma";
 import { z } from "zod";
 import crypto from "crypto";
-import { sendEmail, getInvitationHtml } from "@/lib/mail";
+import { getInvitationHtml } from "@/lib/mail";
+import { enqueueJob } from "@/lib/jobs/queue";
 import {
   rateLimit,
   createRateLimitResponse,
@@ -92,13 +93,14 @@ export async function POST(
     const appUrl = process.env.NEXT_PUBLIC_APP_URL || new URL(req.url).origin;
     const inviteLink = `${appUrl}/invite/${token}`;
 
-    await sendEmail({
+    // Delivered by the background worker so SMTP latency stays off the request
+    await enqueueJob("email.send", {
       to: email,
       subject: `You've been invited to join ${workspace.name}`,
       html: getInvitationHtml(workspace.name, inviteLink),
     });
 
-    console.log("[INVITE_API] Invitation sent successfully to:", email);
+    console.log("[INVITE_API] Invitation queued for:", email);
     return NextResponse.json({
       message: "Invitation sent",
       invitationId: invitation.id,
@@ -23,11 +23,11 @@ export default function WorkspaceChatPage({
   useEffect(() => {
     async function fetchWorkspace() {
       try {
-        const res = await fetch(`/api/workspaces?slug=${slug}`);
+        const res = await fetch(`/api/bootstrap?slug=${slug}`);
         if (res.ok) {
-          const workspaces = await res.json();
-          if (workspaces && workspaces.length > 0) {
-            setWorkspaceId(workspaces[0].id);
+          const { current } = await res.json();
+          if (current) {
+            setWorkspaceId(current.id);
           }
         }
       } catch (error) {
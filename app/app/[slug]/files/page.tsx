@@ -44,8 +44,10 @@ interface FileRecord {
 interface Folder {
   id: string;
   name: string;
-  projectId: string;
   parentId: string | null;
+  fileCount: number;
+  fileSize: number;
+  childCount: number;
 }
 
 interface Project {
@@ -53,10 +55,8 @@ interface Project {
   name: string;
 }
 
-interface Workspace {
-  id: string;
-  slug: string;
-  name: string;
+interface Bootstrap {
+  current: { id: string; projects: Project[] } | null;
 }
 
 export default function AllFilesPage({
@@ -86,15 +86,12 @@ export default function AllFilesPage({
   const fetchWorkspaceData = useCallback(async () => {
     try {
       setLoading(true);
-      const wsRes = await fetch("/api/workspaces");
+      const wsRes = await fetch(`/api/bootstrap?slug=${slug}`);
       if (!wsRes.ok) return;
-      const workspaces: Workspace[] = await wsRes.json();
-      const workspace = workspaces.find((w) => w.slug === slug);
+      const { current }: Bootstrap = await wsRes.json();
 
-      if (workspace) {
-        const pRes = await fetch(`/api/projects?workspaceId=${workspace.id}`);
-        if (!pRes.ok) return;
-        const projectsData = await pRes.json();
+      if (current) {
+        const projectsData = current.projects;
         setProjects(projectsData);
 
         // Fetch all files initially or based on filters
@@ -132,16 +129,13 @@ export default function AllFilesPage({
             }));
           }
 
+          // Only the level being viewed; subfolders load on navigation
           const foldRes = await fetch(
-            `/api/projects/${selectedProjectId}/folders`,
+            `/api/projects/${selectedProjectId}/folders?parentId=${currentFolderId}`,
           );
           if (foldRes.ok) {
             const foldersData = await foldRes.json();
-            allFolders = foldersData.filter((f: Folder) =>
-              currentFolderId === "root"
-                ? !f.parentId
-                : f.parentId === currentFolderId,
-            );
+            allFolders = foldersData.folders;
           }
           setFolders(allFolders);
         }
@@ -397,7 +391,9 @@ export default function AllFilesPage({
                     {folder.name}
                   </h3>
                   <p className="text-[10px] font-black text-mutedForeground uppercase tracking-widest mt-0.5">
-                    Folder
+                    {folder.fileCount} files · {formatSize(folder.fileSize)}
+                    {folder.childCount > 0 &&
+                      ` · ${folder.childCount} folders`}
                   </p>
                 </div>
                 <ArrowRight
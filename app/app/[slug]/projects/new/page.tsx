@@ -30,16 +30,14 @@ export default function NewProjectPage({
 
     try {
       // First get workspace ID
-      const wsRes = await fetch("/api/workspaces");
-      const workspaces = await wsRes.json();
+      const wsRes = await fetch(`/api/bootstrap?slug=${slug}`);
+      const data = await wsRes.json();
 
-      if (!Array.isArray(workspaces)) {
-        throw new Error(workspaces?.error || "Failed to fetch workspaces");
+      if (!wsRes.ok) {
+        throw new Error(data?.error || "Failed to fetch workspace");
       }
 
-      const workspace = workspaces.find(
-        (w: { id: string; slug: string }) => w.slug === slug,
-      );
+      const workspace: { id: string } | null = data.current;
 
       if (!workspace) throw new Error("Workspace not found");
 
@@ -46,10 +46,8 @@ interface Project {
   name: string;
 }
 
-interface Workspace {
-  id: string;
-  slug: string;
-  name: string;
+interface Bootstrap {
+  current: { id: string; projects: Project[] } | null;
 }
 
 export default function TimesheetPage({
@@ -90,17 +88,11 @@ export default function TimesheetPage({
 
   const fetchProjects = useCallback(async () => {
     try {
-      // First get workspace ID from slug
-      const wsRes = await fetch("/api/workspaces");
-      if (wsRes.ok) {
-        const workspaces: Workspace[] = await wsRes.json();
-        const workspace = workspaces.find((w) => w.slug === slug);
-        if (workspace) {
-          const pRes = await fetch(`/api/projects?workspaceId=${workspace.id}`);
-          if (pRes.ok) {
-            const projectsData = await pRes.json();
-            setProjects(projectsData);
-          }
+      const res = await fetch(`/api/bootstrap?slug=${slug}`);
+      if (res.ok) {
+        const { current }: Bootstrap = await res.json();
+        if (current) {
+          setProjects(current.projects);
         }
       }
     } catch (e) {
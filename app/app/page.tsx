@@ -39,10 +39,10 @@ export default function WorkspaceSelector() {
   const fetchWorkspaces = async () => {
     setError(null);
     try {
-      const res = await fetch("/api/workspaces");
+      const res = await fetch("/api/bootstrap");
       if (res.ok) {
         const data = await res.json();
-        setWorkspaces(data);
+        setWorkspaces(data.workspaces);
       } else {
         const data = await res.json();
         setError(data.error || "Failed to load workspaces");
@@ -1,7 +1,14 @@
 "use client";
 
-import { useState, useEffect, useCallback } from "react";
-import { ChevronLeft, ChevronRight, Plus, Search, Clock } from "lucide-react";
+import { useState, useEffect, useCallback, useMemo, useRef } from "react";
+import {
+  ChevronLeft,
+  ChevronRight,
+  Plus,
+  Search,
+  Clock,
+  Download,
+} from "lucide-react";
 import {
   format,
   addMonths,
@@ -13,6 +20,7 @@ import {
   isSameMonth,
   isSameDay,
   addDays,
+  startOfDay,
   parseISO,
   isToday,
 } from "date-fns";
@@ -20,6 +28,14 @@ import { cn } from "@/lib/cn";
 import { Task } from "@/types/task";
 import TaskModal from "@/components/board/task-modal";
 
+/** The slim task shape returned by GET /api/calendar */
+type CalendarTask = Pick<
+  Task,
+  "id" | "title" | "status" | "priority" | "dueDate"
+> & {
+  assignee: { id: string; name: string | null; image: string | null } | null;
+};
+
 interface ProjectCalendarProps {
   projectId: string;
   workspaceSlug: string;
@@ -54,7 +70,7 @@ export default function ProjectCalendar({
   workspaceSlug,
 }: ProjectCalendarProps) {
   const [currentDate, setCurrentDate] = useState(new Date());
-  const [tasks, setTasks] = useState<Task[]>([]);
+  const [tasks, setTasks] = useState<CalendarTask[]>([]);
   const [loading, setLoading] = useState(true);
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [editingTask, setEditingTask] = useState<Task | null>(null);
@@ -64,38 +80,78 @@ export default function ProjectCalendar({
     { userId: string; user: { name: string | null; image: string | null } }[]
   >([]);
   const [searchQuery, setSearchQuery] = useState("");
+  // Members come with the first feed request for a project
+  const membersFor = useRef<string | null>(null);
+  const requestRef = useRef<AbortController | null>(null);
 
-  const fetchTasks = useCallback(async () => {
-    try {
-      setLoading(true);
-      const res = await fetch(`/api/tasks?projectId=${projectId}`);
-      if (res.ok) {
-        const data = await res.json();
-        setTasks(data);
-      }
-    } catch (error) {
-      console.error("Failed to fetch tasks:", error);
-    } finally {
-      setLoading(false);
+  // Visible window [from, to): the whole weeks of the month grid, one
+  // week, or one day
+  const { from, to } = useMemo(() => {
+    if (view === "DAY") {
+      const start = startOfDay(currentDate);
+      return { from: start.toISOString(), to: addDays(start, 1).toISOString() };
     }
-  }, [projectId]);
+    const start =
+      view === "MONTH"
+        ? startOfWeek(startOfMonth(currentDate))
+        : startOfWeek(currentDate);
+    const end = addDays(
+      startOfDay(
+        view === "MONTH"
+          ? endOfWeek(endOfMonth(currentDate))
+          : endOfWeek(currentDate),
+      ),
+      1,
+    );
+    return { from: start.toISOString(), to: end.toISOString() };
+  }, [view, currentDate]);
+
+  const fetchTasks = useCallback(async () => {
+    requestRef.current?.abort();
+    const controller = new AbortController();
+    requestRef.current = controller;
+
+    const params = new URLSearchParams({ projectId, from, to });
+    const withMembers = membersFor.current !== projectId;
+    if (withMembers) params.set("include", "members");
 
-  const fetchMembers = useCallback(async () => {
     try {
-      const res = await fetch(`/api/projects/${projectId}/members`);
+      const res = await fetch(`/api/calendar?${params}`, {
+        signal: controller.signal,
+      });
       if (res.ok) {
         const data = await res.json();
-        setMembers(data);
+        setTasks(data.tasks);
+        if (withMembers) {
+          setMembers(data.members);
+          membersFor.current = projectId;
+        }
       }
+      setLoading(false);
     } catch (error) {
-      console.error("Failed to fetch members:", error);
+      if (!controller.signal.aborted) {
+        console.error("Failed to fetch tasks:", error);
+        setLoading(false);
+      }
     }
-  }, [projectId]);
+  }, [projectId, from, to]);
 
   useEffect(() => {
     fetchTasks();
-    fetchMembers();
-  }, [fetchTasks, fetchMembers]);
+    return () => requestRef.current?.abort();
+  }, [fetchTasks]);
+
+  // The feed is slim; the modal edits the full task
+  const openTask = async (task: CalendarTask) => {
+    try {
+      const res = await fetch(`/api/tasks/${task.id}`);
+      if (!res.ok) return;
+      setEditingTask(await res.json());
+      setIsModalOpen(true);
+    } catch (error) {
+      console.error("Failed to load task:", error);
+    }
+  };
 
   const nextDate = () => {
     if (view === "MONTH") setCurrentDate(addMonths(currentDate, 1));
@@ -108,7 +164,7 @@ export default function ProjectCalendar({
     else setCurrentDate(addDays(currentDate, -1));
   };
 
-  const onDragStart = (e: React.DragEvent, task: Task) => {
+  const onDragStart = (e: React.DragEvent, task: CalendarTask) => {
     e.dataTransfer.setData("taskId", task.id);
   };
 
@@ -217,6 +273,13 @@ export default function ProjectCalendar({
                 onChange={(e) => setSearchQuery(e.target.value)}
               />
             </div>
+            <a
+              href={`/api/calendar/ics?projectId=${projectId}`}
+              title="Export to calendar (.ics)"
+              className="p-2.5 bg-muted border border-border rounded-xl text-mutedForeground hover:text-primary hover:border-primary transition-all"
+            >
+              <Download size={16} />
+            </a>
             <button
               onClick={() => {
                 setEditingTask(null);
@@ -280,15 +343,14 @@ export default function ProjectCalendar({
     );
   };
 
-  const renderTask = (task: Task) => (
+  const renderTask = (task: CalendarTask) => (
     <button
       key={task.id}
       draggable
       onDragStart={(e) => onDragStart(e, task)}
       onClick={(e) => {
         e.stopPropagation();
-        setEditingTask(task);
-        setIsModalOpen(true);
+        openTask(task);
       }}
       className={cn(
         "text-[10px] text-left p-2 rounded-lg border border-border shadow-sm transition-all hover:scale-[1.02] hover:shadow-md active:scale-95",
@@ -30,6 +30,7 @@ import UserProfileModal from "@/components/users/user-profile-modal";
 import { Badge } from "@/components/ui/badge";
 import EmojiPicker from "./emoji-picker";
 import MessageReactions from "./message-reactions";
+import type { ReactionSummary } from "@/lib/reactions";
 import ConfirmDialog from "@/components/ui/confirm-dialog";
 
 export interface Message {
@@ -42,16 +43,37 @@ export interface Message {
   deliveredAt?: string;
   createdAt: string;
   updatedAt: string;
-  reactions: {
-    id: string; // Added id
-    emoji: string;
-    userId: string;
-    user: { id: string; name: string; email: string };
-    createdAt: string; // Added createdAt
-  }[];
+  reactions: ReactionSummary[];
   _count: { replies: number };
 }
 
+/**
+ * Apply a reaction broadcast (the new total for one emoji) to a summary
+ */
+function applyReactionCount(
+  reactions: ReactionSummary[] = [],
+  update: { emoji: string; count: number; userId: string },
+  currentUserId: string,
+  added: boolean,
+): ReactionSummary[] {
+  const existing = reactions.find((r) => r.emoji === update.emoji);
+  const reactedByMe =
+    update.userId === currentUserId ? added : (existing?.reactedByMe ?? false);
+
+  if (update.count <= 0) {
+    return reactions.filter((r) => r.emoji !== update.emoji);
+  }
+  if (!existing) {
+    return [
+      ...reactions,
+      { emoji: update.emoji, count: update.count, reactedByMe },
+    ];
+  }
+  return reactions.map((r) =>
+    r.emoji === update.emoji ? { ...r, count: update.count, reactedByMe } : r,
+  );
+}
+
 interface ChatPaneProps {
   workspaceId?: string;
   projectId?: string;
@@ -350,7 +372,12 @@ export default function ChatPane({
             m.id === payload.messageId
               ? {
                   ...m,
-                  reactions: [...(m.reactions ?? []), payload.reaction],
+                  reactions: applyReactionCount(
+                    m.reactions,
+                    payload,
+                    user.id,
+                    true,
+                  ),
                 }
               : m,
           ),
@@ -362,11 +389,11 @@ export default function ChatPane({
             m.id === payload.messageId
               ? {
                   ...m,
-                  reactions: (m.reactions ?? []).filter(
-                    (r) =>
-                      !(
-                        r.userId === payload.userId && r.emoji === payload.emoji
-                      ),
+                  reactions: applyReactionCount(
+                    m.reactions,
+                    payload,
+                    user.id,
+                    false,
                   ),
                 }
               : m,
@@ -428,6 +455,7 @@ export default function ChatPane({
           credentials: "include",
           body: JSON.stringify({
             messageId: lastMessage.id,
+            workspaceId,
             projectId,
             receiverId,
           }),
@@ -438,7 +466,7 @@ export default function ChatPane({
     };
 
     sendReadReceipt();
-  }, [messages, projectId, receiverId]);
+  }, [messages, workspaceId, projectId, receiverId]);
 
   // Auto scroll to bottom
   useEffect(() => {
@@ -851,8 +879,8 @@ export default function ChatPane({
                     </div>
 
                     <MessageReactions
+                      messageId={msg.id}
                       reactions={msg.reactions || []}
-                      currentUserId={user?.id || ""}
                       onReactionToggle={(emoji) =>
                         handleAddReaction(msg.id, emoji)
                       }
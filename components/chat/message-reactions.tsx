@@ -1,12 +1,12 @@
 "use client";
 
+import { useState } from "react";
 import { cn } from "@/lib/cn";
+import type { ReactionSummary } from "@/lib/reactions";
 
-interface Reaction {
-  id: string;
+interface ReactionDetail {
   emoji: string;
-  userId: string;
-  user?: {
+  user: {
     id: string;
     email: string;
     name?: string;
@@ -14,61 +14,72 @@ interface Reaction {
 }
 
 interface MessageReactionsProps {
-  reactions: Reaction[];
-  currentUserId: string;
+  messageId: string;
+  reactions: ReactionSummary[];
   onReactionToggle: (emoji: string) => void;
 }
 
 export default function MessageReactions({
+  messageId,
   reactions,
-  currentUserId,
   onReactionToggle,
 }: MessageReactionsProps) {
-  // Group reactions by emoji
-  const groupedReactions = reactions.reduce(
-    (acc, reaction) => {
-      if (!acc[reaction.emoji]) {
-        acc[reaction.emoji] = [];
-      }
-      acc[reaction.emoji].push(reaction);
-      return acc;
-    },
-    {} as Record<string, Reaction[]>,
-  );
+  // Who reacted is fetched on first hover, per emoji
+  const [details, setDetails] = useState<Record<string, string>>({});
+
+  const loadDetails = async (emoji: string) => {
+    if (details[emoji] !== undefined) return;
+    setDetails((prev) => ({ ...prev, [emoji]: "" }));
+    try {
+      const res = await fetch(
+        `/api/messages/${messageId}/reactions?emoji=${encodeURIComponent(emoji)}`,
+        { credentials: "include" },
+      );
+      if (!res.ok) return;
+      const data: ReactionDetail[] = await res.json();
+      setDetails((prev) => ({
+        ...prev,
+        [emoji]: data
+          .map((r) => r.user.name || r.user.email || "Unknown")
+          .join(", "),
+      }));
+    } catch (e) {
+      console.error("Failed to load reactions:", e);
+    }
+  };
 
-  if (Object.keys(groupedReactions).length === 0) {
+  if (reactions.length === 0) {
     return null;
   }
 
   return (
     <div className="flex flex-wrap gap-1 mt-1">
-      {Object.entries(groupedReactions).map(([emoji, emojiReactions]) => {
-        const hasUserReacted = emojiReactions.some(
-          (r) => r.userId === currentUserId,
-        );
-        const count = emojiReactions.length;
-        const users = emojiReactions
-          .map((r) => r.user?.name || r.user?.email || "Unknown")
-          .join(", ");
-
-        return (
-          <button
-            key={emoji}
-            type="button"
-            onClick={() => onReactionToggle(emoji)}
-            className={cn(
-              "inline-flex items-center gap-1 px-2 py-0.5 rounded-full text-xs transition-all",
-              hasUserReacted
-                ? "bg-primary/10 border border-primary/30 text-primary"
-                : "bg-muted border border-border hover:bg-muted/80",
-            )}
-            title={users}
-          >
-            <span>{emoji}</span>
-            <span className="font-medium">{count}</span>
-          </button>
-        );
-      })}
+      {reactions.map(({ emoji, count, reactedByMe }) => (
+        <button
+          key={emoji}
+          type="button"
+          onClick={() => {
+            onReactionToggle(emoji);
+            // The list changes with the toggle; refetch on next hover
+            setDetails((prev) => {
+              const next = { ...prev };
+              delete next[emoji];
+              return next;
+            });
+          }}
+          onMouseEnter={() => loadDetails(emoji)}
+          className={cn(
+            "inline-flex items-center gap-1 px-2 py-0.5 rounded-full text-xs transition-all",
+            reactedByMe
+              ? "bg-primary/10 border border-primary/30 text-primary"
+              : "bg-muted border border-border hover:bg-muted/80",
+          )}
+          title={details[emoji] || undefined}
+        >
+          <span>{emoji}</span>
+          <span className="font-medium">{count}</span>
+        </button>
+      ))}
     </div>
   );
 }
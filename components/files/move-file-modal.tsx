@@ -10,8 +10,8 @@ import { cn } from "@/lib/cn";
 interface FolderItem {
   id: string;
   name: string;
-  projectId: string;
   parentId: string | null;
+  childCount: number;
 }
 
 interface MoveFileModalProps {
@@ -34,27 +34,53 @@ export default function MoveFileModal({
   const [moving, setMoving] = useState(false);
   const [search, setSearch] = useState("");
   const [selectedFolderId, setSelectedFolderId] = useState<string | null>(null);
+  // Folder whose children are listed; null is the project root
+  const [openFolderId, setOpenFolderId] = useState<string | null>(null);
+  const [trail, setTrail] = useState<{ id: string; name: string }[]>([]);
 
   useEffect(() => {
     if (!isOpen) return;
 
+    const query = search.trim();
+    const params = query
+      ? `q=${encodeURIComponent(query)}`
+      : `parentId=${openFolderId ?? "root"}`;
+
+    const controller = new AbortController();
     const fetchFolders = async () => {
       try {
         setLoading(true);
-        const res = await fetch(`/api/projects/${projectId}/folders`);
+        const res = await fetch(
+          `/api/projects/${projectId}/folders?${params}`,
+          { signal: controller.signal },
+        );
         if (res.ok) {
           const data = await res.json();
-          setFolders(data);
+          setFolders(data.folders);
+          if (!query) setTrail(data.ancestors);
         }
-      } catch (error) {
-        console.error("Failed to fetch folders:", error);
-      } finally {
         setLoading(false);
+      } catch (error) {
+        if (!controller.signal.aborted) {
+          console.error("Failed to fetch folders:", error);
+          setLoading(false);
+        }
       }
     };
 
-    fetchFolders();
-  }, [isOpen, projectId]);
+    // Debounce typing; level navigation loads immediately
+    const timer = setTimeout(fetchFolders, query ? 250 : 0);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [isOpen, projectId, openFolderId, search]);
+
+  const openFolder = (folderId: string | null) => {
+    setSearch("");
+    setOpenFolderId(folderId);
+    setSelectedFolderId(folderId);
+  };
 
   const handleMove = async () => {
     try {
@@ -78,10 +104,6 @@ export default function MoveFileModal({
 
   if (!isOpen) return null;
 
-  const filteredFolders = folders.filter((f) =>
-    f.name.toLowerCase().includes(search.toLowerCase()),
-  );
-
   return (
     <div className="fixed inset-0 bg-background/80 backdrop-blur-sm z-[2000] flex items-center justify-center p-4 animate-in fade-in duration-300">
       <Card className="w-full max-w-md shadow-2xl border-border/50 overflow-hidden animate-in zoom-in-95 duration-300 rounded-[2rem]">
@@ -121,9 +143,31 @@ export default function MoveFileModal({
             />
           </div>
 
+          {!search && trail.length > 0 && (
+            <div className="flex items-center gap-1 text-xs font-bold text-muted-foreground overflow-x-auto">
+              <button
+                onClick={() => openFolder(null)}
+                className="hover:text-foreground"
+              >
+                Root
+              </button>
+              {trail.map((crumb) => (
+                <span key={crumb.id} className="flex items-center gap-1">
+                  <ChevronRight size={12} className="opacity-40" />
+                  <button
+                    onClick={() => openFolder(crumb.id)}
+                    className="hover:text-foreground truncate max-w-[120px]"
+                  >
+                    {crumb.name}
+                  </button>
+                </span>
+              ))}
+            </div>
+          )}
+
           <div className="max-h-[300px] overflow-y-auto space-y-1 pr-2 custom-scrollbar">
             <button
-              onClick={() => setSelectedFolderId(null)}
+              onClick={() => openFolder(null)}
               className={cn(
                 "w-full flex items-center gap-3 p-3 rounded-xl transition-all text-sm font-bold",
                 selectedFolderId === null
@@ -142,13 +186,13 @@ export default function MoveFileModal({
                   Loading folders...
                 </span>
               </div>
-            ) : filteredFolders.length > 0 ? (
-              filteredFolders.map((folder) => (
-                <button
+            ) : folders.length > 0 ? (
+              folders.map((folder) => (
+                <div
                   key={folder.id}
                   onClick={() => setSelectedFolderId(folder.id)}
                   className={cn(
-                    "w-full flex items-center justify-between p-3 rounded-xl transition-all text-sm font-bold",
+                    "w-full flex items-center justify-between p-3 rounded-xl transition-all text-sm font-bold cursor-pointer",
                     selectedFolderId === folder.id
                       ? "bg-primary text-white shadow-lg shadow-primary/20"
                       : "hover:bg-muted/50 text-muted-foreground",
@@ -158,8 +202,19 @@ export default function MoveFileModal({
                     <Folder size={16} />
                     <span>{folder.name}</span>
                   </div>
-                  <ChevronRight size={14} className="opacity-40" />
-                </button>
+                  {(search || folder.childCount > 0) && (
+                    <button
+                      onClick={(e) => {
+                        e.stopPropagation();
+                        openFolder(folder.id);
+                      }}
+                      className="p-1 rounded-lg hover:bg-black/10"
+                      aria-label={`Open ${folder.name}`}
+                    >
+                      <ChevronRight size={14} className="opacity-60" />
+                    </button>
+                  )}
+                </div>
               ))
             ) : search ? (
               <div className="py-12 text-center text-xs font-bold text-muted-foreground uppercase">
@@ -42,10 +42,21 @@ interface Conversation {
   members: ConversationMember[];
 }
 
-interface Workspace {
-  id: string;
-  slug: string;
-  projects?: Project[];
+interface Bootstrap {
+  current: {
+    id: string;
+    slug: string;
+    projects: Project[];
+  } | null;
+}
+
+function UnreadBadge({ count }: { count?: number }) {
+  if (!count) return null;
+  return (
+    <span className="ml-auto min-w-5 h-5 px-1.5 rounded-full bg-primary text-primary-foreground text-[10px] font-bold flex items-center justify-center">
+      {count > 99 ? "99+" : count}
+    </span>
+  );
 }
 
 export default function Sidebar({
@@ -63,22 +74,18 @@ export default function Sidebar({
   const [conversations, setConversations] = useState<Conversation[]>([]);
   const [workspaceId, setWorkspaceId] = useState<string | null>(null);
   const [isGroupDMModalOpen, setIsGroupDMModalOpen] = useState(false);
+  const [unread, setUnread] = useState<Record<string, number>>({});
 
   useEffect(() => {
     const fetchSidebarData = async () => {
       try {
-        const res = await fetch("/api/workspaces?includeProjects=true");
+        const res = await fetch(`/api/bootstrap?slug=${workspaceSlug}`);
         if (res.ok) {
-          const workspaces: Workspace[] = await res.json();
-          const workspace = workspaces.find(
-            (w: Workspace) => w.slug === workspaceSlug,
-          );
+          const { current }: Bootstrap = await res.json();
 
-          if (workspace) {
-            setWorkspaceId(workspace.id);
-            if (workspace.projects) {
-              setProjects(workspace.projects);
-            }
+          if (current) {
+            setWorkspaceId(current.id);
+            setProjects(current.projects);
           }
         }
       } catch (error: unknown) {
@@ -107,6 +114,48 @@ export default function Sidebar({
     fetchConversations();
   }, [workspaceId]);
 
+  // Unread badges: pushed on the user channel, polled as a fallback for
+  // large channels that are not pushed
+  useEffect(() => {
+    if (!user?.id) return;
+    const fetchUnread = async () => {
+      try {
+        const res = await fetch("/api/unread");
+        if (res.ok) {
+          const { counts }: { counts: Record<string, number> } =
+            await res.json();
+          setUnread(counts);
+        }
+      } catch (error: unknown) {
+        console.error("Failed to fetch unread counts", error);
+      }
+    };
+    fetchUnread();
+    const interval = setInterval(fetchUnread, 60000);
+
+    // Own topic: the tasks page already subscribes to `user:${id}` on the
+    // same client, and a topic can only be subscribed once
+    const channel = supabase
+      .channel(`unread:${user.id}`)
+      .on("broadcast", { event: "unread-updated" }, ({ payload }) => {
+        setUnread((prev) => ({ ...prev, [payload.channel]: payload.count }));
+      })
+      .subscribe();
+
+    return () => {
+      clearInterval(interval);
+      supabase.removeChannel(channel);
+    };
+  }, [user?.id, supabase]);
+
+  // Chat page holds the workspace channel and direct messages
+  const chatUnread = Object.entries(unread)
+    .filter(
+      ([channel]) =>
+        channel === `workspace:${workspaceId}` || channel.startsWith("dm:"),
+    )
+    .reduce((sum, [, count]) => sum + count, 0);
+
   const navItems = [
     { name: "Dashboard", icon: LayoutDashboard, href: `/app/${workspaceSlug}` },
     {
@@ -114,7 +163,12 @@ export default function Sidebar({
       icon: CheckSquare,
       href: `/app/${workspaceSlug}/tasks`,
     },
-    { name: "Chat", icon: MessageSquare, href: `/app/${workspaceSlug}/chat` },
+    {
+      name: "Chat",
+      icon: MessageSquare,
+      href: `/app/${workspaceSlug}/chat`,
+      unread: chatUnread,
+    },
     { name: "Timesheet", icon: Clock, href: `/app/${workspaceSlug}/timesheet` },
     { name: "All Files", icon: FileText, href: `/app/${workspaceSlug}/files` },
   ];
@@ -217,6 +271,9 @@ export default function Sidebar({
                       </span>
                     )}
                   </div>
+                  {!collapsed && "unread" in item && (
+                    <UnreadBadge count={item.unread} />
+                  )}
                   {isActive && !collapsed && (
                     <div className="absolute right-0 h-3/5 w-1 bg-primary rounded-l-full shadow-soft" />
                   )}
@@ -270,6 +327,9 @@ export default function Sidebar({
                       {project.name}
                     </span>
                   )}
+                  {!collapsed && (
+                    <UnreadBadge count={unread[`project:${project.id}`]} />
+                  )}
                 </Link>
               ))}
             </div>
@@ -317,6 +377,9 @@ export default function Sidebar({
                         {name}
                       </span>
                     )}
+                    {!collapsed && (
+                      <UnreadBadge count={unread[`conversation:${conv.id}`]} />
+                    )}
                   </Link>
                 );
               })}
@@ -15,7 +15,7 @@ import { cn } from "@/lib/cn";
 
 interface SearchResult {
   id: string;
-  type: "TASK" | "PROJECT" | "FILE";
+  type: "TASK" | "PROJECT" | "FILE" | "MESSAGE";
   title: string;
   subtitle: string;
   url: string;
@@ -38,28 +38,47 @@ export default function GlobalSearchModal({
   const [selectedIndex, setSelectedIndex] = useState(0);
   const router = useRouter();
   const inputRef = useRef<HTMLInputElement>(null);
+  // Results of this palette session by query, so backspacing is instant
+  const cacheRef = useRef(new Map<string, SearchResult[]>());
+  const requestRef = useRef<AbortController | null>(null);
 
   const fetchResults = useCallback(
     async (q: string) => {
+      // A newer query supersedes a request still in flight
+      requestRef.current?.abort();
       if (q.length < 2) {
         setResults([]);
+        setLoading(false);
+        return;
+      }
+
+      const cached = cacheRef.current.get(q);
+      if (cached) {
+        setResults(cached);
+        setSelectedIndex(0);
+        setLoading(false);
         return;
       }
 
+      const controller = new AbortController();
+      requestRef.current = controller;
       try {
         setLoading(true);
         const res = await fetch(
           `/api/search?q=${encodeURIComponent(q)}&workspaceSlug=${workspaceSlug}`,
+          { signal: controller.signal },
         );
         if (res.ok) {
           const data = await res.json();
+          cacheRef.current.set(q, data);
           setResults(data);
           setSelectedIndex(0);
         }
       } catch (e) {
+        if (controller.signal.aborted) return;
         console.error("Search failed:", e);
       } finally {
-        setLoading(false);
+        if (requestRef.current === controller) setLoading(false);
       }
     },
     [workspaceSlug],
@@ -68,7 +87,7 @@ export default function GlobalSearchModal({
   useEffect(() => {
     const timer = setTimeout(() => {
       fetchResults(query);
-    }, 300);
+    }, 150);
     return () => clearTimeout(timer);
   }, [query, fetchResults]);
 
@@ -76,6 +95,7 @@ export default function GlobalSearchModal({
     if (isOpen) {
       setQuery("");
       setResults([]);
+      cacheRef.current.clear();
       setTimeout(() => inputRef.current?.focus(), 10);
     }
   }, [isOpen]);
@@ -24,9 +24,8 @@ interface Task {
   projectId: string;
 }
 
-interface Workspace {
-  id: string;
-  slug: string;
+interface Bootstrap {
+  current: { id: string; projects: Project[] } | null;
 }
 
 interface TimeEntryModalProps {
@@ -66,18 +65,14 @@ export default function TimeEntryModal({
       setFetching(true);
       setError(null);
       try {
-        // 1. Get workspace ID from slug
-        const wsRes = await fetch("/api/workspaces");
-        if (!wsRes.ok) throw new Error("Failed to fetch workspaces");
-        const workspaces: Workspace[] = await wsRes.json();
-        const workspace = workspaces.find((w) => w.slug === workspaceSlug);
-
-        if (!workspace) throw new Error("Workspace not found");
-
-        // 2. Get projects for workspace
-        const pRes = await fetch(`/api/projects?workspaceId=${workspace.id}`);
-        if (!pRes.ok) throw new Error("Failed to fetch projects");
-        const projectsData = await pRes.json();
+        // Resolve workspace and its projects from the slug
+        const res = await fetch(`/api/bootstrap?slug=${workspaceSlug}`);
+        if (!res.ok) throw new Error("Failed to fetch projects");
+        const { current }: Bootstrap = await res.json();
+
+        if (!current) throw new Error("Workspace not found");
+
+        const projectsData = current.projects;
         setProjects(projectsData);
 
         if (projectsData.length > 0) {
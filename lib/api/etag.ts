@@ -0,0 +1,46 @@
+/**
+ * ETag / Conditional GET Helpers
+ *
+ * Lets read endpoints answer `If-None-Match` with 304 so clients that
+ * already hold the current payload skip the download.
+ */
+
+import { createHash } from "crypto";
+import { NextResponse } from "next/server";
+
+/**
+ * Weak ETag for a JSON-serializable payload
+ */
+export function computeETag(body: string): string {
+  return `W/"${createHash("sha1").update(body).digest("base64url")}"`;
+}
+
+/**
+ * Return `data` as JSON with an ETag, or an empty 304 when the request's
+ * If-None-Match already matches
+ *
+ * Responses are private (per-user) and must be revalidated on every use.
+ */
+export function jsonWithETag(
+  req: Request,
+  data: unknown,
+  headers: Record<string, string> = {},
+): NextResponse {
+  const body = JSON.stringify(data);
+  const etag = computeETag(body);
+  const cacheHeaders = {
+    ...headers,
+    ETag: etag,
+    "Cache-Control": "private, no-cache",
+  };
+
+  const ifNoneMatch = req.headers.get("if-none-match");
+  if (ifNoneMatch?.split(",").some((tag) => tag.trim() === etag)) {
+    return new NextResponse(null, { status: 304, headers: cacheHeaders });
+  }
+
+  return new NextResponse(body, {
+    status: 200,
+    headers: { ...cacheHeaders, "Content-Type": "application/json" },
+  });
+}
@@ -0,0 +1,122 @@
+/**
+ * Streaming JSON Responses
+ *
+ * For list endpoints without a natural page size. Rows are read from the
+ * database in keyset-paginated batches and serialized one batch at a time,
+ * so the response starts after the first batch and the full list is never
+ * held in memory as objects or as one string.
+ */
+
+import { NextResponse } from "next/server";
+import { logEvent } from "@/lib/logger";
+
+export const STREAM_BATCH_SIZE = 500;
+
+/**
+ * Read rows in batches with Prisma cursor pagination
+ *
+ * `fetchPage` receives `take`, and for every batch after the first a
+ * `cursor` on the last row's id with `skip: 1`. The query's orderBy must end
+ * with a unique column (e.g. `{ id: "asc" }`) for stable pages.
+ *
+ * Prisma cursors skip rows when an orderBy column is nullable; such queries
+ * use `offset` mode (`skip` only) instead.
+ */
+export async function* paginate<T extends { id: string }>(
+  fetchPage: (page: {
+    take: number;
+    skip?: number;
+    cursor?: { id: string };
+  }) => Promise<T[]>,
+  { mode = "cursor" }: { mode?: "cursor" | "offset" } = {},
+): AsyncGenerator<T[]> {
+  let cursor: string | undefined;
+  let offset = 0;
+  while (true) {
+    const rows = await fetchPage(
+      mode === "offset"
+        ? { take: STREAM_BATCH_SIZE, skip: offset }
+        : cursor
+          ? { take: STREAM_BATCH_SIZE, skip: 1, cursor: { id: cursor } }
+          : { take: STREAM_BATCH_SIZE },
+    );
+    if (rows.length > 0) yield rows;
+    if (rows.length < STREAM_BATCH_SIZE) return;
+    cursor = rows[rows.length - 1].id;
+    offset += rows.length;
+  }
+}
+
+/**
+ * Stream batches as a JSON array, or as `envelope` with the array under
+ * `key` (e.g. `{ "activeTimer": ..., "entries": [...] }`).
+ *
+ * The first batch is read before the response is created, so a failing
+ * query still produces a normal error response. A failure after that
+ * aborts the stream (the client sees truncated JSON).
+ */
+export async function streamJsonArray(
+  batches: AsyncIterable<unknown[]>,
+  {
+    headers = {},
+    envelope,
+  }: {
+    headers?: Record<string, string>;
+    envelope?: { key: string; data: Record<string, unknown> };
+  } = {},
+): Promise<NextResponse> {
+  const iterator = batches[Symbol.asyncIterator]();
+  const first = await iterator.next();
+
+  const encoder = new TextEncoder();
+  let prefix = "[";
+  let suffix = "]";
+  if (envelope) {
+    const head = JSON.stringify({ ...envelope.data, [envelope.key]: [] });
+    // Everything but the closing "]}" of the empty array
+    prefix = head.slice(0, -2);
+    suffix = "]}";
+  }
+
+  let pending: IteratorResult<unknown[]> | null = first;
+  let wroteRow = false;
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      controller.enqueue(encoder.encode(prefix));
+    },
+    async pull(controller) {
+      try {
+        const result = pending ?? (await iterator.next());
+        pending = null;
+        if (result.done) {
+          controller.enqueue(encoder.encode(suffix));
+          controller.close();
+          return;
+        }
+
+        let chunk = "";
+        for (const row of result.value) {
+          chunk += (wroteRow ? "," : "") + JSON.stringify(row);
+          wroteRow = true;
+        }
+        controller.enqueue(encoder.encode(chunk));
+      } catch (error) {
+        logEvent(
+          "api.stream_failed",
+          { error: error instanceof Error ? error.message : String(error) },
+          { level: "error" },
+        );
+        controller.error(error);
+      }
+    },
+    async cancel() {
+      await iterator.return?.();
+    },
+  });
+
+  return new NextResponse(stream, {
+    status: 200,
+    headers: { ...headers, "Content-Type": "application/json" },
+  });
+}
@@ -9,6 +9,7 @@
  */
 
 import { prisma } from "@/lib/prisma";
+import { getCurrentUser } from "@/lib/supabase/server";
 import { User } from "@prisma/client";
 
 // ============================================================================
@@ -53,7 +54,6 @@ export class NotFoundError extends Error {
  * @returns {Promise<User>} Authenticated user from database
  */
 export async function requireUser(): Promise<User> {
-  const { getCurrentUser } = await import("@/lib/supabase/server");
   const user = await getCurrentUser();
 
   if (!user) {
@@ -0,0 +1,219 @@
+/**
+ * Calendar Feed
+ *
+ * The calendar only needs tasks due inside the visible window, so it reads
+ * a `[from, to)` dueDate range with the few fields a calendar cell shows,
+ * served by the (projectId, dueDate) and (assigneeId, dueDate) indexes.
+ * The same range query backs the streamed iCalendar export.
+ */
+
+import { Prisma } from "@prisma/client";
+import { NextResponse } from "next/server";
+import { z } from "zod";
+import { logEvent } from "@/lib/logger";
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/** Widest window the JSON feed serves (a 6-week month grid fits easily) */
+export const MAX_FEED_DAYS = 62;
+/** Widest window of an iCalendar export */
+export const MAX_EXPORT_DAYS = 366;
+
+export interface CalendarRange {
+  from: Date;
+  to: Date;
+}
+
+/**
+ * Read `from` / `to` (ISO dates, `to` exclusive) from the query string.
+ * Invalid or oversized ranges throw a ZodError (400 via handleApiError).
+ */
+export function parseCalendarRange(
+  searchParams: URLSearchParams,
+  maxDays: number,
+): CalendarRange {
+  return z
+    .object({ from: z.coerce.date(), to: z.coerce.date() })
+    .refine(({ from, to }) => to > from, {
+      message: "`to` must be after `from`",
+      path: ["to"],
+    })
+    .refine(({ from, to }) => to.getTime() - from.getTime() <= maxDays * DAY_MS, {
+      message: `Range cannot exceed ${maxDays} days`,
+      path: ["to"],
+    })
+    .parse({
+      from: searchParams.get("from") ?? undefined,
+      to: searchParams.get("to") ?? undefined,
+    });
+}
+
+/**
+ * Tasks due in the range: one project's, or (without a project) the
+ * user's own assignments across every project they still belong to
+ */
+export function calendarWhere(
+  userId: string,
+  projectId: string | null,
+  { from, to }: CalendarRange,
+): Prisma.TaskWhereInput {
+  const dueDate = { gte: from, lt: to };
+  if (projectId) {
+    return { projectId, dueDate };
+  }
+  return {
+    assigneeId: userId,
+    dueDate,
+    project: { members: { some: { userId } } },
+  };
+}
+
+export const calendarTaskSelect = {
+  id: true,
+  title: true,
+  status: true,
+  priority: true,
+  dueDate: true,
+  projectId: true,
+  assignee: { select: { id: true, name: true, image: true } },
+} satisfies Prisma.TaskSelect;
+
+export const calendarOrderBy: Prisma.TaskOrderByWithRelationInput[] = [
+  { dueDate: "asc" },
+  { id: "asc" },
+];
+
+// ============================================================================
+// ICALENDAR EXPORT
+// ============================================================================
+
+export interface CalendarEvent {
+  id: string;
+  title: string;
+  status: string;
+  priority: string;
+  dueDate: Date | null;
+  project: { id: string; name: string; workspace: { slug: string } };
+}
+
+const encoder = new TextEncoder();
+
+function escapeText(value: string): string {
+  return value
+    .replace(/\\/g, "\\\\")
+    .replace(/;/g, "\\;")
+    .replace(/,/g, "\\,")
+    .replace(/\r?\n/g, "\\n");
+}
+
+/** Fold a content line at 75 octets (RFC 5545 3.1) */
+function foldLine(line: string): string {
+  if (encoder.encode(line).length <= 75) return line + "\r\n";
+  let out = "";
+  let current = "";
+  let octets = 0;
+  for (const char of line) {
+    const size = encoder.encode(char).length;
+    // Continuation lines start with a space, which counts toward the limit
+    if (octets + size > 75) {
+      out += current + "\r\n ";
+      current = "";
+      octets = 1;
+    }
+    current += char;
+    octets += size;
+  }
+  return out + current + "\r\n";
+}
+
+function formatDate(date: Date): string {
+  return date.toISOString().slice(0, 10).replace(/-/g, "");
+}
+
+function formatDateTime(date: Date): string {
+  return date.toISOString().replace(/[-:]/g, "").replace(/\.\d{3}/, "");
+}
+
+function eventLines(task: CalendarEvent, origin: string, stamp: string) {
+  const due = task.dueDate as Date;
+  const lines = [
+    "BEGIN:VEVENT",
+    `UID:task-${task.id}@colab-task-manager`,
+    `DTSTAMP:${stamp}`,
+    // Due dates are whole days
+    `DTSTART;VALUE=DATE:${formatDate(due)}`,
+    `DTEND;VALUE=DATE:${formatDate(new Date(due.getTime() + DAY_MS))}`,
+    `SUMMARY:${escapeText(task.title)}`,
+    `DESCRIPTION:${escapeText(
+      `${task.project.name} · ${task.status.replace("_", " ")} · ${task.priority}`,
+    )}`,
+    `URL:${origin}/app/${task.project.workspace.slug}/projects/${task.project.id}`,
+    `CATEGORIES:${escapeText(task.project.name)}`,
+    "END:VEVENT",
+  ];
+  return lines.map(foldLine).join("");
+}
+
+/**
+ * Stream batches of tasks as a text/calendar download. As with
+ * streamJsonArray, the first batch is read before the response starts so
+ * query errors still become normal error responses.
+ */
+export async function streamICalendar(
+  batches: AsyncIterable<CalendarEvent[]>,
+  { name, origin }: { name: string; origin: string },
+): Promise<NextResponse> {
+  const iterator = batches[Symbol.asyncIterator]();
+  let pending: IteratorResult<CalendarEvent[]> | null = await iterator.next();
+  const stamp = formatDateTime(new Date());
+
+  const header = [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//Colab Task Manager//Calendar//EN",
+    "CALSCALE:GREGORIAN",
+    `X-WR-CALNAME:${escapeText(name)}`,
+  ]
+    .map(foldLine)
+    .join("");
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      controller.enqueue(encoder.encode(header));
+    },
+    async pull(controller) {
+      try {
+        const result = pending ?? (await iterator.next());
+        pending = null;
+        if (result.done) {
+          controller.enqueue(encoder.encode("END:VCALENDAR\r\n"));
+          controller.close();
+          return;
+        }
+        const chunk = result.value
+          .map((task) => eventLines(task, origin, stamp))
+          .join("");
+        controller.enqueue(encoder.encode(chunk));
+      } catch (error) {
+        logEvent(
+          "api.stream_failed",
+          { error: error instanceof Error ? error.message : String(error) },
+          { level: "error" },
+        );
+        controller.error(error);
+      }
+    },
+    async cancel() {
+      await iterator.return?.();
+    },
+  });
+
+  const filename = name.replace(/[^\w.-]+/g, "-").toLowerCase() || "calendar";
+  return new NextResponse(stream, {
+    status: 200,
+    headers: {
+      "Content-Type": "text/calendar; charset=utf-8",
+      "Content-Disposition": `attachment; filename="${filename}.ics"`,
+    },
+  });
+}
@@ -0,0 +1,89 @@
+/**
+ * Read Replica Routing Settings
+ *
+ * Shared by lib/prisma.ts, which sends read-only route handlers to the
+ * replicas in DATABASE_REPLICA_URLS, and middleware.ts, which marks a client
+ * as "sticky" after each of its own mutations so that its next reads go to
+ * the primary (read-your-writes).
+ *
+ * This module must not import Prisma: middleware runs in the edge runtime.
+ */
+
+// ============================================================================
+// CONFIGURATION
+// ============================================================================
+
+/** Comma-separated replica connection strings; empty = primary only */
+export const REPLICA_URLS = (process.env.DATABASE_REPLICA_URLS || "")
+  .split(",")
+  .map((url) => url.trim())
+  .filter(Boolean);
+
+export const REPLICA_ROUTING_ENABLED = REPLICA_URLS.length > 0;
+
+/** Replicas lagging further behind than this are skipped */
+export const REPLICA_MAX_LAG_MS = parseInt(
+  process.env.REPLICA_MAX_LAG_MS || "2000",
+);
+
+/** How often each replica's lag is sampled */
+export const REPLICA_LAG_CHECK_MS = parseInt(
+  process.env.REPLICA_LAG_CHECK_MS || "1000",
+);
+
+/**
+ * How long a client reads from the primary after its own mutation.
+ * Never shorter than the worst lag a replica can have while still in use
+ * (max lag plus one sampling interval), so a write is always visible.
+ */
+export const PRIMARY_STICKY_MS = Math.max(
+  parseInt(process.env.REPLICA_STICKY_MS || "5000"),
+  REPLICA_MAX_LAG_MS + REPLICA_LAG_CHECK_MS,
+);
+
+export const PRIMARY_STICKY_COOKIE = "db-primary-until";
+
+const MUTATING_METHODS = new Set(["POST", "PUT", "PATCH", "DELETE"]);
+
+// ============================================================================
+// STICKINESS
+// ============================================================================
+
+/**
+ * Whether a request writes data and should pin its client to the primary
+ */
+export function isMutation(method: string, pathname: string): boolean {
+  return MUTATING_METHODS.has(method) && pathname.startsWith("/api/");
+}
+
+/**
+ * Cookie marking the client as sticky to the primary until the returned
+ * timestamp
+ */
+export function primaryStickyCookie(now = Date.now()) {
+  return {
+    name: PRIMARY_STICKY_COOKIE,
+    value: String(now + PRIMARY_STICKY_MS),
+    options: {
+      path: "/api",
+      httpOnly: true,
+      sameSite: "lax" as const,
+      maxAge: Math.ceil(PRIMARY_STICKY_MS / 1000),
+    },
+  };
+}
+
+/**
+ * Whether a Cookie header still carries an unexpired sticky marker
+ */
+export function isPrimarySticky(cookieHeader: string | null): boolean {
+  if (!cookieHeader) return false;
+
+  for (const part of cookieHeader.split(";")) {
+    const [name, value] = part.trim().split("=");
+    if (name === PRIMARY_STICKY_COOKIE) {
+      return Number(value) > Date.now();
+    }
+  }
+  return false;
+}
@@ -0,0 +1,232 @@
+/**
+ * Folder Tree
+ *
+ * Folders carry a materialized path ("/<rootId>/.../<id>/") so that the
+ * files page can expand the tree one level at a time and moves/deletes can
+ * address a whole subtree with one range scan on ("projectId", path)
+ * instead of walking parent links. Paths of new folders are set by a
+ * database trigger; this module rewrites them when a folder moves.
+ *
+ * Each folder also carries the count and total size of its own files,
+ * kept current by triggers on "File", so a level costs one indexed query
+ * regardless of how many files sit below it.
+ */
+
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+
+type Db = Pick<typeof prisma, "folder">;
+
+export interface FolderNode {
+  id: string;
+  name: string;
+  parentId: string | null;
+  depth: number;
+  fileCount: number;
+  /** Bytes in the folder's own files */
+  fileSize: number;
+  childCount: number;
+}
+
+export interface FolderRef {
+  id: string;
+  projectId: string;
+  parentId: string | null;
+  path: string;
+  depth: number;
+}
+
+const nodeSelect = {
+  id: true,
+  name: true,
+  parentId: true,
+  depth: true,
+  fileCount: true,
+  fileSize: true,
+  _count: { select: { children: true } },
+} satisfies Prisma.FolderSelect;
+
+function toNode({
+  _count,
+  fileSize,
+  ...folder
+}: Prisma.FolderGetPayload<{ select: typeof nodeSelect }>): FolderNode {
+  return { ...folder, fileSize: Number(fileSize), childCount: _count.children };
+}
+
+/**
+ * Upper bound of a subtree's path range: every descendant path starts
+ * with `path`, which ends in "/", and "0" is the next character after "/"
+ */
+function subtreeEnd(path: string): string {
+  return path.slice(0, -1) + "0";
+}
+
+/**
+ * Direct children of a folder, or the project's top-level folders
+ */
+export async function listFolderLevel(
+  db: Db,
+  projectId: string,
+  parentId: string | null,
+): Promise<FolderNode[]> {
+  const folders = await db.folder.findMany({
+    where: { projectId, parentId },
+    select: nodeSelect,
+    orderBy: { createdAt: "asc" },
+  });
+  return folders.map(toNode);
+}
+
+/**
+ * Folders in a project whose name contains `query`, shallowest first
+ */
+export async function searchFolders(
+  db: Db,
+  projectId: string,
+  query: string,
+  limit = 50,
+): Promise<FolderNode[]> {
+  const folders = await db.folder.findMany({
+    where: { projectId, name: { contains: query, mode: "insensitive" } },
+    select: nodeSelect,
+    orderBy: [{ depth: "asc" }, { name: "asc" }],
+    take: limit,
+  });
+  return folders.map(toNode);
+}
+
+export async function getFolder(
+  db: Db,
+  projectId: string,
+  folderId: string,
+): Promise<FolderRef | null> {
+  return db.folder.findFirst({
+    where: { id: folderId, projectId },
+    select: { id: true, projectId: true, parentId: true, path: true, depth: true },
+  });
+}
+
+/**
+ * Breadcrumb from the top-level folder down to (and including) `folder`,
+ * read by primary key from the IDs in its path
+ */
+export async function getAncestors(
+  db: Db,
+  folder: Pick<FolderRef, "path">,
+): Promise<{ id: string; name: string }[]> {
+  const ids = folder.path.split("/").filter(Boolean);
+  const rows = await db.folder.findMany({
+    where: { id: { in: ids } },
+    select: { id: true, name: true },
+  });
+  const byId = new Map(rows.map((row) => [row.id, row]));
+  return ids.flatMap((id) => byId.get(id) ?? []);
+}
+
+/**
+ * Whether `target` is `folder` or one of its descendants, i.e. moving
+ * `folder` under `target` would create a cycle. Paths must be current:
+ * `moveFolder` checks again under its lock.
+ */
+export function isInSubtree(folder: FolderRef, target: FolderRef): boolean {
+  return target.path.startsWith(folder.path);
+}
+
+export type MoveResult = "moved" | "not_found" | "cycle";
+
+/**
+ * Serialize path rewrites within a project. New folders take the same
+ * lock shared (Folder_set_path trigger), so none is created under a
+ * parent whose path is about to change.
+ */
+async function lockFolderTree(
+  tx: Prisma.TransactionClient,
+  projectId: string,
+) {
+  await tx.$executeRaw`
+    SELECT pg_advisory_xact_lock(hashtext(${"folder-tree:" + projectId}))
+  `;
+}
+
+/**
+ * Re-parent a folder and rewrite the paths and depths of its whole subtree
+ * in one statement. Both folders are re-read and locked inside the
+ * transaction, so a concurrent move cannot leave this one working from
+ * stale paths; the cycle check is repeated there for the same reason.
+ */
+export async function moveFolder(
+  projectId: string,
+  folderId: string,
+  newParentId: string | null,
+): Promise<MoveResult> {
+  return prisma.$transaction(async (tx) => {
+    await lockFolderTree(tx, projectId);
+    const ids = newParentId ? [folderId, newParentId] : [folderId];
+    const rows = await tx.$queryRaw<FolderRef[]>`
+      SELECT id, "projectId", "parentId", path, depth
+      FROM "Folder"
+      WHERE id IN (${Prisma.join(ids)}) AND "projectId" = ${projectId}
+      ORDER BY id
+      FOR UPDATE
+    `;
+    const folder = rows.find((row) => row.id === folderId);
+    const newParent = newParentId
+      ? rows.find((row) => row.id === newParentId)
+      : null;
+    if (!folder || newParent === undefined) return "not_found";
+    if (newParent && isInSubtree(folder, newParent)) return "cycle";
+
+    const newPath = `${newParent?.path ?? "/"}${folder.id}/`;
+    const depthDelta = (newParent ? newParent.depth + 1 : 0) - folder.depth;
+
+    await tx.folder.update({
+      where: { id: folder.id },
+      data: { parentId: newParent?.id ?? null },
+    });
+    await tx.$executeRaw`
+      UPDATE "Folder"
+      SET path = ${newPath} || substr(path, ${folder.path.length + 1}),
+          depth = depth + ${depthDelta}
+      WHERE "projectId" = ${folder.projectId}
+        AND path >= ${folder.path}
+        AND path < ${subtreeEnd(folder.path)}
+    `;
+    return "moved";
+  });
+}
+
+/**
+ * Delete a folder and everything below it. Files are never deleted with a
+ * folder: they move up to the deleted folder's parent (or the project root).
+ * Returns the number of folders removed.
+ */
+export async function deleteFolderTree(folder: FolderRef): Promise<number> {
+  return prisma.$transaction(async (tx) => {
+    await lockFolderTree(tx, folder.projectId);
+    // Re-read under the lock: a move may have changed the path since
+    const [current] = await tx.$queryRaw<FolderRef[]>`
+      SELECT id, "projectId", "parentId", path, depth
+      FROM "Folder"
+      WHERE id = ${folder.id}
+    `;
+    if (!current) return 0;
+
+    await tx.$executeRaw`
+      UPDATE "File"
+      SET "folderId" = ${current.parentId}
+      WHERE "folderId" IN (
+        SELECT id FROM "Folder"
+        WHERE "projectId" = ${current.projectId}
+          AND path >= ${current.path}
+          AND path < ${subtreeEnd(current.path)}
+      )
+    `;
+    return tx.$executeRaw`
+      DELETE FROM "Folder"
+      WHERE "projectId" = ${current.projectId}
+        AND path >= ${current.path}
+        AND path < ${subtreeEnd(current.path)}
+    `;
+  });
+}
@@ -0,0 +1,406 @@
+/**
+ * HTTP Response Compression
+ *
+ * Used by server.ts in place of Next.js' built-in gzip. Negotiates brotli
+ * or gzip from Accept-Encoding and leaves small or already-compressed
+ * responses alone.
+ *
+ * - Dynamic responses use fast settings (brotli quality 4, gzip level 6);
+ *   streamed responses (no Content-Length) are compressed as they are
+ *   written, decided on the first write, and the first chunk is flushed
+ *   immediately so time-to-first-byte is not delayed.
+ * - Hashed static assets (/_next/static) are compressed once at maximum
+ *   quality in the background and then served from an in-memory cache
+ *   (STATIC_COMPRESSION_CACHE_MB, default 64). Conditional and range
+ *   requests go to Next.js, which answers them with 304 and 206.
+ *
+ * COMPRESSION_MIN_BYTES (default 1024) sets the smallest body compressed.
+ */
+
+import type { IncomingMessage, ServerResponse } from "http";
+import {
+  brotliCompress,
+  constants,
+  createBrotliCompress,
+  createGzip,
+  gzip,
+  type BrotliCompress,
+  type Gzip,
+} from "zlib";
+import { promisify } from "util";
+import { counter } from "./metrics";
+
+const MIN_BYTES = parseInt(process.env.COMPRESSION_MIN_BYTES || "1024");
+const STATIC_CACHE_BYTES =
+  parseInt(process.env.STATIC_COMPRESSION_CACHE_MB || "64") * 1024 * 1024;
+// Larger assets are compressed per request instead of cached
+const STATIC_MAX_ENTRY_BYTES = 5 * 1024 * 1024;
+
+const COMPRESSIBLE_TYPE =
+  /^(text\/|application\/(json|javascript|x-javascript|xml|manifest\+json)|image\/svg\+xml)/;
+
+const brotliCompressAsync = promisify(brotliCompress);
+const gzipAsync = promisify(gzip);
+
+const compressedResponses = counter(
+  "http_compressed_responses_total",
+  "Compressed responses by encoding and source",
+);
+
+type Encoding = "br" | "gzip";
+type WriteCallback = (error?: Error | null) => void;
+// Next.js flushes wrapped responses through this after each streamed chunk
+type FlushableResponse = ServerResponse & { flush?: () => void };
+
+// ============================================================================
+// NEGOTIATION
+// ============================================================================
+
+/**
+ * Preferred supported encoding from an Accept-Encoding header (brotli wins
+ * ties; q=0 excludes)
+ */
+export function negotiateEncoding(
+  acceptEncoding: string | undefined,
+): Encoding | null {
+  if (!acceptEncoding) return null;
+
+  let best: Encoding | null = null;
+  let bestQ = 0;
+  for (const part of acceptEncoding.split(",")) {
+    const [name, ...params] = part.trim().toLowerCase().split(";");
+    const qParam = params.find((p) => p.trim().startsWith("q="));
+    const q = qParam ? parseFloat(qParam.trim().slice(2)) : 1;
+    const encoding: Encoding | null =
+      name === "br" ? "br" : name === "gzip" || name === "*" ? "gzip" : null;
+    if (!encoding || !(q > 0)) continue;
+    if (q > bestQ || (q === bestQ && encoding === "br")) {
+      best = encoding;
+      bestQ = q;
+    }
+  }
+  return best;
+}
+
+function createCompressor(encoding: Encoding): BrotliCompress | Gzip {
+  return encoding === "br"
+    ? createBrotliCompress({
+        params: { [constants.BROTLI_PARAM_QUALITY]: 4 },
+      })
+    : createGzip({ level: 6 });
+}
+
+function shouldCompress(res: ServerResponse, length: number | null): boolean {
+  if (res.getHeader("Content-Encoding")) return false;
+  if (res.statusCode === 204 || res.statusCode === 304) return false;
+  if (length !== null && length < MIN_BYTES) return false;
+
+  const type = String(res.getHeader("Content-Type") || "");
+  if (!COMPRESSIBLE_TYPE.test(type) || type.startsWith("text/event-stream")) {
+    return false;
+  }
+  return !String(res.getHeader("Cache-Control") || "").includes(
+    "no-transform",
+  );
+}
+
+function addVary(res: ServerResponse) {
+  const vary = String(res.getHeader("Vary") || "");
+  if (!/accept-encoding/i.test(vary)) {
+    res.setHeader("Vary", vary ? `${vary}, Accept-Encoding` : "Accept-Encoding");
+  }
+}
+
+// ============================================================================
+// STATIC ASSET CACHE
+// ============================================================================
+
+interface CachedAsset {
+  body: Buffer;
+  headers: Record<string, string>;
+}
+
+// Map iteration order doubles as LRU order
+const staticCache = new Map<string, CachedAsset>();
+let staticCacheBytes = 0;
+
+function cacheStaticAsset(key: string, asset: CachedAsset) {
+  if (staticCache.has(key)) return;
+  staticCache.set(key, asset);
+  staticCacheBytes += asset.body.length;
+  for (const [oldKey, old] of staticCache) {
+    if (staticCacheBytes <= STATIC_CACHE_BYTES) break;
+    staticCache.delete(oldKey);
+    staticCacheBytes -= old.body.length;
+  }
+}
+
+function serveCachedAsset(
+  res: ServerResponse,
+  key: string,
+  encoding: Encoding,
+): boolean {
+  const asset = staticCache.get(key);
+  if (!asset) return false;
+
+  // Refresh LRU position
+  staticCache.delete(key);
+  staticCache.set(key, asset);
+
+  res.writeHead(200, {
+    ...asset.headers,
+    "Content-Encoding": encoding,
+    "Content-Length": String(asset.body.length),
+    Vary: "Accept-Encoding",
+  });
+  res.end(asset.body);
+  compressedResponses.inc({ encoding, source: "static-cache" });
+  return true;
+}
+
+/**
+ * Compress a complete static asset at maximum quality for later requests
+ */
+async function precompressStaticAsset(
+  pathname: string,
+  body: Buffer,
+  res: ServerResponse,
+) {
+  const headers: Record<string, string> = {};
+  for (const name of ["content-type", "cache-control"]) {
+    const value = res.getHeader(name);
+    if (value) headers[name] = String(value);
+  }
+
+  const [br, gz] = await Promise.all([
+    brotliCompressAsync(body, {
+      params: {
+        [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+        [constants.BROTLI_PARAM_SIZE_HINT]: body.length,
+      },
+    }),
+    gzipAsync(body, { level: 9 }),
+  ]);
+  cacheStaticAsset(`br:${pathname}`, { body: br, headers });
+  cacheStaticAsset(`gzip:${pathname}`, { body: gz, headers });
+}
+
+// ============================================================================
+// RESPONSE WRAPPER
+// ============================================================================
+
+/**
+ * Compress the response to `req` if the client and content allow it.
+ *
+ * Must be called before the request is handed to Next.js. Removes
+ * Accept-Encoding from the request so Next.js does not compress as well.
+ * Returns true when the response was already served from the static cache.
+ */
+export function compressResponse(
+  req: IncomingMessage,
+  res: ServerResponse,
+  pathname: string,
+): boolean {
+  const encoding = negotiateEncoding(req.headers["accept-encoding"]);
+  delete req.headers["accept-encoding"];
+  if (!encoding || req.method === "HEAD") return false;
+
+  const isStatic = pathname.startsWith("/_next/static/");
+  const plainGet =
+    !req.headers["if-none-match"] &&
+    !req.headers["if-modified-since"] &&
+    !req.headers.range;
+  if (
+    isStatic &&
+    plainGet &&
+    serveCachedAsset(res, `${encoding}:${pathname}`, encoding)
+  ) {
+    return true;
+  }
+
+  const write = res.write.bind(res) as (...args: unknown[]) => boolean;
+  const end = res.end.bind(res) as (...args: unknown[]) => ServerResponse;
+  const on = res.on.bind(res);
+
+  // Undecided until the headers are known and enough body is seen
+  let mode: "pending" | "compress" | "identity" = "pending";
+  let pending: { chunk: Buffer; cb?: WriteCallback }[] = [];
+  let pendingBytes = 0;
+  let compressor: BrotliCompress | Gzip | null = null;
+  let flushedFirst = false;
+  // Uncompressed copy of static assets for the cache
+  const staticBody: Buffer[] | null = isStatic ? [] : null;
+  let staticBytes = 0;
+
+  const toBuffer = (chunk: unknown, enc?: unknown): Buffer =>
+    Buffer.isBuffer(chunk)
+      ? chunk
+      : Buffer.from(
+          chunk as string | Uint8Array,
+          typeof enc === "string" ? (enc as BufferEncoding) : undefined,
+        );
+
+  /**
+   * Pick identity or compression once the length is known, the body ends
+   * or the response streams. `streaming` forces a decision (headers are
+   * being sent, or a chunk of unknown-length body is being written).
+   */
+  const decide = (ending: boolean, streaming = false) => {
+    const declared = res.getHeader("Content-Length");
+    const length =
+      declared !== undefined
+        ? Number(declared)
+        : ending
+          ? pendingBytes
+          : pendingBytes >= MIN_BYTES || streaming
+            ? null
+            : undefined;
+    if (length === undefined) return; // need more data
+
+    if (!shouldCompress(res, length)) {
+      mode = "identity";
+    } else {
+      mode = "compress";
+      res.removeHeader("Content-Length");
+      res.setHeader("Content-Encoding", encoding);
+      addVary(res);
+      compressedResponses.inc({ encoding, source: "dynamic" });
+
+      const stream = createCompressor(encoding);
+      // Backpressure: pause while the socket is full, and let writers
+      // waiting on "drain" continue once the compressor has room
+      stream.on("data", (data: Buffer) => {
+        if (!write(data)) stream.pause();
+      });
+      on("drain", () => stream.resume());
+      stream.on("drain", () => res.emit("drain"));
+      stream.on("end", () => end());
+      stream.on("error", () => end());
+      compressor = stream;
+      // Next.js calls res.flush() after each chunk it pipes (RSC flight
+      // data, Suspense boundaries): push it out of the compressor
+      (res as FlushableResponse).flush = () => stream.flush();
+    }
+
+    const buffered = pending;
+    pending = [];
+    for (const { chunk, cb } of buffered) emit(chunk, cb);
+  };
+
+  /** Pass a chunk on; `cb` runs once the socket or compressor took it */
+  const emit = (chunk: Buffer, cb?: WriteCallback): boolean => {
+    if (mode !== "compress") return write(chunk, cb);
+    const ok = compressor!.write(chunk, cb);
+    if (!flushedFirst) {
+      // Send the first bytes right away instead of waiting for a full block
+      flushedFirst = true;
+      compressor!.flush();
+    }
+    return ok;
+  };
+
+  // Headers stay editable until the body decision: writeHead only records
+  // them, and Node sends them with the first write
+  const writeHead = res.writeHead.bind(res) as (
+    ...args: unknown[]
+  ) => ServerResponse;
+  res.writeHead = function (
+    statusCode: number,
+    reason?: unknown,
+    headers?: unknown,
+  ) {
+    // Node's implicit header write, after the decision
+    if (mode !== "pending") return writeHead(statusCode, reason, headers);
+
+    res.statusCode = statusCode;
+    if (typeof reason === "string") res.statusMessage = reason;
+    else headers = reason;
+    if (Array.isArray(headers)) {
+      for (let i = 0; i < headers.length; i += 2) {
+        res.setHeader(String(headers[i]), headers[i + 1]);
+      }
+    } else if (headers && typeof headers === "object") {
+      for (const [name, value] of Object.entries(headers)) {
+        if (value !== undefined) res.setHeader(name, value as string);
+      }
+    }
+    return res;
+  } as typeof res.writeHead;
+
+  const flushHeaders = res.flushHeaders.bind(res);
+  res.flushHeaders = function () {
+    if (mode === "pending") decide(false, true);
+    flushHeaders();
+  };
+
+  /** Take a body chunk; returns true if it was only buffered */
+  const accept = (buffer: Buffer, cb?: WriteCallback): boolean => {
+    if (staticBody && staticBytes <= STATIC_MAX_ENTRY_BYTES) {
+      staticBody.push(buffer);
+      staticBytes += buffer.length;
+    }
+    if (mode !== "pending") return false;
+    pending.push({ chunk: buffer, cb });
+    pendingBytes += buffer.length;
+    return true;
+  };
+
+  res.write = function (chunk: unknown, enc?: unknown, cb?: unknown) {
+    if (chunk === undefined || chunk === null) return true;
+    const buffer = toBuffer(chunk, enc);
+    const callback = (
+      typeof enc === "function"
+        ? enc
+        : typeof cb === "function"
+          ? cb
+          : undefined
+    ) as WriteCallback | undefined;
+
+    if (accept(buffer, callback)) {
+      // Without a Content-Length the body is streamed (RSC flight data,
+      // streamed JSON): holding chunks back to measure it would delay them
+      decide(false, res.getHeader("Content-Length") === undefined);
+      return true;
+    }
+    return emit(buffer, callback);
+  } as typeof res.write;
+
+  res.end = function (chunk?: unknown, enc?: unknown, cb?: unknown) {
+    if (typeof chunk === "function") {
+      cb = chunk;
+      chunk = undefined;
+    } else if (typeof enc === "function") {
+      cb = enc;
+    }
+    if (chunk !== undefined && chunk !== null) {
+      // A body passed whole to end() is measured, not streamed
+      const buffer = toBuffer(chunk, typeof enc === "string" ? enc : undefined);
+      if (!accept(buffer)) emit(buffer);
+    }
+    if (typeof cb === "function") on("finish", cb as () => void);
+
+    if (mode === "pending") decide(true);
+    if (mode === "compress") compressor!.end();
+    else end();
+
+    if (
+      staticBody &&
+      res.statusCode === 200 &&
+      staticBytes >= MIN_BYTES &&
+      staticBytes <= STATIC_MAX_ENTRY_BYTES &&
+      shouldCompressStatic(res)
+    ) {
+      precompressStaticAsset(pathname, Buffer.concat(staticBody), res).catch(
+        () => {},
+      );
+    }
+    return res;
+  } as typeof res.end;
+
+  return false;
+}
+
+function shouldCompressStatic(res: ServerResponse): boolean {
+  const type = String(res.getHeader("Content-Type") || "");
+  return COMPRESSIBLE_TYPE.test(type);
+}
@@ -0,0 +1,257 @@
+/**
+ * Background Job Handlers
+ *
+ * One handler per job type. A handler either processes single payloads
+ * (`handle`, run by the worker with up to `concurrency` in parallel) or a
+ * whole claimed batch at once (`handleBatch`, for types that benefit from
+ * grouping such as realtime broadcasts).
+ */
+
+import type { RealtimeChannel } from "@supabase/supabase-js";
+import { prisma } from "@/lib/prisma";
+import { sendEmail } from "@/lib/mail";
+import { getAdminClient } from "@/lib/supabase/admin";
+import { getContextChannel, getMessageChannel } from "@/lib/realtime";
+import { withoutReactionCounts } from "@/lib/reactions";
+import { incrementUnreadCounters, type UnreadUpdate } from "@/lib/unread";
+import { archiveOldMessages } from "@/lib/message-archive";
+import { runWorkspaceExport } from "@/lib/workspace-export";
+import { logEvent } from "@/lib/logger";
+import type { JobPayloads, JobType } from "./queue";
+
+export interface JobHandler<T extends JobType> {
+  /** Jobs claimed per poll */
+  batchSize: number;
+  /** Payloads processed in parallel */
+  concurrency: number;
+  /** Keep one job of this type scheduled, this far after the last run */
+  repeatEveryMs?: number;
+  /**
+   * Jobs take minutes: the worker runs them beside its poll loop instead of
+   * holding up the other types until they finish
+   */
+  longRunning?: boolean;
+  /** Process one payload; throw to retry */
+  handle?: (payload: JobPayloads[T]) => Promise<void>;
+  /** Process a batch; return one error (or null) per payload, in order */
+  handleBatch?: (payloads: JobPayloads[T][]) => Promise<(Error | null)[]>;
+}
+
+const SUBSCRIBE_TIMEOUT_MS = 5000;
+
+// Larger channels skip the per-user push; their clients poll /api/unread
+const UNREAD_PUSH_MAX_RECIPIENTS = 50;
+
+// ============================================================================
+// REALTIME
+// ============================================================================
+
+function subscribe(channel: RealtimeChannel): Promise<void> {
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(
+      () => reject(new Error(`Subscribe timed out: ${channel.topic}`)),
+      SUBSCRIBE_TIMEOUT_MS,
+    );
+    channel.subscribe((status) => {
+      if (status === "SUBSCRIBED") {
+        clearTimeout(timer);
+        resolve();
+      } else if (status === "CHANNEL_ERROR" || status === "TIMED_OUT") {
+        clearTimeout(timer);
+        reject(new Error(`Subscribe failed (${status}): ${channel.topic}`));
+      }
+    });
+  });
+}
+
+/**
+ * Send broadcasts grouped by channel: one subscription per channel per
+ * batch, removed afterwards so the worker does not accumulate channels
+ */
+async function broadcastBatch(
+  payloads: JobPayloads["realtime.broadcast"][],
+  concurrency: number,
+): Promise<(Error | null)[]> {
+  const supabase = getAdminClient();
+  const results: (Error | null)[] = payloads.map(() => null);
+
+  const byChannel = new Map<string, number[]>();
+  payloads.forEach((p, i) => {
+    byChannel.set(p.channel, [...(byChannel.get(p.channel) ?? []), i]);
+  });
+
+  await mapWithConcurrency([...byChannel], concurrency, async ([name, ids]) => {
+    const channel = supabase.channel(name);
+    try {
+      await subscribe(channel);
+      for (const i of ids) {
+        const status = await channel.send({
+          type: "broadcast",
+          event: payloads[i].event,
+          payload: payloads[i].payload,
+        });
+        if (status !== "ok") {
+          results[i] = new Error(`Broadcast ${status} on ${name}`);
+        }
+      }
+    } catch (error) {
+      for (const i of ids) results[i] = toError(error);
+    } finally {
+      await supabase.removeChannel(channel);
+    }
+  });
+
+  return results;
+}
+
+// Reactions are left out: clients keep their own per-user summary
+const messageInclude = {
+  sender: { select: { id: true, name: true, image: true } },
+  _count: { select: { replies: true } },
+};
+
+// ============================================================================
+// HANDLERS
+// ============================================================================
+
+export const jobHandlers: { [T in JobType]: JobHandler<T> } = {
+  "email.send": {
+    batchSize: 20,
+    concurrency: 5,
+    async handle(payload) {
+      const result = await sendEmail(payload);
+      if (!result.success) {
+        throw toError(result.error);
+      }
+    },
+  },
+
+  "realtime.broadcast": {
+    batchSize: 100,
+    concurrency: 10,
+    handleBatch(payloads) {
+      return broadcastBatch(payloads, 10);
+    },
+  },
+
+  "message.broadcast": {
+    batchSize: 100,
+    concurrency: 10,
+    async handleBatch(payloads) {
+      const ids = [...new Set(payloads.map((p) => p.messageId))];
+      const needsFull = payloads.some((p) => p.payload === undefined);
+      const messages = await prisma.message.findMany({
+        where: { id: { in: ids } },
+        include: needsFull ? messageInclude : undefined,
+      });
+      const byId = new Map(messages.map((m) => [m.id, m]));
+
+      const broadcasts: JobPayloads["realtime.broadcast"][] = [];
+      const indexes: number[] = [];
+      const results: (Error | null)[] = payloads.map((p, i) => {
+        const message = byId.get(p.messageId);
+        // Deleted before the job ran: nothing left to broadcast
+        if (!message) return null;
+
+        const channel = p.context
+          ? getContextChannel(message)
+          : getMessageChannel(message);
+        if (!channel) return null;
+
+        broadcasts.push({
+          channel,
+          event: p.event,
+          payload:
+            p.payload === undefined ? withoutReactionCounts(message) : p.payload,
+        });
+        indexes.push(i);
+        return null;
+      });
+
+      const sent = await broadcastBatch(broadcasts, 10);
+      sent.forEach((error, j) => {
+        results[indexes[j]] = error;
+      });
+      return results;
+    },
+  },
+
+  "unread.increment": {
+    batchSize: 50,
+    concurrency: 5,
+    async handleBatch(payloads) {
+      const updates: UnreadUpdate[] = [];
+      const results = await mapWithConcurrency(payloads, 5, async (p) => {
+        try {
+          const rows = await incrementUnreadCounters(p.messageId);
+          if (rows.length <= UNREAD_PUSH_MAX_RECIPIENTS) updates.push(...rows);
+          return null;
+        } catch (error) {
+          return toError(error);
+        }
+      });
+
+      // Best effort: a failed push must not retry (and double) the increment
+      await broadcastBatch(
+        updates.map((u) => ({
+          channel: `unread:${u.userId}`,
+          event: "unread-updated",
+          payload: { channel: u.channel, count: u.count },
+        })),
+        10,
+      );
+      return results;
+    },
+  },
+
+  "messages.archive": {
+    batchSize: 1,
+    concurrency: 1,
+    repeatEveryMs: 24 * 60 * 60 * 1000,
+    longRunning: true,
+    async handle(payload) {
+      const moved = await archiveOldMessages(payload.olderThanDays);
+      logEvent("messages.archived", { moved });
+    },
+  },
+
+  "workspace.export": {
+    batchSize: 1,
+    concurrency: 1,
+    longRunning: true,
+    async handle(payload) {
+      await runWorkspaceExport(payload.exportId);
+    },
+  },
+};
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+export function toError(error: unknown): Error {
+  return error instanceof Error ? error : new Error(String(error));
+}
+
+/**
+ * Run `fn` over `items` with at most `limit` in flight
+ */
+export async function mapWithConcurrency<T, R>(
+  items: T[],
+  limit: number,
+  fn: (item: T) => Promise<R>,
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+  const workers = Array.from(
+    { length: Math.min(limit, items.length) },
+    async () => {
+      while (next < items.length) {
+        const i = next++;
+        results[i] = await fn(items[i]);
+      }
+    },
+  );
+  await Promise.all(workers);
+  return results;
+}
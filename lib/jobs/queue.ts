@@ -0,0 +1,143 @@
+/**
+ * Durable Background Job Queue
+ *
+ * Postgres-backed queue for side effects that should not block a request:
+ * email delivery, realtime broadcasts and notification fan-out. Jobs are
+ * rows in the `Job` table and are processed by the worker process
+ * (`npm run worker`, see lib/jobs/worker.ts).
+ *
+ * Usage in API routes:
+ * ```typescript
+ * import { enqueueJob } from "@/lib/jobs/queue";
+ *
+ * await enqueueJob("realtime.broadcast", {
+ *   channel: `project:${projectId}`,
+ *   event: "task-updated",
+ *   payload: { projectId, taskId },
+ * });
+ * ```
+ */
+
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+import { gauge, registerCollector } from "@/lib/metrics";
+
+// ============================================================================
+// JOB TYPES
+// ============================================================================
+
+export interface JobPayloads {
+  /** Send one email through lib/mail.ts */
+  "email.send": {
+    to: string;
+    subject: string;
+    html: string;
+  };
+
+  /** Broadcast an event on a Supabase Realtime channel */
+  "realtime.broadcast": {
+    channel: string;
+    event: string;
+    payload: unknown;
+  };
+
+  /**
+   * Broadcast an event about a message on the message's own channel.
+   * The channel is resolved by the worker. When `payload` is omitted the
+   * worker loads the full message (sender, reply count).
+   */
+  "message.broadcast": {
+    messageId: string;
+    event: string;
+    payload?: unknown;
+    /** Broadcast on the conversation channel even for thread replies */
+    context?: boolean;
+  };
+
+  /** Bump unread counters for every recipient of a new message */
+  "unread.increment": {
+    messageId: string;
+  };
+
+  /** Move old threads to the partitioned archive (recurring, daily) */
+  "messages.archive": {
+    olderThanDays?: number;
+  };
+
+  /** Build or resume a workspace export archive (lib/workspace-export.ts) */
+  "workspace.export": {
+    exportId: string;
+  };
+}
+
+export type JobType = keyof JobPayloads;
+
+interface EnqueueOptions {
+  /** Earliest time the job may run (default: now) */
+  runAt?: Date;
+  /** Attempts before the job is marked FAILED (default: 5) */
+  maxAttempts?: number;
+}
+
+// ============================================================================
+// PUBLIC API
+// ============================================================================
+
+/**
+ * Add a job to the queue
+ */
+export async function enqueueJob<T extends JobType>(
+  type: T,
+  payload: JobPayloads[T],
+  options: EnqueueOptions = {},
+) {
+  return prisma.job.create({
+    data: {
+      type,
+      payload: toJson(payload),
+      runAt: options.runAt,
+      maxAttempts: options.maxAttempts,
+    },
+    select: { id: true },
+  });
+}
+
+/**
+ * Add many jobs of one type in a single insert
+ */
+export async function enqueueJobs<T extends JobType>(
+  type: T,
+  payloads: JobPayloads[T][],
+  options: EnqueueOptions = {},
+) {
+  if (payloads.length === 0) return { count: 0 };
+
+  return prisma.job.createMany({
+    data: payloads.map((payload) => ({
+      type,
+      payload: toJson(payload),
+      runAt: options.runAt,
+      maxAttempts: options.maxAttempts,
+    })),
+  });
+}
+
+/**
+ * Round-trip through JSON so Dates and Prisma results become plain JSON
+ */
+function toJson(value: unknown): Prisma.InputJsonValue {
+  return JSON.parse(JSON.stringify(value)) as Prisma.InputJsonValue;
+}
+
+// Queue depth is sampled from the table on each /metrics scrape
+const queueDepth = gauge("jobs_queue_depth", "Background jobs by status");
+
+registerCollector("jobs", async () => {
+  const counts = await prisma.job.groupBy({
+    by: ["status"],
+    _count: { _all: true },
+  });
+  for (const row of counts) {
+    queueDepth.set({ status: row.status }, row._count._all);
+  }
+});
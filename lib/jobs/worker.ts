@@ -0,0 +1,290 @@
+/**
+ * Background Job Worker
+ *
+ * Polls the `Job` table and runs handlers from lib/jobs/handlers.ts.
+ * Jobs are claimed with `FOR UPDATE SKIP LOCKED`, so any number of worker
+ * processes can run side by side without double-processing.
+ *
+ * Failed jobs are retried with exponential backoff and marked FAILED after
+ * `maxAttempts`. Jobs left RUNNING by a crashed worker are released after
+ * JOB_LOCK_TIMEOUT_MS, which counts as a failed attempt. Handlers with
+ * `repeatEveryMs` (e.g. message archival) always have one job scheduled.
+ * `longRunning` handlers (workspace exports, message archival) run one
+ * batch at a time beside the poll loop, so short jobs keep flowing while
+ * they work; they refresh their own lock.
+ */
+
+import { hostname } from "os";
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+import { logEvent } from "@/lib/logger";
+import { jobHandlers, mapWithConcurrency, toError } from "./handlers";
+import { enqueueJob, type JobPayloads, type JobType } from "./queue";
+
+const POLL_INTERVAL_MS = parseInt(process.env.JOB_POLL_INTERVAL_MS || "1000");
+const LOCK_TIMEOUT_MS = parseInt(process.env.JOB_LOCK_TIMEOUT_MS || "300000");
+const BASE_BACKOFF_MS = 2000;
+const MAX_BACKOFF_MS = 10 * 60 * 1000;
+
+interface ClaimedJob {
+  id: string;
+  type: JobType;
+  payload: unknown;
+  attempts: number;
+  maxAttempts: number;
+}
+
+// ============================================================================
+// QUEUE OPERATIONS
+// ============================================================================
+
+/**
+ * Atomically claim up to `limit` due jobs of one type
+ */
+async function claimJobs(
+  type: JobType,
+  limit: number,
+  workerId: string,
+): Promise<ClaimedJob[]> {
+  return prisma.$queryRaw<ClaimedJob[]>(Prisma.sql`
+    UPDATE "Job"
+    SET status = 'RUNNING',
+        "lockedAt" = now(),
+        "lockedBy" = ${workerId},
+        attempts = attempts + 1,
+        "updatedAt" = now()
+    WHERE id IN (
+      SELECT id FROM "Job"
+      WHERE status = 'PENDING' AND type = ${type} AND "runAt" <= now()
+      ORDER BY "runAt"
+      LIMIT ${limit}
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, type, payload, attempts, "maxAttempts"
+  `);
+}
+
+async function completeJobs(ids: string[]) {
+  if (ids.length === 0) return;
+  await prisma.job.updateMany({
+    where: { id: { in: ids } },
+    data: { status: "COMPLETED", lockedAt: null, lockedBy: null },
+  });
+}
+
+async function failJob(job: ClaimedJob, error: Error) {
+  const exhausted = job.attempts >= job.maxAttempts;
+  const delay = Math.min(
+    BASE_BACKOFF_MS * 2 ** (job.attempts - 1),
+    MAX_BACKOFF_MS,
+  );
+
+  await prisma.job.update({
+    where: { id: job.id },
+    data: {
+      status: exhausted ? "FAILED" : "PENDING",
+      runAt: exhausted ? undefined : new Date(Date.now() + delay),
+      lockedAt: null,
+      lockedBy: null,
+      lastError: error.message.slice(0, 1000),
+    },
+  });
+
+  logEvent(
+    "job.failed",
+    { jobId: job.id, type: job.type, attempts: job.attempts, exhausted },
+    { level: exhausted ? "error" : "warn" },
+  );
+}
+
+/**
+ * Return jobs locked by a worker that died mid-batch to the queue. The
+ * lost run counts as a failed attempt (it was counted when claimed), so a
+ * job that crashes the worker backs off like any failure and ends FAILED
+ * at `maxAttempts` instead of being retried forever.
+ */
+async function releaseStaleJobs() {
+  const released = await prisma.$queryRaw<
+    { id: string; type: string; attempts: number; failed: boolean }[]
+  >(Prisma.sql`
+    UPDATE "Job"
+    SET status = CASE WHEN attempts >= "maxAttempts"
+                      THEN 'FAILED'::"JobStatus"
+                      ELSE 'PENDING'::"JobStatus" END,
+        "runAt" = now() + make_interval(secs => LEAST(
+          ${BASE_BACKOFF_MS / 1000} * power(2, GREATEST(attempts - 1, 0)),
+          ${MAX_BACKOFF_MS / 1000}
+        )),
+        "lockedAt" = NULL,
+        "lockedBy" = NULL,
+        "lastError" = 'Lock expired: the worker stopped while running the job',
+        "updatedAt" = now()
+    WHERE status = 'RUNNING'
+      AND "lockedAt" < ${new Date(Date.now() - LOCK_TIMEOUT_MS)}
+    RETURNING id, type, attempts, status = 'FAILED' AS failed
+  `);
+  if (released.length === 0) return;
+
+  const failed = released.filter((job) => job.failed);
+  logEvent(
+    "job.released",
+    { count: released.length, failed: failed.length },
+    { level: "warn" },
+  );
+  for (const job of failed) {
+    logEvent(
+      "job.failed",
+      {
+        jobId: job.id,
+        type: job.type,
+        attempts: job.attempts,
+        exhausted: true,
+      },
+      { level: "error" },
+    );
+  }
+}
+
+/**
+ * Enqueue a recurring job unless one is already pending or running
+ */
+async function ensureScheduled(type: JobType, runAt: Date) {
+  const existing = await prisma.job.findFirst({
+    where: { type, status: { in: ["PENDING", "RUNNING"] } },
+    select: { id: true },
+  });
+  if (!existing) {
+    await enqueueJob(type, {} as JobPayloads[typeof type], { runAt });
+  }
+}
+
+// ============================================================================
+// PROCESSING
+// ============================================================================
+
+/**
+ * Claim and run one batch of a job type. Returns the number of jobs run.
+ */
+async function processBatch(type: JobType, workerId: string) {
+  const handler = jobHandlers[type];
+  const jobs = await claimJobs(type, handler.batchSize, workerId);
+  if (jobs.length === 0) return 0;
+
+  const payloads = jobs.map((job) => job.payload as JobPayloads[typeof type]);
+  let errors: (Error | null)[];
+
+  try {
+    if (handler.handleBatch) {
+      errors = await (
+        handler.handleBatch as (p: unknown[]) => Promise<(Error | null)[]>
+      )(payloads);
+    } else {
+      const handle = handler.handle as (p: unknown) => Promise<void>;
+      errors = await mapWithConcurrency(
+        payloads,
+        handler.concurrency,
+        async (payload) => {
+          try {
+            await handle(payload);
+            return null;
+          } catch (error) {
+            return toError(error);
+          }
+        },
+      );
+    }
+  } catch (error) {
+    errors = jobs.map(() => toError(error));
+  }
+
+  const completed = jobs.filter((_, i) => !errors[i]).map((job) => job.id);
+  await completeJobs(completed);
+  await Promise.all(
+    jobs.map((job, i) => (errors[i] ? failJob(job, errors[i]!) : null)),
+  );
+
+  if (handler.repeatEveryMs) {
+    await ensureScheduled(type, new Date(Date.now() + handler.repeatEveryMs));
+  }
+
+  logEvent("job.batch", {
+    type,
+    claimed: jobs.length,
+    completed: completed.length,
+  });
+  return jobs.length;
+}
+
+/**
+ * Start a batch of a long-running type unless one is still in flight.
+ * Returns 0: the loop does not wait for it.
+ */
+function startLongRunning(
+  type: JobType,
+  workerId: string,
+  inFlight: Map<JobType, Promise<unknown>>,
+) {
+  if (inFlight.has(type)) return 0;
+  const run = processBatch(type, workerId)
+    .catch((error) => {
+      logEvent(
+        "job.worker_error",
+        { type, error: toError(error).message },
+        { level: "error" },
+      );
+    })
+    .finally(() => inFlight.delete(type));
+  inFlight.set(type, run);
+  return 0;
+}
+
+/**
+ * Run the worker loop until `signal` is aborted
+ */
+export async function runWorker(signal: AbortSignal) {
+  const workerId = `${hostname()}:${process.pid}`;
+  const types = Object.keys(jobHandlers) as JobType[];
+  let lastReleaseAt = 0;
+  const inFlight = new Map<JobType, Promise<unknown>>();
+
+  logEvent("job.worker_started", { workerId, types });
+
+  for (const type of types) {
+    if (jobHandlers[type].repeatEveryMs) {
+      await ensureScheduled(type, new Date());
+    }
+  }
+
+  while (!signal.aborted) {
+    try {
+      if (Date.now() - lastReleaseAt > LOCK_TIMEOUT_MS / 5) {
+        lastReleaseAt = Date.now();
+        await releaseStaleJobs();
+      }
+
+      const counts = await Promise.all(
+        types.map((type) =>
+          jobHandlers[type].longRunning
+            ? startLongRunning(type, workerId, inFlight)
+            : processBatch(type, workerId),
+        ),
+      );
+
+      // Keep draining while there is work; otherwise wait for the next poll
+      if (counts.some((count) => count > 0)) continue;
+    } catch (error) {
+      logEvent(
+        "job.worker_error",
+        { error: toError(error).message },
+        { level: "error" },
+      );
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+  }
+
+  // Wait for running exports; one killed before finishing resumes from
+  // its last checkpoint on another worker
+  await Promise.all(inFlight.values());
+  logEvent("job.worker_stopped", { workerId });
+}
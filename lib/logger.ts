@@ -0,0 +1,47 @@
+/**
+ * Sampled Structured Logging
+ *
+ * High-volume events (socket connects, room joins, notification fan-out)
+ * are logged as single-line JSON and sampled so logging does not become a
+ * throughput cost under load. Warnings and errors are never sampled.
+ *
+ * LOG_SAMPLE_RATE sets the fraction of info events kept (default 0.01 in
+ * production, 1 elsewhere).
+ */
+
+type LogLevel = "info" | "warn" | "error";
+
+const DEFAULT_SAMPLE_RATE = process.env.NODE_ENV === "production" ? 0.01 : 1;
+
+const sampleRate = (() => {
+  const value = parseFloat(process.env.LOG_SAMPLE_RATE ?? "");
+  return Number.isFinite(value)
+    ? Math.min(Math.max(value, 0), 1)
+    : DEFAULT_SAMPLE_RATE;
+})();
+
+/**
+ * Log a structured event
+ *
+ * @param sample - Override the sampling rate for this event (0-1)
+ */
+export function logEvent(
+  event: string,
+  fields: Record<string, unknown> = {},
+  { level = "info", sample }: { level?: LogLevel; sample?: number } = {},
+): void {
+  const rate = level === "info" ? (sample ?? sampleRate) : 1;
+  if (rate < 1 && Math.random() >= rate) return;
+
+  const line = JSON.stringify({
+    ts: new Date().toISOString(),
+    level,
+    event,
+    ...(rate < 1 ? { sampleRate: rate } : {}),
+    ...fields,
+  });
+
+  if (level === "error") console.error(line);
+  else if (level === "warn") console.warn(line);
+  else console.log(line);
+}
@@ -1,12 +1,24 @@
 import nodemailer from "nodemailer";
 
-const transporter = nodemailer.createTransport({
-  service: "gmail",
-  auth: {
-    user: "samuelhany500@gmail.com",
-    pass: process.env.APP_PASSWORD,
-  },
-});
+// SMTP_HOST/SMTP_PORT point at any SMTP server (e.g. scripts/smtp_sink.py
+// for local testing); otherwise mail goes through Gmail. The pooled
+// transport reuses connections across queued emails.
+const transporter = process.env.SMTP_HOST
+  ? nodemailer.createTransport({
+      pool: true,
+      host: process.env.SMTP_HOST,
+      port: parseInt(process.env.SMTP_PORT || "25"),
+      secure: false,
+      ignoreTLS: true,
+    })
+  : nodemailer.createTransport({
+      pool: true,
+      service: "gmail",
+      auth: {
+        user: "samuelhany500@gmail.com",
+        pass: process.env.APP_PASSWORD,
+      },
+    });
 
 /**
  * Utility for sending emails using Gmail SMTP.
@@ -0,0 +1,212 @@
+/**
+ * Message Archive (cold storage)
+ *
+ * Threads older than MESSAGE_ARCHIVE_AFTER_DAYS are moved out of the hot
+ * `Message` table into `MessageArchive`, a Postgres table range-partitioned
+ * by month (see the 20261018160000_message_archive migration). The move is
+ * done by the `archive_messages()` SQL function in small batches, run daily
+ * by the background worker (`messages.archive` job).
+ *
+ * Archived messages stay readable: chat history pages continue into the
+ * archive (`listArchivedMessages`), archived threads open from it
+ * (`findArchivedMessage`, `listArchivedReplies`) and search covers it
+ * (`searchArchivedMessages`). The archive has a trigram index on content
+ * and per-partition context indexes.
+ *
+ * A thread is moved whole (top-level message and replies). Its Reaction
+ * and MessageRead rows are deleted by the ON DELETE CASCADE constraints;
+ * reaction counts survive in `reactionCounts`, but who reacted and read
+ * pointers into archived messages do not.
+ */
+
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+import { summarizeReactions } from "@/lib/reactions";
+
+export const ARCHIVE_AFTER_DAYS = parseInt(
+  process.env.MESSAGE_ARCHIVE_AFTER_DAYS || "180",
+);
+
+const ARCHIVE_BATCH_SIZE = 5000;
+// Bounds one job run; the rest is picked up by the next run
+const ARCHIVE_MAX_BATCHES = 200;
+// Threads are archived whole, so this only guards against huge threads
+const ARCHIVE_THREAD_LIMIT = 1000;
+
+/**
+ * Move threads older than `olderThanDays` into the archive; called by the
+ * `messages.archive` job. Returns the number of messages moved.
+ */
+export async function archiveOldMessages(
+  olderThanDays = ARCHIVE_AFTER_DAYS,
+): Promise<number> {
+  const before = new Date(Date.now() - olderThanDays * 24 * 60 * 60 * 1000);
+  let total = 0;
+
+  // One transaction per batch keeps locks and WAL bursts short
+  for (let i = 0; i < ARCHIVE_MAX_BATCHES; i++) {
+    const [{ moved }] = await prisma.$queryRaw<{ moved: number }[]>(
+      Prisma.sql`SELECT archive_messages(${before}::timestamp, ${ARCHIVE_BATCH_SIZE}) AS moved`,
+    );
+    total += moved;
+    if (moved === 0) break;
+    await touchArchiveJob();
+  }
+
+  return total;
+}
+
+/** Keep the worker from releasing the job as stale while it runs */
+async function touchArchiveJob(): Promise<void> {
+  await prisma.job.updateMany({
+    where: { type: "messages.archive", status: "RUNNING" },
+    data: { lockedAt: new Date() },
+  });
+}
+
+interface ArchivedMessageRow {
+  id: string;
+  content: string;
+  workspaceId: string | null;
+  projectId: string | null;
+  conversationId: string | null;
+  senderId: string;
+  receiverId: string | null;
+  parentId: string | null;
+  isPinned: boolean;
+  reactionCounts: Prisma.JsonValue;
+  createdAt: Date;
+  updatedAt: Date;
+  senderName: string | null;
+  senderImage: string | null;
+  replyCount: number;
+}
+
+export type ArchiveSearchContext =
+  | { workspaceId: string }
+  | { projectId: string }
+  | { userId: string; receiverId: string };
+
+export type ArchiveHistoryContext =
+  | ArchiveSearchContext
+  | { conversationId: string };
+
+function contextFilter(context: ArchiveHistoryContext): Prisma.Sql {
+  if ("workspaceId" in context) {
+    return Prisma.sql`a."workspaceId" = ${context.workspaceId}`;
+  }
+  if ("projectId" in context) {
+    return Prisma.sql`a."projectId" = ${context.projectId}`;
+  }
+  if ("conversationId" in context) {
+    return Prisma.sql`a."conversationId" = ${context.conversationId}`;
+  }
+  return Prisma.sql`(
+    (a."senderId" = ${context.userId} AND a."receiverId" = ${context.receiverId})
+    OR (a."senderId" = ${context.receiverId} AND a."receiverId" = ${context.userId})
+  )`;
+}
+
+/**
+ * Archived messages matching `where` (on alias `a`), in the same shape as
+ * live chat messages, flagged `archived: true`
+ */
+async function queryArchive(
+  where: Prisma.Sql,
+  order: Prisma.Sql,
+  limit: number,
+) {
+  const rows = await prisma.$queryRaw<ArchivedMessageRow[]>(Prisma.sql`
+    SELECT a."id", a."content", a."workspaceId", a."projectId",
+           a."conversationId", a."senderId", a."receiverId", a."parentId",
+           a."isPinned", a."reactionCounts", a."createdAt", a."updatedAt",
+           u."name" AS "senderName", u."image" AS "senderImage",
+           (SELECT count(*)::int FROM "MessageArchive" r
+             WHERE r."parentId" = a."id") AS "replyCount"
+    FROM "MessageArchive" a
+    LEFT JOIN "User" u ON u."id" = a."senderId"
+    WHERE ${where}
+    ORDER BY ${order}
+    LIMIT ${limit}
+  `);
+
+  return rows.map(
+    ({ senderName, senderImage, replyCount, reactionCounts, ...message }) => ({
+      ...message,
+      sender: { id: message.senderId, name: senderName, image: senderImage },
+      reactions: summarizeReactions(reactionCounts),
+      _count: { replies: replyCount },
+      archived: true,
+    }),
+  );
+}
+
+/**
+ * Case-insensitive content search over archived messages, newest first.
+ * Returns the same shape as live chat messages, flagged `archived: true`.
+ */
+export async function searchArchivedMessages(
+  query: string,
+  context: ArchiveSearchContext,
+  limit: number,
+) {
+  if (limit <= 0) return [];
+
+  const pattern = `%${query.replace(/[\\%_]/g, "\\$&")}%`;
+  return queryArchive(
+    Prisma.sql`a."content" ILIKE ${pattern} AND ${contextFilter(context)}`,
+    Prisma.sql`a."createdAt" DESC`,
+    limit,
+  );
+}
+
+/**
+ * Top-level archived messages of a channel or DM sent before `before`,
+ * newest first: the continuation of a chat history page once the hot
+ * table runs out
+ */
+export async function listArchivedMessages(
+  context: ArchiveHistoryContext,
+  before: Date | undefined,
+  limit: number,
+) {
+  if (limit <= 0) return [];
+
+  const beforeFilter = before
+    ? Prisma.sql`AND a."createdAt" < ${before}`
+    : Prisma.empty;
+  return queryArchive(
+    Prisma.sql`${contextFilter(context)} AND a."parentId" IS NULL ${beforeFilter}`,
+    Prisma.sql`a."createdAt" DESC`,
+    limit,
+  );
+}
+
+/** Replies of an archived thread, oldest first */
+export async function listArchivedReplies(parentId: string) {
+  return queryArchive(
+    Prisma.sql`a."parentId" = ${parentId}`,
+    Prisma.sql`a."createdAt" ASC`,
+    ARCHIVE_THREAD_LIMIT,
+  );
+}
+
+/** Context of an archived message, for access checks */
+export async function findArchivedMessage(id: string) {
+  const [message] = await prisma.$queryRaw<
+    {
+      workspaceId: string | null;
+      projectId: string | null;
+      receiverId: string | null;
+      senderId: string;
+      conversationId: string | null;
+    }[]
+  >(Prisma.sql`
+    SELECT "workspaceId", "projectId", "receiverId", "senderId",
+           "conversationId"
+    FROM "MessageArchive"
+    WHERE id = ${id}
+    LIMIT 1
+  `);
+  return message ?? null;
+}
@@ -0,0 +1,216 @@
+/**
+ * Prometheus-style Metrics Registry
+ *
+ * Minimal counters, gauges and histograms rendered in the Prometheus text
+ * exposition format and served by server.ts on `/metrics`.
+ *
+ * Usage:
+ * ```typescript
+ * import { counter } from "@/lib/metrics";
+ *
+ * const rejections = counter("rate_limit_rejections_total", "Rejected requests");
+ * rejections.inc({ bucket: "chat" });
+ * ```
+ *
+ * The registry lives on globalThis so metrics recorded inside Next.js route
+ * bundles and in server.ts end up on the same endpoint.
+ */
+
+type Labels = Record<string, string>;
+
+// ============================================================================
+// METRIC TYPES
+// ============================================================================
+
+function labelKey(labels: Labels): string {
+  return Object.keys(labels)
+    .sort()
+    .map((key) => `${key}="${String(labels[key]).replace(/["\\\n]/g, "\\$&")}"`)
+    .join(",");
+}
+
+function formatSample(name: string, key: string, value: number): string {
+  return key ? `${name}{${key}} ${value}` : `${name} ${value}`;
+}
+
+abstract class Metric {
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    readonly type: "counter" | "gauge" | "histogram",
+  ) {}
+
+  protected header(): string[] {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+  }
+
+  abstract render(): string[];
+}
+
+export class Counter extends Metric {
+  private values = new Map<string, number>();
+
+  constructor(name: string, help: string) {
+    super(name, help, "counter");
+  }
+
+  inc(labels: Labels = {}, value = 1): void {
+    const key = labelKey(labels);
+    this.values.set(key, (this.values.get(key) ?? 0) + value);
+  }
+
+  render(): string[] {
+    return [
+      ...this.header(),
+      ...[...this.values].map(([key, value]) =>
+        formatSample(this.name, key, value),
+      ),
+    ];
+  }
+}
+
+export class Gauge extends Metric {
+  private values = new Map<string, number>();
+
+  constructor(name: string, help: string) {
+    super(name, help, "gauge");
+  }
+
+  set(labels: Labels, value: number): void {
+    this.values.set(labelKey(labels), value);
+  }
+
+  inc(labels: Labels = {}, value = 1): void {
+    const key = labelKey(labels);
+    this.values.set(key, (this.values.get(key) ?? 0) + value);
+  }
+
+  dec(labels: Labels = {}, value = 1): void {
+    this.inc(labels, -value);
+  }
+
+  render(): string[] {
+    return [
+      ...this.header(),
+      ...[...this.values].map(([key, value]) =>
+        formatSample(this.name, key, value),
+      ),
+    ];
+  }
+}
+
+// Seconds; covers fast cached reads up to slow report endpoints
+const DEFAULT_BUCKETS = [
+  0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+];
+
+export class Histogram extends Metric {
+  private series = new Map<
+    string,
+    { buckets: number[]; sum: number; count: number }
+  >();
+
+  constructor(
+    name: string,
+    help: string,
+    private readonly buckets = DEFAULT_BUCKETS,
+  ) {
+    super(name, help, "histogram");
+  }
+
+  observe(labels: Labels, value: number): void {
+    const key = labelKey(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { buckets: this.buckets.map(() => 0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+    this.buckets.forEach((bound, i) => {
+      if (value <= bound) series!.buckets[i]++;
+    });
+    series.sum += value;
+    series.count++;
+  }
+
+  render(): string[] {
+    const lines = this.header();
+    for (const [key, series] of this.series) {
+      const prefix = key ? `${key},` : "";
+      this.buckets.forEach((bound, i) => {
+        lines.push(
+          `${this.name}_bucket{${prefix}le="${bound}"} ${series.buckets[i]}`,
+        );
+      });
+      lines.push(`${this.name}_bucket{${prefix}le="+Inf"} ${series.count}`);
+      lines.push(formatSample(`${this.name}_sum`, key, series.sum));
+      lines.push(formatSample(`${this.name}_count`, key, series.count));
+    }
+    return lines;
+  }
+}
+
+// ============================================================================
+// REGISTRY
+// ============================================================================
+
+type Collector = () => void | string | Promise<void | string>;
+
+const globalForMetrics = globalThis as unknown as {
+  metricsRegistry: Map<string, Metric> | undefined;
+  metricsCollectors: Map<string, Collector> | undefined;
+};
+
+const registry = (globalForMetrics.metricsRegistry ??= new Map());
+const collectors = (globalForMetrics.metricsCollectors ??= new Map());
+
+function getOrCreate<T extends Metric>(name: string, create: () => T): T {
+  let metric = registry.get(name);
+  if (!metric) {
+    metric = create();
+    registry.set(name, metric);
+  }
+  return metric as T;
+}
+
+export function counter(name: string, help: string): Counter {
+  return getOrCreate(name, () => new Counter(name, help));
+}
+
+export function gauge(name: string, help: string): Gauge {
+  return getOrCreate(name, () => new Gauge(name, help));
+}
+
+export function histogram(
+  name: string,
+  help: string,
+  buckets?: number[],
+): Histogram {
+  return getOrCreate(name, () => new Histogram(name, help, buckets));
+}
+
+/**
+ * Register a callback run on every scrape. It can update gauges or return
+ * pre-rendered exposition text (e.g. Prisma's own metrics).
+ * Re-registering under the same name replaces the previous collector.
+ */
+export function registerCollector(name: string, collect: Collector): void {
+  collectors.set(name, collect);
+}
+
+/**
+ * Render every metric in the Prometheus text exposition format
+ */
+export async function renderMetrics(): Promise<string> {
+  const extra: string[] = [];
+  for (const [name, collect] of collectors) {
+    try {
+      const text = await collect();
+      if (text) extra.push(text.trim());
+    } catch (error) {
+      console.error(`[Metrics] Collector ${name} failed:`, error);
+    }
+  }
+
+  const lines = [...registry.values()].flatMap((metric) => metric.render());
+  return [...lines, ...extra].join("\n") + "\n";
+}
@@ -22,6 +22,14 @@
  */
 
 import { NextResponse } from "next/server";
+import { counter, gauge, registerCollector } from "@/lib/metrics";
+import { prisma } from "@/lib/prisma";
+import { getCurrentUser } from "@/lib/supabase/server";
+
+const rateLimitRejections = counter(
+  "rate_limit_rejections_total",
+  "Requests rejected by the rate limiter, by bucket",
+);
 
 // ============================================================================
 // RATE LIMIT STORAGE
@@ -36,19 +44,46 @@ interface RateLimitEntry {
 // In production, use Redis or Upstash for distributed rate limiting
 const rateLimitStore = new Map<string, RateLimitEntry>();
 
-// Cleanup old entries every 5 minutes
-setInterval(
-  () => {
-    const now = Date.now();
-    for (const [key, entry] of rateLimitStore.entries()) {
-      if (entry.resetAt < now) {
-        rateLimitStore.delete(key);
-      }
-    }
-  },
-  5 * 60 * 1000,
+const rateLimitStoreSize = gauge(
+  "rate_limit_store_entries",
+  "Identifiers tracked by the in-memory rate limiter",
+);
+registerCollector("rate-limit", () => {
+  rateLimitStoreSize.set({}, rateLimitStore.size);
+});
+
+// Upper bound between sweeps; a burst of one-off identifiers (IPs of a
+// crawler, anonymous clients) could otherwise grow the Map for minutes
+const MAX_STORE_ENTRIES = parseInt(
+  process.env.RATE_LIMIT_MAX_ENTRIES || "50000",
+  10,
 );
 
+function sweepExpired(now: number): void {
+  for (const [key, entry] of rateLimitStore.entries()) {
+    if (entry.resetAt < now) {
+      rateLimitStore.delete(key);
+    }
+  }
+}
+
+/**
+ * Make room for a new identifier. Entries are re-inserted when their window
+ * starts, so the Map's insertion order is oldest window first and evicting
+ * from the front drops the entries closest to expiring.
+ */
+function ensureCapacity(now: number): void {
+  if (rateLimitStore.size < MAX_STORE_ENTRIES) return;
+  sweepExpired(now);
+  for (const key of rateLimitStore.keys()) {
+    if (rateLimitStore.size < MAX_STORE_ENTRIES) break;
+    rateLimitStore.delete(key);
+  }
+}
+
+// Cleanup old entries every minute; unref'd so it never keeps a script alive
+setInterval(() => sweepExpired(Date.now()), 60 * 1000).unref();
+
 // ============================================================================
 // RATE LIMIT CONFIGURATIONS
 // ============================================================================
@@ -78,10 +113,11 @@ export const RATE_LIMITS = {
     window: 60 * 1000, // 10 uploads per minute
   },
 
-  // Search endpoints (prevent scraping)
+  // Search endpoints (prevent scraping). Palette typeahead sends one
+  // request per pause in typing; results come from memory, not Postgres
   search: {
-    requests: 20,
-    window: 60 * 1000, // 20 searches per minute
+    requests: 60,
+    window: 60 * 1000, // 60 searches per minute
   },
 
   // Comment/reaction endpoints
@@ -132,7 +168,6 @@ function getClientIdentifier(req: Request): string {
  */
 async function getUserIdentifier(req: Request): Promise<string> {
   try {
-    const { getCurrentUser } = await import("@/lib/supabase/server");
     const user = await getCurrentUser();
     if (user) {
       return `user:${user.id}`;
@@ -148,18 +183,26 @@ async function getUserIdentifier(req: Request): Promise<string> {
  * Core rate limiting logic using token bucket algorithm
  */
 function checkRateLimit(
+  bucket: keyof typeof RATE_LIMITS,
   identifier: string,
   limit: number,
   windowMs: number,
 ): RateLimitResult {
   const now = Date.now();
-  const key = identifier;
+  // Each bucket counts separately: chat requests must not use up the
+  // default budget, and the reverse
+  const key = `${bucket}:${identifier}`;
 
   const entry = rateLimitStore.get(key);
 
   if (!entry || entry.resetAt < now) {
     // No entry or expired - create new
     const resetAt = now + windowMs;
+    if (entry) {
+      rateLimitStore.delete(key);
+    } else {
+      ensureCapacity(now);
+    }
     rateLimitStore.set(key, {
       count: 1,
       resetAt,
@@ -181,6 +224,7 @@ function checkRateLimit(
   // Entry exists and is valid
   if (entry.count >= limit) {
     // Rate limit exceeded
+    rateLimitRejections.inc({ bucket });
     return {
       success: false,
       limit,
@@ -197,7 +241,6 @@ function checkRateLimit(
 
   // Increment counter
   entry.count++;
-  rateLimitStore.set(key, entry);
 
   return {
     success: true,
@@ -222,6 +265,7 @@ function checkRateLimit(
 export async function rateLimit(req: Request): Promise<RateLimitResult> {
   const identifier = await getUserIdentifier(req);
   return checkRateLimit(
+    "default",
     identifier,
     RATE_LIMITS.default.requests,
     RATE_LIMITS.default.window,
@@ -235,6 +279,7 @@ export async function rateLimit(req: Request): Promise<RateLimitResult> {
 export async function rateLimitAuth(req: Request): Promise<RateLimitResult> {
   const identifier = `ip:${getClientIdentifier(req)}`;
   return checkRateLimit(
+    "auth",
     identifier,
     RATE_LIMITS.auth.requests,
     RATE_LIMITS.auth.window,
@@ -248,6 +293,7 @@ export async function rateLimitAuth(req: Request): Promise<RateLimitResult> {
 export async function rateLimitChat(req: Request): Promise<RateLimitResult> {
   const identifier = await getUserIdentifier(req);
   return checkRateLimit(
+    "chat",
     identifier,
     RATE_LIMITS.chat.requests,
     RATE_LIMITS.chat.window,
@@ -261,6 +307,7 @@ export async function rateLimitChat(req: Request): Promise<RateLimitResult> {
 export async function rateLimitUpload(req: Request): Promise<RateLimitResult> {
   const identifier = await getUserIdentifier(req);
   return checkRateLimit(
+    "upload",
     identifier,
     RATE_LIMITS.upload.requests,
     RATE_LIMITS.upload.window,
@@ -268,12 +315,13 @@ export async function rateLimitUpload(req: Request): Promise<RateLimitResult> {
 }
 
 /**
- * Search rate limiter (20 searches/min per user)
- * Prevents scraping and database load
+ * Search rate limiter (60 searches/min per user)
+ * Prevents scraping
  */
 export async function rateLimitSearch(req: Request): Promise<RateLimitResult> {
   const identifier = await getUserIdentifier(req);
   return checkRateLimit(
+    "search",
     identifier,
     RATE_LIMITS.search.requests,
     RATE_LIMITS.search.window,
@@ -289,6 +337,7 @@ export async function rateLimitInteraction(
 ): Promise<RateLimitResult> {
   const identifier = await getUserIdentifier(req);
   return checkRateLimit(
+    "interaction",
     identifier,
     RATE_LIMITS.interaction.requests,
     RATE_LIMITS.interaction.window,
@@ -302,6 +351,7 @@ export async function rateLimitInteraction(
 export async function rateLimitStrict(req: Request): Promise<RateLimitResult> {
   const identifier = await getUserIdentifier(req);
   return checkRateLimit(
+    "strict",
     identifier,
     RATE_LIMITS.strict.requests,
     RATE_LIMITS.strict.window,
@@ -419,8 +469,6 @@ export function isSpamContent(content: string): boolean {
  * Stricter than rate limiting - checks last few messages
  */
 export async function checkBurstSpam(userId: string): Promise<boolean> {
-  const { prisma } = await import("@/lib/prisma");
-
   // Check if user sent more than 5 messages in last 10 seconds
   const recentMessages = await prisma.message.count({
     where: {
@@ -1,5 +1,6 @@
 import { prisma } from "./prisma";
 import { NotificationType } from "@prisma/client";
+import { enqueueJob, enqueueJobs } from "./jobs/queue";
 
 interface CreateNotificationParams {
   userId: string;
@@ -10,7 +11,8 @@ interface CreateNotificationParams {
 
 /**
  * Create a notification for a user
- * This function creates a notification in the database and can emit via Socket.io
+ * This function creates a notification in the database and queues the
+ * realtime broadcast for the background worker
  */
 export async function createNotification({
   userId,
@@ -28,12 +30,9 @@ export async function createNotification({
       },
     });
 
-    // Broadcast via Supabase Realtime
-    const { createClient } = await import("./supabase/server");
-    const supabase = await createClient();
-
-    await supabase.channel(`user:${userId}`).send({
-      type: "broadcast",
+    // Broadcast via Supabase Realtime (background job)
+    await enqueueJob("realtime.broadcast", {
+      channel: `user:${userId}`,
       event: "new-notification",
       payload: notification,
     });
@@ -45,6 +44,29 @@ export async function createNotification({
   }
 }
 
+/**
+ * Create many notifications with one insert and queue their realtime
+ * broadcasts with one more
+ */
+export async function createNotifications(params: CreateNotificationParams[]) {
+  if (params.length === 0) return [];
+
+  const notifications = await prisma.notification.createManyAndReturn({
+    data: params,
+  });
+
+  await enqueueJobs(
+    "realtime.broadcast",
+    notifications.map((notification) => ({
+      channel: `user:${notification.userId}`,
+      event: "new-notification",
+      payload: notification,
+    })),
+  );
+
+  return notifications;
+}
+
 /**
  * Create notification when a task is assigned
  */
@@ -63,6 +85,42 @@ export async function notifyTaskAssigned(
   });
 }
 
+/**
+ * Notify the assignees of a batch of tasks in one project: one
+ * notification per assignee, summarizing when they got several tasks
+ */
+export async function notifyTasksAssigned(
+  assignments: { assigneeId: string; taskId: string; taskTitle: string }[],
+  projectId: string,
+  projectName: string,
+  workspaceSlug: string,
+) {
+  const byAssignee = new Map<string, typeof assignments>();
+  for (const assignment of assignments) {
+    const list = byAssignee.get(assignment.assigneeId) ?? [];
+    list.push(assignment);
+    byAssignee.set(assignment.assigneeId, list);
+  }
+
+  return createNotifications(
+    [...byAssignee.entries()].map(([userId, tasks]) =>
+      tasks.length === 1
+        ? {
+            userId,
+            type: "TASK_ASSIGNED" as const,
+            content: `You have been assigned to task: ${tasks[0].taskTitle}`,
+            link: `/app/${workspaceSlug}/projects/${projectId}?task=${tasks[0].taskId}`,
+          }
+        : {
+            userId,
+            type: "TASK_ASSIGNED" as const,
+            content: `You have been assigned ${tasks.length} tasks in ${projectName}`,
+            link: `/app/${workspaceSlug}/projects/${projectId}`,
+          },
+    ),
+  );
+}
+
 /**
  * Create notification when mentioned in a comment
  */
@@ -1,16 +1,254 @@
 import { PrismaClient } from "@prisma/client";
+import {
+  recordQuery,
+  recordReadTarget,
+  runOutsideQueryMetrics,
+} from "@/lib/query-metrics";
+import { counter, gauge, registerCollector } from "@/lib/metrics";
+import {
+  REPLICA_LAG_CHECK_MS,
+  REPLICA_MAX_LAG_MS,
+  REPLICA_URLS,
+  isPrimarySticky,
+} from "@/lib/db-routing";
 
-const globalForPrisma = globalThis as unknown as {
-  prisma: PrismaClient | undefined;
-};
+// Replica unreachable, dropped the connection or ran out of pool slots
+const CONNECTION_ERROR_CODES = new Set([
+  "P1001",
+  "P1002",
+  "P1008",
+  "P1017",
+  "P2024",
+]);
+
+type ConnectionFallback = (
+  model: string,
+  operation: string,
+  args: unknown,
+  error: unknown,
+) => Promise<unknown>;
+
+function isConnectionError(error: unknown): boolean {
+  const code = (error as { code?: string } | null)?.code;
+  return (
+    (code !== undefined && CONNECTION_ERROR_CODES.has(code)) ||
+    (error as Error | null)?.name === "PrismaClientInitializationError"
+  );
+}
 
-export const prisma =
-  globalForPrisma.prisma ??
-  new PrismaClient({
+function createPrismaClient(
+  datasourceUrl?: string,
+  onConnectionError?: ConnectionFallback,
+) {
+  return new PrismaClient({
+    datasourceUrl,
     log:
       process.env.NODE_ENV === "development"
         ? ["query", "error", "warn"]
         : ["error"],
+  }).$extends({
+    query: {
+      // Report every operation to the per-request query metrics
+      async $allOperations({ model, operation, args, query }) {
+        const start = performance.now();
+        try {
+          return await query(args);
+        } catch (error) {
+          if (model && onConnectionError && isConnectionError(error)) {
+            return onConnectionError(model, operation, args, error);
+          }
+          throw error;
+        } finally {
+          recordQuery(model, operation, args, performance.now() - start);
+        }
+      },
+    },
+  });
+}
+
+type Database = ReturnType<typeof createPrismaClient>;
+
+interface Replica {
+  /** Position in DATABASE_REPLICA_URLS; used as the metrics label */
+  label: string;
+  client: Database;
+  /** Infinity until the first successful check or after a failure */
+  lagMs: number;
+  checkedAt: number;
+  checking: boolean;
+}
+
+const globalForPrisma = globalThis as unknown as {
+  prisma: Database | undefined;
+  prismaReplicas: Replica[] | undefined;
+};
+
+// Kept on globalThis in production too: server.ts (warmup) and the route
+// handlers Next.js bundles separately then share one client and its pool
+export const prisma = (globalForPrisma.prisma ??= createPrismaClient());
+
+// Connection pool usage and query timings from Prisma's own metrics
+registerCollector("prisma", () => prisma.$metrics.prometheus());
+
+// ============================================================================
+// READ REPLICAS
+// ============================================================================
+
+const readRouting = counter(
+  "db_read_routing_total",
+  "Read-only requests by database and routing reason",
+);
+const replicaLag = gauge(
+  "db_replica_lag_seconds",
+  "Replication lag per replica at the last check (-1 = unavailable)",
+);
+
+function markReplicaDown(replica: Replica, error: unknown): void {
+  replica.lagMs = Infinity;
+  replica.checkedAt = Date.now();
+  console.error(`[Prisma] Replica ${replica.label} unavailable:`, error);
+}
+
+function createReplica(url: string, index: number): Replica {
+  const replica: Replica = {
+    label: String(index),
+    lagMs: Infinity,
+    checkedAt: 0,
+    checking: false,
+    client: undefined as unknown as Database,
+  };
+
+  // Model reads that hit a dead replica are retried on the primary
+  replica.client = createPrismaClient(url, (model, operation, args, error) => {
+    markReplicaDown(replica, error);
+    readRouting.inc({ target: "primary", reason: "replica_error" });
+    const delegate = (prisma as unknown as Record<string, unknown>)[
+      model.charAt(0).toLowerCase() + model.slice(1)
+    ] as Record<string, (args: unknown) => Promise<unknown>>;
+    return delegate[operation](args);
+  });
+  return replica;
+}
+
+const replicas = (globalForPrisma.prismaReplicas ??=
+  REPLICA_URLS.map(createReplica));
+
+/**
+ * Sample a replica's replay lag. A replica that has replayed everything it
+ * received from a live WAL stream is current, however old its last replayed
+ * transaction is (an idle primary sends nothing new).
+ */
+async function checkReplica(replica: Replica): Promise<void> {
+  replica.checking = true;
+  try {
+    const [{ lagMs }] = await runOutsideQueryMetrics(() =>
+      replica.client.$queryRaw<[{ lagMs: number | null }]>`
+        SELECT (CASE
+          WHEN NOT pg_is_in_recovery() THEN 0
+          WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            AND EXISTS (
+              SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+            ) THEN 0
+          ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) * 1000
+        END)::float8 AS "lagMs"
+      `,
+    );
+    replica.lagMs = lagMs ?? Infinity;
+    replica.checkedAt = Date.now();
+  } catch (error) {
+    markReplicaDown(replica, error);
+  } finally {
+    replica.checking = false;
+  }
+}
+
+let nextReplica = 0;
+
+/**
+ * Round-robin over replicas within the lag limit. Lag is refreshed in the
+ * background, so a request never waits for a health check.
+ */
+function pickReplica(): Replica | undefined {
+  const now = Date.now();
+  for (const replica of replicas) {
+    if (!replica.checking && now - replica.checkedAt >= REPLICA_LAG_CHECK_MS) {
+      void checkReplica(replica);
+    }
+  }
+
+  const healthy = replicas.filter((r) => r.lagMs <= REPLICA_MAX_LAG_MS);
+  if (healthy.length === 0) return undefined;
+  return healthy[nextReplica++ % healthy.length];
+}
+
+/**
+ * Client for a read-only route handler.
+ *
+ * Returns a replica from DATABASE_REPLICA_URLS, or the primary when no
+ * replica is configured, none is within REPLICA_MAX_LAG_MS, or the client
+ * made its own mutation recently (read-your-writes, see middleware.ts).
+ * Use `prisma` for anything that writes.
+ */
+export function readPrisma(req: Request): Database {
+  if (replicas.length === 0) return prisma;
+
+  if (isPrimarySticky(req.headers.get("cookie"))) {
+    readRouting.inc({ target: "primary", reason: "sticky" });
+    recordReadTarget("primary");
+    return prisma;
+  }
+
+  const replica = pickReplica();
+  if (!replica) {
+    readRouting.inc({ target: "primary", reason: "lag" });
+    recordReadTarget("primary");
+    return prisma;
+  }
+
+  readRouting.inc({ target: "replica", reason: "read" });
+  recordReadTarget("replica");
+  return replica.client;
+}
+
+/**
+ * Client for bulk reads outside a request (workspace exports): a replica
+ * within REPLICA_MAX_LAG_MS when one is configured, so long scans stay off
+ * the primary, otherwise the primary
+ */
+export function bulkReadPrisma(): Database {
+  const replica = pickReplica();
+  readRouting.inc({
+    target: replica ? "replica" : "primary",
+    reason: "bulk",
+  });
+  return replica?.client ?? prisma;
+}
+
+if (replicas.length > 0) {
+  registerCollector("prisma_replicas", () => {
+    for (const replica of replicas) {
+      replicaLag.set(
+        { replica: replica.label },
+        Number.isFinite(replica.lagMs) ? replica.lagMs / 1000 : -1,
+      );
+    }
   });
+}
 
-if (process.env.NODE_ENV !== "production") globalForPrisma.prisma = prisma;
+/**
+ * Open database connections ahead of traffic (see lib/warmup.ts).
+ * `connections` overlapping queries make the primary's pool open that many
+ * connections; each replica is connected and its lag sampled so the first
+ * reads can be routed to it instead of falling back to the primary.
+ */
+export async function warmDatabase(connections = 1): Promise<void> {
+  await runOutsideQueryMetrics(() =>
+    Promise.all([
+      ...Array.from(
+        { length: connections },
+        () => prisma.$queryRaw`SELECT 1 FROM pg_sleep(0.05)`,
+      ),
+      ...replicas.map((replica) => checkReplica(replica)),
+    ]),
+  );
+}
@@ -0,0 +1,278 @@
+/**
+ * Per-Request Query Metrics
+ *
+ * Counts Prisma queries and DB time for each HTTP request and flags
+ * repeated identical query shapes (N+1 patterns).
+ *
+ * The request scope is opened in server.ts with `runWithQueryMetrics()`;
+ * lib/prisma.ts reports every query through `recordQuery()`. State lives on
+ * globalThis because server.ts and the Next.js route bundles load separate
+ * copies of this module.
+ */
+
+import { AsyncLocalStorage } from "async_hooks";
+
+// ============================================================================
+// CONFIGURATION
+// ============================================================================
+
+/**
+ * Enable debug headers and the metrics endpoint.
+ * On by default outside production, opt-in with QUERY_DEBUG=true.
+ */
+export const QUERY_DEBUG_ENABLED =
+  process.env.QUERY_DEBUG === "true" ||
+  (process.env.QUERY_DEBUG !== "false" &&
+    process.env.NODE_ENV !== "production");
+
+// Same query shape seen this many times in one request is flagged as N+1
+const N_PLUS_ONE_THRESHOLD = 3;
+
+export const QUERY_HEADERS = {
+  count: "X-Query-Count",
+  time: "X-Query-Time",
+  nPlusOne: "X-Query-N-Plus-One",
+  readTarget: "X-Query-Db",
+};
+
+// ============================================================================
+// STORAGE
+// ============================================================================
+
+export interface RequestQueryContext {
+  route: string;
+  count: number;
+  durationMs: number;
+  shapes: Map<string, number>;
+  /** Database that served the request's reads, when routed by readPrisma() */
+  readTarget?: "primary" | "replica";
+}
+
+interface RouteQueryStats {
+  requests: number;
+  queries: number;
+  maxQueries: number;
+  durationMs: number;
+  nPlusOneRequests: number;
+  nPlusOneShapes: Record<string, number>;
+  /** Calls per `Model.operation`, used to map database statistics to routes */
+  operations: Record<string, number>;
+}
+
+const globalForMetrics = globalThis as unknown as {
+  queryMetricsStorage: AsyncLocalStorage<RequestQueryContext> | undefined;
+  queryMetricsRoutes: Map<string, RouteQueryStats> | undefined;
+};
+
+const storage = (globalForMetrics.queryMetricsStorage ??=
+  new AsyncLocalStorage<RequestQueryContext>());
+const routeStats = (globalForMetrics.queryMetricsRoutes ??= new Map());
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+/**
+ * Reduce query arguments to their structure so that queries differing only
+ * in parameter values share a shape
+ */
+function shapeOf(value: unknown): unknown {
+  if (Array.isArray(value)) {
+    return value.length > 0 ? [shapeOf(value[0])] : [];
+  }
+  if (value && typeof value === "object" && !(value instanceof Date)) {
+    return Object.fromEntries(
+      Object.keys(value)
+        .sort()
+        .map((key) => [key, shapeOf((value as Record<string, unknown>)[key])]),
+    );
+  }
+  return "?";
+}
+
+/**
+ * Collapse IDs and workspace slugs in a URL path so requests are grouped
+ * per route, e.g. /api/tasks/clx.../subtasks -> /api/tasks/:id/subtasks
+ */
+export function normalizeRoute(method: string, url: string): string {
+  const segments = url.split("?")[0].split("/");
+  const normalized = segments
+    .map((segment, i) => {
+      if (
+        /^c[a-z0-9]{24}$/.test(segment) ||
+        /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i.test(
+          segment,
+        ) ||
+        /^\d+$/.test(segment)
+      ) {
+        return ":id";
+      }
+      // /api/workspaces/[slug]/...
+      if (segments[i - 1] === "workspaces" && segments[i - 2] === "api") {
+        return ":slug";
+      }
+      return segment;
+    })
+    .join("/");
+  return `${method} ${normalized}`;
+}
+
+function findNPlusOne(context: RequestQueryContext): string[] {
+  return [...context.shapes.entries()]
+    .filter(([, count]) => count >= N_PLUS_ONE_THRESHOLD)
+    .map(([shape]) => shape);
+}
+
+// ============================================================================
+// PUBLIC API
+// ============================================================================
+
+/**
+ * Run a request handler inside a query-metrics scope
+ */
+export function runWithQueryMetrics<T>(route: string, fn: () => T): T {
+  return storage.run(
+    { route, count: 0, durationMs: 0, shapes: new Map() },
+    fn,
+  );
+}
+
+/**
+ * Record one Prisma operation against the current request, if any
+ */
+export function recordQuery(
+  model: string | undefined,
+  operation: string,
+  args: unknown,
+  durationMs: number,
+): void {
+  const context = storage.getStore();
+  if (!context) return;
+
+  const shape = `${model ?? "$raw"}.${operation}(${JSON.stringify(shapeOf(args))})`;
+  context.count++;
+  context.durationMs += durationMs;
+  context.shapes.set(shape, (context.shapes.get(shape) ?? 0) + 1);
+}
+
+/**
+ * Record which database served the current request's reads
+ */
+export function recordReadTarget(target: "primary" | "replica"): void {
+  const context = storage.getStore();
+  if (context) context.readTarget = target;
+}
+
+/**
+ * Run background work (e.g. replica health checks) without charging its
+ * queries to the request that happened to trigger it
+ */
+export function runOutsideQueryMetrics<T>(fn: () => T): T {
+  return storage.exit(fn);
+}
+
+/**
+ * The active request scope, for callbacks that run outside its async context
+ * (e.g. response "finish" listeners)
+ */
+export function getQueryMetricsContext(): RequestQueryContext | undefined {
+  return storage.getStore();
+}
+
+/**
+ * Snapshot of a request's query metrics (defaults to the current request)
+ */
+export function getRequestQueryMetrics(context = storage.getStore()) {
+  if (!context) return null;
+
+  return {
+    route: context.route,
+    count: context.count,
+    durationMs: Math.round(context.durationMs * 10) / 10,
+    nPlusOne: findNPlusOne(context),
+    readTarget: context.readTarget,
+  };
+}
+
+/**
+ * Debug headers describing a request's queries
+ */
+export function getQueryMetricsHeaders(
+  context = storage.getStore(),
+): Record<string, string> {
+  const metrics = getRequestQueryMetrics(context);
+  if (!metrics) return {};
+
+  const headers: Record<string, string> = {
+    [QUERY_HEADERS.count]: String(metrics.count),
+    [QUERY_HEADERS.time]: String(metrics.durationMs),
+  };
+  if (metrics.nPlusOne.length > 0) {
+    headers[QUERY_HEADERS.nPlusOne] = String(metrics.nPlusOne.length);
+  }
+  if (metrics.readTarget) {
+    headers[QUERY_HEADERS.readTarget] = metrics.readTarget;
+  }
+  return headers;
+}
+
+/**
+ * Fold a request into the per-route totals.
+ * Called once per request when the response is finished.
+ */
+export function finishRequestQueryMetrics(context = storage.getStore()): void {
+  if (!context || context.count === 0) return;
+
+  let stats = routeStats.get(context.route);
+  if (!stats) {
+    stats = {
+      requests: 0,
+      queries: 0,
+      maxQueries: 0,
+      durationMs: 0,
+      nPlusOneRequests: 0,
+      nPlusOneShapes: {},
+      operations: {},
+    };
+    routeStats.set(context.route, stats);
+  }
+
+  stats.requests++;
+  stats.queries += context.count;
+  stats.maxQueries = Math.max(stats.maxQueries, context.count);
+  stats.durationMs += context.durationMs;
+
+  for (const [shape, count] of context.shapes) {
+    const operation = shape.slice(0, shape.indexOf("("));
+    stats.operations[operation] = (stats.operations[operation] ?? 0) + count;
+  }
+
+  const nPlusOne = findNPlusOne(context);
+  if (nPlusOne.length > 0) {
+    stats.nPlusOneRequests++;
+    for (const shape of nPlusOne) {
+      stats.nPlusOneShapes[shape] = Math.max(
+        stats.nPlusOneShapes[shape] ?? 0,
+        context.shapes.get(shape) ?? 0,
+      );
+    }
+  }
+}
+
+/**
+ * Per-route totals since startup (or the last reset)
+ */
+export function getRouteQueryStats() {
+  return [...routeStats.entries()]
+    .map(([route, stats]) => ({
+      route,
+      ...stats,
+      avgQueries: Math.round((stats.queries / stats.requests) * 10) / 10,
+      avgDurationMs: Math.round((stats.durationMs / stats.requests) * 10) / 10,
+    }))
+    .sort((a, b) => b.queries - a.queries);
+}
+
+export function resetRouteQueryStats(): void {
+  routeStats.clear();
+}
@@ -0,0 +1,144 @@
+/**
+ * Message Reaction Summaries
+ *
+ * Each message stores a denormalized `reactionCounts` map (emoji -> count)
+ * that is kept in step with the `Reaction` table by `toggleReaction`.
+ * Chat payloads carry only the summary; who reacted is loaded on demand
+ * from GET /api/messages/[id]/reactions.
+ */
+
+import { randomUUID } from "crypto";
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+
+export interface ReactionSummary {
+  emoji: string;
+  count: number;
+  reactedByMe: boolean;
+}
+
+type ReactionCounts = Record<string, number>;
+
+/**
+ * Convert a stored counts map into the client-facing summary
+ */
+export function summarizeReactions(
+  counts: Prisma.JsonValue | null | undefined,
+  myEmojis: Iterable<string> = [],
+): ReactionSummary[] {
+  const mine = new Set(myEmojis);
+  return Object.entries((counts ?? {}) as ReactionCounts)
+    .filter(([, count]) => count > 0)
+    .map(([emoji, count]) => ({ emoji, count, reactedByMe: mine.has(emoji) }));
+}
+
+/**
+ * Replace `reactionCounts` on each message with a `reactions` summary,
+ * flagging the emojis the current user reacted with (one query per page)
+ */
+export async function withReactionSummaries<
+  T extends { id: string; reactionCounts: Prisma.JsonValue },
+>(messages: T[], userId: string) {
+  const withReactions = messages.filter(
+    (m) => Object.keys((m.reactionCounts ?? {}) as ReactionCounts).length > 0,
+  );
+
+  const mine = new Map<string, string[]>();
+  if (withReactions.length > 0) {
+    const rows = await prisma.reaction.findMany({
+      where: { userId, messageId: { in: withReactions.map((m) => m.id) } },
+      select: { messageId: true, emoji: true },
+    });
+    for (const row of rows) {
+      mine.set(row.messageId, [...(mine.get(row.messageId) ?? []), row.emoji]);
+    }
+  }
+
+  return messages.map(({ reactionCounts, ...message }) => ({
+    ...message,
+    reactions: summarizeReactions(reactionCounts, mine.get(message.id)),
+  }));
+}
+
+/**
+ * Drop the raw counts from a message sent to many users (e.g. broadcasts);
+ * receivers keep their own `reactions` summary
+ */
+export function withoutReactionCounts<T extends { reactionCounts?: unknown }>(
+  message: T,
+): Omit<T, "reactionCounts"> {
+  const copy = { ...message };
+  delete copy.reactionCounts;
+  return copy;
+}
+
+interface ToggleResult {
+  action: "added" | "removed";
+  count: number;
+  message: {
+    parentId: string | null;
+    workspaceId: string | null;
+    projectId: string | null;
+    conversationId: string | null;
+    receiverId: string | null;
+    senderId: string;
+  };
+}
+
+/**
+ * Add the reaction if absent, remove it if present, and adjust the
+ * message's count in the same statement. Returns null if the message
+ * does not exist.
+ */
+export async function toggleReaction(
+  messageId: string,
+  userId: string,
+  emoji: string,
+): Promise<ToggleResult | null> {
+  const rows = await prisma.$queryRaw<
+    (ToggleResult["message"] & { removed: number; count: number })[]
+  >(Prisma.sql`
+    WITH removed AS (
+      DELETE FROM "Reaction"
+      WHERE "messageId" = ${messageId} AND "userId" = ${userId} AND emoji = ${emoji}
+      RETURNING id
+    ),
+    added AS (
+      INSERT INTO "Reaction" (id, emoji, "messageId", "userId")
+      SELECT ${randomUUID()}, ${emoji}, ${messageId}, ${userId}
+      WHERE NOT EXISTS (SELECT 1 FROM removed)
+        AND EXISTS (SELECT 1 FROM "Message" WHERE id = ${messageId})
+      ON CONFLICT ("messageId", "userId", emoji) DO NOTHING
+      RETURNING id
+    ),
+    delta AS (
+      SELECT (SELECT count(*) FROM added)::int AS added,
+             (SELECT count(*) FROM removed)::int AS removed
+    ),
+    updated AS (
+      UPDATE "Message" m
+      SET "reactionCounts" = CASE
+        WHEN COALESCE((m."reactionCounts" ->> ${emoji}::text)::int, 0) + d.added - d.removed <= 0
+          THEN m."reactionCounts" - ${emoji}::text
+        ELSE jsonb_set(
+          m."reactionCounts",
+          ARRAY[${emoji}::text],
+          to_jsonb(COALESCE((m."reactionCounts" ->> ${emoji}::text)::int, 0) + d.added - d.removed)
+        )
+      END
+      FROM delta d
+      WHERE m.id = ${messageId}
+      RETURNING m."parentId", m."workspaceId", m."projectId",
+                m."conversationId", m."receiverId", m."senderId",
+                COALESCE((m."reactionCounts" ->> ${emoji}::text)::int, 0) AS count
+    )
+    SELECT u.*, d.removed FROM updated u, delta d
+  `);
+
+  const row = rows[0];
+  if (!row) return null;
+
+  // A concurrent duplicate insert (ON CONFLICT) still leaves the reaction in place
+  const { removed, count, ...message } = row;
+  return { action: removed > 0 ? "removed" : "added", count, message };
+}
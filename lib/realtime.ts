@@ -0,0 +1,36 @@
+/**
+ * Realtime Channel Naming
+ *
+ * Single source of truth for the Supabase Realtime channel a message's
+ * events are broadcast on. Must match `channelName` in chat-pane.tsx.
+ */
+
+interface MessageContext {
+  parentId?: string | null;
+  workspaceId?: string | null;
+  projectId?: string | null;
+  conversationId?: string | null;
+  receiverId?: string | null;
+  senderId: string;
+}
+
+/**
+ * Channel for events about a message (thread replies go to the thread)
+ */
+export function getMessageChannel(message: MessageContext): string | null {
+  if (message.parentId) return `thread:${message.parentId}`;
+  return getContextChannel(message);
+}
+
+/**
+ * Channel of the conversation a message lives in, ignoring threads
+ */
+export function getContextChannel(message: MessageContext): string | null {
+  if (message.workspaceId) return `workspace:${message.workspaceId}`;
+  if (message.projectId) return `project:${message.projectId}`;
+  if (message.conversationId) return `conversation:${message.conversationId}`;
+  if (message.receiverId) {
+    return `dm:${[message.senderId, message.receiverId].sort().join(":")}`;
+  }
+  return null;
+}
@@ -0,0 +1,619 @@
+/**
+ * Command-Palette Search Index
+ *
+ * The palette (components/search/global-search-modal.tsx) searches on
+ * every pause in typing, so a 10-character query used to cost up to nine
+ * rounds of ILIKE scans over tasks, projects, files and messages. Instead,
+ * each server keeps an in-memory index per workspace:
+ *
+ * - documents: task titles, project names, file names and the most recent
+ *   SEARCH_INDEX_MESSAGES project messages
+ * - a trigram index (trigram -> document keys) narrows a query to the
+ *   documents containing all of its trigrams; candidates are confirmed with
+ *   a substring check, so matching is the same as the old `contains`.
+ *   Two-character queries scan the documents directly.
+ * - workspace members (by Supabase user ID) and the projects each belongs
+ *   to, for the access check: like the chat and task routes, a user only
+ *   sees documents of their own projects. Access is trusted for
+ *   SEARCH_MEMBER_TTL_MS, then read from the database again, so a removal
+ *   made anywhere takes effect within that window. The project member
+ *   routes call `refreshSearchMember` to apply their change at once.
+ *
+ * An index is built on the first search in a workspace. Routes that create,
+ * rename or delete tasks, projects, files and messages report the change
+ * with `indexSearchDocs` / `removeSearchDocs`, so this server's index stays
+ * current. Changes made on other servers show up when the index is rebuilt
+ * in the background after SEARCH_INDEX_TTL_MS. Changes reported while a
+ * build is loading are recorded and replayed onto the new index before it
+ * replaces the old one, so they are not lost with the old index. Results
+ * are cached for SEARCH_CACHE_TTL_MS per (workspace, index version,
+ * project set, query); any change to an index bumps its version.
+ */
+
+import { prisma } from "@/lib/prisma";
+import { logEvent } from "@/lib/logger";
+
+export type SearchDocType = "TASK" | "PROJECT" | "FILE" | "MESSAGE";
+
+export type SearchDocInput =
+  | {
+      type: "TASK" | "FILE" | "MESSAGE";
+      id: string;
+      text: string;
+      projectId: string;
+      /** Message sender's name */
+      sender?: string | null;
+    }
+  | { type: "PROJECT"; id: string; text: string; workspaceId: string };
+
+export interface SearchResult {
+  id: string;
+  type: SearchDocType;
+  title: string;
+  subtitle: string;
+  url: string;
+}
+
+interface IndexedDoc {
+  type: SearchDocType;
+  id: string;
+  text: string;
+  /** Lowercased, truncated text that is matched against */
+  normalized: string;
+  projectId: string;
+  sender?: string | null;
+  /** Insertion order; later documents rank first among equal matches */
+  seq: number;
+}
+
+/** Applies one mutation to an index; true when the index changed */
+type IndexEvent = (index: WorkspaceIndex) => boolean;
+
+interface MemberAccess {
+  projectIds: Set<string>;
+  /** Sorted project IDs; users with the same projects share cached results */
+  key: string;
+  checkedAt: number;
+}
+
+interface WorkspaceIndex {
+  workspaceId: string;
+  slug: string;
+  builtAt: number;
+  lastUsed: number;
+  version: number;
+  seq: number;
+  /** Supabase user ID -> the user's projects, when last read */
+  members: Map<string, MemberAccess>;
+  projects: Map<string, string>;
+  docs: Map<string, IndexedDoc>;
+  trigrams: Map<string, Set<string>>;
+  /** Message keys, oldest first, for evicting beyond the cap */
+  messageKeys: string[];
+}
+
+const INDEX_TTL_MS = parseInt(process.env.SEARCH_INDEX_TTL_MS || "300000", 10);
+const CACHE_TTL_MS = parseInt(process.env.SEARCH_CACHE_TTL_MS || "30000", 10);
+const MAX_MESSAGES = parseInt(process.env.SEARCH_INDEX_MESSAGES || "500", 10);
+const MEMBER_TTL_MS = parseInt(
+  process.env.SEARCH_MEMBER_TTL_MS || "60000",
+  10,
+);
+const MAX_WORKSPACES = 100;
+const MAX_CACHED_QUERIES = 5000;
+// Long messages are matched on their beginning only
+const MAX_INDEXED_CHARS = 200;
+
+// Results per type, in the order they are listed
+const LIMITS: [SearchDocType, number][] = [
+  ["TASK", 5],
+  ["PROJECT", 3],
+  ["FILE", 3],
+  ["MESSAGE", 5],
+];
+
+// Shared by all route bundles, like the metrics registry
+const globalForSearch = globalThis as unknown as {
+  searchIndexes: Map<string, WorkspaceIndex> | undefined;
+  searchIndexBuilds: Map<string, Promise<WorkspaceIndex | null>> | undefined;
+  searchWorkspaceIds: Map<string, string> | undefined;
+  searchBuildLogs: Set<IndexEvent[]> | undefined;
+  searchResultCache:
+    | Map<string, { at: number; results: SearchResult[] }>
+    | undefined;
+};
+
+const indexes = (globalForSearch.searchIndexes ??= new Map());
+const builds = (globalForSearch.searchIndexBuilds ??= new Map());
+// slug -> workspace ID, for loaded indexes
+const workspaceIds = (globalForSearch.searchWorkspaceIds ??= new Map());
+// Mutation events reported during each build in flight, to replay on it
+const buildLogs = (globalForSearch.searchBuildLogs ??= new Set());
+const resultCache = (globalForSearch.searchResultCache ??= new Map());
+
+// ============================================================================
+// INDEXING
+// ============================================================================
+
+function normalize(text: string): string {
+  return text.slice(0, MAX_INDEXED_CHARS).toLowerCase();
+}
+
+function trigramsOf(text: string): Set<string> {
+  const grams = new Set<string>();
+  for (let i = 0; i + 3 <= text.length; i++) {
+    grams.add(text.slice(i, i + 3));
+  }
+  return grams;
+}
+
+function docKey(type: SearchDocType, id: string): string {
+  return `${type}:${id}`;
+}
+
+function removeDoc(index: WorkspaceIndex, key: string): boolean {
+  const doc = index.docs.get(key);
+  if (!doc) return false;
+  for (const gram of trigramsOf(doc.normalized)) {
+    const keys = index.trigrams.get(gram);
+    keys?.delete(key);
+    if (keys?.size === 0) index.trigrams.delete(gram);
+  }
+  index.docs.delete(key);
+  return true;
+}
+
+function addDoc(
+  index: WorkspaceIndex,
+  doc: Omit<IndexedDoc, "normalized" | "seq">,
+): void {
+  const key = docKey(doc.type, doc.id);
+  if (removeDoc(index, key) && doc.type === "MESSAGE") {
+    index.messageKeys = index.messageKeys.filter((k) => k !== key);
+  }
+
+  const normalized = normalize(doc.text);
+  index.docs.set(key, { ...doc, normalized, seq: ++index.seq });
+  for (const gram of trigramsOf(normalized)) {
+    let keys = index.trigrams.get(gram);
+    if (!keys) {
+      keys = new Set();
+      index.trigrams.set(gram, keys);
+    }
+    keys.add(key);
+  }
+
+  if (doc.type === "MESSAGE") {
+    index.messageKeys.push(key);
+    while (index.messageKeys.length > MAX_MESSAGES) {
+      removeDoc(index, index.messageKeys.shift() as string);
+    }
+  }
+}
+
+async function loadIndex(slug: string): Promise<WorkspaceIndex | null> {
+  const workspace = await prisma.workspace.findUnique({
+    where: { slug },
+    select: {
+      id: true,
+      members: {
+        select: {
+          user: {
+            select: {
+              supabaseId: true,
+              projectMemberships: {
+                where: { project: { workspace: { slug } } },
+                select: { projectId: true },
+              },
+            },
+          },
+        },
+      },
+      projects: { select: { id: true, name: true } },
+    },
+  });
+  if (!workspace) return null;
+
+  const inWorkspace = { project: { workspaceId: workspace.id } };
+  const [tasks, files, messages] = await Promise.all([
+    prisma.task.findMany({
+      where: inWorkspace,
+      select: { id: true, title: true, projectId: true },
+      orderBy: { updatedAt: "asc" },
+    }),
+    prisma.file.findMany({
+      where: inWorkspace,
+      select: { id: true, originalName: true, projectId: true },
+      orderBy: { createdAt: "asc" },
+    }),
+    prisma.message.findMany({
+      where: inWorkspace,
+      select: {
+        id: true,
+        content: true,
+        projectId: true,
+        sender: { select: { name: true } },
+      },
+      orderBy: { createdAt: "desc" },
+      take: MAX_MESSAGES,
+    }),
+  ]);
+
+  const builtAt = Date.now();
+  const index: WorkspaceIndex = {
+    workspaceId: workspace.id,
+    slug,
+    builtAt,
+    lastUsed: builtAt,
+    version: 0,
+    seq: 0,
+    members: new Map(
+      workspace.members
+        .filter(({ user }) => !!user.supabaseId)
+        .map(({ user }) => [
+          user.supabaseId as string,
+          memberAccess(user.projectMemberships, builtAt),
+        ]),
+    ),
+    projects: new Map(workspace.projects.map((p) => [p.id, p.name])),
+    docs: new Map(),
+    trigrams: new Map(),
+    messageKeys: [],
+  };
+
+  for (const project of workspace.projects) {
+    addDoc(index, {
+      type: "PROJECT",
+      id: project.id,
+      text: project.name,
+      projectId: project.id,
+    });
+  }
+  for (const task of tasks) {
+    addDoc(index, {
+      type: "TASK",
+      id: task.id,
+      text: task.title,
+      projectId: task.projectId,
+    });
+  }
+  for (const file of files) {
+    addDoc(index, {
+      type: "FILE",
+      id: file.id,
+      text: file.originalName,
+      projectId: file.projectId,
+    });
+  }
+  for (const message of messages.reverse()) {
+    addDoc(index, {
+      type: "MESSAGE",
+      id: message.id,
+      text: message.content,
+      projectId: message.projectId as string,
+      sender: message.sender.name,
+    });
+  }
+  return index;
+}
+
+function install(index: WorkspaceIndex): void {
+  const previous = indexes.get(index.workspaceId);
+  if (previous) index.version = previous.version + 1;
+  indexes.set(index.workspaceId, index);
+  workspaceIds.set(index.slug, index.workspaceId);
+
+  // Keep the most recently used workspaces
+  if (indexes.size > MAX_WORKSPACES) {
+    const oldest = [...indexes.values()].sort(
+      (a, b) => a.lastUsed - b.lastUsed,
+    )[0];
+    indexes.delete(oldest.workspaceId);
+    workspaceIds.delete(oldest.slug);
+  }
+}
+
+/**
+ * Build (or rebuild) a workspace's index; concurrent callers share one
+ * build
+ */
+function buildIndex(slug: string): Promise<WorkspaceIndex | null> {
+  let build = builds.get(slug);
+  if (!build) {
+    const start = performance.now();
+    const log: IndexEvent[] = [];
+    buildLogs.add(log);
+    build = loadIndex(slug)
+      .then((index) => {
+        if (index) {
+          // Changes reported while the build was reading the database
+          for (const event of log) event(index);
+          install(index);
+          logEvent("search.index_built", {
+            workspaceId: index.workspaceId,
+            docs: index.docs.size,
+            ms: Math.round(performance.now() - start),
+          });
+        }
+        return index;
+      })
+      .finally(() => {
+        buildLogs.delete(log);
+        builds.delete(slug);
+      });
+    builds.set(slug, build);
+  }
+  return build;
+}
+
+async function getIndex(slug: string): Promise<WorkspaceIndex | null> {
+  const workspaceId = workspaceIds.get(slug);
+  const index = workspaceId ? indexes.get(workspaceId) : undefined;
+  if (!index) return buildIndex(slug);
+
+  // Serve the current index while a stale one is rebuilt
+  if (Date.now() - index.builtAt > INDEX_TTL_MS) {
+    buildIndex(slug).catch((error) =>
+      logEvent(
+        "search.index_build_failed",
+        { workspaceId: index.workspaceId, error: String(error) },
+        { level: "warn" },
+      ),
+    );
+  }
+  return index;
+}
+
+// ============================================================================
+// MUTATION EVENTS
+// ============================================================================
+
+/**
+ * Apply `event` to every loaded index, and record it for the builds in
+ * flight
+ */
+function applyEvent(event: IndexEvent): void {
+  for (const index of indexes.values()) {
+    if (event(index)) index.version++;
+  }
+  for (const log of buildLogs) log.push(event);
+}
+
+function docEvent(doc: SearchDocInput): IndexEvent {
+  return (index) => {
+    if (doc.type === "PROJECT") {
+      if (doc.workspaceId !== index.workspaceId) return false;
+      index.projects.set(doc.id, doc.text);
+      addDoc(index, {
+        type: "PROJECT",
+        id: doc.id,
+        text: doc.text,
+        projectId: doc.id,
+      });
+      return true;
+    }
+    if (!index.projects.has(doc.projectId)) {
+      // A task moved to another workspace leaves its old index
+      return removeDocs(index, doc.type, [doc.id]);
+    }
+    addDoc(index, doc);
+    return true;
+  };
+}
+
+function removeDocs(
+  index: WorkspaceIndex,
+  type: SearchDocType,
+  ids: string[],
+): boolean {
+  let changed = false;
+  for (const id of ids) {
+    changed = removeDoc(index, docKey(type, id)) || changed;
+  }
+  if (changed && type === "MESSAGE") {
+    index.messageKeys = index.messageKeys.filter((key) =>
+      index.docs.has(key),
+    );
+  }
+  return changed;
+}
+
+/**
+ * Add or replace documents after a create or rename. Documents of
+ * workspaces without a loaded index are ignored; the index picks them up
+ * when it is built.
+ */
+export function indexSearchDocs(docs: SearchDocInput[]): void {
+  for (const doc of docs) applyEvent(docEvent(doc));
+}
+
+/**
+ * Drop deleted documents
+ */
+export function removeSearchDocs(type: SearchDocType, ids: string[]): void {
+  applyEvent((index) => removeDocs(index, type, ids));
+}
+
+/**
+ * Read a user's access again on their next search, after they joined or
+ * left a project, instead of after SEARCH_MEMBER_TTL_MS
+ */
+export function refreshSearchMember(supabaseUserId: string | null): void {
+  if (!supabaseUserId) return;
+  applyEvent((index) => {
+    index.members.delete(supabaseUserId);
+    // Documents are unchanged, so the version stays
+    return false;
+  });
+}
+
+// ============================================================================
+// SEARCH
+// ============================================================================
+
+function candidates(index: WorkspaceIndex, query: string): Iterable<string> {
+  if (query.length < 3) return index.docs.keys();
+
+  const postings: Set<string>[] = [];
+  for (const gram of trigramsOf(query)) {
+    const keys = index.trigrams.get(gram);
+    if (!keys) return [];
+    postings.push(keys);
+  }
+  postings.sort((a, b) => a.size - b.size);
+  const [smallest, ...rest] = postings;
+  return [...smallest].filter((key) => rest.every((keys) => keys.has(key)));
+}
+
+/** 0: text starts with the query, 1: a word does, 2: anywhere else */
+function matchRank(text: string, query: string): number {
+  const at = text.indexOf(query);
+  if (at === 0) return 0;
+  if (/[^\p{L}\p{N}]/u.test(text[at - 1]) || text.includes(` ${query}`)) {
+    return 1;
+  }
+  return 2;
+}
+
+function toResult(index: WorkspaceIndex, doc: IndexedDoc): SearchResult {
+  const base = `/app/${index.slug}`;
+  const projectName = index.projects.get(doc.projectId) ?? "";
+  switch (doc.type) {
+    case "TASK":
+      return {
+        id: doc.id,
+        type: doc.type,
+        title: doc.text,
+        subtitle: `in ${projectName}`,
+        url: `${base}/projects/${doc.projectId}?task=${doc.id}`,
+      };
+    case "PROJECT":
+      return {
+        id: doc.id,
+        type: doc.type,
+        title: doc.text,
+        subtitle: "Project",
+        url: `${base}/projects/${doc.id}`,
+      };
+    case "FILE":
+      return {
+        id: doc.id,
+        type: doc.type,
+        title: doc.text,
+        subtitle: `File in ${projectName}`,
+        url: `${base}/files`,
+      };
+    case "MESSAGE":
+      return {
+        id: doc.id,
+        type: doc.type,
+        title: doc.text.substring(0, 50) + (doc.text.length > 50 ? "..." : ""),
+        subtitle: `from ${doc.sender || "User"} in ${projectName}`,
+        url: `${base}/chat?channel=${doc.projectId}`,
+      };
+  }
+}
+
+function searchIndex(
+  index: WorkspaceIndex,
+  query: string,
+  projectIds: Set<string>,
+): SearchResult[] {
+  const matches = new Map<SearchDocType, { doc: IndexedDoc; rank: number }[]>();
+  for (const key of candidates(index, query)) {
+    const doc = index.docs.get(key);
+    if (!doc || !projectIds.has(doc.projectId)) continue;
+    if (!doc.normalized.includes(query)) continue;
+    const list = matches.get(doc.type) ?? [];
+    list.push({ doc, rank: matchRank(doc.normalized, query) });
+    matches.set(doc.type, list);
+  }
+
+  return LIMITS.flatMap(([type, limit]) =>
+    (matches.get(type) ?? [])
+      .sort((a, b) => a.rank - b.rank || b.doc.seq - a.doc.seq)
+      .slice(0, limit)
+      .map(({ doc }) => toResult(index, doc)),
+  );
+}
+
+function memberAccess(
+  memberships: { projectId: string }[],
+  checkedAt: number,
+): MemberAccess {
+  const projectIds = memberships.map((m) => m.projectId).sort();
+  return {
+    projectIds: new Set(projectIds),
+    key: projectIds.join(","),
+    checkedAt,
+  };
+}
+
+/**
+ * The user's projects in the index's workspace, or null when they are not
+ * a workspace member
+ */
+async function getAccess(
+  index: WorkspaceIndex,
+  supabaseUserId: string,
+): Promise<MemberAccess | null> {
+  const cached = index.members.get(supabaseUserId);
+  if (cached && Date.now() - cached.checkedAt < MEMBER_TTL_MS) return cached;
+
+  // Joined after the index was built, or not read recently
+  const user = await prisma.user.findUnique({
+    where: { supabaseId: supabaseUserId },
+    select: {
+      workspaces: {
+        where: { workspaceId: index.workspaceId },
+        select: { id: true },
+      },
+      projectMemberships: {
+        where: { project: { workspaceId: index.workspaceId } },
+        select: { projectId: true },
+      },
+    },
+  });
+  if (!user || user.workspaces.length === 0) {
+    index.members.delete(supabaseUserId);
+    return null;
+  }
+  const access = memberAccess(user.projectMemberships, Date.now());
+  index.members.set(supabaseUserId, access);
+  return access;
+}
+
+/**
+ * Palette results for `query` in the workspace `slug`, or null when the
+ * workspace does not exist or the user is not a member
+ */
+export async function searchWorkspace(
+  slug: string,
+  supabaseUserId: string,
+  query: string,
+): Promise<SearchResult[] | null> {
+  const index = await getIndex(slug);
+  if (!index) return null;
+  const access = await getAccess(index, supabaseUserId);
+  if (!access) return null;
+  index.lastUsed = Date.now();
+
+  const normalized = normalize(query.trim());
+  const key = [index.workspaceId, index.version, access.key, normalized].join(
+    ":",
+  );
+  const cached = resultCache.get(key);
+  if (cached && Date.now() - cached.at < CACHE_TTL_MS) {
+    return cached.results;
+  }
+
+  const results = searchIndex(index, normalized, access.projectIds);
+  resultCache.delete(key);
+  resultCache.set(key, { at: Date.now(), results });
+  // Map order is insertion order: drop the oldest entries
+  for (const oldest of resultCache.keys()) {
+    if (resultCache.size <= MAX_CACHED_QUERIES) break;
+    resultCache.delete(oldest);
+  }
+  return results;
+}
@@ -1,4 +1,5 @@
 import { createClient } from "./supabase/server";
+import { getAdminClient } from "./supabase/admin";
 
 const BUCKET_NAME = process.env.SUPABASE_BUCKET_NAME || "colab-task-manager";
 
@@ -41,3 +42,50 @@ export async function getDownloadUrl(key: string) {
   if (error) throw error;
   return data.signedUrl;
 }
+
+// ============================================================================
+// SERVICE ROLE ACCESS
+// ============================================================================
+// For code running outside a user session (the job worker) and for routes
+// that have already authorized the caller, e.g. workspace export downloads.
+
+function serviceHeaders(): Record<string, string> {
+  const key = process.env.SUPABASE_SERVICE_ROLE_KEY || "";
+  return { apikey: key, Authorization: `Bearer ${key}` };
+}
+
+function objectUrl(key: string): string {
+  const base = `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/object`;
+  const path = key.split("/").map(encodeURIComponent).join("/");
+  return `${base}/authenticated/${BUCKET_NAME}/${path}`;
+}
+
+export async function uploadObject(
+  key: string,
+  body: Buffer,
+  contentType = "application/octet-stream",
+) {
+  const { error } = await getAdminClient()
+    .storage.from(BUCKET_NAME)
+    .upload(key, body, { upsert: true, contentType });
+  if (error) throw error;
+}
+
+/**
+ * Open an object for streaming, optionally a byte range of it
+ * (`bytes=0-1023`). Resolves to null when the object does not exist.
+ */
+export async function fetchObject(
+  key: string,
+  range?: string,
+): Promise<Response | null> {
+  const res = await fetch(objectUrl(key), {
+    headers: { ...serviceHeaders(), ...(range ? { Range: range } : {}) },
+  });
+  if (res.ok) return res;
+
+  // Missing objects are reported as 404, or as 400 with a not_found body
+  const text = await res.text();
+  if (res.status === 404 || /not.?found/i.test(text)) return null;
+  throw new Error(`Storage returned ${res.status} for ${key}: ${text}`);
+}
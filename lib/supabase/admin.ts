@@ -0,0 +1,36 @@
+import { createClient } from "@supabase/supabase-js";
+import { gauge, registerCollector } from "@/lib/metrics";
+
+let adminClient: ReturnType<typeof createClient> | undefined;
+
+/**
+ * Cookie-less Supabase client for code running outside a request
+ * (the background job worker). Uses the service role key when available.
+ */
+export function getAdminClient() {
+  if (!adminClient) {
+    adminClient = createClient(
+      process.env.NEXT_PUBLIC_SUPABASE_URL!,
+      process.env.SUPABASE_SERVICE_ROLE_KEY ||
+        process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!,
+      {
+        auth: {
+          autoRefreshToken: false,
+          persistSession: false,
+          detectSessionInUrl: false,
+        },
+      },
+    );
+  }
+  return adminClient;
+}
+
+// Channels are removed after each broadcast batch (lib/jobs/handlers.ts);
+// a count that only grows means a code path forgot removeChannel
+const realtimeChannels = gauge(
+  "realtime_channels",
+  "Supabase Realtime channels held by the admin client",
+);
+registerCollector("supabase-admin", () => {
+  realtimeChannels.set({}, adminClient?.getChannels().length ?? 0);
+});
@@ -1,6 +1,7 @@
 import { createServerClient } from "@supabase/ssr";
 import { cookies, headers } from "next/headers";
 import { cache } from "react";
+import { prisma } from "@/lib/prisma";
 
 export const createClient = cache(async () => {
   const cookieStore = await cookies();
@@ -60,8 +61,6 @@ export const getCurrentUser = cache(async () => {
     return null;
   }
 
-  const { prisma } = await import("@/lib/prisma");
-
   // 1. Try finding by supabaseId first
   let user = await prisma.user.findUnique({
     where: { supabaseId: supabaseUser.id },
@@ -0,0 +1,529 @@
+/**
+ * Batch Task Writes
+ *
+ * Create, update and delete many tasks of one project with a handful of
+ * statements, instead of one request per task, each with its own
+ * rate-limit slot, membership check, activity insert and notification.
+ * The batch endpoint and the CSV / NDJSON import both use these functions;
+ * imports feed rows through createTasks in chunks of TASK_BATCH_SIZE.
+ *
+ * Rows are validated one by one and every input row gets a result, so an
+ * invalid row does not fail the rest of the batch. Realtime is told once
+ * per batch (announceTaskChanges) rather than once per task.
+ */
+
+import { Prisma, type TaskStatus } from "@prisma/client";
+import { z } from "zod";
+import { prisma } from "@/lib/prisma";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { indexSearchDocs, removeSearchDocs } from "@/lib/search-index";
+import { notifyTasksAssigned } from "@/lib/notifications";
+import { ForbiddenError, NotFoundError } from "@/lib/auth/guards";
+import {
+  taskBatchUpdateSchema,
+  taskImportRowSchema,
+} from "@/lib/validation/schemas";
+
+export const TASK_BATCH_SIZE = 500;
+
+const POSITION_STEP = 1000;
+
+export type RowResult =
+  | { index: number; status: "created" | "updated" | "deleted"; id: string }
+  | { index: number; status: "error"; id?: string; error: string };
+
+export interface ProjectContext {
+  userId: string;
+  projectId: string;
+  projectName: string;
+  workspaceId: string;
+  workspaceSlug: string;
+  memberIds: Set<string>;
+  /** Member ids by lower-cased email */
+  membersByEmail: Map<string, string>;
+  tagIds: Set<string>;
+  /** Workspace tag ids by lower-cased name */
+  tagsByName: Map<string, string>;
+}
+
+/**
+ * Everything batch rows are checked against, in one query
+ *
+ * @throws {NotFoundError} If the project does not exist
+ * @throws {ForbiddenError} If the user is not a project member
+ */
+export async function loadProjectContext(
+  userId: string,
+  projectId: string,
+): Promise<ProjectContext> {
+  const project = await prisma.project.findUnique({
+    where: { id: projectId },
+    select: {
+      name: true,
+      workspace: {
+        select: {
+          id: true,
+          slug: true,
+          tags: { select: { id: true, name: true } },
+        },
+      },
+      members: { select: { userId: true, user: { select: { email: true } } } },
+    },
+  });
+  if (!project) {
+    throw new NotFoundError("Project not found");
+  }
+  if (!project.members.some((member) => member.userId === userId)) {
+    throw new ForbiddenError("You are not a member of this project");
+  }
+
+  return {
+    userId,
+    projectId,
+    projectName: project.name,
+    workspaceId: project.workspace.id,
+    workspaceSlug: project.workspace.slug,
+    memberIds: new Set(project.members.map((member) => member.userId)),
+    membersByEmail: new Map(
+      project.members.map((member) => [
+        member.user.email.toLowerCase(),
+        member.userId,
+      ]),
+    ),
+    tagIds: new Set(project.workspace.tags.map((tag) => tag.id)),
+    tagsByName: new Map(
+      project.workspace.tags.map((tag) => [tag.name.toLowerCase(), tag.id]),
+    ),
+  };
+}
+
+/**
+ * Tell open boards to refetch, once for a whole batch
+ */
+export async function announceTaskChanges(projectId: string): Promise<void> {
+  await enqueueJob("realtime.broadcast", {
+    channel: `project:${projectId}`,
+    event: "task-updated",
+    payload: { projectId, type: "BATCH" },
+  });
+}
+
+function describeIssues(error: z.ZodError): string {
+  return error.issues
+    .map((issue) =>
+      issue.path.length
+        ? `${issue.path.join(".")}: ${issue.message}`
+        : issue.message,
+    )
+    .join("; ");
+}
+
+function checkAssignee(
+  ctx: ProjectContext,
+  assigneeId: string | null | undefined,
+): string | null {
+  if (assigneeId && !ctx.memberIds.has(assigneeId)) {
+    return "Assignee is not a member of this project";
+  }
+  return null;
+}
+
+function checkTagIds(
+  ctx: ProjectContext,
+  tagIds: string[] = [],
+): string | null {
+  const unknown = tagIds.find((id) => !ctx.tagIds.has(id));
+  return unknown ? `Tag ${unknown} does not belong to this workspace` : null;
+}
+
+/** Create workspace tags named by import rows that do not exist yet */
+async function ensureTags(ctx: ProjectContext, names: string[]): Promise<void> {
+  const missing = [
+    ...new Map(
+      names
+        .filter((name) => !ctx.tagsByName.has(name.toLowerCase()))
+        .map((name) => [name.toLowerCase(), name]),
+    ).values(),
+  ];
+  if (missing.length === 0) return;
+
+  await prisma.tag.createMany({
+    data: missing.map((name) => ({ name, workspaceId: ctx.workspaceId })),
+    skipDuplicates: true,
+  });
+  // Tag names are unique per workspace but not case-insensitively
+  const tags = await prisma.tag.findMany({
+    where: {
+      workspaceId: ctx.workspaceId,
+      name: { in: missing, mode: "insensitive" },
+    },
+    select: { id: true, name: true },
+  });
+  for (const tag of tags) {
+    ctx.tagIds.add(tag.id);
+    if (!ctx.tagsByName.has(tag.name.toLowerCase())) {
+      ctx.tagsByName.set(tag.name.toLowerCase(), tag.id);
+    }
+  }
+}
+
+async function linkTags(
+  tx: Prisma.TransactionClient,
+  links: { taskId: string; tagId: string }[],
+): Promise<void> {
+  if (links.length === 0) return;
+  // Implicit many-to-many table: A = Tag, B = Task
+  await tx.$executeRaw`
+    INSERT INTO "_TagToTask" ("A", "B")
+    SELECT * FROM unnest(
+      ${links.map((link) => link.tagId)}::text[],
+      ${links.map((link) => link.taskId)}::text[]
+    )
+    ON CONFLICT DO NOTHING
+  `;
+}
+
+// ============================================================================
+// CREATE
+// ============================================================================
+
+/**
+ * Create tasks at the end of their status column. `startIndex` offsets the
+ * reported row indexes (imports call this once per chunk).
+ *
+ * Rows the import reader could not parse arrive as Error instances and are
+ * reported as such.
+ */
+export async function createTasks(
+  ctx: ProjectContext,
+  rows: unknown[],
+  startIndex = 0,
+): Promise<RowResult[]> {
+  const results: RowResult[] = new Array(rows.length);
+  const parsed: {
+    at: number;
+    data: z.infer<typeof taskImportRowSchema>;
+  }[] = [];
+
+  rows.forEach((row, at) => {
+    const index = startIndex + at;
+    if (row instanceof Error) {
+      results[at] = { index, status: "error", error: row.message };
+      return;
+    }
+    const result = taskImportRowSchema.safeParse(row);
+    if (!result.success) {
+      results[at] = {
+        index,
+        status: "error",
+        error: describeIssues(result.error),
+      };
+      return;
+    }
+    parsed.push({ at, data: result.data });
+  });
+
+  await ensureTags(ctx, parsed.flatMap(({ data }) => data.tags ?? []));
+
+  const valid: {
+    at: number;
+    task: Prisma.TaskCreateManyInput & { status: TaskStatus; position: number };
+    tagIds: string[];
+  }[] = [];
+
+  for (const { at, data } of parsed) {
+    const assigneeId = data.assigneeEmail
+      ? ctx.membersByEmail.get(data.assigneeEmail)
+      : data.assigneeId;
+    const tagIds = [
+      ...new Set([
+        ...(data.tagIds ?? []),
+        ...(data.tags ?? []).map(
+          (name) => ctx.tagsByName.get(name.toLowerCase()) as string,
+        ),
+      ]),
+    ];
+    const error =
+      (data.assigneeEmail && !assigneeId
+        ? `${data.assigneeEmail} is not a member of this project`
+        : checkAssignee(ctx, assigneeId)) ?? checkTagIds(ctx, tagIds);
+    if (error) {
+      results[at] = { index: startIndex + at, status: "error", error };
+      continue;
+    }
+
+    valid.push({
+      at,
+      task: {
+        title: data.title,
+        description: data.description,
+        status: data.status,
+        priority: data.priority,
+        dueDate: data.dueDate ?? null,
+        assigneeId: assigneeId ?? null,
+        projectId: ctx.projectId,
+        creatorId: ctx.userId,
+        position: 0,
+      },
+      tagIds,
+    });
+  }
+
+  if (valid.length === 0) return results;
+
+  // Append to each column after its current last task
+  const last = await prisma.task.groupBy({
+    by: ["status"],
+    where: { projectId: ctx.projectId },
+    _max: { position: true },
+  });
+  const nextPosition = new Map(
+    last.map((row) => [row.status, row._max.position ?? 0]),
+  );
+  for (const { task } of valid) {
+    const position = (nextPosition.get(task.status) ?? 0) + POSITION_STEP;
+    nextPosition.set(task.status, position);
+    task.position = position;
+  }
+
+  const created = await prisma.$transaction(async (tx) => {
+    const tasks = await tx.task.createManyAndReturn({
+      data: valid.map(({ task }) => task),
+      select: { id: true, status: true, position: true },
+    });
+
+    // (status, position) is unique within the batch
+    const ids = new Map(
+      tasks.map((task) => [`${task.status}:${task.position}`, task.id]),
+    );
+    const withIds = valid.map((row) => ({
+      ...row,
+      id: ids.get(`${row.task.status}:${row.task.position}`) as string,
+    }));
+
+    await linkTags(
+      tx,
+      withIds.flatMap(({ id, tagIds }) =>
+        tagIds.map((tagId) => ({ taskId: id, tagId })),
+      ),
+    );
+    await tx.activity.createMany({
+      data: withIds.map(({ id }) => ({
+        type: "CREATED" as const,
+        taskId: id,
+        userId: ctx.userId,
+      })),
+    });
+    return withIds;
+  });
+
+  for (const { at, id } of created) {
+    results[at] = { index: startIndex + at, status: "created", id };
+  }
+  indexSearchDocs(
+    created.map(({ id, task }) => ({
+      type: "TASK" as const,
+      id,
+      text: task.title,
+      projectId: ctx.projectId,
+    })),
+  );
+
+  await notifyAssignees(
+    ctx,
+    created.map(({ id, task }) => ({
+      taskId: id,
+      taskTitle: task.title,
+      assigneeId: task.assigneeId ?? null,
+    })),
+  );
+
+  return results;
+}
+
+async function notifyAssignees(
+  ctx: ProjectContext,
+  tasks: { taskId: string; taskTitle: string; assigneeId: string | null }[],
+): Promise<void> {
+  const assignments = tasks.filter(
+    (task): task is typeof task & { assigneeId: string } =>
+      !!task.assigneeId && task.assigneeId !== ctx.userId,
+  );
+  if (assignments.length === 0) return;
+  try {
+    await notifyTasksAssigned(
+      assignments,
+      ctx.projectId,
+      ctx.projectName,
+      ctx.workspaceSlug,
+    );
+  } catch (notificationError) {
+    console.error("Failed to send notifications:", notificationError);
+  }
+}
+
+// ============================================================================
+// UPDATE
+// ============================================================================
+
+/**
+ * Apply partial updates. Rows that set the same fields to the same values
+ * (e.g. "move these 300 tasks to DONE") share one UPDATE.
+ */
+export async function updateTasks(
+  ctx: ProjectContext,
+  rows: unknown[],
+): Promise<RowResult[]> {
+  const results: RowResult[] = new Array(rows.length);
+  const parsed: {
+    at: number;
+    data: z.infer<typeof taskBatchUpdateSchema>;
+  }[] = [];
+  const seen = new Set<string>();
+
+  rows.forEach((row, at) => {
+    const result = taskBatchUpdateSchema.safeParse(row);
+    if (!result.success) {
+      results[at] = {
+        index: at,
+        status: "error",
+        error: describeIssues(result.error),
+      };
+    } else if (seen.has(result.data.id)) {
+      results[at] = {
+        index: at,
+        status: "error",
+        id: result.data.id,
+        error: "Task is updated twice in this batch",
+      };
+    } else {
+      seen.add(result.data.id);
+      parsed.push({ at, data: result.data });
+    }
+  });
+
+  const existing = new Map(
+    (
+      await prisma.task.findMany({
+        where: {
+          id: { in: parsed.map(({ data }) => data.id) },
+          projectId: ctx.projectId,
+        },
+        select: { id: true, title: true, status: true, assigneeId: true },
+      })
+    ).map((task) => [task.id, task]),
+  );
+
+  const groups = new Map<
+    string,
+    { data: Prisma.TaskUncheckedUpdateManyInput; ids: string[] }
+  >();
+  const tagUpdates: { id: string; tagIds: string[] }[] = [];
+  const statusChanges: Prisma.ActivityCreateManyInput[] = [];
+  const newAssignees: Parameters<typeof notifyAssignees>[1] = [];
+  const updated: { at: number; id: string }[] = [];
+
+  for (const { at, data } of parsed) {
+    const { id, tagIds, ...fields } = data;
+    const task = existing.get(id);
+    const error = !task
+      ? "Task not found"
+      : (checkAssignee(ctx, fields.assigneeId) ?? checkTagIds(ctx, tagIds));
+    if (!task || error) {
+      results[at] = { index: at, status: "error", id, error: error as string };
+      continue;
+    }
+
+    if (Object.keys(fields).length > 0) {
+      const key = JSON.stringify(fields);
+      const group = groups.get(key) ?? { data: fields, ids: [] };
+      group.ids.push(id);
+      groups.set(key, group);
+    }
+    if (tagIds) tagUpdates.push({ id, tagIds });
+    if (fields.status && fields.status !== task.status) {
+      statusChanges.push({
+        type: "STATUS_CHANGE",
+        taskId: id,
+        userId: ctx.userId,
+        metadata: { from: task.status, to: fields.status },
+      });
+    }
+    if (fields.assigneeId && fields.assigneeId !== task.assigneeId) {
+      newAssignees.push({
+        taskId: id,
+        taskTitle: fields.title ?? task.title,
+        assigneeId: fields.assigneeId,
+      });
+    }
+    updated.push({ at, id });
+  }
+
+  if (updated.length === 0) return results;
+
+  await prisma.$transaction(async (tx) => {
+    for (const { data, ids } of groups.values()) {
+      await tx.task.updateMany({ where: { id: { in: ids } }, data });
+    }
+    if (tagUpdates.length > 0) {
+      await tx.$executeRaw`
+        DELETE FROM "_TagToTask"
+        WHERE "B" = ANY(${tagUpdates.map(({ id }) => id)}::text[])
+      `;
+      await linkTags(
+        tx,
+        tagUpdates.flatMap(({ id, tagIds }) =>
+          tagIds.map((tagId) => ({ taskId: id, tagId })),
+        ),
+      );
+    }
+    if (statusChanges.length > 0) {
+      await tx.activity.createMany({ data: statusChanges });
+    }
+  });
+
+  for (const { at, id } of updated) {
+    results[at] = { index: at, status: "updated", id };
+  }
+  indexSearchDocs(
+    parsed
+      .filter(({ at, data }) => data.title && results[at].status === "updated")
+      .map(({ data }) => ({
+        type: "TASK" as const,
+        id: data.id,
+        text: data.title as string,
+        projectId: ctx.projectId,
+      })),
+  );
+  await notifyAssignees(ctx, newAssignees);
+
+  return results;
+}
+
+// ============================================================================
+// DELETE
+// ============================================================================
+
+export async function deleteTasks(
+  ctx: ProjectContext,
+  ids: string[],
+): Promise<RowResult[]> {
+  const found = await prisma.task.findMany({
+    where: { id: { in: ids }, projectId: ctx.projectId },
+    select: { id: true },
+  });
+  const deletable = new Set(found.map((task) => task.id));
+
+  if (deletable.size > 0) {
+    await prisma.task.deleteMany({
+      where: { id: { in: [...deletable] }, projectId: ctx.projectId },
+    });
+    removeSearchDocs("TASK", [...deletable]);
+  }
+
+  return ids.map((id, index) =>
+    deletable.has(id)
+      ? { index, status: "deleted", id }
+      : { index, status: "error", id, error: "Task not found" },
+  );
+}
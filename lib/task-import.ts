@@ -0,0 +1,215 @@
+/**
+ * Task Import Readers
+ *
+ * Turn an import request body into chunks of task rows for createTasks
+ * (lib/task-batch.ts) without buffering the whole file:
+ *
+ * - text/csv: header row, then one task per record. Quoted fields may
+ *   contain commas, quotes ("") and newlines.
+ * - application/x-ndjson: one JSON task object per line
+ * - application/json: a JSON array of task objects (read in full)
+ *
+ * CSV headers are matched loosely so exports from other tools import as
+ * they are: "Title"/"Name"/"Summary", "Due date"/"Due", "Assignee" (an
+ * email or user ID), "Tags"/"Labels" (separated by ";", "," or "|").
+ * Lines that cannot be parsed become Error rows, reported per row.
+ */
+
+import { TASK_BATCH_SIZE } from "@/lib/task-batch";
+
+const CSV_COLUMNS: Record<string, string> = {
+  title: "title",
+  name: "title",
+  summary: "title",
+  task: "title",
+  description: "description",
+  notes: "description",
+  status: "status",
+  state: "status",
+  priority: "priority",
+  duedate: "dueDate",
+  due: "dueDate",
+  assignee: "assignee",
+  assigneeemail: "assignee",
+  assigneeid: "assignee",
+  owner: "assignee",
+  tags: "tags",
+  labels: "tags",
+};
+
+/**
+ * Rows of the request body in chunks, or null for an unsupported
+ * Content-Type
+ */
+export function readImportRows(
+  req: Request,
+): AsyncGenerator<unknown[]> | null {
+  const type = (req.headers.get("content-type") ?? "")
+    .split(";")[0]
+    .trim()
+    .toLowerCase();
+
+  if (type === "application/json") {
+    return chunk(jsonArrayRows(req));
+  }
+  if (!req.body) return null;
+  if (type === "text/csv") {
+    return chunk(csvRows(req.body));
+  }
+  if (type === "application/x-ndjson" || type === "application/jsonl") {
+    return chunk(ndjsonRows(req.body));
+  }
+  return null;
+}
+
+async function* chunk(
+  rows: AsyncIterable<unknown>,
+  size = TASK_BATCH_SIZE,
+): AsyncGenerator<unknown[]> {
+  let batch: unknown[] = [];
+  for await (const row of rows) {
+    batch.push(row);
+    if (batch.length === size) {
+      yield batch;
+      batch = [];
+    }
+  }
+  if (batch.length > 0) yield batch;
+}
+
+async function* jsonArrayRows(req: Request): AsyncGenerator<unknown> {
+  const body: unknown = await req.json();
+  if (!Array.isArray(body)) {
+    throw new SyntaxError("Expected a JSON array of tasks");
+  }
+  yield* body;
+}
+
+async function* textLines(
+  body: ReadableStream<Uint8Array>,
+): AsyncGenerator<string> {
+  const decoder = new TextDecoder();
+  const reader = body.getReader();
+  let buffered = "";
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      buffered += done
+        ? decoder.decode()
+        : decoder.decode(value, { stream: true });
+      const lines = buffered.split("\n");
+      buffered = done ? "" : (lines.pop() as string);
+      for (const line of lines) yield line;
+      if (done) return;
+    }
+  } finally {
+    reader.releaseLock();
+  }
+}
+
+async function* ndjsonRows(
+  body: ReadableStream<Uint8Array>,
+): AsyncGenerator<unknown> {
+  for await (const line of textLines(body)) {
+    if (!line.trim()) continue;
+    try {
+      yield JSON.parse(line);
+    } catch {
+      yield new Error("Invalid JSON");
+    }
+  }
+}
+
+/**
+ * RFC 4180 records. A quoted field can span lines, so records are
+ * assembled from lines until the quotes balance.
+ */
+async function* csvRecords(
+  body: ReadableStream<Uint8Array>,
+): AsyncGenerator<string[]> {
+  let fields: string[] = [];
+  let field = "";
+  let quoted = false;
+  let first = true;
+
+  for await (let line of textLines(body)) {
+    if (first) {
+      line = line.replace(/^\uFEFF/, "");
+      first = false;
+    }
+    if (!quoted) {
+      line = line.replace(/\r$/, "");
+    }
+
+    for (let i = 0; i < line.length; i++) {
+      const char = line[i];
+      if (quoted) {
+        if (char !== '"') {
+          field += char;
+        } else if (line[i + 1] === '"') {
+          field += '"';
+          i++;
+        } else {
+          quoted = false;
+        }
+      } else if (char === '"') {
+        quoted = true;
+      } else if (char === ",") {
+        fields.push(field);
+        field = "";
+      } else {
+        field += char;
+      }
+    }
+
+    if (quoted) {
+      // The newline is part of the quoted field
+      field += "\n";
+      continue;
+    }
+    fields.push(field);
+    if (fields.length > 1 || fields[0] !== "") yield fields;
+    fields = [];
+    field = "";
+  }
+
+  if (quoted) {
+    fields.push(field.replace(/\n$/, ""));
+    yield fields;
+  }
+}
+
+async function* csvRows(
+  body: ReadableStream<Uint8Array>,
+): AsyncGenerator<unknown> {
+  let columns: (string | undefined)[] | null = null;
+
+  for await (const record of csvRecords(body)) {
+    if (!columns) {
+      columns = record.map(
+        (name) => CSV_COLUMNS[name.toLowerCase().replace(/[\s_-]+/g, "")],
+      );
+      if (!columns.includes("title")) {
+        throw new SyntaxError("CSV header must include a title column");
+      }
+      continue;
+    }
+
+    const row: Record<string, unknown> = {};
+    columns.forEach((column, i) => {
+      const value = record[i]?.trim();
+      if (!column || !value) return;
+      if (column === "assignee") {
+        row[value.includes("@") ? "assigneeEmail" : "assigneeId"] = value;
+      } else if (column === "tags") {
+        row.tags = value
+          .split(/[;,|]/)
+          .map((tag) => tag.trim())
+          .filter(Boolean);
+      } else {
+        row[column] = value;
+      }
+    });
+    yield row;
+  }
+}
@@ -0,0 +1,316 @@
+/**
+ * Time Tracking Write Path
+ *
+ * Each timer action is a single SQL statement, so a start, stop or task
+ * switch costs one round trip and cannot interleave with a concurrent
+ * request from another tab or device:
+ *
+ * - start:  INSERT ... ON CONFLICT ("userId") DO NOTHING (one timer per user)
+ * - stop:   DELETE the timer and INSERT its time entry in one CTE
+ * - switch: close the running entry and re-point the timer at another task
+ *
+ * Time entries carry an optional `idempotencyKey`, unique per user. Clients
+ * that retry a stop / switch / manual entry, or re-sync entries recorded
+ * offline, send the same key and get the original entry back instead of a
+ * duplicate. Bulk creation inserts a whole batch with one statement.
+ *
+ * Timestamps are written as UTC wall-clock time, the same convention Prisma
+ * uses for `DateTime` columns, and durations are computed by the database
+ * from its own clock.
+ */
+
+import { randomUUID } from "crypto";
+import { Prisma, type TimeEntry, type Timer } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+import { assertCanAccessTask } from "@/lib/auth/guards";
+
+const NOW_UTC = Prisma.sql`(now() AT TIME ZONE 'UTC')`;
+
+/** The task, if the user is a member of its project */
+function accessibleTask(userId: string, taskId: string) {
+  return Prisma.sql`
+    SELECT t.id FROM "Task" t
+    JOIN "ProjectMember" pm
+      ON pm."projectId" = t."projectId" AND pm."userId" = ${userId}
+    WHERE t.id = ${taskId}
+  `;
+}
+
+/** True unless the user already has an entry with this key */
+function keyUnused(userId: string, idempotencyKey: string | null) {
+  return Prisma.sql`NOT EXISTS (
+    SELECT 1 FROM "TimeEntry"
+    WHERE "userId" = ${userId} AND "idempotencyKey" = ${idempotencyKey}
+  )`;
+}
+
+async function findByKey(
+  userId: string,
+  idempotencyKey: string | null,
+): Promise<TimeEntry | null> {
+  if (!idempotencyKey) return null;
+  return prisma.timeEntry.findUnique({
+    where: { userId_idempotencyKey: { userId, idempotencyKey } },
+  });
+}
+
+// ============================================================================
+// TIMER
+// ============================================================================
+
+export type StartTimerResult =
+  | { status: "started"; timer: Timer }
+  /** A timer was already running; `timer` is that timer */
+  | { status: "running"; timer: Timer };
+
+/**
+ * Start a timer on a task the user can access
+ *
+ * @throws {NotFoundError} If the task does not exist or is not accessible
+ */
+export async function startTimer(
+  userId: string,
+  taskId: string,
+): Promise<StartTimerResult> {
+  const insert = () =>
+    prisma.$queryRaw<Timer[]>(Prisma.sql`
+      WITH task AS (${accessibleTask(userId, taskId)})
+      INSERT INTO "Timer" (id, "taskId", "userId", "startTime")
+      SELECT ${randomUUID()}, task.id, ${userId}, ${NOW_UTC} FROM task
+      ON CONFLICT ("userId") DO NOTHING
+      RETURNING *
+    `);
+
+  const [timer] = await insert();
+  if (timer) return { status: "started", timer };
+
+  // Nothing inserted: either a timer is already running or the task is
+  // not accessible. Only this path pays for the extra reads.
+  await assertCanAccessTask(userId, taskId);
+  const running = await prisma.timer.findUnique({ where: { userId } });
+  if (running) return { status: "running", timer: running };
+
+  // The running timer was stopped in between; the retry settles it
+  const [retried] = await insert();
+  return retried
+    ? { status: "started", timer: retried }
+    : {
+        status: "running",
+        timer: await prisma.timer.findUniqueOrThrow({ where: { userId } }),
+      };
+}
+
+export interface TimerWriteOptions {
+  note?: string | null;
+  idempotencyKey?: string | null;
+}
+
+export interface StopTimerResult {
+  entry: TimeEntry;
+  /** True when `entry` was recorded by an earlier request with the same key */
+  replayed: boolean;
+}
+
+/**
+ * Stop the running timer and record its time entry.
+ * Returns null if no timer is running.
+ */
+export async function stopTimer(
+  userId: string,
+  { note = null, idempotencyKey = null }: TimerWriteOptions = {},
+): Promise<StopTimerResult | null> {
+  const [entry] = await prisma.$queryRaw<TimeEntry[]>(Prisma.sql`
+    WITH stopped AS (
+      DELETE FROM "Timer"
+      WHERE "userId" = ${userId} AND ${keyUnused(userId, idempotencyKey)}
+      RETURNING "taskId", "startTime"
+    )
+    INSERT INTO "TimeEntry"
+      (id, "taskId", "userId", "startTime", "endTime", duration, note, "idempotencyKey")
+    SELECT ${randomUUID()}, "taskId", ${userId}, "startTime", ${NOW_UTC},
+           GREATEST(0, floor(EXTRACT(EPOCH FROM ${NOW_UTC} - "startTime")))::int,
+           ${note}, ${idempotencyKey}
+    FROM stopped
+    RETURNING *
+  `);
+  if (entry) return { entry, replayed: false };
+
+  const previous = await findByKey(userId, idempotencyKey);
+  return previous ? { entry: previous, replayed: true } : null;
+}
+
+export interface SwitchTimerResult {
+  /** The running timer; null only on a replay after it was stopped */
+  timer: Timer | null;
+  /** Entry closed for the previous task; null if no timer was running */
+  entry: TimeEntry | null;
+  replayed: boolean;
+}
+
+type SwitchRow = TimeEntry & {
+  timerId: string;
+  timerTaskId: string;
+  timerStartTime: Date;
+};
+
+/**
+ * Close the running timer's entry and move the timer to another task in
+ * one statement. With no timer running this is a plain start.
+ *
+ * @throws {NotFoundError} If the task does not exist or is not accessible
+ */
+export async function switchTimer(
+  userId: string,
+  taskId: string,
+  { note = null, idempotencyKey = null }: TimerWriteOptions = {},
+): Promise<SwitchTimerResult> {
+  // `prev` locks the timer row and keeps its old values for the entry
+  // while `moved` rewrites the same row
+  const [row] = await prisma.$queryRaw<SwitchRow[]>(Prisma.sql`
+    WITH task AS (${accessibleTask(userId, taskId)}),
+    prev AS (
+      SELECT "taskId", "startTime" FROM "Timer"
+      WHERE "userId" = ${userId}
+        AND EXISTS (SELECT 1 FROM task)
+        AND ${keyUnused(userId, idempotencyKey)}
+      FOR UPDATE
+    ),
+    moved AS (
+      UPDATE "Timer" SET "taskId" = task.id, "startTime" = ${NOW_UTC}
+      FROM task, prev
+      WHERE "Timer"."userId" = ${userId}
+      RETURNING "Timer".id, "Timer"."taskId", "Timer"."startTime"
+    ),
+    entry AS (
+      INSERT INTO "TimeEntry"
+        (id, "taskId", "userId", "startTime", "endTime", duration, note, "idempotencyKey")
+      SELECT ${randomUUID()}, prev."taskId", ${userId}, prev."startTime", ${NOW_UTC},
+             GREATEST(0, floor(EXTRACT(EPOCH FROM ${NOW_UTC} - prev."startTime")))::int,
+             ${note}, ${idempotencyKey}
+      FROM prev
+      RETURNING *
+    )
+    SELECT entry.*, moved.id AS "timerId", moved."taskId" AS "timerTaskId",
+           moved."startTime" AS "timerStartTime"
+    FROM moved, entry
+  `);
+
+  if (row) {
+    const { timerId, timerTaskId, timerStartTime, ...entry } = row;
+    return {
+      timer: { id: timerId, taskId: timerTaskId, userId, startTime: timerStartTime },
+      entry,
+      replayed: false,
+    };
+  }
+
+  // Nothing switched: inaccessible task, a replayed key, or no timer running
+  await assertCanAccessTask(userId, taskId);
+
+  const previous = await findByKey(userId, idempotencyKey);
+  if (previous) {
+    const timer = await prisma.timer.findUnique({ where: { userId } });
+    return { timer, entry: previous, replayed: true };
+  }
+
+  const started = await startTimer(userId, taskId);
+  if (started.status === "running") {
+    // A timer appeared concurrently; switch it now that it exists
+    return switchTimer(userId, taskId, { note, idempotencyKey });
+  }
+  return { timer: started.timer, entry: null, replayed: false };
+}
+
+// ============================================================================
+// TIME ENTRIES
+// ============================================================================
+
+export interface TimeEntryInput {
+  taskId: string;
+  startTime: string;
+  endTime: string;
+  note?: string;
+  isBillable: boolean;
+  idempotencyKey?: string;
+}
+
+export interface BulkCreateResult {
+  created: TimeEntry[];
+  /** Entries whose key was already used; the original entry is returned */
+  duplicates: TimeEntry[];
+  /** Inputs (by index) whose task does not exist or is not accessible */
+  rejected: { index: number; taskId: string }[];
+}
+
+/**
+ * Create many time entries in one INSERT ... SELECT FROM unnest(...).
+ * Entries on tasks the user cannot access are skipped, and entries whose
+ * idempotency key was already used are returned as duplicates.
+ */
+export async function createTimeEntries(
+  userId: string,
+  inputs: TimeEntryInput[],
+): Promise<BulkCreateResult> {
+  if (inputs.length === 0) {
+    return { created: [], duplicates: [], rejected: [] };
+  }
+
+  const ids = inputs.map(() => randomUUID());
+  const created = await prisma.$queryRaw<TimeEntry[]>(Prisma.sql`
+    WITH input AS (
+      SELECT * FROM unnest(
+        ${ids}::text[],
+        ${inputs.map((input) => input.taskId)}::text[],
+        ${inputs.map((input) => input.startTime)}::timestamptz[],
+        ${inputs.map((input) => input.endTime)}::timestamptz[],
+        ${inputs.map((input) => input.note ?? null)}::text[],
+        ${inputs.map((input) => input.isBillable)}::boolean[],
+        ${inputs.map((input) => input.idempotencyKey ?? null)}::text[]
+      ) AS i(id, "taskId", "startTime", "endTime", note, "isBillable", "idempotencyKey")
+    ),
+    allowed AS (
+      SELECT t.id FROM "Task" t
+      JOIN "ProjectMember" pm
+        ON pm."projectId" = t."projectId" AND pm."userId" = ${userId}
+      WHERE t.id IN (SELECT "taskId" FROM input)
+    )
+    INSERT INTO "TimeEntry"
+      (id, "taskId", "userId", "startTime", "endTime", duration, note,
+       "isBillable", "idempotencyKey")
+    SELECT i.id, i."taskId", ${userId},
+           i."startTime" AT TIME ZONE 'UTC', i."endTime" AT TIME ZONE 'UTC',
+           floor(EXTRACT(EPOCH FROM i."endTime" - i."startTime"))::int,
+           i.note, i."isBillable", i."idempotencyKey"
+    FROM input i
+    WHERE i."taskId" IN (SELECT id FROM allowed)
+    ON CONFLICT ("userId", "idempotencyKey") DO NOTHING
+    RETURNING *
+  `);
+
+  if (created.length === inputs.length) {
+    return { created, duplicates: [], rejected: [] };
+  }
+
+  // Some inputs were skipped: look up which of them were duplicates
+  const createdIds = new Set(created.map((entry) => entry.id));
+  const skippedKeys = inputs
+    .filter((input, index) => input.idempotencyKey && !createdIds.has(ids[index]))
+    .map((input) => input.idempotencyKey as string);
+  const duplicates = skippedKeys.length
+    ? await prisma.timeEntry.findMany({
+        where: { userId, idempotencyKey: { in: skippedKeys } },
+      })
+    : [];
+
+  const duplicateKeys = new Set(duplicates.map((entry) => entry.idempotencyKey));
+  const rejected = inputs
+    .map((input, index) => ({ index, taskId: input.taskId, input }))
+    .filter(
+      ({ index, input }) =>
+        !createdIds.has(ids[index]) &&
+        !(input.idempotencyKey && duplicateKeys.has(input.idempotencyKey)),
+    )
+    .map(({ index, taskId }) => ({ index, taskId }));
+
+  return { created, duplicates, rejected };
+}
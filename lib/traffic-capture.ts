@@ -0,0 +1,237 @@
+/**
+ * Traffic Capture
+ *
+ * Records the shape of API traffic for load-test replay
+ * (scripts/traffic_replay.py). Enabled by TRAFFIC_CAPTURE_FILE; each API
+ * request is appended to that file as one compact JSON line.
+ *
+ * Nothing identifying is written: every ID (users, workspaces, tasks, ...)
+ * is replaced by a capture-local token ("@1", "@2", ...) so cardinality and
+ * reuse are preserved, and free text is reduced to its length ("s:42").
+ * Only values of known enum fields (status=TODO, role=ADMIN) are kept.
+ * Sampling (TRAFFIC_CAPTURE_SAMPLE) is per user, so sampled sessions stay
+ * complete.
+ *
+ * Line format:
+ *   {"v":1,"startedAt":"..."}                                   header
+ *   {"t":1520,"u":"@1","m":"POST","r":"/api/chat","p":"/api/chat",
+ *    "q":{},"b":{"content":"s:42","projectId":"@7"},"s":201,"d":38.2}
+ * t = ms since capture start, u = user token, r = route, p = path with ID
+ * tokens, q = query params, b = JSON body shape, s = status, d = duration ms.
+ * Arrays are written as {"n": <length>, "of": <first element shape>}.
+ */
+
+import { createWriteStream, type WriteStream } from "fs";
+import type { IncomingMessage, ServerResponse } from "http";
+import { createHash } from "crypto";
+import { normalizeRoute } from "./query-metrics";
+import { logEvent } from "./logger";
+
+const CAPTURE_FILE = process.env.TRAFFIC_CAPTURE_FILE;
+const SAMPLE_RATE = parseFloat(process.env.TRAFFIC_CAPTURE_SAMPLE || "1");
+const MAX_EVENTS = parseInt(process.env.TRAFFIC_CAPTURE_MAX_EVENTS || "1000000");
+// Larger bodies (uploads) are recorded by size only
+const MAX_BODY_BYTES = 64 * 1024;
+
+export const TRAFFIC_CAPTURE_ENABLED = Boolean(CAPTURE_FILE);
+
+const ID_PATTERN =
+  /^(c[a-z0-9]{24}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$/i;
+// Enum values (status=TODO, role=ADMIN) are kept as-is, but only under
+// these keys: elsewhere ("content": "ASAP") a short uppercase word is text
+const ENUM_KEYS = new Set(["status", "priority", "type", "role", "action"]);
+const ENUM_PATTERN = /^[A-Z_]{1,20}$/;
+const SLUG_KEY = /slug$/i;
+
+let stream: WriteStream | null = null;
+let startedAt = 0;
+let written = 0;
+const tokens = new Map<string, string>();
+
+function getStream(): WriteStream {
+  if (!stream) {
+    stream = createWriteStream(CAPTURE_FILE!, { flags: "a" });
+    startedAt = Date.now();
+    stream.write(
+      JSON.stringify({ v: 1, startedAt: new Date(startedAt).toISOString() }) +
+        "\n",
+    );
+    logEvent("traffic.capture_started", { file: CAPTURE_FILE });
+  }
+  return stream;
+}
+
+function tokenFor(id: string): string {
+  let token = tokens.get(id);
+  if (!token) {
+    token = `@${tokens.size + 1}`;
+    tokens.set(id, token);
+  }
+  return token;
+}
+
+/**
+ * Anonymize a value while keeping its shape
+ */
+function shapeOf(value: unknown, depth = 0, key?: string): unknown {
+  if (typeof value === "string") {
+    if (ID_PATTERN.test(value)) return tokenFor(value);
+    if (key && ENUM_KEYS.has(key) && ENUM_PATTERN.test(value)) return value;
+    return `s:${value.length}`;
+  }
+  if (Array.isArray(value)) {
+    // Element count matters for batch endpoints; keep the first element's shape
+    return value.length > 0
+      ? { n: value.length, of: shapeOf(value[0], depth + 1, key) }
+      : [];
+  }
+  if (value && typeof value === "object") {
+    if (depth > 4) return "o";
+    return Object.fromEntries(
+      Object.entries(value).map(([key, v]) => [
+        key,
+        // Workspace slugs identify entities just like IDs
+        SLUG_KEY.test(key) && typeof v === "string"
+          ? tokenFor(v)
+          : shapeOf(v, depth + 1, key),
+      ]),
+    );
+  }
+  return value;
+}
+
+function pathShape(pathname: string): string {
+  const segments = pathname.split("/");
+  return segments
+    .map((segment, i) =>
+      ID_PATTERN.test(segment) ||
+      (segments[i - 1] === "workspaces" && segments[i - 2] === "api")
+        ? tokenFor(segment)
+        : segment,
+    )
+    .join("/");
+}
+
+function decodeJwtSubject(jwt: string): string | null {
+  try {
+    const payload = JSON.parse(
+      Buffer.from(jwt.split(".")[1], "base64url").toString(),
+    );
+    return typeof payload.sub === "string" ? payload.sub : null;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * The requesting user's Supabase ID, from the bearer token or the (possibly
+ * chunked) sb-<ref>-auth-token cookie. Only used to derive a token; the
+ * signature is not checked here.
+ */
+function userIdOf(req: IncomingMessage): string | null {
+  const authorization = req.headers.authorization;
+  if (authorization?.startsWith("Bearer ")) {
+    return decodeJwtSubject(authorization.slice(7));
+  }
+
+  const chunks = (req.headers.cookie || "")
+    .split(";")
+    .map((part) => part.trim().split("="))
+    .filter(([name]) => /^sb-.+-auth-token(\.\d+)?$/.test(name))
+    .sort(([a], [b]) => a.localeCompare(b))
+    .map(([, ...value]) => decodeURIComponent(value.join("=")));
+  if (chunks.length === 0) return null;
+
+  try {
+    const raw = chunks.join("");
+    const session = JSON.parse(
+      raw.startsWith("base64-")
+        ? Buffer.from(raw.slice(7), "base64url").toString()
+        : raw,
+    );
+    return decodeJwtSubject(session.access_token);
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Per-user sampling, so a sampled user's whole session is recorded
+ */
+function isSampled(userId: string | null): boolean {
+  if (SAMPLE_RATE >= 1) return true;
+  const hash = createHash("sha1")
+    .update(userId ?? "anonymous")
+    .digest()
+    .readUInt32BE(0);
+  return hash / 0xffffffff < SAMPLE_RATE;
+}
+
+/**
+ * Record one API request. Call before handing the request to Next.js; the
+ * body is observed as it is read, without consuming it.
+ */
+export function captureRequest(
+  req: IncomingMessage,
+  res: ServerResponse,
+  pathname: string,
+  query: Record<string, string | string[] | undefined>,
+): void {
+  if (written >= MAX_EVENTS) return;
+
+  const userId = userIdOf(req);
+  if (!isSampled(userId)) return;
+
+  const start = process.hrtime.bigint();
+  const out = getStream();
+  const offset = Date.now() - startedAt;
+
+  const isJson = (req.headers["content-type"] || "").includes(
+    "application/json",
+  );
+  const chunks: Buffer[] = [];
+  let bodyBytes = 0;
+  if (isJson) {
+    const emit = req.emit;
+    req.emit = function (this: IncomingMessage, event: string, ...args: unknown[]) {
+      if (event === "data" && bodyBytes <= MAX_BODY_BYTES) {
+        const chunk = args[0] as Buffer;
+        bodyBytes += chunk.length;
+        chunks.push(chunk);
+      }
+      return (emit as (...a: unknown[]) => boolean).apply(this, [event, ...args]);
+    } as typeof req.emit;
+  }
+
+  res.on("finish", () => {
+    if (written >= MAX_EVENTS) return;
+
+    let body: unknown;
+    if (chunks.length > 0 && bodyBytes <= MAX_BODY_BYTES) {
+      try {
+        body = shapeOf(JSON.parse(Buffer.concat(chunks).toString()));
+      } catch {
+        body = `s:${bodyBytes}`;
+      }
+    } else if (req.headers["content-length"]) {
+      body = `s:${req.headers["content-length"]}`;
+    }
+
+    const event = {
+      t: offset,
+      u: userId ? tokenFor(userId) : null,
+      m: req.method || "GET",
+      r: normalizeRoute("", pathname).trim(),
+      p: pathShape(pathname),
+      q: shapeOf(query),
+      ...(body !== undefined ? { b: body } : {}),
+      s: res.statusCode,
+      d: Math.round(Number(process.hrtime.bigint() - start) / 1e5) / 10,
+    };
+    out.write(JSON.stringify(event) + "\n");
+
+    if (++written === MAX_EVENTS) {
+      logEvent("traffic.capture_full", { events: written }, { level: "warn" });
+    }
+  });
+}
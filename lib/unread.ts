@@ -0,0 +1,110 @@
+/**
+ * Unread Message Counters
+ *
+ * One `UnreadCounter` row per (user, channel), where channel is the
+ * message's context channel from lib/realtime.ts (`workspace:<id>`,
+ * `project:<id>`, `conversation:<id>`, `dm:<a>:<b>`). Counters are bumped
+ * for every recipient when a top-level message is created (background job)
+ * and reset when the user reads the channel, so badges for all channels
+ * come from a single primary-key range scan.
+ *
+ * Thread replies are not counted, matching the chat views, which only
+ * list top-level messages.
+ */
+
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+
+export interface UnreadUpdate {
+  userId: string;
+  channel: string;
+  count: number;
+}
+
+/**
+ * Increment the counter of every recipient of a message (everyone in the
+ * channel except the sender) in one statement
+ *
+ * Users whose read pointer is already past the message (they read the
+ * channel before this job ran) are skipped. The message is marked
+ * (`unreadCountedAt`) in the same statement, so a retried job counts it
+ * at most once.
+ */
+export async function incrementUnreadCounters(
+  messageId: string,
+): Promise<UnreadUpdate[]> {
+  return prisma.$queryRaw<UnreadUpdate[]>(Prisma.sql`
+    WITH msg AS (
+      UPDATE "Message"
+      SET "unreadCountedAt" = now()
+      WHERE id = ${messageId}
+        AND "parentId" IS NULL
+        AND "unreadCountedAt" IS NULL
+      RETURNING "senderId", "workspaceId", "projectId", "conversationId",
+                "receiverId", "createdAt"
+    ),
+    recipients AS (
+      SELECT wm."userId", 'workspace:' || msg."workspaceId" AS channel
+      FROM msg JOIN "WorkspaceMember" wm ON wm."workspaceId" = msg."workspaceId"
+      UNION ALL
+      SELECT pm."userId", 'project:' || msg."projectId"
+      FROM msg JOIN "ProjectMember" pm ON pm."projectId" = msg."projectId"
+      WHERE msg."workspaceId" IS NULL
+      UNION ALL
+      SELECT cm."userId", 'conversation:' || msg."conversationId"
+      FROM msg JOIN "ConversationMember" cm
+        ON cm."conversationId" = msg."conversationId"
+      WHERE msg."workspaceId" IS NULL AND msg."projectId" IS NULL
+      UNION ALL
+      SELECT msg."receiverId",
+             'dm:' || LEAST(msg."senderId" COLLATE "C", msg."receiverId")
+               || ':' || GREATEST(msg."senderId" COLLATE "C", msg."receiverId")
+      FROM msg
+      WHERE msg."receiverId" IS NOT NULL
+        AND msg."workspaceId" IS NULL
+        AND msg."projectId" IS NULL
+        AND msg."conversationId" IS NULL
+    )
+    INSERT INTO "UnreadCounter" ("userId", channel, count, "lastReadAt", "updatedAt")
+    SELECT r."userId", r.channel, 1, 'epoch', now()
+    FROM recipients r, msg
+    WHERE r."userId" <> msg."senderId"
+    ON CONFLICT ("userId", channel) DO UPDATE
+      SET count = "UnreadCounter".count + 1, "updatedAt" = now()
+      WHERE "UnreadCounter"."lastReadAt" < (SELECT "createdAt" FROM msg)
+    RETURNING "userId", channel, count
+  `);
+}
+
+/**
+ * Reset a user's counter after reading up to `readAt`. Reading an older
+ * message than the stored pointer leaves the counter alone.
+ */
+export async function markChannelRead(
+  userId: string,
+  channel: string,
+  readAt: Date,
+): Promise<void> {
+  await prisma.$executeRaw(Prisma.sql`
+    INSERT INTO "UnreadCounter" ("userId", channel, count, "lastReadAt", "updatedAt")
+    VALUES (${userId}, ${channel}, 0, ${readAt}, now())
+    ON CONFLICT ("userId", channel) DO UPDATE
+      SET count = 0,
+          "lastReadAt" = EXCLUDED."lastReadAt",
+          "updatedAt" = now()
+      WHERE "UnreadCounter"."lastReadAt" <= EXCLUDED."lastReadAt"
+  `);
+}
+
+/**
+ * All non-zero counters for a user, keyed by channel
+ */
+export async function getUnreadCounts(
+  userId: string,
+): Promise<Record<string, number>> {
+  const rows = await prisma.unreadCounter.findMany({
+    where: { userId, count: { gt: 0 } },
+    select: { channel: true, count: true },
+  });
+  return Object.fromEntries(rows.map((row) => [row.channel, row.count]));
+}
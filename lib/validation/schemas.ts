@@ -163,6 +163,68 @@ export const taskPositionUpdateSchema = z.object({
   position: z.number().optional(),
 });
 
+// Batch and import rows (lib/task-batch.ts). Imports come from other tools,
+// so status / priority are case-insensitive ("In progress" → IN_PROGRESS)
+// and assignees and tags may be given by email and name.
+const enumValue = (val: unknown) =>
+  typeof val === "string"
+    ? val.trim().toUpperCase().replace(/[\s-]+/g, "_")
+    : val;
+
+const taskStatusSchema = z.preprocess(
+  enumValue,
+  z.enum(["TODO", "IN_PROGRESS", "DONE"]),
+);
+const taskPrioritySchema = z.preprocess(
+  enumValue,
+  z.enum(["LOW", "MEDIUM", "HIGH", "URGENT"]),
+);
+const batchDueDateSchema = z.preprocess(
+  (val) => (val === "" ? null : val),
+  z.union([z.null(), z.coerce.date()]),
+);
+
+export const taskImportRowSchema = z.object({
+  title: z.string().min(1, "Title is required").max(500).trim(),
+  description: descriptionSchema,
+  status: taskStatusSchema.default("TODO"),
+  priority: taskPrioritySchema.default("MEDIUM"),
+  dueDate: batchDueDateSchema.optional(),
+  assigneeId: optionalCuidSchema.optional(),
+  assigneeEmail: emailSchema.optional(),
+  tagIds: z.array(cuidSchema).optional(),
+  /** Tag names; missing tags are created in the workspace */
+  tags: z.array(z.string().min(1).max(50).trim()).optional(),
+});
+
+export const taskBatchUpdateSchema = z.object({
+  id: cuidSchema,
+  title: z.string().min(1).max(500).trim().optional(),
+  description: z.union([descriptionSchema, z.null()]).optional(),
+  status: taskStatusSchema.optional(),
+  priority: taskPrioritySchema.optional(),
+  dueDate: batchDueDateSchema.optional(),
+  assigneeId: optionalCuidSchema.optional(),
+  position: z.number().optional(),
+  tagIds: z.array(cuidSchema).optional(),
+});
+
+/** Rows are validated one by one so each gets its own result */
+export const taskBatchSchema = z
+  .object({
+    create: z.array(z.unknown()).default([]),
+    update: z.array(z.unknown()).default([]),
+    delete: z.array(z.string()).default([]),
+  })
+  .refine(
+    (batch) => {
+      const total =
+        batch.create.length + batch.update.length + batch.delete.length;
+      return total > 0 && total <= 500;
+    },
+    { message: "A batch must contain between 1 and 500 operations" },
+  );
+
 // ============================================================================
 // SUBTASK SCHEMAS
 // ============================================================================
@@ -360,18 +422,40 @@ export const folderUpdateSchema = z.object({
 // TIME ENTRY SCHEMAS
 // ============================================================================
 
-export const timeEntryCreateSchema = z
-  .object({
-    taskId: cuidSchema,
-    startTime: z.string().datetime(),
-    endTime: z.string().datetime(),
-    note: z.string().max(1000).trim().optional(),
-    isBillable: z.boolean().default(true),
-  })
-  .refine((data) => new Date(data.endTime) > new Date(data.startTime), {
-    message: "End time must be after start time",
-    path: ["endTime"],
-  });
+export const idempotencyKeySchema = z.string().min(1).max(255);
+
+const timeEntryFields = z.object({
+  taskId: cuidSchema,
+  startTime: z.string().datetime(),
+  endTime: z.string().datetime(),
+  note: z.string().max(1000).trim().optional(),
+  isBillable: z.boolean().default(true),
+});
+
+function endAfterStart(data: { startTime: string; endTime: string }) {
+  return new Date(data.endTime) > new Date(data.startTime);
+}
+
+const endAfterStartMessage = {
+  message: "End time must be after start time",
+  path: ["endTime"],
+};
+
+export const timeEntryCreateSchema = timeEntryFields.refine(
+  endAfterStart,
+  endAfterStartMessage,
+);
+
+export const timeEntryBulkCreateSchema = z.object({
+  entries: z
+    .array(
+      timeEntryFields
+        .extend({ idempotencyKey: idempotencyKeySchema.optional() })
+        .refine(endAfterStart, endAfterStartMessage),
+    )
+    .min(1)
+    .max(500),
+});
 
 export const timeEntryUpdateSchema = z.object({
   startTime: z.string().datetime().optional(),
@@ -388,6 +472,19 @@ export const timerStartSchema = z.object({
   taskId: cuidSchema,
 });
 
+export const timerActionSchema = z.discriminatedUnion("action", [
+  z.object({ action: z.literal("start"), taskId: cuidSchema }),
+  z.object({
+    action: z.literal("stop"),
+    note: z.string().max(1000).trim().optional(),
+  }),
+  z.object({
+    action: z.literal("switch"),
+    taskId: cuidSchema,
+    note: z.string().max(1000).trim().optional(),
+  }),
+]);
+
 // ============================================================================
 // TAG SCHEMAS
 // ============================================================================
@@ -427,3 +524,11 @@ export const searchSchema = z.object({
   type: z.enum(["all", "tasks", "files", "messages"]).default("all"),
   limit: z.coerce.number().int().min(1).max(50).default(20),
 });
+
+// ============================================================================
+// EXPORT SCHEMAS
+// ============================================================================
+
+export const workspaceExportSchema = z.object({
+  includeFiles: z.boolean().default(true),
+});
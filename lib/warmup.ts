@@ -0,0 +1,140 @@
+/**
+ * Server Warmup
+ *
+ * After a deploy or scale-out the first requests used to pay for opening
+ * database connections and for Next.js loading (in dev: compiling) each
+ * route module on its first hit. server.ts runs `warmup()` right after it
+ * starts listening:
+ *
+ * 1. database: fill WARMUP_DB_CONNECTIONS pool slots on the primary and
+ *    sample replica lag so reads can go to replicas immediately
+ * 2. routes: request every path in WARMUP_PATHS once so Next.js loads the
+ *    route modules and their imports (the responses, typically 401s for
+ *    unauthenticated API calls, are discarded)
+ *
+ * `/readyz` answers 503 until warmup has finished, so a load balancer only
+ * sends traffic to a warm instance. Failed steps are logged and do not
+ * block readiness. Set WARMUP=false to skip it.
+ */
+
+import { logEvent } from "@/lib/logger";
+import { warmDatabase } from "@/lib/prisma";
+
+export const WARMUP_ENABLED = process.env.WARMUP !== "false";
+
+const DB_CONNECTIONS = parseInt(process.env.WARMUP_DB_CONNECTIONS || "4", 10);
+const ROUTE_CONCURRENCY = 4;
+const ROUTE_TIMEOUT_MS = parseInt(
+  process.env.WARMUP_ROUTE_TIMEOUT_MS || "30000",
+  10,
+);
+
+// The routes every signed-in page load hits, plus the login page
+const DEFAULT_PATHS = [
+  "/api/bootstrap",
+  "/api/workspaces",
+  "/api/notifications",
+  "/api/unread",
+  "/api/tasks",
+  "/api/time",
+  "/api/calendar",
+  "/api/search",
+  "/login",
+];
+
+export const WARMUP_PATHS = process.env.WARMUP_PATHS
+  ? process.env.WARMUP_PATHS.split(",")
+      .map((path) => path.trim())
+      .filter(Boolean)
+  : DEFAULT_PATHS;
+
+export interface WarmupStep {
+  name: string;
+  ms: number;
+  ok: boolean;
+  error?: string;
+}
+
+export interface WarmupStatus {
+  ready: boolean;
+  /** Milliseconds from process start until ready */
+  readyAfterMs: number | null;
+  steps: WarmupStep[];
+}
+
+const status: WarmupStatus = {
+  ready: !WARMUP_ENABLED,
+  readyAfterMs: null,
+  steps: [],
+};
+
+export function isReady(): boolean {
+  return status.ready;
+}
+
+export function getWarmupStatus(): WarmupStatus {
+  return status;
+}
+
+async function step(name: string, fn: () => Promise<void>): Promise<void> {
+  const start = performance.now();
+  try {
+    await fn();
+    status.steps.push({ name, ms: Math.round(performance.now() - start), ok: true });
+  } catch (error) {
+    const message = error instanceof Error ? error.message : String(error);
+    status.steps.push({
+      name,
+      ms: Math.round(performance.now() - start),
+      ok: false,
+      error: message,
+    });
+    logEvent("server.warmup_step_failed", { step: name, error: message }, { level: "warn" });
+  }
+}
+
+async function warmRoute(baseUrl: string, path: string): Promise<void> {
+  const res = await fetch(baseUrl + path, {
+    headers: { "x-warmup": "1" },
+    redirect: "manual",
+    signal: AbortSignal.timeout(ROUTE_TIMEOUT_MS),
+  });
+  // Drain the body so streamed handlers run to completion
+  await res.arrayBuffer();
+  if (res.status >= 500) {
+    throw new Error(`${path} answered ${res.status}`);
+  }
+}
+
+/**
+ * Warm the database pool and route modules, then mark the server ready.
+ * `baseUrl` is the server's own listening address.
+ */
+export async function warmup(baseUrl: string): Promise<void> {
+  if (!WARMUP_ENABLED) return;
+  const start = performance.now();
+
+  // The pool is warmed alongside the routes, which need it anyway
+  const paths = [...WARMUP_PATHS];
+  await Promise.all([
+    step("database", () => warmDatabase(DB_CONNECTIONS)),
+    ...Array.from({ length: ROUTE_CONCURRENCY }, async () => {
+      for (let path = paths.shift(); path; path = paths.shift()) {
+        const current = path;
+        await step(`route ${current}`, () => warmRoute(baseUrl, current));
+      }
+    }),
+  ]);
+
+  status.ready = true;
+  status.readyAfterMs = Math.round(performance.now());
+  logEvent(
+    "server.warmup",
+    {
+      ms: Math.round(performance.now() - start),
+      readyAfterMs: status.readyAfterMs,
+      failed: status.steps.filter((s) => !s.ok).map((s) => s.name),
+    },
+    { sample: 1 },
+  );
+}
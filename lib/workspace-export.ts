@@ -0,0 +1,827 @@
+/**
+ * Workspace Export
+ *
+ * Builds a zip archive of a workspace in the background job worker
+ * (`workspace.export` job) and streams it back to workspace owners. Layout:
+ *
+ * - <section>/00001.ndjson, 00002.ndjson, ... - one JSON row per line, at
+ *   most EXPORT_ROWS_PER_ENTRY rows per file, for members, projects,
+ *   project_members, tags, tasks (with tagIds), subtasks, comments,
+ *   activities, time_entries, folders, files, file_versions and messages
+ *   (workspace and project channels, archived history included; direct
+ *   messages are private and left out)
+ * - files/<projectId>/<fileId>/<name> - uploaded files, current version
+ * - export.json - workspace, row counts and missing files, written last
+ *
+ * Rows are read through Postgres cursors (one DECLARE ... FETCH per
+ * entry, on a replica when one is configured) and files are streamed from
+ * storage straight into the deflater, so memory stays at roughly one
+ * archive part (EXPORT_PART_MB) whatever the workspace size.
+ *
+ * The archive is uploaded as numbered part objects. Between entries, once
+ * a part's worth of data or CHECKPOINT_INTERVAL_MS has gone by, the open
+ * part is closed and the position (section, last row ID, zip directory) is
+ * saved; a job that dies is retried and continues from there instead of
+ * starting over. The download route concatenates the parts, with Range
+ * support, so interrupted downloads can be resumed too.
+ */
+
+import { Prisma, type WorkspaceExport } from "@prisma/client";
+import { bulkReadPrisma, prisma } from "@/lib/prisma";
+import { enqueueJob } from "@/lib/jobs/queue";
+import { ForbiddenError, NotFoundError } from "@/lib/auth/guards";
+import { logEvent } from "@/lib/logger";
+import { fetchObject, uploadObject } from "@/lib/storage";
+import { ZipWriter, type ZipState } from "@/lib/zip-stream";
+
+const PART_BYTES =
+  parseInt(process.env.EXPORT_PART_MB || "16") * 1024 * 1024;
+const ROWS_PER_ENTRY = parseInt(process.env.EXPORT_ROWS_PER_ENTRY || "50000");
+// Attempts before an export is marked FAILED; each resumes where the
+// previous one stopped
+export const EXPORT_MAX_ATTEMPTS = 5;
+const FETCH_SIZE = 1000;
+const FILE_PAGE_SIZE = 100;
+const CHECKPOINT_INTERVAL_MS = 30 * 1000;
+const PROGRESS_INTERVAL_MS = 5 * 1000;
+// Cursor transaction for one entry
+const ENTRY_TIMEOUT_MS = 10 * 60 * 1000;
+// A RUNNING export not heard from for this long belongs to a dead worker
+const STALE_MS = parseInt(process.env.JOB_LOCK_TIMEOUT_MS || "300000");
+// Stored without recompressing (deflate level 0)
+const COMPRESSED_TYPE = new RegExp(
+  "^(image/(?!svg)|video/|audio/|" +
+    "application/(zip|gzip|pdf|x-7z|x-rar|vnd\\.openxmlformats))",
+);
+
+export interface ExportProgress {
+  /** Section being written, "files", "finishing" or "done" */
+  step: string;
+  /** Rows per section when the export started */
+  totals: Record<string, number>;
+  /** Rows written per section */
+  rows: Record<string, number>;
+  files: {
+    total: number;
+    done: number;
+    totalBytes: number;
+    bytes: number;
+    missing: number;
+  };
+  /** Archive bytes written */
+  bytes: number;
+}
+
+interface Checkpoint {
+  /** Index into SECTIONS; SECTIONS.length is the files step */
+  step: number;
+  /** Last row or file ID written in the current step */
+  after: string;
+  /** Next entry number in the current section */
+  entry: number;
+  zip: ZipState;
+  progress: ExportProgress;
+}
+
+// ============================================================================
+// SECTIONS
+// ============================================================================
+
+interface Section {
+  name: string;
+  columns: Prisma.Sql;
+  /** Table(s), aliased x */
+  from: Prisma.Sql;
+  where: (workspaceId: string) => Prisma.Sql;
+  map?: (
+    row: Record<string, unknown>,
+    exportRow: WorkspaceExport,
+  ) => Record<string, unknown>;
+}
+
+type ArchivedFile = { id: string; projectId: string; originalName: string };
+
+/** Archive path of an uploaded file */
+function fileEntryName(file: ArchivedFile): string {
+  const name = file.originalName.replace(/[/\\]/g, "_").replace(/^\.+$/, "_");
+  return `files/${file.projectId}/${file.id}/${name || "file"}`;
+}
+
+const inWorkspace = (workspaceId: string) =>
+  Prisma.sql`x."workspaceId" = ${workspaceId}`;
+const inProjects = (workspaceId: string) =>
+  Prisma.sql`x."projectId" IN (SELECT id FROM "Project" WHERE "workspaceId" = ${workspaceId})`;
+const inTasks = (workspaceId: string) =>
+  Prisma.sql`x."taskId" IN (
+    SELECT t.id FROM "Task" t JOIN "Project" p ON p.id = t."projectId"
+    WHERE p."workspaceId" = ${workspaceId}
+  )`;
+
+const MESSAGE_COLUMNS = Prisma.raw(`id, content, "workspaceId", "projectId",
+  "conversationId", "receiverId", "senderId", "parentId", "isPinned",
+  "reactionCounts", "createdAt", "updatedAt"`);
+
+const SECTIONS: Section[] = [
+  {
+    name: "members",
+    columns: Prisma.sql`x.id, x."userId", u.name, u.email, x.role, x."joinedAt"`,
+    from: Prisma.sql`"WorkspaceMember" x JOIN "User" u ON u.id = x."userId"`,
+    where: inWorkspace,
+  },
+  {
+    name: "projects",
+    columns: Prisma.sql`x.id, x.name, x.description, x.status, x."createdAt", x."updatedAt"`,
+    from: Prisma.sql`"Project" x`,
+    where: inWorkspace,
+  },
+  {
+    name: "project_members",
+    columns: Prisma.sql`x.id, x."projectId", x."userId", x.role, x."joinedAt"`,
+    from: Prisma.sql`"ProjectMember" x`,
+    where: inProjects,
+  },
+  {
+    name: "tags",
+    columns: Prisma.sql`x.id, x.name, x.color, x."createdAt"`,
+    from: Prisma.sql`"Tag" x`,
+    where: inWorkspace,
+  },
+  {
+    name: "tasks",
+    columns: Prisma.sql`x.id, x."projectId", x.title, x.description, x.status,
+      x.priority, x."dueDate", x.position, x."assigneeId", x."creatorId",
+      x."createdAt", x."updatedAt",
+      ARRAY(SELECT tt."A" FROM "_TagToTask" tt WHERE tt."B" = x.id) AS "tagIds"`,
+    from: Prisma.sql`"Task" x`,
+    where: inProjects,
+  },
+  {
+    name: "subtasks",
+    columns: Prisma.sql`x.id, x."taskId", x.title, x.completed, x.position,
+      x."createdAt", x."updatedAt"`,
+    from: Prisma.sql`"Subtask" x`,
+    where: inTasks,
+  },
+  {
+    name: "comments",
+    columns: Prisma.sql`x.id, x."taskId", x."authorId", x.content, x."createdAt"`,
+    from: Prisma.sql`"Comment" x`,
+    where: inTasks,
+  },
+  {
+    name: "activities",
+    columns: Prisma.sql`x.id, x."taskId", x."userId", x.type, x.metadata, x."createdAt"`,
+    from: Prisma.sql`"Activity" x`,
+    where: inTasks,
+  },
+  {
+    name: "time_entries",
+    columns: Prisma.sql`x.id, x."taskId", x."userId", x."startTime", x."endTime",
+      x.duration, x.note, x."isBillable", x."createdAt"`,
+    from: Prisma.sql`"TimeEntry" x`,
+    where: inTasks,
+  },
+  {
+    name: "folders",
+    columns: Prisma.sql`x.id, x."projectId", x."parentId", x.name, x."createdAt"`,
+    from: Prisma.sql`"Folder" x`,
+    where: inProjects,
+  },
+  {
+    name: "files",
+    columns: Prisma.sql`x.id, x."projectId", x."taskId", x."folderId",
+      x."originalName", x."mimeType", x.size, x."uploadedById", x."createdAt"`,
+    from: Prisma.sql`"File" x`,
+    where: inProjects,
+    map: (row, exportRow) =>
+      exportRow.includeFiles
+        ? { ...row, archivePath: fileEntryName(row as ArchivedFile) }
+        : row,
+  },
+  {
+    name: "file_versions",
+    columns: Prisma.sql`x.id, x."fileId", x."versionNumber", x."originalName",
+      x."mimeType", x.size, x."uploadedById", x."createdAt"`,
+    from: Prisma.sql`"FileVersion" x`,
+    where: (workspaceId) =>
+      Prisma.sql`x."fileId" IN (
+        SELECT f.id FROM "File" f JOIN "Project" p ON p.id = f."projectId"
+        WHERE p."workspaceId" = ${workspaceId}
+      )`,
+  },
+  {
+    name: "messages",
+    columns: Prisma.sql`x.*`,
+    from: Prisma.sql`(
+      SELECT ${MESSAGE_COLUMNS}, false AS archived FROM "Message"
+      UNION ALL
+      SELECT ${MESSAGE_COLUMNS}, true AS archived FROM "MessageArchive"
+    ) x`,
+    where: (workspaceId) => Prisma.sql`
+      (${inWorkspace(workspaceId)} OR ${inProjects(workspaceId)})
+      AND x."conversationId" IS NULL AND x."receiverId" IS NULL`,
+  },
+];
+
+
+// ============================================================================
+// ARCHIVE PARTS
+// ============================================================================
+
+export function exportPartKey(exportRow: WorkspaceExport, part: number) {
+  const name = String(part).padStart(5, "0");
+  return `exports/${exportRow.workspaceId}/${exportRow.id}/${name}.part`;
+}
+
+/**
+ * Collects archive bytes and uploads them as numbered part objects of
+ * about PART_BYTES. `flush` closes the current part early (checkpoints).
+ */
+class PartSink {
+  private buffer: Buffer[] = [];
+  private buffered = 0;
+
+  constructor(
+    private exportRow: WorkspaceExport,
+    /** Sizes of the parts uploaded so far */
+    readonly parts: number[],
+    private onPart: () => Promise<void>,
+  ) {}
+
+  write = async (chunk: Buffer): Promise<void> => {
+    this.buffer.push(chunk);
+    this.buffered += chunk.length;
+    if (this.buffered >= PART_BYTES) await this.flush();
+  };
+
+  async flush(): Promise<void> {
+    if (this.buffered === 0) return;
+    const body = Buffer.concat(this.buffer);
+    this.buffer = [];
+    this.buffered = 0;
+    await uploadObject(exportPartKey(this.exportRow, this.parts.length), body);
+    this.parts.push(body.length);
+    await this.onPart();
+  }
+}
+
+// ============================================================================
+// EXPORT RUN
+// ============================================================================
+
+function toJson(value: unknown): Prisma.InputJsonValue {
+  return JSON.parse(JSON.stringify(value)) as Prisma.InputJsonValue;
+}
+
+async function* readChunks(
+  body: ReadableStream<Uint8Array>,
+  onChunk: (bytes: number) => void,
+): AsyncGenerator<Uint8Array> {
+  const reader = body.getReader();
+  let finished = false;
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) {
+        finished = true;
+        return;
+      }
+      onChunk(value.length);
+      yield value;
+    }
+  } finally {
+    // Stopped early (failed entry, cancelled download): drop the connection
+    if (!finished) await reader.cancel().catch(() => {});
+  }
+}
+
+async function countRows(workspaceId: string) {
+  const db = bulkReadPrisma();
+  const totals: Record<string, number> = {};
+  for (const section of SECTIONS) {
+    const [{ count }] = await db.$queryRaw<[{ count: number }]>`
+      SELECT COUNT(*)::int AS count
+      FROM ${section.from} WHERE ${section.where(workspaceId)}
+    `;
+    totals[section.name] = count;
+  }
+  const [files] = await db.$queryRaw<[{ count: number; bytes: number }]>`
+    SELECT COUNT(*)::int AS count, COALESCE(SUM(x.size), 0)::float8 AS bytes
+    FROM "File" x WHERE ${inProjects(workspaceId)}
+  `;
+  return { totals, files };
+}
+
+class ExportRun {
+  private sink: PartSink;
+  private zip: ZipWriter;
+  private checkpointAt = Date.now();
+  private checkpointBytes: number;
+  private progressAt = 0;
+
+  constructor(
+    private exportRow: WorkspaceExport,
+    private checkpoint: Checkpoint,
+    parts: number[],
+  ) {
+    this.sink = new PartSink(exportRow, parts, () => this.reportProgress());
+    this.zip = new ZipWriter(this.sink.write, checkpoint.zip);
+    this.checkpointBytes = checkpoint.zip.offset;
+  }
+
+  private get progress() {
+    return this.checkpoint.progress;
+  }
+
+  async run(): Promise<void> {
+    const { workspaceId } = this.exportRow;
+    const cp = this.checkpoint;
+
+    for (; cp.step < SECTIONS.length; cp.step++) {
+      const section = SECTIONS[cp.step];
+      this.progress.step = section.name;
+      while (await this.writeRows(section, workspaceId)) {
+        await this.maybeCheckpoint();
+      }
+      cp.after = "";
+      cp.entry = 1;
+    }
+
+    if (this.exportRow.includeFiles) {
+      this.progress.step = "files";
+      while (await this.writeFiles(workspaceId)) {
+        // Pages of FILE_PAGE_SIZE until none are left
+      }
+    }
+
+    this.progress.step = "finishing";
+    await this.writeManifest();
+    await this.zip.finish();
+    await this.sink.flush();
+    this.progress.step = "done";
+    this.progress.bytes = this.zip.state.offset;
+  }
+
+  /**
+   * Write the next entry of a section through a cursor. Returns false
+   * when the section is done.
+   */
+  private async writeRows(
+    section: Section,
+    workspaceId: string,
+  ): Promise<boolean> {
+    const cp = this.checkpoint;
+    const limit = Prisma.raw(String(ROWS_PER_ENTRY));
+    const fetchSize = Prisma.raw(String(FETCH_SIZE));
+
+    return bulkReadPrisma().$transaction(
+      async (tx) => {
+        await tx.$executeRaw`
+          DECLARE export_rows NO SCROLL CURSOR FOR
+          SELECT ${section.columns}
+          FROM ${section.from}
+          WHERE ${section.where(workspaceId)} AND x.id > ${cp.after}
+          ORDER BY x.id
+          LIMIT ${limit}
+        `;
+        const fetchRows = () =>
+          tx.$queryRaw<Record<string, unknown>[]>`
+            FETCH ${fetchSize} FROM export_rows
+          `;
+
+        let rows = await fetchRows();
+        if (rows.length === 0) return false;
+
+        let count = 0;
+        let last = cp.after;
+        const exportRow = this.exportRow;
+        const map = section.map ?? ((row) => row);
+        async function* ndjson(): AsyncGenerator<Buffer> {
+          while (rows.length > 0) {
+            count += rows.length;
+            last = rows[rows.length - 1].id as string;
+            const lines = rows.map((row) =>
+              JSON.stringify(map(row, exportRow)),
+            );
+            yield Buffer.from(lines.join("\n") + "\n");
+            if (rows.length < FETCH_SIZE) return;
+            rows = await fetchRows();
+          }
+        }
+
+        const entry = String(cp.entry).padStart(5, "0");
+        await this.zip.addEntry(`${section.name}/${entry}.ndjson`, ndjson(), {
+          modified: this.exportRow.createdAt,
+        });
+
+        cp.after = last;
+        cp.entry++;
+        this.progress.rows[section.name] =
+          (this.progress.rows[section.name] ?? 0) + count;
+        return count === ROWS_PER_ENTRY;
+      },
+      { timeout: ENTRY_TIMEOUT_MS, maxWait: 10 * 1000 },
+    );
+  }
+
+  /**
+   * Stream the next page of files into the archive. Returns false when
+   * all files are written.
+   */
+  private async writeFiles(workspaceId: string): Promise<boolean> {
+    const cp = this.checkpoint;
+    const files = await bulkReadPrisma().$queryRaw<
+      {
+        id: string;
+        projectId: string;
+        originalName: string;
+        mimeType: string;
+        key: string;
+        createdAt: Date;
+      }[]
+    >`
+      SELECT x.id, x."projectId", x."originalName", x."mimeType", x.key,
+             x."createdAt"
+      FROM "File" x
+      WHERE ${inProjects(workspaceId)} AND x.id > ${cp.after}
+      ORDER BY x.id
+      LIMIT ${FILE_PAGE_SIZE}
+    `;
+
+    for (const file of files) {
+      const res = await fetchObject(file.key);
+      if (res?.body) {
+        const body = readChunks(res.body, (bytes) => {
+          this.progress.files.bytes += bytes;
+        });
+        await this.zip.addEntry(fileEntryName(file), body, {
+          level: COMPRESSED_TYPE.test(file.mimeType) ? 0 : 6,
+          modified: file.createdAt,
+          // File.size is a 32-bit column, so it cannot tell which objects
+          // come near 4 GiB; the zip64 header costs 20 bytes
+          zip64: true,
+        });
+      } else {
+        this.progress.files.missing++;
+        logEvent(
+          "export.file_missing",
+          { exportId: this.exportRow.id, fileId: file.id },
+          { level: "warn" },
+        );
+      }
+      this.progress.files.done++;
+      cp.after = file.id;
+      await this.maybeCheckpoint();
+    }
+    return files.length === FILE_PAGE_SIZE;
+  }
+
+  private async writeManifest(): Promise<void> {
+    const workspace = await prisma.workspace.findUniqueOrThrow({
+      where: { id: this.exportRow.workspaceId },
+      select: { id: true, name: true, slug: true, createdAt: true },
+    });
+    const manifest = {
+      format: 1,
+      exportId: this.exportRow.id,
+      exportedAt: this.exportRow.createdAt,
+      workspace,
+      rows: this.progress.rows,
+      files: this.exportRow.includeFiles
+        ? {
+            count: this.progress.files.done - this.progress.files.missing,
+            bytes: this.progress.files.bytes,
+            missing: this.progress.files.missing,
+          }
+        : null,
+    };
+    async function* body() {
+      yield Buffer.from(JSON.stringify(manifest, null, 2) + "\n");
+    }
+    await this.zip.addEntry("export.json", body(), {
+      modified: this.exportRow.createdAt,
+    });
+  }
+
+  /** Between entries: close the part and save the position when due */
+  private async maybeCheckpoint(): Promise<void> {
+    const offset = this.zip.state.offset;
+    if (
+      offset - this.checkpointBytes < PART_BYTES &&
+      Date.now() - this.checkpointAt < CHECKPOINT_INTERVAL_MS
+    ) {
+      return this.reportProgress();
+    }
+
+    await this.sink.flush();
+    this.checkpoint.zip = this.zip.state;
+    this.progress.bytes = offset;
+    await prisma.workspaceExport.update({
+      where: { id: this.exportRow.id },
+      data: {
+        checkpoint: toJson(this.checkpoint),
+        parts: this.sink.parts,
+        progress: toJson(this.progress),
+      },
+    });
+    await this.touchJob();
+    this.checkpointAt = this.progressAt = Date.now();
+    this.checkpointBytes = offset;
+  }
+
+  /** Progress for the status endpoint; doubles as the liveness heartbeat */
+  private async reportProgress(): Promise<void> {
+    if (Date.now() - this.progressAt < PROGRESS_INTERVAL_MS) return;
+    this.progressAt = Date.now();
+    this.progress.bytes = this.zip.state.offset;
+    await prisma.workspaceExport.update({
+      where: { id: this.exportRow.id },
+      data: { progress: toJson(this.progress) },
+    });
+    await this.touchJob();
+  }
+
+  /** Keep the worker from releasing the job as stale while it runs */
+  private async touchJob(): Promise<void> {
+    await prisma.job.updateMany({
+      where: {
+        type: "workspace.export",
+        status: "RUNNING",
+        payload: { path: ["exportId"], equals: this.exportRow.id },
+      },
+      data: { lockedAt: new Date() },
+    });
+  }
+
+  get parts(): number[] {
+    return this.sink.parts;
+  }
+}
+
+/**
+ * Run (or resume) an export; called by the `workspace.export` job.
+ * Throws to have the job retried from the last checkpoint.
+ */
+export async function runWorkspaceExport(exportId: string): Promise<void> {
+  const claimed = await prisma.workspaceExport.updateMany({
+    where: {
+      id: exportId,
+      OR: [
+        { status: "PENDING" },
+        {
+          status: "RUNNING",
+          updatedAt: { lt: new Date(Date.now() - STALE_MS) },
+        },
+      ],
+    },
+    data: { status: "RUNNING", attempts: { increment: 1 } },
+  });
+  if (claimed.count === 0) {
+    const current = await prisma.workspaceExport.findUnique({
+      where: { id: exportId },
+      select: { status: true },
+    });
+    // Deleted with its workspace, or already finished
+    if (!current || current.status !== "RUNNING") return;
+    throw new Error(`Export ${exportId} is running in another worker`);
+  }
+
+  const exportRow = await prisma.workspaceExport.findUniqueOrThrow({
+    where: { id: exportId },
+  });
+  const start = performance.now();
+
+  try {
+    let checkpoint = exportRow.checkpoint as Checkpoint | null;
+    if (!checkpoint) {
+      const { totals, files } = await countRows(exportRow.workspaceId);
+      checkpoint = {
+        step: 0,
+        after: "",
+        entry: 1,
+        zip: { offset: 0, entries: [] },
+        progress: {
+          step: SECTIONS[0].name,
+          totals,
+          rows: {},
+          files: {
+            total: exportRow.includeFiles ? files.count : 0,
+            done: 0,
+            totalBytes: exportRow.includeFiles ? files.bytes : 0,
+            bytes: 0,
+            missing: 0,
+          },
+          bytes: 0,
+        },
+      };
+    }
+    // Parts uploaded after the checkpoint are rewritten
+    const parts = (exportRow.parts as number[]).slice(
+      0,
+      countParts(exportRow.parts as number[], checkpoint.zip.offset),
+    );
+
+    const run = new ExportRun(exportRow, checkpoint, parts);
+    await run.run();
+
+    await prisma.workspaceExport.update({
+      where: { id: exportId },
+      data: {
+        status: "COMPLETED",
+        checkpoint: Prisma.DbNull,
+        parts: run.parts,
+        progress: toJson(checkpoint.progress),
+        error: null,
+        completedAt: new Date(),
+      },
+    });
+    logEvent("export.completed", {
+      exportId,
+      workspaceId: exportRow.workspaceId,
+      bytes: checkpoint.progress.bytes,
+      ms: Math.round(performance.now() - start),
+    });
+  } catch (error) {
+    const message = error instanceof Error ? error.message : String(error);
+    const exhausted = exportRow.attempts >= EXPORT_MAX_ATTEMPTS;
+    await prisma.workspaceExport.update({
+      where: { id: exportId },
+      data: {
+        status: exhausted ? "FAILED" : "PENDING",
+        error: message.slice(0, 1000),
+      },
+    });
+    if (!exhausted) throw error;
+    logEvent("export.failed", { exportId, error: message }, { level: "error" });
+  }
+
+  await enqueueJob("realtime.broadcast", {
+    channel: `user:${exportRow.requestedById}`,
+    event: "export-updated",
+    payload: { exportId, workspaceId: exportRow.workspaceId },
+  });
+}
+
+/** Number of leading parts that make up exactly `bytes` */
+function countParts(parts: number[], bytes: number): number {
+  let total = 0;
+  for (let i = 0; i < parts.length; i++) {
+    if (total === bytes) return i;
+    total += parts[i];
+  }
+  if (total !== bytes) {
+    throw new Error("Export parts do not match the checkpoint");
+  }
+  return parts.length;
+}
+
+// ============================================================================
+// API
+// ============================================================================
+
+/**
+ * Workspace by slug, if the user may export it (an owner)
+ *
+ * @throws {NotFoundError} Unknown workspace or not a member
+ * @throws {ForbiddenError} A member but not an owner
+ */
+export async function getExportableWorkspace(userId: string, slug: string) {
+  const workspace = await prisma.workspace.findUnique({
+    where: { slug },
+    select: {
+      id: true,
+      slug: true,
+      ownerId: true,
+      members: { where: { userId }, select: { role: true } },
+    },
+  });
+  if (!workspace || workspace.members.length === 0) {
+    throw new NotFoundError("Workspace not found");
+  }
+  if (workspace.ownerId !== userId && workspace.members[0].role !== "OWNER") {
+    throw new ForbiddenError("Only workspace owners can export data");
+  }
+  return workspace;
+}
+
+/**
+ * Queue an export, or return the one already queued or running for the
+ * workspace
+ */
+export async function startWorkspaceExport(
+  workspaceId: string,
+  userId: string,
+  includeFiles: boolean,
+): Promise<{ exportRow: WorkspaceExport; created: boolean }> {
+  const active = await prisma.workspaceExport.findFirst({
+    where: { workspaceId, status: { in: ["PENDING", "RUNNING"] } },
+  });
+  if (active) {
+    // Its job ran out of attempts without the export recording a failure
+    // (e.g. workers killed repeatedly): queue it again
+    const job = await prisma.job.findFirst({
+      where: {
+        type: "workspace.export",
+        status: { in: ["PENDING", "RUNNING"] },
+        payload: { path: ["exportId"], equals: active.id },
+      },
+      select: { id: true },
+    });
+    if (!job) await enqueueExportJob(active.id);
+    return { exportRow: active, created: false };
+  }
+
+  const exportRow = await prisma.workspaceExport.create({
+    data: { workspaceId, requestedById: userId, includeFiles },
+  });
+  await enqueueExportJob(exportRow.id);
+  return { exportRow, created: true };
+}
+
+function enqueueExportJob(exportId: string) {
+  // Attempts are counted on the export (EXPORT_MAX_ATTEMPTS); the extra job
+  // attempts cover a worker dying before it could record a failure
+  return enqueueJob(
+    "workspace.export",
+    { exportId },
+    { maxAttempts: EXPORT_MAX_ATTEMPTS * 2 },
+  );
+}
+
+/** Archive size in bytes (of the parts uploaded so far) */
+export function exportSize(exportRow: WorkspaceExport): number {
+  return (exportRow.parts as number[]).reduce((a, b) => a + b, 0);
+}
+
+/** Status as returned by the export routes */
+export function describeExport(exportRow: WorkspaceExport, slug: string) {
+  const progress = exportRow.progress as Partial<ExportProgress>;
+  const done = exportRow.status === "COMPLETED";
+  return {
+    id: exportRow.id,
+    status: exportRow.status,
+    includeFiles: exportRow.includeFiles,
+    progress,
+    size: done ? exportSize(exportRow) : null,
+    error: exportRow.status === "FAILED" ? exportRow.error : null,
+    createdAt: exportRow.createdAt,
+    completedAt: exportRow.completedAt,
+    downloadUrl: done
+      ? `/api/workspaces/${slug}/exports/${exportRow.id}/download`
+      : null,
+  };
+}
+
+/**
+ * Bytes `start`..`end` (inclusive) of a completed archive, read part by
+ * part from storage as the client consumes them
+ */
+export function streamExportArchive(
+  exportRow: WorkspaceExport,
+  start: number,
+  end: number,
+): ReadableStream<Uint8Array> {
+  const parts = exportRow.parts as number[];
+
+  async function* chunks(): AsyncGenerator<Uint8Array> {
+    let partStart = 0;
+    for (let i = 0; i < parts.length && partStart <= end; i++) {
+      const partEnd = partStart + parts[i] - 1;
+      if (partEnd >= start) {
+        const from = Math.max(start, partStart) - partStart;
+        const to = Math.min(end, partEnd) - partStart;
+        const res = await fetchObject(
+          exportPartKey(exportRow, i),
+          `bytes=${from}-${to}`,
+        );
+        if (!res?.body) throw new Error(`Export part ${i} is missing`);
+        yield* readChunks(res.body, () => {});
+      }
+      partStart = partEnd + 1;
+    }
+  }
+
+  const iterator = chunks();
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { done, value } = await iterator.next();
+        if (done) controller.close();
+        else controller.enqueue(value);
+      } catch (error) {
+        logEvent(
+          "export.download_failed",
+          {
+            exportId: exportRow.id,
+            error: error instanceof Error ? error.message : String(error),
+          },
+          { level: "error" },
+        );
+        controller.error(error);
+      }
+    },
+    async cancel() {
+      await iterator.return(undefined);
+    },
+  });
+}
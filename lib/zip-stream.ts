@@ -0,0 +1,265 @@
+/**
+ * Streaming Zip Writer
+ *
+ * Writes a zip archive front to back into an async sink, one entry at a
+ * time, without knowing entry sizes in advance: every entry is deflated
+ * as its data arrives and followed by a data descriptor carrying its CRC
+ * and sizes. Only the central directory records (a few dozen bytes per
+ * entry) are kept in memory.
+ *
+ * The writer's position can be saved between entries (`state`) and a new
+ * writer created from it continues the same archive, which is how
+ * workspace exports resume after a worker restart (lib/workspace-export.ts).
+ *
+ * Zip64 records are added only where a size, offset or the entry count
+ * does not fit the classic format, so small archives stay readable by
+ * every unzip tool. An entry that may reach 4 GiB has to say so up front
+ * (`zip64`): streaming readers parse the local header, which is written
+ * before the size is known, to tell how long the data descriptor is.
+ */
+
+import { createDeflateRaw } from "zlib";
+import { pipeline } from "stream/promises";
+
+/** [name, crc32, compressed size, size, header offset, DOS time, DOS date] */
+export type ZipEntryRecord = [
+  string,
+  number,
+  number,
+  number,
+  number,
+  number,
+  number,
+];
+
+export interface ZipState {
+  /** Bytes written so far */
+  offset: number;
+  entries: ZipEntryRecord[];
+}
+
+export interface ZipEntryOptions {
+  /** zlib level; 0 stores already-compressed data without recompressing */
+  level?: number;
+  modified?: Date;
+  /** Write a zip64 local header, so the entry may reach 4 GiB */
+  zip64?: boolean;
+}
+
+const MAX_32 = 0xffffffff;
+const MAX_16 = 0xffff;
+// General purpose flags: sizes in a data descriptor (3), UTF-8 names (11)
+const FLAGS = 0x0808;
+const METHOD_DEFLATE = 8;
+// Made by Unix (3) with zip 4.5, so regular-file permissions are kept
+const VERSION_MADE_BY = (3 << 8) | 45;
+const FILE_ATTRIBUTES = 0o100644 * 0x10000;
+
+const CRC_TABLE = new Int32Array(256).map((_, n) => {
+  let c = n;
+  for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+  return c;
+});
+
+export function crc32(bytes: Uint8Array, crc = 0): number {
+  let c = ~crc;
+  for (let i = 0; i < bytes.length; i++) {
+    c = CRC_TABLE[(c ^ bytes[i]) & 0xff] ^ (c >>> 8);
+  }
+  return ~c >>> 0;
+}
+
+function dosDateTime(date: Date): [number, number] {
+  const year = Math.max(date.getFullYear(), 1980);
+  return [
+    (date.getHours() << 11) |
+      (date.getMinutes() << 5) |
+      (date.getSeconds() >> 1),
+    ((year - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate(),
+  ];
+}
+
+export class ZipWriter {
+  private offset: number;
+  private entries: ZipEntryRecord[];
+
+  constructor(
+    private sink: (chunk: Buffer) => Promise<void>,
+    state: ZipState = { offset: 0, entries: [] },
+  ) {
+    this.offset = state.offset;
+    this.entries = [...state.entries];
+  }
+
+  /** Position to resume from; valid between entries */
+  get state(): ZipState {
+    return { offset: this.offset, entries: this.entries };
+  }
+
+  private async write(chunk: Buffer): Promise<void> {
+    this.offset += chunk.length;
+    await this.sink(chunk);
+  }
+
+  /**
+   * Add one entry, deflating `data` as it is read. If `data` throws, the
+   * archive is left mid-entry; resume from the last saved state.
+   */
+  async addEntry(
+    name: string,
+    data: AsyncIterable<Uint8Array>,
+    { level = 6, modified = new Date(), zip64 = false }: ZipEntryOptions = {},
+  ): Promise<void> {
+    const nameBytes = Buffer.from(name, "utf8");
+    const headerOffset = this.offset;
+    const [time, date] = dosDateTime(modified);
+
+    const header = Buffer.alloc(30);
+    header.writeUInt32LE(0x04034b50, 0);
+    header.writeUInt16LE(zip64 ? 45 : 20, 4);
+    header.writeUInt16LE(FLAGS, 6);
+    header.writeUInt16LE(METHOD_DEFLATE, 8);
+    header.writeUInt16LE(time, 10);
+    header.writeUInt16LE(date, 12);
+    // CRC and sizes (14-25) are zero: they follow in the data descriptor
+    header.writeUInt16LE(nameBytes.length, 26);
+    // Zip64 extra field with zero sizes; the sizes point to it
+    const extra = Buffer.alloc(zip64 ? 20 : 0);
+    if (zip64) {
+      header.writeUInt32LE(MAX_32, 18);
+      header.writeUInt32LE(MAX_32, 22);
+      header.writeUInt16LE(extra.length, 28);
+      extra.writeUInt16LE(0x0001, 0);
+      extra.writeUInt16LE(16, 2);
+    }
+    await this.write(Buffer.concat([header, nameBytes, extra]));
+
+    let crc = 0;
+    let size = 0;
+    let compressedSize = 0;
+    await pipeline(
+      async function* () {
+        for await (const chunk of data) {
+          crc = crc32(chunk, crc);
+          size += chunk.length;
+          yield chunk;
+        }
+      },
+      createDeflateRaw({ level }),
+      async (compressed: AsyncIterable<Buffer>) => {
+        for await (const chunk of compressed) {
+          compressedSize += chunk.length;
+          await this.write(chunk);
+        }
+      },
+    );
+
+    if (!zip64 && (size >= MAX_32 || compressedSize >= MAX_32)) {
+      throw new Error(`Zip entry ${name} reached 4 GiB without zip64`);
+    }
+    // Readers size the descriptor from the local header
+    const descriptor = Buffer.alloc(zip64 ? 24 : 16);
+    descriptor.writeUInt32LE(0x08074b50, 0);
+    descriptor.writeUInt32LE(crc, 4);
+    if (zip64) {
+      descriptor.writeBigUInt64LE(BigInt(compressedSize), 8);
+      descriptor.writeBigUInt64LE(BigInt(size), 16);
+    } else {
+      descriptor.writeUInt32LE(compressedSize, 8);
+      descriptor.writeUInt32LE(size, 12);
+    }
+    await this.write(descriptor);
+
+    this.entries.push([
+      name,
+      crc,
+      compressedSize,
+      size,
+      headerOffset,
+      time,
+      date,
+    ]);
+  }
+
+  /** Write the central directory and end records */
+  async finish(): Promise<void> {
+    const directoryOffset = this.offset;
+    for (const entry of this.entries) {
+      await this.write(directoryRecord(entry));
+    }
+    const directorySize = this.offset - directoryOffset;
+    const count = this.entries.length;
+
+    const zip64 =
+      count >= MAX_16 || directoryOffset >= MAX_32 || directorySize >= MAX_32;
+    if (zip64) {
+      const end64Offset = this.offset;
+      const end64 = Buffer.alloc(56 + 20);
+      end64.writeUInt32LE(0x06064b50, 0);
+      end64.writeBigUInt64LE(BigInt(44), 4);
+      end64.writeUInt16LE(VERSION_MADE_BY, 12);
+      end64.writeUInt16LE(45, 14);
+      end64.writeBigUInt64LE(BigInt(count), 24);
+      end64.writeBigUInt64LE(BigInt(count), 32);
+      end64.writeBigUInt64LE(BigInt(directorySize), 40);
+      end64.writeBigUInt64LE(BigInt(directoryOffset), 48);
+      // Locator
+      end64.writeUInt32LE(0x07064b50, 56);
+      end64.writeBigUInt64LE(BigInt(end64Offset), 64);
+      end64.writeUInt32LE(1, 72);
+      await this.write(end64);
+    }
+
+    const end = Buffer.alloc(22);
+    end.writeUInt32LE(0x06054b50, 0);
+    end.writeUInt16LE(Math.min(count, MAX_16), 8);
+    end.writeUInt16LE(Math.min(count, MAX_16), 10);
+    end.writeUInt32LE(Math.min(directorySize, MAX_32), 12);
+    end.writeUInt32LE(Math.min(directoryOffset, MAX_32), 16);
+    await this.write(end);
+  }
+}
+
+function directoryRecord([
+  name,
+  crc,
+  compressedSize,
+  size,
+  offset,
+  time,
+  date,
+]: ZipEntryRecord): Buffer {
+  const nameBytes = Buffer.from(name, "utf8");
+
+  // Zip64 extra field: only the values that overflow, in this order
+  const extraValues = [size, compressedSize, offset].filter(
+    (value) => value >= MAX_32,
+  );
+  const extra = Buffer.alloc(
+    extraValues.length ? 4 + 8 * extraValues.length : 0,
+  );
+  if (extraValues.length) {
+    extra.writeUInt16LE(0x0001, 0);
+    extra.writeUInt16LE(8 * extraValues.length, 2);
+    extraValues.forEach((value, i) => {
+      extra.writeBigUInt64LE(BigInt(value), 4 + 8 * i);
+    });
+  }
+
+  const record = Buffer.alloc(46);
+  record.writeUInt32LE(0x02014b50, 0);
+  record.writeUInt16LE(VERSION_MADE_BY, 4);
+  record.writeUInt16LE(extraValues.length ? 45 : 20, 6);
+  record.writeUInt16LE(FLAGS, 8);
+  record.writeUInt16LE(METHOD_DEFLATE, 10);
+  record.writeUInt16LE(time, 12);
+  record.writeUInt16LE(date, 14);
+  record.writeUInt32LE(crc, 16);
+  record.writeUInt32LE(Math.min(compressedSize, MAX_32), 20);
+  record.writeUInt32LE(Math.min(size, MAX_32), 24);
+  record.writeUInt16LE(nameBytes.length, 28);
+  record.writeUInt16LE(extra.length, 30);
+  record.writeUInt32LE(FILE_ATTRIBUTES, 38);
+  record.writeUInt32LE(Math.min(offset, MAX_32), 42);
+  return Buffer.concat([record, nameBytes, extra]);
+}
@@ -1,9 +1,24 @@
 import { type NextRequest } from "next/server";
 import { updateSession } from "@/lib/supabase/middleware";
+import {
+  REPLICA_ROUTING_ENABLED,
+  isMutation,
+  primaryStickyCookie,
+} from "@/lib/db-routing";
 
 export async function middleware(request: NextRequest) {
   // Middleware logic continues...
   const response = await updateSession(request);
+
+  // Read this client's own writes from the primary (see lib/db-routing.ts)
+  if (
+    REPLICA_ROUTING_ENABLED &&
+    isMutation(request.method, request.nextUrl.pathname)
+  ) {
+    const { name, value, options } = primaryStickyCookie();
+    response.cookies.set(name, value, options);
+  }
+
   return response;
 }
 
@@ -0,0 +1,141 @@
+-- CreateIndex
+CREATE INDEX "Task_assigneeId_status_dueDate_idx" ON "Task"("assigneeId", "status", "dueDate");
+
+-- CreateIndex
+CREATE INDEX "Activity_createdAt_idx" ON "Activity"("createdAt");
+
+-- Dashboard in a single round trip.
+-- Resolves the workspace by slug, checks membership, and returns stats,
+-- the caller's today/overdue/upcoming tasks, the active timer and recent
+-- activity as one JSONB document.
+--   NULL                  -> workspace not found
+--   {"forbidden": true}   -> caller is not a member
+-- Day boundaries are passed in so they follow the app server's timezone.
+CREATE OR REPLACE FUNCTION get_workspace_dashboard(
+  p_slug TEXT,
+  p_user_id TEXT,
+  p_today_start TIMESTAMP(3),
+  p_today_end TIMESTAMP(3),
+  p_week_end TIMESTAMP(3)
+) RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+  WITH ws AS (
+    SELECT "id" FROM "Workspace" WHERE "slug" = p_slug
+  ),
+  membership AS (
+    SELECT 1
+    FROM "WorkspaceMember" wm
+    JOIN ws ON wm."workspaceId" = ws."id"
+    WHERE wm."userId" = p_user_id
+  ),
+  projects AS (
+    SELECT p."id", p."name"
+    FROM "Project" p
+    JOIN ws ON p."workspaceId" = ws."id"
+  ),
+  my_open_tasks AS (
+    SELECT t."id", t."title", t."status", t."priority", t."dueDate"
+    FROM "Task" t
+    JOIN projects p ON t."projectId" = p."id"
+    WHERE t."assigneeId" = p_user_id
+      AND t."status" <> 'DONE'
+      AND t."dueDate" <= p_week_end
+  )
+  SELECT CASE
+    WHEN NOT EXISTS (SELECT 1 FROM ws) THEN NULL
+    WHEN NOT EXISTS (SELECT 1 FROM membership) THEN '{"forbidden": true}'::jsonb
+    ELSE jsonb_build_object(
+      'stats', jsonb_build_object(
+        'projects', (SELECT count(*) FROM projects),
+        'members', (
+          SELECT count(*) FROM "WorkspaceMember" wm
+          JOIN ws ON wm."workspaceId" = ws."id"
+        ),
+        'tasks', (
+          SELECT count(*) FROM "Task" t
+          JOIN projects p ON t."projectId" = p."id"
+        ),
+        'seconds', (
+          SELECT coalesce(sum(te."duration"), 0) FROM "TimeEntry" te
+          JOIN "Task" t ON te."taskId" = t."id"
+          JOIN projects p ON t."projectId" = p."id"
+        )
+      ),
+      'taskStatusStats', (
+        SELECT jsonb_build_object(
+          'TODO', count(*) FILTER (WHERE t."status" = 'TODO'),
+          'IN_PROGRESS', count(*) FILTER (WHERE t."status" = 'IN_PROGRESS'),
+          'DONE', count(*) FILTER (WHERE t."status" = 'DONE')
+        )
+        FROM "Task" t
+        JOIN projects p ON t."projectId" = p."id"
+      ),
+      'todaysTasks', coalesce((
+        SELECT jsonb_agg(jsonb_build_object(
+          'id', x."id", 'title', x."title",
+          'status', x."status", 'priority', x."priority"
+        ))
+        FROM (
+          SELECT * FROM my_open_tasks
+          WHERE "dueDate" >= p_today_start AND "dueDate" <= p_today_end
+          LIMIT 5
+        ) x
+      ), '[]'::jsonb),
+      'overdueTasks', coalesce((
+        SELECT jsonb_agg(jsonb_build_object(
+          'id', x."id", 'title', x."title",
+          'status', x."status", 'priority', x."priority",
+          'dueDate', to_char(x."dueDate", 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"')
+        ))
+        FROM (
+          SELECT * FROM my_open_tasks
+          WHERE "dueDate" < p_today_start
+          LIMIT 5
+        ) x
+      ), '[]'::jsonb),
+      'upcomingTasks', coalesce((
+        SELECT jsonb_agg(jsonb_build_object(
+          'id', x."id", 'title', x."title",
+          'status', x."status", 'priority', x."priority",
+          'dueDate', to_char(x."dueDate", 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"')
+        ))
+        FROM (
+          SELECT * FROM my_open_tasks
+          WHERE "dueDate" > p_today_end
+          LIMIT 5
+        ) x
+      ), '[]'::jsonb),
+      'activeTimer', (
+        SELECT jsonb_build_object(
+          'id', tm."id", 'taskId', tm."taskId", 'userId', tm."userId",
+          'startTime', to_char(tm."startTime", 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"'),
+          'task', jsonb_build_object('title', t."title")
+        )
+        FROM "Timer" tm
+        JOIN "Task" t ON tm."taskId" = t."id"
+        WHERE tm."userId" = p_user_id
+      ),
+      'recentActivity', coalesce((
+        SELECT jsonb_agg(jsonb_build_object(
+          'id', x."id", 'type', x."type",
+          'createdAt', to_char(x."createdAt", 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"'),
+          'userName', x."userName", 'taskTitle', x."taskTitle",
+          'projectName', x."projectName"
+        ) ORDER BY x."createdAt" DESC)
+        FROM (
+          SELECT a."id", a."type", a."createdAt",
+                 u."name" AS "userName", t."title" AS "taskTitle",
+                 p."name" AS "projectName"
+          FROM "Activity" a
+          JOIN "Task" t ON a."taskId" = t."id"
+          JOIN projects p ON t."projectId" = p."id"
+          JOIN "User" u ON a."userId" = u."id"
+          ORDER BY a."createdAt" DESC
+          LIMIT 10
+        ) x
+      ), '[]'::jsonb)
+    )
+  END;
+$$;
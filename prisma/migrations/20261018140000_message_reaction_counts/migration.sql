@@ -0,0 +1,17 @@
+-- Denormalized per-message reaction counts (emoji -> count), maintained by
+-- the reaction toggle in lib/reactions.ts
+ALTER TABLE "Message" ADD COLUMN "reactionCounts" JSONB NOT NULL DEFAULT '{}';
+
+-- Backfill from existing reactions
+UPDATE "Message" m
+SET "reactionCounts" = r.counts
+FROM (
+  SELECT "messageId", jsonb_object_agg(emoji, n) AS counts
+  FROM (
+    SELECT "messageId", emoji, count(*)::int AS n
+    FROM "Reaction"
+    GROUP BY "messageId", emoji
+  ) per_emoji
+  GROUP BY "messageId"
+) r
+WHERE m.id = r."messageId";
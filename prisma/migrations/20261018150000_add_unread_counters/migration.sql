@@ -0,0 +1,16 @@
+-- CreateTable
+CREATE TABLE "UnreadCounter" (
+    "userId" TEXT NOT NULL,
+    "channel" TEXT NOT NULL,
+    "count" INTEGER NOT NULL DEFAULT 0,
+    "lastReadAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "UnreadCounter_pkey" PRIMARY KEY ("userId","channel")
+);
+
+-- AddForeignKey
+ALTER TABLE "UnreadCounter" ADD CONSTRAINT "UnreadCounter_userId_fkey" FOREIGN KEY ("userId") REFERENCES "User"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Counters are maintained by the server and worker (service role)
+ALTER TABLE "UnreadCounter" ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,163 @@
+-- Hot/cold message storage
+--
+-- "Message" keeps recent history and everything the app writes to
+-- (reactions, read pointers, threads). archive_messages() moves old threads
+-- into "MessageArchive", which is range-partitioned by month. Queries that
+-- bound "createdAt" only touch the matching partitions, and old months can be
+-- detached or dropped without vacuuming the hot table.
+
+-- ============================================================================
+-- HOT TABLE INDEXES
+-- ============================================================================
+
+-- Chat history pages: context + top-level filter, ordered by time.
+-- These replace the single-column context indexes (same leading column).
+DROP INDEX IF EXISTS "Message_workspaceId_idx";
+DROP INDEX IF EXISTS "Message_projectId_idx";
+DROP INDEX IF EXISTS "Message_conversationId_idx";
+DROP INDEX IF EXISTS "Message_senderId_idx";
+DROP INDEX IF EXISTS "Message_receiverId_idx";
+
+CREATE INDEX "Message_workspaceId_parentId_createdAt_idx" ON "Message"("workspaceId", "parentId", "createdAt");
+CREATE INDEX "Message_projectId_parentId_createdAt_idx" ON "Message"("projectId", "parentId", "createdAt");
+CREATE INDEX "Message_conversationId_parentId_createdAt_idx" ON "Message"("conversationId", "parentId", "createdAt");
+CREATE INDEX "Message_receiverId_senderId_createdAt_idx" ON "Message"("receiverId", "senderId", "createdAt");
+
+-- Burst-spam check (sender's messages in the last seconds)
+CREATE INDEX "Message_senderId_createdAt_idx" ON "Message"("senderId", "createdAt");
+
+-- Archival scan
+CREATE INDEX "Message_createdAt_idx" ON "Message"("createdAt");
+
+-- ============================================================================
+-- ARCHIVE TABLE
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- No foreign keys: archived rows outlive nothing they point at, and
+-- reactions are kept as the denormalized counts
+CREATE TABLE "MessageArchive" (
+    "id" TEXT NOT NULL,
+    "content" TEXT NOT NULL,
+    "workspaceId" TEXT,
+    "projectId" TEXT,
+    "conversationId" TEXT,
+    "senderId" TEXT NOT NULL,
+    "receiverId" TEXT,
+    "parentId" TEXT,
+    "isPinned" BOOLEAN NOT NULL DEFAULT false,
+    "reactionCounts" JSONB NOT NULL DEFAULT '{}',
+    "status" "MessageStatus" NOT NULL DEFAULT 'SENT',
+    "deliveredAt" TIMESTAMP(3),
+    "createdAt" TIMESTAMP(3) NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+    "archivedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "MessageArchive_pkey" PRIMARY KEY ("id", "createdAt")
+) PARTITION BY RANGE ("createdAt");
+
+-- Partitioned indexes (created on every partition)
+CREATE INDEX "MessageArchive_workspaceId_createdAt_idx" ON "MessageArchive"("workspaceId", "createdAt");
+CREATE INDEX "MessageArchive_projectId_createdAt_idx" ON "MessageArchive"("projectId", "createdAt");
+CREATE INDEX "MessageArchive_conversationId_createdAt_idx" ON "MessageArchive"("conversationId", "createdAt");
+CREATE INDEX "MessageArchive_receiverId_senderId_createdAt_idx" ON "MessageArchive"("receiverId", "senderId", "createdAt");
+CREATE INDEX "MessageArchive_parentId_idx" ON "MessageArchive"("parentId");
+-- Keeps ILIKE search usable on cold storage
+CREATE INDEX "MessageArchive_content_trgm_idx" ON "MessageArchive" USING GIN ("content" gin_trgm_ops);
+
+ALTER TABLE "MessageArchive" ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- PARTITION MANAGEMENT
+-- ============================================================================
+
+-- Create the monthly partition containing p_month if it does not exist.
+-- A low toast_tuple_target makes Postgres compress typical chat rows
+-- (the default only compresses rows over ~2KB).
+CREATE OR REPLACE FUNCTION ensure_message_archive_partition(p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_start DATE := date_trunc('month', p_month)::date;
+  v_name TEXT := 'MessageArchive_' || to_char(v_start, 'YYYY_MM');
+BEGIN
+  IF to_regclass(quote_ident(v_name)) IS NULL THEN
+    EXECUTE format(
+      'CREATE TABLE %I PARTITION OF "MessageArchive"
+         FOR VALUES FROM (%L) TO (%L)
+         WITH (toast_tuple_target = 128)',
+      v_name, v_start, (v_start + INTERVAL '1 month')::date
+    );
+  END IF;
+  RETURN v_name;
+END;
+$$;
+
+-- Move up to p_limit threads (a top-level message and all its replies)
+-- whose newest message is older than p_before. Returns rows moved; call
+-- repeatedly until it returns 0. Reactions and read pointers of moved
+-- messages are removed by the existing ON DELETE CASCADE constraints.
+CREATE OR REPLACE FUNCTION archive_messages(p_before TIMESTAMP, p_limit INT DEFAULT 5000)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_oldest TIMESTAMP;
+  v_month DATE;
+  v_moved INT;
+BEGIN
+  SELECT min("createdAt") INTO v_oldest FROM "Message";
+  IF v_oldest IS NULL OR v_oldest >= p_before THEN
+    RETURN 0;
+  END IF;
+
+  FOR v_month IN
+    SELECT generate_series(
+      date_trunc('month', v_oldest),
+      date_trunc('month', p_before),
+      INTERVAL '1 month'
+    )::date
+  LOOP
+    PERFORM ensure_message_archive_partition(v_month);
+  END LOOP;
+
+  WITH roots AS (
+    SELECT m.id
+    FROM "Message" m
+    WHERE m."parentId" IS NULL
+      AND m."createdAt" < p_before
+      AND NOT EXISTS (
+        SELECT 1 FROM "Message" r
+        WHERE r."parentId" = m.id AND r."createdAt" >= p_before
+      )
+    ORDER BY m."createdAt"
+    LIMIT p_limit
+  ),
+  batch AS (
+    SELECT id FROM roots
+    UNION ALL
+    SELECT r.id FROM "Message" r JOIN roots ON r."parentId" = roots.id
+  ),
+  moved AS (
+    DELETE FROM "Message" m
+    USING batch b
+    WHERE m.id = b.id
+    RETURNING m.*
+  )
+  INSERT INTO "MessageArchive" (
+    "id", "content", "workspaceId", "projectId", "conversationId",
+    "senderId", "receiverId", "parentId", "isPinned", "reactionCounts",
+    "status", "deliveredAt", "createdAt", "updatedAt"
+  )
+  SELECT
+    "id", "content", "workspaceId", "projectId", "conversationId",
+    "senderId", "receiverId", "parentId", "isPinned", "reactionCounts",
+    "status", "deliveredAt", "createdAt", "updatedAt"
+  FROM moved;
+
+  GET DIAGNOSTICS v_moved = ROW_COUNT;
+  RETURN v_moved;
+END;
+$$;
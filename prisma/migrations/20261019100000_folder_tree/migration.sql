@@ -0,0 +1,106 @@
+-- Materialized paths and per-folder file stats for lazy folder browsing.
+-- "path" lists the folder's ancestors and itself as "/<rootId>/.../<id>/",
+-- so a subtree is one index range scan on ("projectId", path).
+ALTER TABLE "Folder" ADD COLUMN "path" TEXT NOT NULL DEFAULT '';
+ALTER TABLE "Folder" ADD COLUMN "depth" INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE "Folder" ADD COLUMN "fileCount" INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE "Folder" ADD COLUMN "fileSize" BIGINT NOT NULL DEFAULT 0;
+
+-- Backfill paths from the parent links
+WITH RECURSIVE tree AS (
+  SELECT id, '/' || id || '/' AS path, 0 AS depth
+  FROM "Folder"
+  WHERE "parentId" IS NULL
+  UNION ALL
+  SELECT f.id, tree.path || f.id || '/', tree.depth + 1
+  FROM "Folder" f
+  JOIN tree ON f."parentId" = tree.id
+)
+UPDATE "Folder" f
+SET path = tree.path, depth = tree.depth
+FROM tree
+WHERE f.id = tree.id;
+
+-- Backfill direct file stats
+UPDATE "Folder" f
+SET "fileCount" = s.n, "fileSize" = s.bytes
+FROM (
+  SELECT "folderId", count(*)::int AS n, sum(size)::bigint AS bytes
+  FROM "File"
+  WHERE "folderId" IS NOT NULL
+  GROUP BY "folderId"
+) s
+WHERE f.id = s."folderId";
+
+-- Level listing: children of one folder (or the project root)
+CREATE INDEX "Folder_projectId_parentId_idx" ON "Folder"("projectId", "parentId");
+
+-- Subtree range scans (lib/folder-tree.ts compares paths with COLLATE "C")
+CREATE INDEX "Folder_projectId_path_idx" ON "Folder"("projectId", "path" COLLATE "C");
+
+-- New folders get their path from the parent, which must be in the same
+-- project. Moves rewrite paths in lib/folder-tree.ts.
+CREATE OR REPLACE FUNCTION folder_set_path()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  parent RECORD;
+BEGIN
+  IF NEW."parentId" IS NULL THEN
+    NEW.path := '/' || NEW.id || '/';
+    NEW.depth := 0;
+    RETURN NEW;
+  END IF;
+
+  SELECT path, depth, "projectId" INTO parent
+  FROM "Folder"
+  WHERE id = NEW."parentId";
+
+  IF NOT FOUND OR parent."projectId" <> NEW."projectId" THEN
+    RAISE EXCEPTION 'Parent folder % is not in project %', NEW."parentId", NEW."projectId"
+      USING ERRCODE = 'foreign_key_violation';
+  END IF;
+
+  NEW.path := parent.path || NEW.id || '/';
+  NEW.depth := parent.depth + 1;
+  RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER "Folder_set_path"
+BEFORE INSERT ON "Folder"
+FOR EACH ROW EXECUTE FUNCTION folder_set_path();
+
+-- Keep fileCount/fileSize in step with every File write (uploads, new
+-- versions, restores, moves, cascaded deletes)
+CREATE OR REPLACE FUNCTION folder_file_stats()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD."folderId" IS NOT NULL THEN
+    UPDATE "Folder"
+    SET "fileCount" = "fileCount" - 1, "fileSize" = "fileSize" - OLD.size
+    WHERE id = OLD."folderId";
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'INSERT') AND NEW."folderId" IS NOT NULL THEN
+    UPDATE "Folder"
+    SET "fileCount" = "fileCount" + 1, "fileSize" = "fileSize" + NEW.size
+    WHERE id = NEW."folderId";
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER "File_folder_stats_insert_delete"
+AFTER INSERT OR DELETE ON "File"
+FOR EACH ROW EXECUTE FUNCTION folder_file_stats();
+
+CREATE TRIGGER "File_folder_stats_update"
+AFTER UPDATE OF "folderId", size ON "File"
+FOR EACH ROW
+WHEN (OLD."folderId" IS DISTINCT FROM NEW."folderId" OR OLD.size <> NEW.size)
+EXECUTE FUNCTION folder_file_stats();
@@ -0,0 +1,4 @@
+-- Calendar feed: tasks due in a [from, to) window, per project or per
+-- assignee (lib/calendar.ts)
+CREATE INDEX "Task_projectId_dueDate_idx" ON "Task"("projectId", "dueDate");
+CREATE INDEX "Task_assigneeId_dueDate_idx" ON "Task"("assigneeId", "dueDate");
@@ -0,0 +1,6 @@
+-- Idempotency keys for time entries: retried timer stops / switches and
+-- offline bulk syncs return the existing entry instead of a duplicate
+-- (lib/time-tracking.ts). NULL keys never conflict.
+ALTER TABLE "TimeEntry" ADD COLUMN "idempotencyKey" TEXT;
+
+CREATE UNIQUE INDEX "TimeEntry_userId_idempotencyKey_key" ON "TimeEntry"("userId", "idempotencyKey");
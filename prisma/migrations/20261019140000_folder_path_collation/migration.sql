@@ -0,0 +1,41 @@
+-- Subtree range scans need byte-wise path ordering. The first version
+-- compared `path COLLATE "C"` against an expression index that Prisma
+-- cannot model, so `migrate dev` would have dropped it. The column itself
+-- now uses the "C" collation and the index is a plain one, declared in
+-- schema.prisma as @@index([projectId, path]).
+DROP INDEX IF EXISTS "Folder_projectId_path_idx";
+ALTER TABLE "Folder" ALTER COLUMN "path" TYPE TEXT COLLATE "C";
+CREATE INDEX "Folder_projectId_path_idx" ON "Folder"("projectId", "path");
+
+-- Path rewrites (moves, subtree deletes) take an exclusive per-project
+-- advisory lock in lib/folder-tree.ts. New folders take it shared, so a
+-- folder is never created under a parent whose path is being rewritten.
+CREATE OR REPLACE FUNCTION folder_set_path()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  parent RECORD;
+BEGIN
+  PERFORM pg_advisory_xact_lock_shared(hashtext('folder-tree:' || NEW."projectId"));
+
+  IF NEW."parentId" IS NULL THEN
+    NEW.path := '/' || NEW.id || '/';
+    NEW.depth := 0;
+    RETURN NEW;
+  END IF;
+
+  SELECT path, depth, "projectId" INTO parent
+  FROM "Folder"
+  WHERE id = NEW."parentId";
+
+  IF NOT FOUND OR parent."projectId" <> NEW."projectId" THEN
+    RAISE EXCEPTION 'Parent folder % is not in project %', NEW."parentId", NEW."projectId"
+      USING ERRCODE = 'foreign_key_violation';
+  END IF;
+
+  NEW.path := parent.path || NEW.id || '/';
+  NEW.depth := parent.depth + 1;
+  RETURN NEW;
+END;
+$$;
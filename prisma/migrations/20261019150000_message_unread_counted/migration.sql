@@ -0,0 +1,4 @@
+-- Marks messages already counted by the unread.increment job, so a retry
+-- (failed batch, worker crash, expired lock) does not count them twice.
+-- Nullable without a default: adding it does not rewrite the table.
+ALTER TABLE "Message" ADD COLUMN "unreadCountedAt" TIMESTAMP(3);
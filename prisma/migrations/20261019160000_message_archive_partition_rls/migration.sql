@@ -0,0 +1,39 @@
+-- Partitions do not inherit the parent's row level security, and on
+-- Supabase every new public table is granted to anon/authenticated, so
+-- each monthly MessageArchive partition was readable through PostgREST.
+-- Enable RLS on every partition (no policies: only the table owner, i.e.
+-- the app, can read them), now and when a partition is created.
+
+CREATE OR REPLACE FUNCTION ensure_message_archive_partition(p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_start DATE := date_trunc('month', p_month)::date;
+  v_name TEXT := 'MessageArchive_' || to_char(v_start, 'YYYY_MM');
+BEGIN
+  IF to_regclass(quote_ident(v_name)) IS NULL THEN
+    EXECUTE format(
+      'CREATE TABLE %I PARTITION OF "MessageArchive"
+         FOR VALUES FROM (%L) TO (%L)
+         WITH (toast_tuple_target = 128)',
+      v_name, v_start, (v_start + INTERVAL '1 month')::date
+    );
+    EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', v_name);
+  END IF;
+  RETURN v_name;
+END;
+$$;
+
+-- Backfill the partitions created so far
+DO $$
+DECLARE
+  v_partition REGCLASS;
+BEGIN
+  FOR v_partition IN
+    SELECT inhrelid::regclass FROM pg_inherits
+    WHERE inhparent = '"MessageArchive"'::regclass
+  LOOP
+    EXECUTE format('ALTER TABLE %s ENABLE ROW LEVEL SECURITY', v_partition);
+  END LOOP;
+END $$;
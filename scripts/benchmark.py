@@ -0,0 +1,372 @@
+"""
+Performance Regression Gate
+Runs a fixed scenario set against the seeded dataset, stores results as
+versioned baselines and exits non-zero when a route regresses.
+
+Usage:
+    python scripts/benchmark.py                 # Compare against latest baseline
+    python scripts/benchmark.py --save-baseline # Record a new baseline version
+    python scripts/benchmark.py --baseline 3    # Compare against baseline v3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from colab_client import BASE_URL, ColabClient
+
+WORKSPACE_SLUG = os.getenv("BENCH_WORKSPACE", "engineering")
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Regression thresholds
+P95_REGRESSION_PCT = float(os.getenv("BENCH_P95_REGRESSION_PCT", "25"))
+P95_NOISE_FLOOR_MS = float(os.getenv("BENCH_P95_NOISE_FLOOR_MS", "20"))
+QUERY_COUNT_SLACK = int(os.getenv("BENCH_QUERY_COUNT_SLACK", "0"))
+
+# Headers set by server.ts when query instrumentation is enabled (QUERY_DEBUG)
+QUERY_COUNT_HEADER = "X-Query-Count"
+N_PLUS_ONE_HEADER = "X-Query-N-Plus-One"
+
+# Per-user limits of the rate-limit buckets the scenarios hit
+# (RATE_LIMITS in lib/middleware/rate-limit.ts). Each bucket counts
+# separately; several scenarios share "default", so requests are paced to
+# stay RATE_LIMIT_HEADROOM under the limit and a 429 never reaches the
+# timings.
+RATE_LIMITS = {"default": 100, "chat": 30, "search": 60}
+RATE_LIMIT_WINDOW_S = 60
+RATE_LIMIT_HEADROOM = 5
+
+# Fixed scenario set. queryBudget is the most Prisma queries a single
+# request may issue, independent of the baseline.
+SCENARIOS = [
+    {
+        "name": "dashboard",
+        "path": "/api/workspaces/{slug}/dashboard",
+        "bucket": "default",
+        "iterations": 20,
+        "queryBudget": 4,
+    },
+    {
+        "name": "board_load",
+        "path": "/api/tasks?projectId={projectId}",
+        "bucket": "default",
+        "iterations": 20,
+        "queryBudget": 6,
+    },
+    {
+        "name": "chat_history",
+        "path": "/api/chat?projectId={projectId}",
+        "bucket": "chat",
+        "iterations": 15,
+        "queryBudget": 7,
+    },
+    {
+        "name": "search",
+        "path": "/api/search?q=task&workspaceSlug={slug}",
+        "bucket": "search",
+        "iterations": 10,
+        "queryBudget": 4,
+    },
+    {
+        "name": "calendar_month",
+        "path": "/api/calendar?projectId={projectId}&from={monthStart}&to={monthEnd}",
+        "bucket": "default",
+        "iterations": 20,
+        "queryBudget": 4,
+    },
+    {
+        "name": "file_listing",
+        "path": "/api/files?projectId={projectId}",
+        "bucket": "default",
+        "iterations": 20,
+        "queryBudget": 4,
+    },
+    {
+        "name": "timesheet",
+        "path": "/api/time",
+        "bucket": "default",
+        "iterations": 20,
+        "queryBudget": 5,
+    },
+]
+WARMUP_ITERATIONS = 2
+
+
+class RatePacer:
+    """Sliding-window request log per bucket; waits before a request would be limited"""
+
+    def __init__(self):
+        self.sent = {bucket: [] for bucket in RATE_LIMITS}
+
+    async def wait(self, bucket):
+        sent = self.sent[bucket]
+        limit = RATE_LIMITS[bucket] - RATE_LIMIT_HEADROOM
+        while True:
+            now = time.monotonic()
+            sent[:] = [t for t in sent if now - t < RATE_LIMIT_WINDOW_S]
+            if len(sent) < limit:
+                sent.append(now)
+                return
+            await asyncio.sleep(sent[0] + RATE_LIMIT_WINDOW_S - now)
+
+
+class BenchmarkRunner:
+    def __init__(self, client):
+        self.client = client
+        self.session = None
+        self.pacer = RatePacer()
+        month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        self.context = {
+            "slug": WORKSPACE_SLUG,
+            "monthStart": month.date().isoformat(),
+            "monthEnd": next_month.date().isoformat(),
+        }
+
+    async def resolve_context(self):
+        """Look up IDs from the seeded dataset"""
+        await self.pacer.wait("default")
+        projects = await self.session.projects.list(workspace_slug=WORKSPACE_SLUG)
+        if not projects:
+            raise RuntimeError(f"No projects in workspace '{WORKSPACE_SLUG}'. Seed the database first.")
+        self.context["projectId"] = projects[0]["id"]
+
+    async def run_scenario(self, scenario):
+        path = scenario["path"].format(**self.context)
+        for _ in range(WARMUP_ITERATIONS):
+            await self.pacer.wait(scenario["bucket"])
+            await self.session.request("GET", path, check=False)
+
+        timings, query_counts, sizes, errors, n_plus_one = [], [], [], 0, 0
+        for _ in range(scenario["iterations"]):
+            await self.pacer.wait(scenario["bucket"])
+            # Sent once: a retried request would hide its own latency
+            start = time.perf_counter()
+            res = await self.session.request("GET", path, retries=0, check=False)
+            elapsed = (time.perf_counter() - start) * 1000
+            if res.status_code != 200:
+                errors += 1
+                continue
+            timings.append(elapsed)
+            sizes.append(len(res.content))
+            if QUERY_COUNT_HEADER in res.headers:
+                query_counts.append(int(res.headers[QUERY_COUNT_HEADER]))
+            n_plus_one = max(n_plus_one, int(res.headers.get(N_PLUS_ONE_HEADER, 0)))
+
+        if not timings:
+            return {"errors": errors}
+
+        return {
+            "iterations": len(timings),
+            "errors": errors,
+            "p50": percentile(timings, 50),
+            "p95": percentile(timings, 95),
+            "mean": statistics.mean(timings),
+            "bytes": max(sizes),
+            "queries": max(query_counts) if query_counts else None,
+            "nPlusOne": n_plus_one,
+        }
+
+    async def run(self):
+        self.session = await self.client.login()
+        await self.resolve_context()
+        results = {}
+        for scenario in SCENARIOS:
+            print(f"   Running {scenario['name']}...")
+            results[scenario["name"]] = await self.run_scenario(scenario)
+        return results
+
+
+async def run_benchmark():
+    async with ColabClient() as client:
+        return await BenchmarkRunner(client).run()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def baseline_versions():
+    if not os.path.isdir(BASELINE_DIR):
+        return []
+    versions = []
+    for name in os.listdir(BASELINE_DIR):
+        if name.startswith("baseline-v") and name.endswith(".json"):
+            versions.append(int(name[len("baseline-v"):-len(".json")]))
+    return sorted(versions)
+
+
+def baseline_path(version):
+    return os.path.join(BASELINE_DIR, f"baseline-v{version}.json")
+
+
+def save_baseline(results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    versions = baseline_versions()
+    version = versions[-1] + 1 if versions else 1
+    data = {
+        "version": version,
+        "createdAt": datetime.now().isoformat(),
+        "revision": git_revision(),
+        "baseUrl": BASE_URL,
+        "workspace": WORKSPACE_SLUG,
+        "results": results,
+    }
+    with open(baseline_path(version), "w") as f:
+        json.dump(data, f, indent=2)
+    return baseline_path(version)
+
+
+def check_query_budgets(results):
+    """Describe every scenario that exceeded its per-request query budget"""
+    violations = []
+    for scenario in SCENARIOS:
+        current = results.get(scenario["name"], {})
+        if current.get("queries") is None:
+            continue
+        if current["queries"] > scenario["queryBudget"]:
+            violations.append(
+                f"{scenario['name']}: {current['queries']} queries "
+                f"(budget {scenario['queryBudget']})"
+            )
+        if current.get("nPlusOne"):
+            violations.append(
+                f"{scenario['name']}: {current['nPlusOne']} repeated query shape(s) (N+1)"
+            )
+    return violations
+
+
+def failed_scenarios(results):
+    """Scenarios in which every request failed (no timings to compare)"""
+    return [name for name, r in results.items() if "p95" not in r]
+
+
+def find_regressions(baseline, results):
+    """Compare results against a baseline and describe every regression"""
+    regressions = []
+    for name, current in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        if "p95" not in before:
+            # Should not be saved any more (see failed_scenarios), but an old
+            # baseline must not silently stop gating the scenario
+            regressions.append(
+                f"{name}: baseline v{baseline['version']} has no timings; "
+                "record a new baseline"
+            )
+            continue
+        if "p95" not in current:
+            regressions.append(f"{name}: every request failed ({current['errors']} errors)")
+            continue
+
+        allowed_p95 = before["p95"] * (1 + P95_REGRESSION_PCT / 100) + P95_NOISE_FLOOR_MS
+        if current["p95"] > allowed_p95:
+            regressions.append(
+                f"{name}: p95 {before['p95']:.0f}ms → {current['p95']:.0f}ms "
+                f"(limit {allowed_p95:.0f}ms)"
+            )
+
+        if before.get("queries") is not None and current.get("queries") is not None:
+            if current["queries"] > before["queries"] + QUERY_COUNT_SLACK:
+                regressions.append(
+                    f"{name}: queries {before['queries']} → {current['queries']}"
+                )
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print("\n" + "=" * 60)
+    print("📊 BENCHMARK RESULTS")
+    print("=" * 60)
+    print(f"{'scenario':<16}{'p50':>8}{'p95':>8}{'base p95':>10}{'queries':>9}{'KB':>8}")
+    for name, r in results.items():
+        if "p95" not in r:
+            print(f"{name:<16}{'failed':>8}")
+            continue
+        before = (baseline or {}).get("results", {}).get(name, {})
+        base_p95 = f"{before['p95']:.0f}" if "p95" in before else "-"
+        queries = r["queries"] if r["queries"] is not None else "-"
+        print(
+            f"{name:<16}{r['p50']:>8.0f}{r['p95']:>8.0f}{base_p95:>10}"
+            f"{queries:>9}{r['bytes'] / 1024:>8.1f}"
+        )
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance regression gate")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as a new baseline version")
+    parser.add_argument("--baseline", type=int, help="Baseline version to compare against (default: latest)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏁 COLAB TASK MANAGER - PERFORMANCE BENCHMARK")
+    print("=" * 60)
+
+    try:
+        results = asyncio.run(run_benchmark())
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        return 2
+
+    versions = baseline_versions()
+    version = args.baseline or (versions[-1] if versions else None)
+    baseline = None
+    if version is not None:
+        if not os.path.exists(baseline_path(version)):
+            print(f"❌ Baseline v{version} not found")
+            return 2
+        with open(baseline_path(version)) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    violations = check_query_budgets(results)
+    if violations:
+        print(f"❌ {len(violations)} query budget violation(s):")
+        for v in violations:
+            print(f"   {v}")
+
+    if args.save_baseline:
+        failed = failed_scenarios(results)
+        if failed:
+            print(f"❌ Not saving a baseline: every request failed in {', '.join(failed)}")
+            return 1
+        print(f"💾 Baseline saved: {save_baseline(results)}")
+        return 1 if violations else 0
+
+    if baseline is None:
+        print("🟡 No baseline found. Run with --save-baseline to create one.")
+        return 1 if violations else 0
+
+    regressions = find_regressions(baseline, results)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against baseline v{baseline['version']}:")
+        for r in regressions:
+            print(f"   {r}")
+        return 1
+
+    print(f"✅ No regressions against baseline v{baseline['version']}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""
+Async Python client for the Colab Task Manager REST API, shared by the
+integration, benchmark and load scripts in this directory.
+"""
+
+from .auth import AuthError, Credentials
+from .client import ApiError, ColabClient, Session, bounded_gather
+from .config import BASE_URL, EMAIL, PASSWORD, load_env
+
+__all__ = [
+    "ApiError",
+    "AuthError",
+    "BASE_URL",
+    "ColabClient",
+    "Credentials",
+    "EMAIL",
+    "PASSWORD",
+    "Session",
+    "bounded_gather",
+    "load_env",
+]
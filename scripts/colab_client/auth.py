@@ -0,0 +1,77 @@
+"""
+Supabase password login and token refresh.
+
+The app authenticates API calls with the Supabase access token
+(Authorization: Bearer ...). Tokens expire after an hour, so long load runs
+refresh them with the refresh token shortly before expiry, or after a 401.
+"""
+
+import asyncio
+import time
+
+# Refresh this many seconds before the access token expires
+REFRESH_MARGIN = 60
+
+
+class AuthError(Exception):
+    """Login or token refresh was rejected"""
+
+
+class Credentials:
+    """Tokens for one account. Sessions logged in as the same account share it."""
+
+    def __init__(self, email, access_token, refresh_token, expires_at):
+        self.email = email
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        # Supabase user object from the last grant (for browser session cookies)
+        self.user = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def expiring(self):
+        return time.time() >= self.expires_at - REFRESH_MARGIN
+
+    def update(self, token):
+        self.access_token = token["access_token"]
+        self.refresh_token = token.get("refresh_token", self.refresh_token)
+        self.expires_at = token.get("expires_at") or time.time() + token.get("expires_in", 3600)
+        self.user = token.get("user", self.user)
+
+
+class SupabaseAuth:
+    def __init__(self, http, supabase_url, anon_key):
+        self.http = http
+        self.url = f"{supabase_url}/auth/v1/token"
+        self.headers = {"apikey": anon_key, "Content-Type": "application/json"}
+
+    async def _grant(self, grant_type, body, who):
+        res = await self.http.post(
+            self.url, params={"grant_type": grant_type}, headers=self.headers, json=body
+        )
+        if res.status_code != 200:
+            raise AuthError(f"Supabase {grant_type} failed for {who}: {res.status_code} {res.text[:200]}")
+        return res.json()
+
+    async def login(self, email, password):
+        token = await self._grant("password", {"email": email, "password": password}, email)
+        credentials = Credentials(email, None, None, 0)
+        credentials.update(token)
+        return credentials
+
+    async def refresh(self, credentials, stale_token=None):
+        """
+        Refresh once per expiry: concurrent callers wait for the first one.
+        `stale_token` is the token a request was rejected with; if it has
+        already been replaced, nothing is refreshed.
+        """
+        async with credentials.lock:
+            if stale_token is not None and credentials.access_token != stale_token:
+                return
+            if stale_token is None and not credentials.expiring:
+                return
+            token = await self._grant(
+                "refresh_token", {"refresh_token": credentials.refresh_token}, credentials.email
+            )
+            credentials.update(token)
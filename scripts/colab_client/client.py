@@ -0,0 +1,268 @@
+"""
+Async HTTP client for the app's REST API.
+
+One ColabClient owns a keep-alive connection pool. Any number of Sessions,
+each with its own credentials and cookies, send requests through that
+pool, so thousands of concurrent users can be driven from one process:
+
+    async with ColabClient() as client:
+        alice = await client.login("alice@example.com", "...")
+        workspaces = await alice.workspaces.list()
+        async for message in alice.chat.history(project_id=project_id):
+            ...
+
+Requests are retried with exponential backoff on connection failures and
+on 502/503/504 (idempotent methods only). A 429 is retried for every
+method once the rate-limit window resets (Retry-After / X-RateLimit-Reset).
+A 401 triggers a single token refresh and retry.
+"""
+
+import asyncio
+import random
+import time
+
+import httpx
+
+from .auth import SupabaseAuth
+from .config import BASE_URL, EMAIL, PASSWORD, SUPABASE_ANON_KEY, SUPABASE_URL
+from .resources import Chat, Files, Notifications, Projects, Tasks, Time, Workspaces
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {502, 503, 504}
+# Failures that happen before the request reaches the server
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ApiError(Exception):
+    """Non-2xx response that was not retried (or ran out of retries)"""
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        try:
+            self.body = response.json()
+        except ValueError:
+            self.body = response.text[:200]
+        super().__init__(f"{response.request.method} {response.request.url.path}: {self.status_code} {self.body}")
+
+
+async def bounded_gather(aws, limit):
+    """Await many coroutines with at most `limit` in flight; results keep their order"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+
+class ColabClient:
+    def __init__(
+        self,
+        base_url=BASE_URL,
+        *,
+        supabase_url=SUPABASE_URL,
+        supabase_anon_key=SUPABASE_ANON_KEY,
+        max_connections=1000,
+        max_keepalive_connections=200,
+        timeout=30.0,
+        retries=3,
+        backoff=0.5,
+        max_backoff=60.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            )
+        )
+        self.http = self._new_http()
+        # Open sessions, each with its own httpx client; closed in aclose()
+        self.sessions = set()
+        self.auth = SupabaseAuth(self.http, supabase_url, supabase_anon_key)
+
+    def _new_http(self):
+        # Clients are cheap; the transport holds the shared connection pool
+        return httpx.AsyncClient(transport=self.transport, timeout=self.timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        for session in list(self.sessions):
+            await session.aclose()
+        await self.http.aclose()
+        await self.transport.aclose()
+
+    def session(self, credentials=None):
+        """
+        A session with its own cookies; anonymous without credentials.
+        Sessions are closed with the client; close one earlier with
+        `await session.aclose()` or `async with client.session() as s:`.
+        """
+        session = Session(self, credentials)
+        self.sessions.add(session)
+        return session
+
+    async def login(self, email=EMAIL, password=PASSWORD):
+        return self.session(await self.auth.login(email, password))
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def rate_limit_delay(self, response, attempt):
+        """Seconds until the rate-limit window resets, from the 429 response"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(self.max_backoff, float(retry_after))
+            except ValueError:
+                pass
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset:
+            # Epoch milliseconds (lib/middleware/rate-limit.ts)
+            wait = int(reset) / 1000 - time.time()
+            return min(self.max_backoff, max(0.0, wait) + random.uniform(0, 0.25))
+        return self.backoff_delay(attempt)
+
+
+class Session:
+    """One user of the API: credentials, cookies and the resource helpers"""
+
+    def __init__(self, client, credentials=None):
+        self.client = client
+        self.credentials = credentials
+        self.http = client._new_http()
+        self.workspaces = Workspaces(self)
+        self.projects = Projects(self)
+        self.tasks = Tasks(self)
+        self.chat = Chat(self)
+        self.files = Files(self)
+        self.time = Time(self)
+        self.notifications = Notifications(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        self.client.sessions.discard(self)
+        await self.http.aclose()
+
+    async def request(
+        self,
+        method,
+        path,
+        *,
+        params=None,
+        json=None,
+        data=None,
+        files=None,
+        content=None,
+        headers=None,
+        retries=None,
+        check=True,
+        idempotency_key=None,
+    ):
+        """
+        Send a request and return the httpx.Response.
+        retries=0 sends exactly once (for latency measurements); check=False
+        returns error responses instead of raising ApiError. A request with
+        an idempotency_key (sent as Idempotency-Key) is retried like an
+        idempotent method. content/headers send a raw body (e.g. a CSV).
+        """
+        method = method.upper()
+        max_retries = self.client.retries if retries is None else retries
+        idempotent = method in IDEMPOTENT_METHODS or idempotency_key is not None
+        attempt = 0
+        refreshed = False
+
+        extra_headers = headers or {}
+
+        while True:
+            headers = dict(extra_headers)
+            if idempotency_key is not None:
+                headers["Idempotency-Key"] = idempotency_key
+            token = None
+            if self.credentials:
+                if self.credentials.expiring:
+                    await self.client.auth.refresh(self.credentials)
+                token = self.credentials.access_token
+                headers["Authorization"] = f"Bearer {token}"
+
+            try:
+                res = await self.http.request(
+                    method,
+                    self.client.base_url + path,
+                    params=params,
+                    json=json,
+                    data=data,
+                    files=files,
+                    content=content,
+                    headers=headers,
+                )
+            except httpx.TransportError as e:
+                retryable = isinstance(e, CONNECT_ERRORS) or idempotent
+                if not retryable or attempt >= max_retries:
+                    raise
+                await asyncio.sleep(self.client.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if res.status_code == 401 and token and not refreshed:
+                await self.client.auth.refresh(self.credentials, stale_token=token)
+                refreshed = True
+                continue
+
+            if attempt < max_retries:
+                if res.status_code == 429:
+                    await asyncio.sleep(self.client.rate_limit_delay(res, attempt))
+                    attempt += 1
+                    continue
+                if res.status_code in RETRY_STATUSES and idempotent:
+                    await asyncio.sleep(self.client.backoff_delay(attempt))
+                    attempt += 1
+                    continue
+
+            if check and res.status_code >= 400:
+                raise ApiError(res)
+            return res
+
+    async def get(self, path, params=None, **kwargs):
+        return (await self.request("GET", path, params=params, **kwargs)).json()
+
+    async def post(self, path, json=None, **kwargs):
+        return (await self.request("POST", path, json=json, **kwargs)).json()
+
+    async def patch(self, path, json=None, **kwargs):
+        return (await self.request("PATCH", path, json=json, **kwargs)).json()
+
+    async def delete(self, path, **kwargs):
+        res = await self.request("DELETE", path, **kwargs)
+        return res.json() if res.content else None
+
+    async def pages(self, path, params, next_params):
+        """
+        Yield successive pages of a list endpoint. `next_params(page)`
+        returns the parameters for the following page, or None at the end.
+        """
+        params = dict(params)
+        while True:
+            page = await self.get(path, params)
+            yield page
+            following = next_params(page)
+            if following is None:
+                return
+            params.update(following)
@@ -0,0 +1,28 @@
+"""
+Settings shared by the scripts: values from .env, overridable from the
+environment (BASE_URL, TEST_USER_EMAIL, TEST_USER_PASSWORD).
+"""
+
+import os
+
+
+# Load config from .env
+def load_env(path=".env"):
+    env = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if "=" in line and not line.startswith("#"):
+                    parts = line.split("=", 1)
+                    if len(parts) == 2:
+                        key, value = parts
+                        env[key.strip()] = value.strip().strip('"')
+    return env
+
+
+config = load_env()
+BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
+SUPABASE_URL = config.get("NEXT_PUBLIC_SUPABASE_URL")
+SUPABASE_ANON_KEY = config.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
+EMAIL = os.getenv("TEST_USER_EMAIL", "samuelhany500@gmail.com")
+PASSWORD = os.getenv("TEST_USER_PASSWORD", "Sam@wwe20")
@@ -0,0 +1,288 @@
+"""
+Typed-ish wrappers for the API routes under app/api, grouped by area.
+Each method returns the decoded JSON body. Keyword arguments use Python
+names; request bodies and query strings use the API's camelCase names.
+"""
+
+# Messages per page returned by GET /api/chat
+CHAT_PAGE_SIZE = 50
+
+
+def _compact(**values):
+    """Drop unset (None) values from a query string or body"""
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def _channel(workspace_id=None, project_id=None, conversation_id=None, receiver_id=None, parent_id=None):
+    return _compact(
+        workspaceId=workspace_id,
+        projectId=project_id,
+        conversationId=conversation_id,
+        receiverId=receiver_id,
+        parentId=parent_id,
+    )
+
+
+class Resource:
+    def __init__(self, session):
+        self.session = session
+
+
+class Workspaces(Resource):
+    async def list(self, include_projects=False):
+        params = {"includeProjects": "true"} if include_projects else None
+        return await self.session.get("/api/workspaces", params)
+
+    async def create(self, name, slug):
+        return await self.session.post("/api/workspaces", {"name": name, "slug": slug})
+
+    async def bootstrap(self, slug=None):
+        return await self.session.get("/api/bootstrap", _compact(slug=slug))
+
+    async def dashboard(self, slug):
+        return await self.session.get(f"/api/workspaces/{slug}/dashboard")
+
+    async def members(self, slug):
+        return await self.session.get(f"/api/workspaces/{slug}/members")
+
+    async def tags(self, slug):
+        return await self.session.get(f"/api/workspaces/{slug}/tags")
+
+    async def invite(self, slug, email, role="MEMBER"):
+        return await self.session.post(f"/api/workspaces/{slug}/invite", {"email": email, "role": role})
+
+
+class Projects(Resource):
+    async def list(self, workspace_slug=None, workspace_id=None):
+        params = _compact(workspaceSlug=workspace_slug, workspaceId=workspace_id)
+        return await self.session.get("/api/projects", params)
+
+    async def create(self, workspace_id, name, description=None):
+        body = _compact(workspaceId=workspace_id, name=name, description=description)
+        return await self.session.post("/api/projects", body)
+
+    async def members(self, project_id):
+        return await self.session.get(f"/api/projects/{project_id}/members")
+
+    async def folders(self, project_id, parent_id=None, query=None):
+        """One level of the folder tree ({folders, ancestors}); query searches all levels"""
+        params = _compact(parentId=parent_id, q=query)
+        return await self.session.get(f"/api/projects/{project_id}/folders", params)
+
+    async def create_folder(self, project_id, name, parent_id=None):
+        body = {"name": name, "parentId": parent_id}
+        return await self.session.post(f"/api/projects/{project_id}/folders", body)
+
+    async def update_folder(self, project_id, folder_id, name=None, parent_id=...):
+        """Rename and/or move; parent_id=None moves the folder to the project root"""
+        body = _compact(name=name)
+        if parent_id is not ...:
+            body["parentId"] = parent_id
+        return await self.session.patch(f"/api/projects/{project_id}/folders/{folder_id}", body)
+
+    async def delete_folder(self, project_id, folder_id):
+        """Deletes subfolders too; files move up to the parent folder"""
+        return await self.session.delete(f"/api/projects/{project_id}/folders/{folder_id}")
+
+
+class Tasks(Resource):
+    async def list(self, project_id):
+        return await self.session.get("/api/tasks", {"projectId": project_id})
+
+    async def mine(self):
+        return await self.session.get("/api/tasks/my")
+
+    async def create(self, project_id, title, **fields):
+        """Extra fields: description, status, priority, dueDate, assigneeId, tagIds"""
+        return await self.session.post("/api/tasks", {"projectId": project_id, "title": title, **fields})
+
+    async def update(self, task_id, **fields):
+        return await self.session.patch(f"/api/tasks/{task_id}", fields)
+
+    async def move(self, task_id, status=None, position=None):
+        """Board drag and drop: new column and/or position"""
+        res = await self.session.request(
+            "PATCH",
+            "/api/tasks",
+            params={"taskId": task_id},
+            json=_compact(status=status, position=position),
+        )
+        return res.json()
+
+    async def get(self, task_id):
+        return await self.session.get(f"/api/tasks/{task_id}")
+
+    async def delete(self, task_id):
+        return await self.session.delete(f"/api/tasks/{task_id}")
+
+    async def batch(self, project_id, create=None, update=None, delete=None):
+        """
+        Up to 500 operations in one request: create rows (create() fields),
+        update rows ({"id", ...fields}) and task IDs to delete. Returns one
+        {index, status, id | error} result per row under the same keys.
+        """
+        body = {"create": create or [], "update": update or [], "delete": delete or []}
+        return await self.session.post(f"/api/projects/{project_id}/tasks/batch", body)
+
+    async def import_tasks(self, project_id, content, content_type="text/csv"):
+        """
+        Import a CSV (default), NDJSON (application/x-ndjson) or JSON array
+        body; returns the per-row results
+        """
+        res = await self.session.request(
+            "POST",
+            f"/api/projects/{project_id}/tasks/import",
+            content=content,
+            headers={"Content-Type": content_type},
+        )
+        return res.json()
+
+    async def calendar(self, start, end, project_id=None, include_members=False):
+        """Tasks due in [start, end) (ISO dates); without a project, the user's own"""
+        params = _compact(
+            projectId=project_id,
+            **{"from": start, "to": end},
+            include="members" if include_members else None,
+        )
+        return await self.session.get("/api/calendar", params)
+
+    async def comments(self, task_id):
+        return await self.session.get(f"/api/tasks/{task_id}/comments")
+
+    async def add_comment(self, task_id, content):
+        return await self.session.post(f"/api/tasks/{task_id}/comments", {"content": content})
+
+    async def subtasks(self, task_id):
+        return await self.session.get(f"/api/tasks/{task_id}/subtasks")
+
+    async def add_subtask(self, task_id, title, position=None):
+        body = _compact(title=title, position=position)
+        return await self.session.post(f"/api/tasks/{task_id}/subtasks", body)
+
+
+class Chat(Resource):
+    """
+    Channel arguments select one of: workspace_id, project_id,
+    conversation_id or receiver_id (DM); parent_id selects a thread.
+    """
+
+    async def page(self, before=None, **channel):
+        """One page of up to 50 messages, oldest first, ending before `before`"""
+        params = {**_channel(**channel), **_compact(before=before)}
+        return await self.session.get("/api/chat", params)
+
+    async def history(self, **channel):
+        """Every message in a channel, newest page first, oldest-first within a page"""
+
+        def next_page(messages):
+            if len(messages) < CHAT_PAGE_SIZE:
+                return None
+            return {"before": messages[0]["createdAt"]}
+
+        async for messages in self.session.pages("/api/chat", _channel(**channel), next_page):
+            for message in messages:
+                yield message
+
+    async def send(self, content, **channel):
+        return await self.session.post("/api/chat", {"content": content, **_channel(**channel)})
+
+    async def search(self, query, workspace_id=None, project_id=None, receiver_id=None):
+        params = {"q": query, **_channel(workspace_id, project_id, receiver_id=receiver_id)}
+        return await self.session.get("/api/chat/search", params)
+
+    async def reactions(self, message_id, emoji=None):
+        return await self.session.get(f"/api/messages/{message_id}/reactions", _compact(emoji=emoji))
+
+    async def react(self, message_id, emoji):
+        """Toggle the current user's reaction"""
+        return await self.session.post(f"/api/messages/{message_id}/reactions", {"emoji": emoji})
+
+    async def pin(self, message_id):
+        """Toggle the pinned state"""
+        return await self.session.post(f"/api/messages/{message_id}/pin")
+
+    async def mark_read(self, message_id, workspace_id=None, project_id=None, receiver_id=None):
+        body = {"messageId": message_id, **_channel(workspace_id, project_id, receiver_id=receiver_id)}
+        return await self.session.post("/api/messages/read", body)
+
+    async def mark_delivered(self, message_id):
+        return await self.session.post("/api/messages/delivered", {"messageId": message_id})
+
+    async def unread(self):
+        return await self.session.get("/api/unread")
+
+
+class Files(Resource):
+    async def list(self, project_id, folder_id=None):
+        return await self.session.get("/api/files", _compact(projectId=project_id, folderId=folder_id))
+
+    async def upload(self, project_id, filename, content, mime_type="application/octet-stream", folder_id=None):
+        res = await self.session.request(
+            "POST",
+            "/api/files",
+            data=_compact(projectId=project_id, folderId=folder_id),
+            files={"file": (filename, content, mime_type)},
+        )
+        return res.json()
+
+    async def move(self, file_id, folder_id):
+        """folder_id=None moves the file to the project root"""
+        return await self.session.patch(f"/api/files/{file_id}/move", {"folderId": folder_id})
+
+    async def versions(self, file_id):
+        return await self.session.get(f"/api/files/{file_id}/versions")
+
+
+class Time(Resource):
+    async def list(self, task_id=None, project_id=None, start_date=None, end_date=None):
+        params = _compact(taskId=task_id, projectId=project_id, startDate=start_date, endDate=end_date)
+        return await self.session.get("/api/time", params)
+
+    async def create(
+        self, task_id, start_time, end_time, note=None, billable=True, idempotency_key=None
+    ):
+        body = _compact(
+            taskId=task_id, startTime=start_time, endTime=end_time, note=note, isBillable=billable
+        )
+        return await self.session.post("/api/time", body, idempotency_key=idempotency_key)
+
+    async def bulk_create(self, entries):
+        """
+        Create many entries in one request. Each entry is a dict of the
+        create() fields in API form (taskId, startTime, endTime, note,
+        isBillable, idempotencyKey); returns {created, duplicates, rejected}.
+        """
+        return await self.session.post("/api/time/bulk", {"entries": entries})
+
+    async def start_timer(self, task_id):
+        return await self.session.post("/api/time", {"action": "start", "taskId": task_id})
+
+    async def stop_timer(self, note=None, idempotency_key=None):
+        return await self.session.post(
+            "/api/time", _compact(action="stop", note=note), idempotency_key=idempotency_key
+        )
+
+    async def switch_timer(self, task_id, note=None, idempotency_key=None):
+        """Close the running timer's entry and start timing task_id"""
+        return await self.session.post(
+            "/api/time",
+            _compact(action="switch", taskId=task_id, note=note),
+            idempotency_key=idempotency_key,
+        )
+
+    async def delete(self, entry_id):
+        return await self.session.delete(f"/api/time/{entry_id}")
+
+
+class Notifications(Resource):
+    async def list(self, filter=None, limit=50):
+        return await self.session.get("/api/notifications", _compact(filter=filter, limit=limit))
+
+    async def mark_read(self, notification_id, read=True):
+        return await self.session.patch(f"/api/notifications/{notification_id}", {"read": read})
+
+    async def read_all(self):
+        return await self.session.patch("/api/notifications/read-all")
+
+    async def delete(self, notification_id):
+        return await self.session.delete(f"/api/notifications/{notification_id}")
@@ -0,0 +1,295 @@
+"""
+E2E Fixtures
+Builds the state a Selenium scenario needs through the API and the
+database instead of the UI, and signs the browser in by injecting the
+Supabase session cookie, so each scenario spends its time on what it
+asserts rather than on login forms and setup clicks.
+
+Usage (from a Selenium suite):
+    from e2e_fixtures import seed_fixture, sign_in
+
+    fixture = seed_fixture(tasks=6, messages=10)
+    sign_in(driver, fixture, fixture.board_path)   # lands on the board, logged in
+
+    python scripts/e2e_fixtures.py                  # seed one and print its URLs
+
+What gets created, in a few requests:
+- user: TEST_USER_EMAIL, or with E2E_FRESH_USER=true a new confirmed
+  account created through the Supabase admin API (needs
+  SUPABASE_SERVICE_ROLE_KEY)
+- a workspace and a project owned by that user (API)
+- teammates: User, WorkspaceMember and ProjectMember rows inserted
+  directly (needs E2E_DATABASE_URL / DIRECT_URL / DATABASE_URL; there is
+  no API to add members without an invitation round trip)
+- tasks across the board columns, some assigned to teammates (one
+  /tasks/batch request) and subtasks on the first task
+- project chat history (one INSERT with the database, otherwise the chat API)
+
+Names carry a run stamp, so fixtures never collide with each other or with
+hand-made data. They are not deleted; reset the test database with
+`npx tsx scripts/clear-db.ts`.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import uuid
+from urllib.parse import urlparse
+
+import httpx
+
+from colab_client import BASE_URL, EMAIL, PASSWORD, ApiError, AuthError, ColabClient, load_env
+
+config = load_env()
+SUPABASE_URL = config.get("NEXT_PUBLIC_SUPABASE_URL")
+SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or config.get("SUPABASE_SERVICE_ROLE_KEY")
+DATABASE_URL = os.getenv("E2E_DATABASE_URL") or config.get("DIRECT_URL") or config.get("DATABASE_URL")
+FRESH_USER = os.getenv("E2E_FRESH_USER", "false").lower() == "true"
+
+STATUSES = ["TODO", "IN_PROGRESS", "DONE"]
+# @supabase/ssr splits cookie values longer than this into name.0, name.1, ...
+COOKIE_CHUNK_SIZE = 3180
+
+
+class E2EFixture:
+    """Everything one scenario needs: who to sign in as and what exists"""
+
+    def __init__(self, email, password, credentials, workspace, project):
+        self.email = email
+        self.password = password
+        self.credentials = credentials
+        self.workspace = workspace
+        self.project = project
+        self.tasks = []
+        self.subtasks = []
+        self.messages = []
+        self.teammates = []
+
+    @property
+    def dashboard_path(self):
+        return f"/app/{self.workspace['slug']}"
+
+    @property
+    def board_path(self):
+        return f"{self.dashboard_path}/projects/{self.project['id']}"
+
+    def path(self, page):
+        """Workspace page, e.g. path("chat") or path("timesheet")"""
+        return f"{self.dashboard_path}/{page}"
+
+
+# ============================================================================
+# SEEDING
+# ============================================================================
+
+async def create_auth_user(http, email, password, name):
+    """Confirmed Supabase account, skipping the sign-up email"""
+    if not SERVICE_ROLE_KEY:
+        raise RuntimeError("E2E_FRESH_USER needs SUPABASE_SERVICE_ROLE_KEY")
+    res = await http.post(
+        f"{SUPABASE_URL}/auth/v1/admin/users",
+        headers={"apikey": SERVICE_ROLE_KEY, "Authorization": f"Bearer {SERVICE_ROLE_KEY}"},
+        json={
+            "email": email,
+            "password": password,
+            "email_confirm": True,
+            "user_metadata": {"full_name": name},
+        },
+    )
+    if res.status_code not in (200, 201):
+        raise RuntimeError(f"Supabase user creation failed: {res.status_code} {res.text[:200]}")
+
+
+def connect():
+    try:
+        import psycopg
+    except ImportError:
+        print("⚠️  psycopg not installed; seeding without teammates (pip install -r scripts/requirements.txt)")
+        return None
+    return psycopg.connect(DATABASE_URL)
+
+
+def insert_teammates(conn, stamp, count, workspace_id, project_id):
+    """Users who never sign in: assignees and chat senders"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            WITH users AS (
+              INSERT INTO "User" (id, name, email, "updatedAt")
+              SELECT 'c' || substr(md5(%(stamp)s || i), 1, 24),
+                     'E2E Teammate ' || i,
+                     'e2e-' || %(stamp)s || '-' || i || '@example.org',
+                     now()
+              FROM generate_series(1, %(count)s) i
+              RETURNING id, name, email
+            ), workspace_members AS (
+              INSERT INTO "WorkspaceMember" (id, "workspaceId", "userId")
+              SELECT 'c' || substr(md5('wm' || id), 1, 24), %(workspace)s, id FROM users
+            ), project_members AS (
+              INSERT INTO "ProjectMember" (id, "projectId", "userId")
+              SELECT 'c' || substr(md5('pm' || id), 1, 24), %(project)s, id FROM users
+            )
+            SELECT id, name, email FROM users ORDER BY email
+            """,
+            {"stamp": stamp, "count": count, "workspace": workspace_id, "project": project_id},
+        )
+        return [{"id": row[0], "name": row[1], "email": row[2]} for row in cur.fetchall()]
+
+
+def insert_messages(conn, stamp, count, project_id, sender_ids):
+    """Chat history, oldest first, a minute apart"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO "Message" (id, content, "projectId", "senderId", "createdAt", "updatedAt")
+            SELECT 'c' || substr(md5('msg' || %(stamp)s || i), 1, 24),
+                   'E2E message ' || i || ' (' || %(stamp)s || ')',
+                   %(project)s,
+                   (%(senders)s::text[])[1 + i %% array_length(%(senders)s::text[], 1)],
+                   now() - make_interval(mins => %(count)s - i),
+                   now()
+            FROM generate_series(1, %(count)s) i
+            RETURNING id, content
+            """,
+            {"stamp": stamp, "count": count, "project": project_id, "senders": sender_ids},
+        )
+        return [{"id": row[0], "content": row[1]} for row in cur.fetchall()]
+
+
+async def seed(tasks=6, subtasks=2, messages=10, teammates=2):
+    """Seed one fixture: a workspace and project with the given numbers of rows"""
+    stamp = f"{time.strftime('%m%d%H%M%S')}{uuid.uuid4().hex[:4]}"
+    email, password = EMAIL, PASSWORD
+
+    async with ColabClient() as client:
+        if FRESH_USER:
+            email, password = f"e2e-{stamp}@example.org", f"E2e-{uuid.uuid4().hex}"
+            await create_auth_user(client.http, email, password, f"E2E User {stamp}")
+        session = await client.login(email, password)
+
+        workspace = await session.workspaces.create(f"E2E {stamp}", f"e2e-{stamp}")
+        project = await session.projects.create(
+            workspace["id"], f"E2E Project {stamp}", "Seeded by scripts/e2e_fixtures.py"
+        )
+        fixture = E2EFixture(email, password, session.credentials, workspace, project)
+
+        conn = connect() if DATABASE_URL and (teammates or messages) else None
+        try:
+            await seed_content(session, fixture, conn, stamp, tasks, subtasks, messages, teammates)
+        finally:
+            if conn:
+                conn.close()
+
+    return fixture
+
+
+async def seed_content(session, fixture, conn, stamp, tasks, subtasks, messages, teammates):
+    workspace, project = fixture.workspace, fixture.project
+    if conn and teammates:
+        with conn.transaction():
+            fixture.teammates = insert_teammates(conn, stamp, teammates, workspace["id"], project["id"])
+
+    rows = [
+        {
+            "title": f"E2E Task {i + 1} {stamp}",
+            "status": STATUSES[i % len(STATUSES)],
+            "priority": "MEDIUM",
+            **({"assigneeEmail": fixture.teammates[i % len(fixture.teammates)]["email"]}
+               if fixture.teammates and i % 2 else {}),
+        }
+        for i in range(tasks)
+    ]
+    if rows:
+        results = (await session.tasks.batch(project["id"], create=rows))["create"]
+        failed = [r for r in results if r["status"] == "error"]
+        if failed:
+            raise RuntimeError(f"Task seeding failed: {failed[0]['error']}")
+        fixture.tasks = [{**row, "id": r["id"]} for row, r in zip(rows, results)]
+
+    if fixture.tasks:
+        for i in range(subtasks):
+            fixture.subtasks.append(
+                await session.tasks.add_subtask(fixture.tasks[0]["id"], f"E2E Subtask {i + 1}")
+            )
+
+    if messages and conn:
+        members = (await session.workspaces.members(workspace["slug"]))["members"]
+        with conn.transaction():
+            fixture.messages = insert_messages(
+                conn, stamp, messages, project["id"], [m["userId"] for m in members]
+            )
+    else:
+        for i in range(messages):
+            fixture.messages.append(
+                await session.chat.send(f"E2E message {i + 1} ({stamp})", project_id=project["id"])
+            )
+
+
+def seed_fixture(**counts):
+    """Synchronous seed() for the Selenium suites; see seed() for counts"""
+    return asyncio.run(seed(**counts))
+
+
+# ============================================================================
+# BROWSER SESSION
+# ============================================================================
+
+def session_cookies(credentials):
+    """
+    The cookies @supabase/ssr reads the session from:
+    sb-<project ref>-auth-token = "base64-" + base64url(session JSON),
+    chunked when long
+    """
+    ref = urlparse(SUPABASE_URL).hostname.split(".")[0]
+    name = f"sb-{ref}-auth-token"
+    session = {
+        "access_token": credentials.access_token,
+        "refresh_token": credentials.refresh_token,
+        "token_type": "bearer",
+        "expires_at": int(credentials.expires_at),
+        "expires_in": max(0, int(credentials.expires_at - time.time())),
+        "user": credentials.user,
+    }
+    encoded = base64.urlsafe_b64encode(json.dumps(session).encode()).decode().rstrip("=")
+    value = f"base64-{encoded}"
+    if len(value) <= COOKIE_CHUNK_SIZE:
+        return {name: value}
+    chunks = [value[i:i + COOKIE_CHUNK_SIZE] for i in range(0, len(value), COOKIE_CHUNK_SIZE)]
+    return {f"{name}.{i}": chunk for i, chunk in enumerate(chunks)}
+
+
+def sign_in(driver, fixture, path="/app"):
+    """Log the browser in as the fixture user and open `path`"""
+    # Cookies can only be set for the current origin; the favicon is the
+    # cheapest page there (it skips the middleware too)
+    driver.get(f"{BASE_URL}/favicon.ico")
+    for name, value in session_cookies(fixture.credentials).items():
+        driver.add_cookie({"name": name, "value": value, "path": "/", "sameSite": "Lax"})
+    driver.get(BASE_URL + path)
+
+
+def main():
+    print("=" * 60)
+    print("🌱 E2E FIXTURE")
+    print("=" * 60)
+    start = time.perf_counter()
+    try:
+        fixture = seed_fixture()
+    except (RuntimeError, ApiError, AuthError, httpx.HTTPError) as e:
+        print(f"❌ Seeding failed: {e}")
+        return 2
+    print(f"✅ Seeded in {time.perf_counter() - start:.1f}s as {fixture.email}")
+    print(f"   Workspace: {BASE_URL}{fixture.dashboard_path}")
+    print(f"   Board:     {BASE_URL}{fixture.board_path}")
+    print(
+        f"   {len(fixture.tasks)} tasks, {len(fixture.subtasks)} subtasks, "
+        f"{len(fixture.messages)} messages, {len(fixture.teammates)} teammates"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+/**
+ * Background job worker entry point
+ *
+ * Usage: npm run worker
+ */
+import { runWorker } from "@/lib/jobs/worker";
+import { prisma } from "@/lib/prisma";
+
+const controller = new AbortController();
+
+for (const signal of ["SIGINT", "SIGTERM"] as const) {
+  process.on(signal, () => {
+    console.log(`[WORKER] ${signal} received, finishing current batch...`);
+    controller.abort();
+  });
+}
+
+runWorker(controller.signal)
+  .catch((error) => {
+    console.error("[WORKER] Fatal error:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
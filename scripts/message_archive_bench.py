@@ -0,0 +1,393 @@
+"""
+Message Storage Scale Benchmark
+Generates synthetic chat history directly in Postgres and checks that chat
+query latency stays flat as history grows, thanks to the hot/cold split
+(`Message` + monthly-partitioned `MessageArchive`).
+
+The hot table is filled once with the retention window's worth of messages
+(BENCH_HOT_ROWS); each scale step then adds older months to the archive
+until the total reaches the next target. After every step the same query
+set is timed and table/index sizes are recorded.
+
+Runs against a DEDICATED database with all migrations applied - it writes
+tens of millions of rows:
+
+    export BENCH_DATABASE_URL=postgresql://.../colab_bench
+    npx prisma migrate deploy    # with DATABASE_URL=$BENCH_DATABASE_URL
+    python scripts/message_archive_bench.py
+    BENCH_SCALES=1000000,10000000 python scripts/message_archive_bench.py
+
+Exits 1 when a query's p95 at the largest scale exceeds its p95 at the
+smallest scale by more than BENCH_FLAT_TOLERANCE_PCT (plus a noise floor).
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import psycopg
+
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+SCALES = [int(s) for s in os.getenv("BENCH_SCALES", "1000000,10000000,100000000").split(",")]
+HOT_ROWS = int(os.getenv("BENCH_HOT_ROWS", "2000000"))
+WORKSPACES = int(os.getenv("BENCH_WORKSPACES", "50"))
+USERS = int(os.getenv("BENCH_USERS", "200"))
+ROWS_PER_MONTH = int(os.getenv("BENCH_ROWS_PER_MONTH", "2000000"))
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "30"))
+FLAT_TOLERANCE_PCT = float(os.getenv("BENCH_FLAT_TOLERANCE_PCT", "30"))
+NOISE_FLOOR_MS = float(os.getenv("BENCH_NOISE_FLOOR_MS", "2"))
+REPORT_DIR = os.getenv("PERF_REPORT_DIR", "perf-reports")
+
+# Matches MESSAGE_ARCHIVE_AFTER_DAYS; hot rows are spread over this window
+HOT_DAYS = int(os.getenv("MESSAGE_ARCHIVE_AFTER_DAYS", "180"))
+CHUNK_ROWS = 1_000_000
+
+# Query set mirroring the app: chat pages (hot), burst-spam check (hot),
+# archive search (trigram) and one archived month (partition pruning)
+QUERIES = {
+    "chat_page": """
+        SELECT id FROM "Message"
+        WHERE "workspaceId" = %(workspace)s AND "parentId" IS NULL
+        ORDER BY "createdAt" DESC LIMIT 50
+    """,
+    "chat_page_before": """
+        SELECT id FROM "Message"
+        WHERE "workspaceId" = %(workspace)s AND "parentId" IS NULL
+          AND "createdAt" < now() - interval '30 days'
+        ORDER BY "createdAt" DESC LIMIT 50
+    """,
+    "burst_check": """
+        SELECT count(*) FROM "Message"
+        WHERE "senderId" = %(sender)s AND "createdAt" >= now() - interval '10 seconds'
+    """,
+    "archive_search": """
+        SELECT id FROM "MessageArchive"
+        WHERE "content" ILIKE %(pattern)s AND "workspaceId" = %(workspace)s
+        ORDER BY "createdAt" DESC LIMIT 20
+    """,
+    "archive_month": """
+        SELECT id FROM "MessageArchive"
+        WHERE "workspaceId" = %(workspace)s
+          AND "createdAt" >= %(month_start)s AND "createdAt" < %(month_end)s
+        ORDER BY "createdAt" DESC LIMIT 50
+    """,
+}
+
+
+class ArchiveBenchmark:
+    def __init__(self, conn):
+        self.conn = conn
+        self.results = []
+
+    # ------------------------------------------------------------------
+    # Data generation
+    # ------------------------------------------------------------------
+
+    def setup_fixtures(self):
+        """Bench users and workspaces (ids prefixed with bench_)"""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO "User" (id, name, email, "updatedAt")
+                SELECT 'bench_u' || i, 'Bench User ' || i, 'bench' || i || '@example.com', now()
+                FROM generate_series(1, %s) i
+                ON CONFLICT DO NOTHING
+                """,
+                (USERS,),
+            )
+            cur.execute(
+                """
+                INSERT INTO "Workspace" (id, name, slug, "ownerId", "updatedAt")
+                SELECT 'bench_w' || i, 'Bench ' || i, 'bench-' || i, 'bench_u1', now()
+                FROM generate_series(1, %s) i
+                ON CONFLICT DO NOTHING
+                """,
+                (WORKSPACES,),
+            )
+        self.conn.commit()
+
+    def count_rows(self):
+        with self.conn.cursor() as cur:
+            cur.execute("""SELECT count(*) FROM "Message" WHERE id LIKE 'bench_%'""")
+            hot = cur.fetchone()[0]
+            cur.execute("""SELECT count(*) FROM "MessageArchive" WHERE id LIKE 'bench_%'""")
+            cold = cur.fetchone()[0]
+        return hot, cold
+
+    def insert_chunk(self, table, offset, rows, start_sql, span_sql):
+        """Insert `rows` synthetic messages spread evenly over a time span"""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO "{table}" (id, content, "workspaceId", "senderId",
+                                       "parentId", "createdAt", "updatedAt")
+                SELECT
+                  'bench_' || %(table)s || '_' || (%(offset)s + i),
+                  'message ' || md5((%(offset)s + i)::text) || ' about release ' || (i %% 997),
+                  'bench_w' || (1 + i %% %(workspaces)s),
+                  'bench_u' || (1 + i %% %(users)s),
+                  NULL,
+                  {start_sql} + ({span_sql}) * (i::float8 / %(rows)s),
+                  now()
+                FROM generate_series(1, %(rows)s) i
+                """,
+                {
+                    "table": table,
+                    "offset": offset,
+                    "rows": rows,
+                    "workspaces": WORKSPACES,
+                    "users": USERS,
+                },
+            )
+        self.conn.commit()
+
+    def fill_hot(self):
+        hot, _ = self.count_rows()
+        while hot < HOT_ROWS:
+            rows = min(CHUNK_ROWS, HOT_ROWS - hot)
+            # Newest chunk last: each chunk covers its share of the window
+            self.insert_chunk(
+                "Message",
+                hot,
+                rows,
+                f"now() - interval '{HOT_DAYS} days' + interval '{HOT_DAYS} days' * ({hot}::float8 / {HOT_ROWS})",
+                f"interval '{HOT_DAYS} days' * ({rows}::float8 / {HOT_ROWS})",
+            )
+            hot += rows
+            print(f"   hot: {hot:,} rows")
+
+    def fill_archive(self, target_total):
+        """Add older months to the archive until hot + cold reaches target"""
+        hot, cold = self.count_rows()
+        while hot + cold < target_total:
+            rows = min(CHUNK_ROWS, target_total - hot - cold)
+            # Months further back as the archive grows
+            months_back = cold / ROWS_PER_MONTH
+            start = f"now() - interval '{HOT_DAYS} days' - interval '1 month' * ({months_back + rows / ROWS_PER_MONTH})"
+            span = f"interval '1 month' * ({rows / ROWS_PER_MONTH})"
+            self.ensure_partitions(start, span)
+            self.insert_chunk("MessageArchive", cold, rows, start, span)
+            cold += rows
+            print(f"   archive: {cold:,} rows")
+
+    def ensure_partitions(self, start_sql, span_sql):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT ensure_message_archive_partition(m::date)
+                FROM generate_series(
+                  date_trunc('month', {start_sql}),
+                  date_trunc('month', {start_sql} + {span_sql}),
+                  interval '1 month'
+                ) m
+                """
+            )
+        self.conn.commit()
+
+    def verify_archival(self):
+        """Move a small slice through archive_messages() to time the function"""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO "Message" (id, content, "workspaceId", "senderId", "createdAt", "updatedAt")
+                SELECT 'bench_move_' || i || '_' || extract(epoch FROM now())::bigint,
+                       'archival probe ' || i, 'bench_w1', 'bench_u1',
+                       now() - make_interval(days => %s + 1), now()
+                FROM generate_series(1, 10000) i
+                """,
+                (HOT_DAYS,),
+            )
+            self.conn.commit()
+            start = time.perf_counter()
+            cur.execute(
+                "SELECT archive_messages((now() - make_interval(days => %s))::timestamp, 10000)",
+                (HOT_DAYS,),
+            )
+            moved = cur.fetchone()[0]
+            self.conn.commit()
+        elapsed = time.perf_counter() - start
+        print(f"   archive_messages moved {moved:,} rows in {elapsed:.2f}s")
+        return {"moved": moved, "seconds": round(elapsed, 3)}
+
+    def analyze(self):
+        self.conn.autocommit = True
+        with self.conn.cursor() as cur:
+            cur.execute('VACUUM ANALYZE "Message"')
+            cur.execute('ANALYZE "MessageArchive"')
+        self.conn.autocommit = False
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def query_params(self):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """SELECT min("createdAt") FROM "MessageArchive" WHERE id LIKE 'bench_%'"""
+            )
+            oldest = cur.fetchone()[0] or datetime.now()
+        month_start = oldest.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        return {
+            "workspace": "bench_w7",
+            "sender": "bench_u7",
+            "pattern": "%release 42%",
+            "month_start": month_start,
+            "month_end": month_end,
+        }
+
+    def time_query(self, sql, params):
+        timings = []
+        with self.conn.cursor() as cur:
+            for _ in range(ITERATIONS):
+                start = time.perf_counter()
+                cur.execute(sql, params)
+                cur.fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+        self.conn.rollback()
+        return timings
+
+    def partitions_scanned(self, sql, params):
+        with self.conn.cursor() as cur:
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0]
+        self.conn.rollback()
+        relations = set()
+
+        def walk(node):
+            if node.get("Relation Name", "").startswith("MessageArchive_"):
+                relations.add(node["Relation Name"])
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan[0]["Plan"])
+        return len(relations)
+
+    def sizes(self):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT pg_table_size('"Message"'), pg_indexes_size('"Message"'),
+                       count(*), COALESCE(max(pg_total_relation_size(c.oid)), 0)
+                FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = '"MessageArchive"'::regclass
+                """
+            )
+            table, indexes, partitions, largest = cur.fetchone()
+        self.conn.rollback()
+        mb = 1024 * 1024
+        return {
+            "hotTableMb": round(table / mb, 1),
+            "hotIndexesMb": round(indexes / mb, 1),
+            "archivePartitions": partitions,
+            "largestPartitionMb": round(largest / mb, 1),
+        }
+
+    def measure(self, scale):
+        params = self.query_params()
+        queries = {}
+        for name, sql in QUERIES.items():
+            timings = self.time_query(sql, params)
+            queries[name] = {
+                "p50Ms": round(statistics.median(timings), 2),
+                "p95Ms": round(percentile(timings, 95), 2),
+            }
+        queries["archive_month"]["partitionsScanned"] = self.partitions_scanned(
+            QUERIES["archive_month"], params
+        )
+        result = {"scale": scale, "queries": queries, "sizes": self.sizes()}
+        self.results.append(result)
+        return result
+
+    def run(self):
+        print("\n📦 Preparing fixtures...")
+        self.setup_fixtures()
+        self.fill_hot()
+
+        for scale in sorted(SCALES):
+            print(f"\n📈 Growing history to {scale:,} messages...")
+            self.fill_archive(scale)
+            self.analyze()
+            result = self.measure(scale)
+            print_step(result)
+
+        print("\n🚚 Archival function check...")
+        archival = self.verify_archival()
+        return archival
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_step(result):
+    sizes = result["sizes"]
+    print(
+        f"   hot table {sizes['hotTableMb']}MB + indexes {sizes['hotIndexesMb']}MB, "
+        f"{sizes['archivePartitions']} archive partitions (largest {sizes['largestPartitionMb']}MB)"
+    )
+    for name, stats in result["queries"].items():
+        extra = f"  partitions={stats['partitionsScanned']}" if "partitionsScanned" in stats else ""
+        print(f"   {name:18} p50 {stats['p50Ms']:8.2f}ms  p95 {stats['p95Ms']:8.2f}ms{extra}")
+
+
+def find_growth(results):
+    """Queries whose p95 grew beyond tolerance from smallest to largest scale"""
+    if len(results) < 2:
+        return []
+    first, last = results[0]["queries"], results[-1]["queries"]
+    failures = []
+    for name in QUERIES:
+        allowed = first[name]["p95Ms"] * (1 + FLAT_TOLERANCE_PCT / 100) + NOISE_FLOOR_MS
+        if last[name]["p95Ms"] > allowed:
+            failures.append((name, first[name]["p95Ms"], last[name]["p95Ms"], allowed))
+    if last["archive_month"]["partitionsScanned"] > 1:
+        failures.append(("archive_month (pruning)", 1, last["archive_month"]["partitionsScanned"], 1))
+    return failures
+
+
+def main():
+    if not DATABASE_URL:
+        print("❌ BENCH_DATABASE_URL is not set (use a dedicated database)")
+        return 2
+
+    print("=" * 60)
+    print("📊 MESSAGE STORAGE SCALE BENCHMARK")
+    print("=" * 60)
+    print(f"Scales: {', '.join(f'{s:,}' for s in SCALES)}  hot rows: {HOT_ROWS:,}")
+
+    with psycopg.connect(DATABASE_URL) as conn:
+        bench = ArchiveBenchmark(conn)
+        try:
+            archival = bench.run()
+        except psycopg.Error as e:
+            print(f"❌ Database error: {e}")
+            return 2
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_path = os.path.join(
+        REPORT_DIR, f"message-archive-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    with open(report_path, "w") as f:
+        json.dump({"results": bench.results, "archival": archival}, f, indent=2)
+    print(f"\n💾 Report written to {report_path}")
+
+    failures = find_growth(bench.results)
+    print("\n" + "=" * 60)
+    if failures:
+        print("❌ Latency grew with history size:")
+        for name, before, after, allowed in failures:
+            print(f"   {name}: {before} -> {after} (allowed {allowed:.2f})")
+        return 1
+
+    print("✅ Query latency stayed flat across scales")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Browser-side Performance Capture for the Selenium Suites
+Collects Navigation Timing, LCP, long tasks and resource timings per page
+and writes them to a JSON report that can be compared run-to-run.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+# Configuration
+PERF_REPORT_DIR = os.getenv("PERF_REPORT_DIR", "perf-reports")
+PERF_COMPARE_WITH = os.getenv("PERF_COMPARE_WITH")  # Path to a previous report
+PERF_REGRESSION_PCT = float(os.getenv("PERF_REGRESSION_PCT", "20"))
+SLOW_RESOURCE_MS = 500
+LARGE_RESOURCE_BYTES = 500 * 1024
+
+# Installed once per document. Buffered observers also deliver entries that
+# were recorded before the script ran, so it is safe to inject after load.
+OBSERVER_SCRIPT = """
+if (!window.__perfCapture) {
+  window.__perfCapture = { lcp: null, longTasks: [], since: 0 };
+  var supported = (window.PerformanceObserver &&
+    PerformanceObserver.supportedEntryTypes) || [];
+  if (supported.indexOf('largest-contentful-paint') !== -1) {
+    new PerformanceObserver(function (list) {
+      var entries = list.getEntries();
+      var last = entries[entries.length - 1];
+      window.__perfCapture.lcp = {
+        startTime: last.startTime,
+        size: last.size,
+        element: last.element ? last.element.tagName : null,
+        url: last.url || null
+      };
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+  }
+  if (supported.indexOf('longtask') !== -1) {
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(function (e) {
+        window.__perfCapture.longTasks.push({
+          startTime: e.startTime, duration: e.duration, name: e.name
+        });
+      });
+    }).observe({ type: 'longtask', buffered: true });
+  }
+}
+"""
+
+# Returns everything recorded since the previous capture on this document.
+COLLECT_SCRIPT = """
+var state = window.__perfCapture || { lcp: null, longTasks: [], since: 0 };
+var since = state.since;
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource')
+  .filter(function (r) { return r.startTime >= since; })
+  .map(function (r) {
+    return {
+      name: r.name,
+      initiatorType: r.initiatorType,
+      startTime: r.startTime,
+      duration: r.duration,
+      ttfb: r.responseStart > 0 ? r.responseStart - r.startTime : null,
+      transferSize: r.transferSize || 0,
+      decodedBodySize: r.decodedBodySize || 0
+    };
+  });
+var longTasks = state.longTasks.filter(function (t) {
+  return t.startTime >= since;
+});
+var result = {
+  url: location.href,
+  softNavigation: since > 0,
+  navigation: nav && since === 0 ? {
+    type: nav.type,
+    ttfb: nav.responseStart - nav.startTime,
+    domContentLoaded: nav.domContentLoadedEventEnd - nav.startTime,
+    load: nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    transferSize: nav.transferSize || 0
+  } : null,
+  lcp: since === 0 ? state.lcp : null,
+  longTasks: longTasks,
+  resources: resources,
+  capturedAt: performance.now()
+};
+state.since = result.capturedAt;
+return result;
+"""
+
+
+class PerfCollector:
+    """Collects per-page browser timings during a Selenium run"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = {}
+
+    def capture(self, page_name, settle=1.0):
+        """Record timings for the page currently loaded in the browser.
+
+        Full page loads report Navigation Timing and LCP. Client-side
+        navigations only report the resources and long tasks recorded since
+        the previous capture on the same document.
+        """
+        try:
+            time.sleep(settle)  # Let pending fetches finish
+            self.driver.execute_script(OBSERVER_SCRIPT)
+            time.sleep(0.1)  # Allow buffered observers to flush
+            raw = self.driver.execute_script(COLLECT_SCRIPT)
+            self.pages[page_name] = summarize(raw)
+            page = self.pages[page_name]
+            print(
+                f"   ⏱️  {page_name}: {page['summary']['apiRequests']} API calls, "
+                f"{page['summary']['apiTime']:.0f}ms API, "
+                f"{page['summary']['transferKB']:.0f}KB"
+            )
+        except Exception as e:
+            print(f"   (Perf capture for {page_name} failed: {e})")
+
+    def write_report(self):
+        """Write the JSON report and print a comparison with the previous run"""
+        if not self.pages:
+            return None
+
+        os.makedirs(PERF_REPORT_DIR, exist_ok=True)
+        previous_path = PERF_COMPARE_WITH or latest_report(PERF_REPORT_DIR)
+
+        report = {
+            "createdAt": datetime.now().isoformat(),
+            "baseUrl": self.driver.current_url.split("/app")[0],
+            "browser": self.driver.capabilities.get("browserName"),
+            "pages": self.pages,
+        }
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(PERF_REPORT_DIR, f"perf-{timestamp}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Performance report saved: {path}")
+
+        regressions = []
+        if previous_path and os.path.exists(previous_path):
+            with open(previous_path) as f:
+                previous = json.load(f)
+            regressions = compare_reports(previous, report)
+            print_comparison(previous_path, previous, report, regressions)
+
+        return regressions
+
+
+def summarize(raw):
+    """Attach per-page aggregates and per-endpoint API stats to a capture"""
+    resources = raw.get("resources", [])
+    api = [r for r in resources if "/api/" in r["name"]]
+
+    endpoints = {}
+    for r in api:
+        path = r["name"].split("://", 1)[-1].split("/", 1)[-1]
+        route = "/" + path.split("?", 1)[0]
+        entry = endpoints.setdefault(
+            route, {"count": 0, "totalDuration": 0, "maxDuration": 0, "bytes": 0}
+        )
+        entry["count"] += 1
+        entry["totalDuration"] += r["duration"]
+        entry["maxDuration"] = max(entry["maxDuration"], r["duration"])
+        entry["bytes"] += r["decodedBodySize"]
+
+    nav = raw.get("navigation") or {}
+    lcp = raw.get("lcp") or {}
+    long_tasks = raw.get("longTasks", [])
+
+    raw["summary"] = {
+        "ttfb": nav.get("ttfb"),
+        "domContentLoaded": nav.get("domContentLoaded"),
+        "load": nav.get("load"),
+        "lcp": lcp.get("startTime"),
+        "longTaskCount": len(long_tasks),
+        "longTaskTime": sum(t["duration"] for t in long_tasks),
+        "requests": len(resources),
+        "apiRequests": len(api),
+        "apiTime": sum(r["duration"] for r in api),
+        "transferKB": sum(r["transferSize"] for r in resources) / 1024,
+        "apiBodyKB": sum(r["decodedBodySize"] for r in api) / 1024,
+    }
+    raw["endpoints"] = endpoints
+    raw["slowResources"] = [
+        r["name"]
+        for r in resources
+        if r["duration"] > SLOW_RESOURCE_MS
+        or r["decodedBodySize"] > LARGE_RESOURCE_BYTES
+    ]
+    return raw
+
+
+def latest_report(directory):
+    """Return the most recent report in a directory, if any"""
+    if not os.path.isdir(directory):
+        return None
+    reports = sorted(
+        f for f in os.listdir(directory) if f.startswith("perf-") and f.endswith(".json")
+    )
+    return os.path.join(directory, reports[-1]) if reports else None
+
+
+def compare_reports(previous, current):
+    """List summary metrics that grew by more than PERF_REGRESSION_PCT"""
+    regressions = []
+    for page, data in current["pages"].items():
+        before = previous.get("pages", {}).get(page)
+        if not before:
+            continue
+        for metric, value in data["summary"].items():
+            old = before["summary"].get(metric)
+            if not old or value is None:
+                continue
+            change = (value - old) / old * 100
+            if change > PERF_REGRESSION_PCT:
+                regressions.append(
+                    {"page": page, "metric": metric, "before": old,
+                     "after": value, "changePct": round(change, 1)}
+                )
+    return regressions
+
+
+def print_comparison(previous_path, previous, current, regressions):
+    print("\n" + "=" * 60)
+    print(f"📊 PERFORMANCE vs {os.path.basename(previous_path)}")
+    print("=" * 60)
+    for page, data in current["pages"].items():
+        before = previous.get("pages", {}).get(page, {}).get("summary", {})
+        after = data["summary"]
+        print(f"\n{page}")
+        for metric in ("ttfb", "lcp", "apiTime", "apiBodyKB", "longTaskTime"):
+            if after.get(metric) is None:
+                continue
+            old = before.get(metric)
+            old_text = f"{old:.0f}" if old is not None else "-"
+            print(f"   {metric:<14} {old_text:>8} → {after[metric]:>8.0f}")
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} metric(s) regressed by more than {PERF_REGRESSION_PCT:.0f}%:")
+        for r in regressions:
+            print(f"   {r['page']}.{r['metric']}: {r['before']:.0f} → {r['after']:.0f} (+{r['changePct']}%)")
+    else:
+        print("\n✅ No performance regressions detected")
+    print("=" * 60)
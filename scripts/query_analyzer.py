@@ -0,0 +1,615 @@
+"""
+pg_stat_statements Analyzer and Index Advisor
+Ranks database statements by cost, maps them back to the API routes that
+issue them, diffs snapshots over time and proposes candidate indexes.
+
+Sources:
+    python scripts/query_analyzer.py                          # live DB (DATABASE_URL)
+    python scripts/query_analyzer.py --json temp/query-performance-supabase.json
+
+Supabase's "Query performance" export and snapshots written with --save are
+both accepted by --json.
+
+Usage:
+    python scripts/query_analyzer.py --sort mean --top 15
+    python scripts/query_analyzer.py --save                   # snapshot to perf-reports/
+    python scripts/query_analyzer.py --diff perf-reports/pgss-20261018-120000.json
+    python scripts/query_analyzer.py --routes                 # exact mapping from /api/debug/queries
+    python scripts/query_analyzer.py --all                    # include Postgres/tooling statements
+
+Statements that touch no app table (pg_catalog introspection, auth/pgbouncer
+internals, Prisma shadow databases) are reported as one "system" total and
+excluded from the ranking unless --all is given.
+
+Index candidates come from each statement's filter and ORDER BY columns,
+minus indexes that already cover them (schema.prisma, or pg_index when
+live). On a live database they are checked with the Supabase index_advisor
+extension, or hypopg + EXPLAIN (GENERIC_PLAN) on Postgres 16+, when installed.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+import httpx
+
+from colab_client import BASE_URL, ApiError, ColabClient, load_env
+
+config = load_env()
+# Session connection (not the pgbouncer URL): EXPLAIN and hypopg need one backend
+DATABASE_URL = os.getenv("DATABASE_URL") or config.get("DIRECT_URL") or config.get("DATABASE_URL")
+REPORT_DIR = os.getenv("PERF_REPORT_DIR", "perf-reports")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(ROOT, "prisma", "schema.prisma")
+
+# Prisma operations by the SQL verb they issue
+OPERATIONS_BY_VERB = {
+    "SELECT": {"findMany", "findUnique", "findUniqueOrThrow", "findFirst",
+               "findFirstOrThrow", "count", "aggregate", "groupBy"},
+    "INSERT": {"create", "createMany", "createManyAndReturn", "upsert"},
+    "UPDATE": {"update", "updateMany", "upsert"},
+    "DELETE": {"delete", "deleteMany"},
+}
+RAW_OPERATIONS = {"$queryRaw", "$executeRaw", "$queryRawUnsafe", "$executeRawUnsafe"}
+
+# Only suggest indexes for statements costing at least this much in total
+ADVISE_MIN_TOTAL_MS = float(os.getenv("ADVISE_MIN_TOTAL_MS", "100"))
+
+LIVE_STATEMENTS_SQL = """
+SELECT s.queryid::text AS queryid, s.query, r.rolname, s.calls,
+       s.total_exec_time AS total_time, s.mean_exec_time AS mean_time,
+       s.min_exec_time AS min_time, s.max_exec_time AS max_time,
+       s.rows AS rows_read,
+       CASE WHEN s.shared_blks_hit + s.shared_blks_read = 0 THEN NULL
+            ELSE 100.0 * s.shared_blks_hit / (s.shared_blks_hit + s.shared_blks_read)
+       END AS cache_hit_rate
+FROM pg_stat_statements s
+JOIN pg_roles r ON r.oid = s.userid
+JOIN pg_database d ON d.oid = s.dbid AND d.datname = current_database()
+"""
+
+LIVE_INDEXES_SQL = """
+SELECT t.relname AS table, array_agg(a.attname ORDER BY k.ord) AS columns
+FROM pg_index i
+JOIN pg_class t ON t.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace AND n.nspname = 'public'
+CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+GROUP BY i.indexrelid, t.relname
+"""
+
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+def load_schema(path=SCHEMA_PATH):
+    """Tables (Prisma models) and the column lists of their indexes"""
+    tables = {}
+    current = None
+    with open(path) as f:
+        for line in f:
+            line = line.split("//")[0].strip()
+            model = re.match(r"model (\w+) \{", line)
+            if model:
+                current = model.group(1)
+                tables[current] = []
+            elif line == "}":
+                current = None
+            elif current:
+                block = re.match(r"@@(?:id|unique|index)\(\[([^\]]+)\]", line)
+                if block:
+                    tables[current].append([c.strip() for c in block.group(1).split(",")])
+                elif re.search(r"\s@(id|unique)\b", line):
+                    tables[current].append([line.split()[0]])
+    return tables
+
+
+def load_live_indexes(conn):
+    with conn.cursor() as cur:
+        cur.execute(LIVE_INDEXES_SQL)
+        indexes = {}
+        for table, columns in cur.fetchall():
+            indexes.setdefault(table, []).append(list(columns))
+    return indexes
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def statement_key(stmt):
+    """Stable identity across snapshots (queryid is missing from exports)"""
+    return stmt.get("queryid") or f"{stmt.get('rolname')}:{' '.join(stmt['query'].split())}"
+
+
+def normalize(raw):
+    stmt = {
+        "queryid": raw.get("queryid"),
+        "query": raw["query"],
+        "rolname": raw.get("rolname"),
+        "calls": int(raw.get("calls") or 0),
+        "total_time": float(raw.get("total_time") or 0),
+        "mean_time": float(raw.get("mean_time") or 0),
+        "max_time": float(raw.get("max_time") or 0),
+        "rows_read": int(raw.get("rows_read") or 0),
+        "cache_hit_rate": float(raw["cache_hit_rate"]) if raw.get("cache_hit_rate") not in (None, "") else None,
+        "index_advisor_result": raw.get("index_advisor_result"),
+    }
+    stmt["key"] = statement_key(stmt)
+    return stmt
+
+
+def load_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    # Our snapshots wrap the statements; Supabase exports are a bare list
+    statements = data["statements"] if isinstance(data, dict) else data
+    return [normalize(s) for s in statements]
+
+
+def connect():
+    try:
+        import psycopg
+    except ImportError:
+        print("❌ psycopg is required for live mode: pip install -r scripts/requirements.txt")
+        sys.exit(2)
+    return psycopg.connect(DATABASE_URL, autocommit=True)
+
+
+def load_live(conn):
+    with conn.cursor() as cur:
+        cur.execute(LIVE_STATEMENTS_SQL)
+        columns = [c.name for c in cur.description]
+        return [normalize(dict(zip(columns, row))) for row in cur.fetchall()]
+
+
+# ============================================================================
+# CLASSIFICATION AND ROUTE MAPPING
+# ============================================================================
+
+def statement_verb(query):
+    match = re.match(r"\s*(?:WITH\b.*?\)\s*)?(SELECT|INSERT|UPDATE|DELETE)\b", query, re.I | re.S)
+    return match.group(1).upper() if match else None
+
+
+def referenced_tables(query, tables):
+    """App tables a statement reads or writes"""
+    found = re.findall(
+        r'(?:FROM|JOIN|INTO|UPDATE)\s+(?:"public"\.)?"(\w+)"', query, re.I
+    )
+    return sorted({t for t in found if t in tables})
+
+
+def scan_source_usage(tables):
+    """Static fallback: which files call which Prisma operations per model"""
+    usage = {}
+    pattern = re.compile(r"\b(?:prisma|tx)\s*\.\s*(\w+)\s*\.\s*(\w+)\s*\(")
+    files = glob.glob(os.path.join(ROOT, "app", "api", "**", "route.ts"), recursive=True)
+    files += glob.glob(os.path.join(ROOT, "lib", "**", "*.ts"), recursive=True)
+
+    for path in files:
+        with open(path) as f:
+            source = f.read()
+        rel = os.path.relpath(path, ROOT)
+        label = "/" + os.path.dirname(rel)[len("app/"):] if rel.startswith("app/") else rel
+
+        for model, operation in pattern.findall(source):
+            table = model[0].upper() + model[1:]
+            if table in tables:
+                usage.setdefault(f"{table}.{operation}", set()).add(label)
+        # Raw SQL: attribute every quoted app table in the file
+        if re.search(r"\$(?:query|execute)Raw", source):
+            for table in set(re.findall(r'"(\w+)"', source)) & set(tables):
+                usage.setdefault(f"{table}.$raw", set()).add(label)
+    return usage
+
+
+async def fetch_debug_queries():
+    async with ColabClient(timeout=10.0, retries=1) as client:
+        return await client.session().get("/api/debug/queries")
+
+
+def fetch_runtime_usage():
+    """Exact mapping recorded by the running server (QUERY_DEBUG enabled)"""
+    try:
+        stats = asyncio.run(fetch_debug_queries())
+    except (ApiError, httpx.HTTPError) as e:
+        print(f"⚠️  Could not read {BASE_URL}/api/debug/queries ({e}); using source scan")
+        return None
+
+    usage = {}
+    for route in stats.get("routes", []):
+        for operation in route.get("operations", {}):
+            model, _, op = operation.partition(".")
+            key = "$raw.$raw" if model == "$raw" else f"{model}.{op}"
+            usage.setdefault(key, set()).add(route["route"])
+    return usage
+
+
+def map_routes(stmt, usage):
+    verb = stmt.get("verb")
+    candidates = set()
+    for table in stmt["tables"]:
+        for key, labels in usage.items():
+            model, _, op = key.partition(".")
+            if model == table and (op in OPERATIONS_BY_VERB.get(verb, ()) or op in RAW_OPERATIONS or op == "$raw"):
+                candidates |= labels
+    # Runtime stats cannot tell which tables a raw query touched
+    if not candidates and "$raw.$raw" in usage:
+        candidates = {f"{label} (raw)" for label in usage["$raw.$raw"]}
+    return sorted(candidates)
+
+
+def classify(statements, tables, usage):
+    for stmt in statements:
+        stmt["verb"] = statement_verb(stmt["query"])
+        stmt["tables"] = referenced_tables(stmt["query"], tables)
+        stmt["app"] = bool(stmt["tables"])
+        stmt["routes"] = map_routes(stmt, usage) if stmt["app"] else []
+
+
+# ============================================================================
+# SNAPSHOT DIFF
+# ============================================================================
+
+def diff_snapshots(current, previous):
+    """Per-statement activity between two snapshots"""
+    before = {s["key"]: s for s in previous}
+    deltas = []
+    for stmt in current:
+        old = before.get(stmt["key"])
+        calls = stmt["calls"] - (old["calls"] if old else 0)
+        total = stmt["total_time"] - (old["total_time"] if old else 0)
+        if old and calls < 0:
+            # pg_stat_statements was reset in between; counters restarted
+            calls, total = stmt["calls"], stmt["total_time"]
+        if calls <= 0:
+            continue
+        deltas.append({
+            **stmt,
+            "calls": calls,
+            "total_time": total,
+            "mean_time": total / calls,
+            "rows_read": stmt["rows_read"] - (old["rows_read"] if old and stmt["rows_read"] >= old["rows_read"] else 0),
+            "previous_mean_time": old["mean_time"] if old else None,
+            "new": old is None,
+        })
+    return deltas
+
+
+# ============================================================================
+# INDEX ADVISOR
+# ============================================================================
+
+PREDICATE = re.compile(
+    r'(?:(?:"public"\.)?"?(\w+)"?\.)?"(\w+)"\s*(=|<>|!=|<=|>=|<|>|IN\b|IS\b|LIKE\b|ILIKE\b)',
+    re.I,
+)
+
+
+def table_aliases(query, tables):
+    aliases = {}
+    for table, alias in re.findall(
+        r'(?:FROM|JOIN)\s+(?:"public"\.)?"(\w+)"(?:\s+(?:AS\s+)?(\w+))?', query, re.I
+    ):
+        if table in tables:
+            aliases[table] = table
+            if alias and alias.upper() not in {"WHERE", "ON", "JOIN", "LEFT", "INNER", "ORDER", "GROUP", "LIMIT"}:
+                aliases[alias] = table
+    return aliases
+
+
+def candidate_columns(query, tables):
+    """Equality columns, then one range/ORDER BY column, per table.
+    LIKE/ILIKE columns are kept apart: they need a trigram index."""
+    aliases = table_aliases(query, tables)
+    where, order = split_clauses(query)
+    result = {}
+
+    def owner(qualifier):
+        if qualifier:
+            return aliases.get(qualifier)
+        owners = set(aliases.values())
+        return owners.pop() if len(owners) == 1 else None
+
+    for qualifier, column, op in PREDICATE.findall(where):
+        table = owner(qualifier)
+        if not table:
+            continue
+        entry = result.setdefault(table, {"equality": [], "range": [], "pattern": []})
+        op = op.upper()
+        bucket = "equality" if op in ("=", "IN", "IS") else "pattern" if op in ("LIKE", "ILIKE") else "range"
+        if column not in entry[bucket]:
+            entry[bucket].append(column)
+
+    for qualifier, column in re.findall(r'(?:(?:"public"\.)?"?(\w+)"?\.)?"(\w+)"', order):
+        table = owner(qualifier)
+        if table:
+            entry = result.setdefault(table, {"equality": [], "range": [], "pattern": []})
+            if column not in entry["equality"] and column not in entry["range"]:
+                entry["range"].append(column)
+            break
+    return result
+
+
+def split_clauses(query):
+    parts = re.split(r"\bORDER\s+BY\b", query, maxsplit=1, flags=re.I)
+    # Only the WHERE clause(s) carry filter predicates; JOIN ... ON is
+    # covered by the foreign-key indexes already
+    where = " ".join(re.split(r"\bWHERE\b", parts[0], flags=re.I)[1:])
+    return where, parts[1] if len(parts) > 1 else ""
+
+
+def is_covered(columns, indexes):
+    """An existing index starts with the candidate's columns"""
+    return any(index[: len(columns)] == columns for index in indexes)
+
+
+def propose_indexes(statements, indexes, tables):
+    proposals = {}
+
+    def add(name, table, columns, statement, stmt):
+        proposal = proposals.setdefault(name, {
+            "table": table,
+            "columns": columns,
+            "statement": statement,
+            "total_time": 0.0,
+            "queries": [],
+            "verified": None,
+        })
+        proposal["total_time"] += stmt["total_time"]
+        proposal["queries"].append(stmt["key"])
+
+    for stmt in statements:
+        if not stmt["app"] or stmt["verb"] == "INSERT" or stmt["total_time"] < ADVISE_MIN_TOTAL_MS:
+            continue
+        for table, cols in candidate_columns(stmt["query"], tables).items():
+            # Skip the primary key lookups Prisma issues for every relation load
+            equality = [c for c in cols["equality"] if c != "id"]
+            columns = equality + cols["range"][:1]
+            if columns and not is_covered(columns, indexes.get(table, [])):
+                name = f'{table}_{"_".join(columns)}_idx'
+                quoted = ", ".join(f'"{c}"' for c in columns)
+                add(name, table, columns,
+                    f'CREATE INDEX CONCURRENTLY "{name}" ON "{table}" ({quoted});', stmt)
+            # Substring matches cannot use a btree; pg_trgm handles them
+            for column in cols["pattern"]:
+                name = f"{table}_{column}_trgm_idx"
+                add(name, table, [column],
+                    f'CREATE INDEX CONCURRENTLY "{name}" ON "{table}" USING gin ("{column}" gin_trgm_ops);', stmt)
+    return sorted(proposals.values(), key=lambda p: -p["total_time"])
+
+
+def installed_extensions(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT extname FROM pg_extension")
+        extensions = {row[0] for row in cur.fetchall()}
+        cur.execute("SHOW server_version_num")
+        version = int(cur.fetchone()[0])
+    return extensions, version
+
+
+def plan_cost(cur, query):
+    cur.execute("EXPLAIN (GENERIC_PLAN, FORMAT JSON) " + query)
+    return cur.fetchone()[0][0]["Plan"]["Total Cost"]
+
+
+def verify_with_hypopg(conn, proposals, statements):
+    """Cost of each candidate's queries before/after a hypothetical index"""
+    by_key = {s["key"]: s for s in statements}
+    with conn.cursor() as cur:
+        for proposal in proposals:
+            query = by_key[proposal["queries"][0]]["query"]
+            try:
+                before = plan_cost(cur, query)
+                cur.execute("SELECT * FROM hypopg_create_index(%s)", (proposal["statement"].replace(" CONCURRENTLY", ""),))
+                after = plan_cost(cur, query)
+            except Exception as e:
+                proposal["verified"] = {"error": str(e).splitlines()[0]}
+                continue
+            finally:
+                cur.execute("SELECT hypopg_reset()")
+            proposal["verified"] = {"cost_before": before, "cost_after": after}
+
+
+def run_index_advisor(conn, statements, limit):
+    """Supabase index_advisor() for the costliest app reads"""
+    results = []
+    with conn.cursor() as cur:
+        for stmt in [s for s in statements if s["app"] and s["verb"] == "SELECT"][:limit]:
+            try:
+                cur.execute(
+                    "SELECT total_cost_before, total_cost_after, index_statements, errors FROM index_advisor(%s)",
+                    (stmt["query"],),
+                )
+                before, after, index_statements, errors = cur.fetchone()
+            except Exception as e:
+                errors, index_statements, before, after = [str(e).splitlines()[0]], [], None, None
+            stmt["index_advisor_result"] = {
+                "total_cost_before": before,
+                "total_cost_after": after,
+                "index_statements": index_statements,
+                "errors": errors,
+            }
+            if index_statements:
+                results.append(stmt)
+    return results
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+SORT_KEYS = {
+    "total": "total_time",
+    "mean": "mean_time",
+    "calls": "calls",
+    "rows": "rows_read",
+}
+
+
+def short(query, width=90):
+    text = " ".join(query.split())
+    text = re.sub(r'"public"\.', "", text)
+    return text if len(text) <= width else text[: width - 1] + "…"
+
+
+def print_ranking(statements, sort, top, diff_mode):
+    print(f"\n📊 Top {top} statements by {sort}" + (" (since previous snapshot)" if diff_mode else ""))
+    print("-" * 60)
+    if not statements:
+        print("No app statements (use --all to list system statements)")
+    for i, stmt in enumerate(statements[:top], 1):
+        hit = f"{stmt['cache_hit_rate']:.0f}%" if stmt["cache_hit_rate"] is not None else "-"
+        print(
+            f"{i:2}. total {stmt['total_time']:10.1f}ms  mean {stmt['mean_time']:8.2f}ms  "
+            f"calls {stmt['calls']:7}  rows {stmt['rows_read']:8}  cache {hit}"
+        )
+        if diff_mode and stmt.get("previous_mean_time") is not None:
+            change = stmt["mean_time"] - stmt["previous_mean_time"]
+            print(f"    mean {stmt['previous_mean_time']:.2f}ms -> {stmt['mean_time']:.2f}ms ({change:+.2f}ms)")
+        elif diff_mode and stmt.get("new"):
+            print("    🆕 new statement")
+        print(f"    {short(stmt['query'])}")
+        if stmt["app"]:
+            routes = ", ".join(stmt["routes"][:4]) + (" …" if len(stmt["routes"]) > 4 else "")
+            print(f"    tables: {', '.join(stmt['tables'])}  routes: {routes or 'unmapped'}")
+        else:
+            print(f"    (system: {stmt['rolname']})")
+
+
+def print_proposals(proposals, advisor_results):
+    print("\n🔍 Candidate indexes")
+    print("-" * 60)
+    if not proposals and not advisor_results:
+        print("✅ No uncovered filter columns in the costly statements")
+    for proposal in proposals:
+        print(f"• {proposal['statement']}")
+        print(f"  {len(proposal['queries'])} statement(s), {proposal['total_time']:.1f}ms total")
+        verified = proposal["verified"]
+        if verified and "error" in verified:
+            print(f"  ⚠️  not verified: {verified['error']}")
+        elif verified:
+            gain = 100 * (1 - verified["cost_after"] / verified["cost_before"]) if verified["cost_before"] else 0
+            print(f"  hypothetical plan cost {verified['cost_before']:.1f} -> {verified['cost_after']:.1f} ({gain:.0f}% lower)")
+    for stmt in advisor_results:
+        result = stmt["index_advisor_result"]
+        print(f"• index_advisor for: {short(stmt['query'], 70)}")
+        for statement in result["index_statements"]:
+            print(f"  {statement}")
+        print(f"  cost {result['total_cost_before']} -> {result['total_cost_after']}")
+
+
+def save_snapshot(statements, source):
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"pgss-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    fields = ["queryid", "query", "rolname", "calls", "total_time", "mean_time",
+              "max_time", "rows_read", "cache_hit_rate", "index_advisor_result"]
+    with open(path, "w") as f:
+        json.dump({
+            "capturedAt": datetime.now().isoformat(),
+            "source": source,
+            "statements": [{k: s[k] for k in fields} for s in statements],
+        }, f, indent=2, default=str)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pg_stat_statements analyzer and index advisor")
+    parser.add_argument("--json", metavar="PATH", help="read a Supabase export or saved snapshot instead of the live DB")
+    parser.add_argument("--diff", metavar="PATH", help="rank activity since this earlier snapshot")
+    parser.add_argument("--save", action="store_true", help="write the current statements as a snapshot")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="total")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--all", action="store_true", help="include statements that touch no app table")
+    parser.add_argument("--routes", action="store_true", help="map statements to routes via /api/debug/queries")
+    parser.add_argument("--no-advise", action="store_true", help="skip index suggestions")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 QUERY PERFORMANCE ANALYSIS")
+    print("=" * 60)
+
+    tables = load_schema()
+    conn = None
+    if args.json:
+        statements = load_json(args.json)
+        source = args.json
+        indexes = tables
+    else:
+        if not DATABASE_URL:
+            print("❌ DATABASE_URL is not set (or pass --json PATH)")
+            return 2
+        conn = connect()
+        try:
+            statements = load_live(conn)
+        except Exception as e:
+            print(f"❌ Could not read pg_stat_statements: {e}")
+            return 2
+        source = "live"
+        indexes = load_live_indexes(conn)
+    print(f"Source: {source} ({len(statements)} statements)")
+
+    usage = (fetch_runtime_usage() if args.routes else None) or scan_source_usage(tables)
+    classify(statements, tables, usage)
+
+    if args.save:
+        print(f"💾 Snapshot written to {save_snapshot(statements, source)}")
+
+    ranked = statements
+    if args.diff:
+        previous = load_json(args.diff)
+        ranked = diff_snapshots(statements, previous)
+        print(f"Compared with {args.diff}: {len(ranked)} statements ran in between")
+
+    total = sum(s["total_time"] for s in ranked) or 1
+    app_time = sum(s["total_time"] for s in ranked if s["app"])
+    print(f"App statements: {app_time:.1f}ms ({100 * app_time / total:.0f}% of total DB time)")
+    print(f"System/tooling statements: {total - app_time:.1f}ms ({100 * (total - app_time) / total:.0f}%)")
+
+    if not args.all:
+        ranked = [s for s in ranked if s["app"]]
+    ranked.sort(key=lambda s: -s[SORT_KEYS[args.sort]])
+    print_ranking(ranked, args.sort, args.top, bool(args.diff))
+
+    proposals, advisor_results = [], []
+    if not args.no_advise:
+        by_cost = sorted(ranked, key=lambda s: -s["total_time"])
+        proposals = propose_indexes(by_cost, indexes, tables)
+        if conn:
+            extensions, version = installed_extensions(conn)
+            if "index_advisor" in extensions:
+                advisor_results = run_index_advisor(conn, by_cost, args.top)
+            elif "hypopg" in extensions and version >= 160000:
+                verify_with_hypopg(conn, proposals, statements)
+            else:
+                print("\nℹ️  Install index_advisor or hypopg (Postgres 16+) to verify candidates")
+        else:
+            advisor_results = [s for s in by_cost if (s["index_advisor_result"] or {}).get("index_statements")]
+        print_proposals(proposals, advisor_results)
+
+    if conn:
+        conn.close()
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_path = os.path.join(REPORT_DIR, f"query-analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(report_path, "w") as f:
+        json.dump({
+            "source": source,
+            "diff": args.diff,
+            "statements": ranked[: args.top],
+            "indexCandidates": proposals,
+        }, f, indent=2, default=str)
+    print(f"\n💾 Report written to {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,58 +1,63 @@
 """
 Quick Manual Verification Script
-Tests core functionality without Selenium (uses requests library)
+Tests core functionality without Selenium (uses the colab_client API client)
 """
 
-import requests
-import json
+import asyncio
 
-BASE_URL = "http://localhost:3000"
+import httpx
 
-def test_server_running():
+from colab_client import ColabClient
+
+async def test_server_running(session):
     """Test 1: Server is running"""
     try:
-        response = requests.get(BASE_URL, timeout=5)
+        response = await session.request("GET", "/", retries=0, check=False)
         if response.status_code == 200:
             print("✅ Server is running")
             return True
         else:
             print(f"❌ Server returned status {response.status_code}")
             return False
-    except Exception as e:
+    except httpx.HTTPError as e:
         print(f"❌ Server not reachable: {e}")
         return False
 
-def test_api_health():
+async def test_api_health(session):
     """Test 2: API endpoints are accessible"""
     endpoints = [
         "/api/workspaces",
+        "/api/bootstrap",
         "/api/search",
     ]
     
     passed = 0
     for endpoint in endpoints:
         try:
-            response = requests.get(f"{BASE_URL}{endpoint}", timeout=5)
+            response = await session.request("GET", endpoint, retries=0, check=False)
             # 401 is expected for protected routes without auth
             if response.status_code in [200, 401]:
                 print(f"✅ {endpoint} - Accessible")
                 passed += 1
             else:
                 print(f"❌ {endpoint} - Status {response.status_code}")
-        except Exception as e:
+        except httpx.HTTPError as e:
             print(f"❌ {endpoint} - Error: {e}")
     
     return passed == len(endpoints)
 
-def main():
+async def main():
     print("=" * 60)
     print("🧪 COLAB TASK MANAGER - QUICK VERIFICATION")
     print("=" * 60)
     print()
     
     results = []
-    results.append(test_server_running())
-    results.append(test_api_health())
+    async with ColabClient(timeout=5) as client:
+        # No credentials: protected routes should answer 401
+        session = client.session()
+        results.append(await test_server_running(session))
+        results.append(await test_api_health(session))
     
     print()
     print("=" * 60)
@@ -70,4 +75,4 @@ def main():
     print()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
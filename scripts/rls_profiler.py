@@ -0,0 +1,509 @@
+"""
+RLS Policy Cost Profiler
+Runs the app's hot read queries (chat history, task board, search, files,
+notifications) with EXPLAIN ANALYZE twice: as the connecting table owner,
+which bypasses RLS, and as the Supabase `authenticated` role for a real
+user. It reports what the policies add to each query.
+
+Usage:
+    python scripts/rls_profiler.py                      # overhead of the installed policies
+    python scripts/rls_profiler.py --email alice@example.com
+    python scripts/rls_profiler.py --per-policy         # cost of each policy
+    python scripts/rls_profiler.py --compare            # installed vs supabase/rls-policies-optimized.sql
+    python scripts/rls_profiler.py --compare --policies supabase/rls-policies.sql
+    python scripts/rls_profiler.py --bootstrap          # plain Postgres: create the Supabase roles first
+
+Connect as the table owner (DIRECT_URL / RLS_DATABASE_URL, e.g. the
+`postgres` user on Supabase). Policy files given with --policies and
+--optimized are applied inside a transaction that is rolled back, and
+--per-policy drops one policy at a time the same way. Nothing is persisted,
+but those runs hold table locks while they measure, so point the tool at a
+staging copy rather than production.
+
+--per-policy replaces each policy with nothing (if other policies on the
+table still grant access) or with USING (true). Its cost is how much faster
+the query gets without it. --compare exits 1 if the optimized set returns
+different row counts than the current one, or is slower overall.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+from datetime import datetime
+
+from colab_client import load_env
+
+config = load_env()
+DATABASE_URL = (
+    os.getenv("RLS_DATABASE_URL") or config.get("DIRECT_URL") or config.get("DATABASE_URL")
+)
+REPORT_DIR = os.getenv("PERF_REPORT_DIR", "perf-reports")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPTIMIZED_POLICIES = os.path.join(ROOT, "supabase", "rls-policies-optimized.sql")
+
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+
+# Mirrors the SQL Prisma issues for the matching API routes
+QUERIES = {
+    "chat_history": """
+        SELECT m.*, (SELECT count(*) FROM "Message" r WHERE r."parentId" = m.id) AS replies
+        FROM "Message" m
+        WHERE m."projectId" = %(project)s AND m."parentId" IS NULL
+        ORDER BY m."createdAt" DESC LIMIT 50
+    """,
+    "workspace_chat": """
+        SELECT m.* FROM "Message" m
+        WHERE m."workspaceId" = %(workspace)s AND m."parentId" IS NULL
+        ORDER BY m."createdAt" DESC LIMIT 50
+    """,
+    "task_board": """
+        SELECT t.*,
+               (SELECT count(*) FROM "Subtask" s WHERE s."taskId" = t.id) AS subtasks,
+               (SELECT count(*) FROM "Comment" c WHERE c."taskId" = t.id) AS comments
+        FROM "Task" t
+        WHERE t."projectId" = %(project)s
+        ORDER BY t.position
+    """,
+    "my_tasks": """
+        SELECT t.*, p.name AS project FROM "Task" t
+        JOIN "Project" p ON p.id = t."projectId"
+        WHERE t."assigneeId" = %(user)s
+        ORDER BY t."dueDate" NULLS LAST
+    """,
+    "search_tasks": """
+        SELECT t.id, t.title FROM "Task" t
+        JOIN "Project" p ON p.id = t."projectId"
+        WHERE p."workspaceId" = %(workspace)s AND t.title ILIKE %(pattern)s
+        LIMIT 20
+    """,
+    "search_messages": """
+        SELECT m.id, m.content FROM "Message" m
+        WHERE (m."workspaceId" = %(workspace)s
+               OR m."projectId" IN (SELECT id FROM "Project" WHERE "workspaceId" = %(workspace)s))
+          AND m.content ILIKE %(pattern)s
+        ORDER BY m."createdAt" DESC LIMIT 20
+    """,
+    "file_listing": """
+        SELECT f.*, u.name AS uploader FROM "File" f
+        JOIN "User" u ON u.id = f."uploadedById"
+        WHERE f."projectId" = %(project)s
+        ORDER BY f."createdAt" DESC
+    """,
+    "notifications": """
+        SELECT * FROM "Notification"
+        WHERE "userId" = %(user)s
+        ORDER BY "createdAt" DESC LIMIT 50
+    """,
+    "workspace_members": """
+        SELECT wm.*, u.name, u.email FROM "WorkspaceMember" wm
+        JOIN "User" u ON u.id = wm."userId"
+        WHERE wm."workspaceId" = %(workspace)s
+    """,
+}
+
+# Supabase's auth.uid(), for --bootstrap on plain Postgres
+BOOTSTRAP_SQL = """
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN
+    CREATE ROLE authenticated NOLOGIN;
+  END IF;
+END $$;
+GRANT authenticated TO CURRENT_USER;
+GRANT USAGE ON SCHEMA public TO authenticated;
+GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO authenticated;
+CREATE SCHEMA IF NOT EXISTS auth;
+GRANT USAGE ON SCHEMA auth TO authenticated;
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS $$
+  SELECT coalesce(
+    nullif(current_setting('request.jwt.claim.sub', true), ''),
+    (nullif(current_setting('request.jwt.claims', true), '')::jsonb ->> 'sub')
+  )::uuid
+$$;
+"""
+
+
+def connect():
+    try:
+        import psycopg
+    except ImportError:
+        print("❌ psycopg is required: pip install -r scripts/requirements.txt")
+        sys.exit(2)
+    return psycopg.connect(DATABASE_URL)
+
+
+def plan_stats(plan):
+    """Total time, rows and how often policy-style subqueries ran"""
+    top = plan[0]
+    stats = {
+        "ms": top["Planning Time"] + top["Execution Time"],
+        "rows": top["Plan"]["Actual Rows"],
+        "subplanLoops": 0,
+        "initPlans": 0,
+        "rowsFiltered": 0,
+    }
+
+    def walk(node):
+        relationship = node.get("Parent Relationship")
+        if relationship == "SubPlan":
+            stats["subplanLoops"] += node.get("Actual Loops", 0)
+        elif relationship == "InitPlan":
+            stats["initPlans"] += 1
+        stats["rowsFiltered"] += node.get("Rows Removed by Filter", 0) * node.get("Actual Loops", 1)
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(top["Plan"])
+    return stats
+
+
+class Profiler:
+    def __init__(self, conn, runs):
+        self.conn = conn
+        self.runs = runs
+        self.params = None
+        self.user = None
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def check_access(self):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT r.rolsuper OR r.rolbypassrls OR c.relowner = r.oid,
+                       EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated'),
+                       to_regprocedure('auth.uid()') IS NOT NULL
+                FROM pg_roles r, pg_class c
+                WHERE r.rolname = current_user AND c.oid = '"Task"'::regclass
+                """
+            )
+            bypasses, has_role, has_uid = cur.fetchone()
+        self.conn.rollback()
+        if not bypasses:
+            raise RuntimeError("Connect as the table owner (or a BYPASSRLS role) to measure without RLS")
+        if not (has_role and has_uid):
+            raise RuntimeError("No `authenticated` role or auth.uid(). On plain Postgres, run with --bootstrap")
+
+    def bootstrap(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('auth.users') IS NOT NULL")
+            if cur.fetchone()[0]:
+                raise RuntimeError("--bootstrap is for plain Postgres; this looks like a Supabase database")
+            cur.execute(BOOTSTRAP_SQL)
+        self.conn.commit()
+        print("🔧 Created the authenticated role and auth.uid()")
+
+    def pick_fixtures(self, email, search):
+        """The profiled user and their busiest project"""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT u.id, u."supabaseId", u.email FROM "User" u
+                WHERE u."supabaseId" IS NOT NULL AND (%(email)s::text IS NULL OR u.email = %(email)s)
+                ORDER BY (SELECT count(*) FROM "ProjectMember" pm WHERE pm."userId" = u.id) DESC
+                LIMIT 1
+                """,
+                {"email": email},
+            )
+            user = cur.fetchone()
+            if not user:
+                raise RuntimeError(f"No user with a supabaseId{f' and email {email}' if email else ''}")
+            if not UUID_RE.match(user[1]):
+                raise RuntimeError(f"{user[2]} has a non-UUID supabaseId; auth.uid() cannot match it")
+            cur.execute(
+                """
+                SELECT p.id, p."workspaceId" FROM "ProjectMember" pm
+                JOIN "Project" p ON p.id = pm."projectId"
+                WHERE pm."userId" = %s
+                ORDER BY (SELECT count(*) FROM "Task" t WHERE t."projectId" = p.id) DESC
+                LIMIT 1
+                """,
+                (user[0],),
+            )
+            project = cur.fetchone()
+            if not project:
+                raise RuntimeError(f"{user[2]} is not a member of any project. Seed the database first.")
+
+            # Session-level claims, read by auth.uid() as on Supabase
+            claims = json.dumps({"sub": user[1], "role": "authenticated"})
+            cur.execute(
+                """
+                SELECT set_config('request.jwt.claims', %s, false),
+                       set_config('request.jwt.claim.sub', %s, false),
+                       set_config('request.jwt.claim.role', 'authenticated', false)
+                """,
+                (claims, user[1]),
+            )
+        self.conn.commit()
+
+        self.user = user[2]
+        self.params = {
+            "user": user[0],
+            "project": project[0],
+            "workspace": project[1],
+            "pattern": f"%{search}%",
+        }
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def explain(self, cur, sql):
+        cur.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", self.params)
+        return plan_stats(cur.fetchone()[0])
+
+    def measure(self, sql, rls):
+        """Median of `runs` EXPLAIN ANALYZE runs after one warm-up, in a savepoint"""
+        try:
+            with self.conn.transaction():
+                with self.conn.cursor() as cur:
+                    if rls:
+                        cur.execute("SET ROLE authenticated")
+                    self.explain(cur, sql)
+                    samples = [self.explain(cur, sql) for _ in range(self.runs)]
+                    if rls:
+                        cur.execute("RESET ROLE")
+        except Exception as e:
+            return {"error": str(e).splitlines()[0]}
+        result = dict(samples[-1])
+        result["ms"] = round(statistics.median(s["ms"] for s in samples), 3)
+        return result
+
+    def apply_policies(self, path):
+        """Run a policy file in the current transaction (rolled back by the caller)"""
+        with open(path) as f, self.conn.cursor() as cur:
+            cur.execute(f.read())
+
+    def policy_count(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM pg_policies WHERE schemaname = 'public'")
+            return cur.fetchone()[0]
+
+    def profile(self, policies=None):
+        """Every query without and with RLS under the given (or installed) policies"""
+        try:
+            # Opens the transaction rolled back below; measurements use savepoints
+            self.conn.execute("SELECT 1")
+            if policies:
+                self.apply_policies(policies)
+            count = self.policy_count()
+            results = {}
+            for name, sql in QUERIES.items():
+                results[name] = {
+                    "noRls": self.measure(sql, rls=False),
+                    "rls": self.measure(sql, rls=True),
+                }
+            return count, results
+        finally:
+            self.conn.rollback()
+
+    def select_policies(self, sql):
+        """Read policies that apply to the `authenticated` role on the query's tables"""
+        tables = set(re.findall(r'"(\w+)"', sql))
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT tablename, policyname, permissive,
+                       count(*) OVER (PARTITION BY tablename, permissive)
+                FROM pg_policies
+                WHERE schemaname = 'public' AND tablename = ANY(%s)
+                  AND cmd IN ('SELECT', 'ALL')
+                  AND roles && ARRAY['authenticated', 'public']::name[]
+                ORDER BY tablename, policyname
+                """,
+                (list(tables),),
+            )
+            return cur.fetchall()
+
+    def profile_policies(self, policies=None):
+        """Cost of each policy: how much faster each query gets without it"""
+        import psycopg
+
+        try:
+            self.conn.execute("SELECT 1")
+            if policies:
+                self.apply_policies(policies)
+            rows = []
+            for name, sql in QUERIES.items():
+                full = self.measure(sql, rls=True)
+                if "error" in full:
+                    rows.append({"query": name, "error": full["error"]})
+                    continue
+                for table, policy, permissive, siblings in self.select_policies(sql):
+                    with self.conn.transaction():
+                        with self.conn.cursor() as cur:
+                            cur.execute(f'DROP POLICY "{policy}" ON "{table}"')
+                            if permissive == "PERMISSIVE" and siblings == 1:
+                                # Last grant on the table: keep rows visible
+                                cur.execute(
+                                    f'CREATE POLICY "rls_profiler_open" ON "{table}" '
+                                    f"FOR SELECT TO authenticated USING (true)"
+                                )
+                        without = self.measure(sql, rls=True)
+                        raise psycopg.Rollback()
+                    if "error" in without:
+                        continue
+                    rows.append({
+                        "query": name,
+                        "table": table,
+                        "policy": policy,
+                        "costMs": round(full["ms"] - without["ms"], 3),
+                        "pct": round(100 * (full["ms"] - without["ms"]) / full["ms"], 1) if full["ms"] else 0,
+                        "rowsChanged": full["rows"] != without["rows"],
+                    })
+            return rows
+        finally:
+            self.conn.rollback()
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+def print_overhead(count, results):
+    print(f"\n{count} policies installed\n")
+    print(f"{'query':<20}{'no RLS':>10}{'RLS':>10}{'overhead':>10}{'rows':>12}{'subplans':>10}{'initplans':>10}")
+    for name, r in results.items():
+        base, rls = r["noRls"], r["rls"]
+        if "error" in base or "error" in rls:
+            print(f"{name:<20}❌ {(rls if 'error' in rls else base)['error']}")
+            continue
+        overhead = f"{rls['ms'] / base['ms']:.1f}x" if base["ms"] else "-"
+        rows = f"{base['rows']}/{rls['rows']}"
+        print(
+            f"{name:<20}{base['ms']:>9.2f}ms{rls['ms']:>8.2f}ms{overhead:>10}"
+            f"{rows:>12}{rls['subplanLoops']:>10}{rls['initPlans']:>10}"
+        )
+    print("\nrows: without/with RLS. subplans: executions of correlated subqueries (per-row policy checks).")
+
+
+def print_policies(rows):
+    print(f"\n{'query':<20}{'table':<18}{'cost':>10}{'share':>8}  policy")
+    for row in sorted(rows, key=lambda r: -r.get("costMs", 0)):
+        if "error" in row:
+            print(f"{row['query']:<20}❌ {row['error']}")
+            continue
+        flag = " (rows changed)" if row["rowsChanged"] else ""
+        print(
+            f"{row['query']:<20}{row['table']:<18}{row['costMs']:>8.2f}ms{row['pct']:>7.1f}%"
+            f"  {row['policy']}{flag}"
+        )
+
+
+def compare(current, optimized):
+    """Print current vs optimized RLS timings; returns problems found"""
+    (current_count, current_results), (optimized_count, optimized_results) = current, optimized
+    print(f"\nPolicies: {current_count} current, {optimized_count} optimized\n")
+    print(f"{'query':<20}{'current':>10}{'optimized':>11}{'speedup':>9}{'subplans':>14}{'rows':>14}")
+
+    problems = []
+    totals = [0.0, 0.0]
+    for name in QUERIES:
+        before, after = current_results[name]["rls"], optimized_results[name]["rls"]
+        if "error" in after:
+            problems.append(f"{name}: optimized policies fail: {after['error']}")
+            print(f"{name:<20}❌ {after['error']}")
+            continue
+        if "error" in before:
+            print(f"{name:<20}{'error':>10}{after['ms']:>9.2f}ms   (current: {before['error']})")
+            continue
+        totals[0] += before["ms"]
+        totals[1] += after["ms"]
+        speedup = f"{before['ms'] / after['ms']:.1f}x" if after["ms"] else "-"
+        subplans = f"{before['subplanLoops']}→{after['subplanLoops']}"
+        rows = f"{before['rows']}→{after['rows']}"
+        marker = "" if before["rows"] == after["rows"] else " ⚠️"
+        print(
+            f"{name:<20}{before['ms']:>8.2f}ms{after['ms']:>9.2f}ms{speedup:>9}"
+            f"{subplans:>14}{rows:>14}{marker}"
+        )
+        if before["rows"] != after["rows"]:
+            problems.append(f"{name}: row count changed ({before['rows']} -> {after['rows']})")
+
+    print(f"\n{'total':<20}{totals[0]:>8.2f}ms{totals[1]:>9.2f}ms")
+    if totals[1] > totals[0]:
+        problems.append(f"optimized policies are slower overall ({totals[1]:.2f}ms vs {totals[0]:.2f}ms)")
+    return problems
+
+
+def save_report(report):
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"rls-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RLS policy cost profiler")
+    parser.add_argument("--email", help="profile as this user (default: the one in the most projects)")
+    parser.add_argument("--search", default="task", help="search term for the search queries")
+    parser.add_argument("--runs", type=int, default=5, help="EXPLAIN ANALYZE runs per measurement")
+    parser.add_argument("--policies", metavar="PATH", help="apply this policy file as the current set")
+    parser.add_argument("--per-policy", action="store_true", help="measure each policy's cost")
+    parser.add_argument("--compare", action="store_true", help="compare with the optimized policy set")
+    parser.add_argument("--optimized", metavar="PATH", default=OPTIMIZED_POLICIES)
+    parser.add_argument("--bootstrap", action="store_true", help="create Supabase's role and auth.uid() on plain Postgres")
+    parser.add_argument("--save", action="store_true", help=f"write a JSON report to {REPORT_DIR}/")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🛡️  RLS POLICY COST PROFILE")
+    print("=" * 60)
+
+    if not DATABASE_URL:
+        print("❌ Set RLS_DATABASE_URL, DIRECT_URL or DATABASE_URL")
+        return 2
+
+    conn = connect()
+    profiler = Profiler(conn, args.runs)
+    try:
+        if args.bootstrap:
+            profiler.bootstrap()
+        profiler.check_access()
+        profiler.pick_fixtures(args.email, args.search)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+
+    print(f"User: {profiler.user}  project: {profiler.params['project']}  runs: {args.runs}")
+    if args.policies:
+        print(f"Current policies: {args.policies} (applied in a rolled-back transaction)")
+
+    report = {"capturedAt": datetime.now().isoformat(), "user": profiler.user}
+    current = profiler.profile(args.policies)
+    report["overhead"] = current[1]
+    print_overhead(*current)
+
+    if args.per_policy:
+        print("\n🔬 Per-policy cost")
+        report["policies"] = profiler.profile_policies(args.policies)
+        print_policies(report["policies"])
+
+    problems = []
+    if args.compare:
+        print(f"\n⚖️  Current vs {os.path.relpath(args.optimized)}")
+        optimized = profiler.profile(args.optimized)
+        report["optimized"] = optimized[1]
+        problems = compare(current, optimized)
+
+    conn.close()
+    if args.save:
+        print(f"\n💾 Report written to {save_report(report)}")
+
+    print("=" * 60)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if args.compare and not problems:
+        print("✅ Optimized policies return the same rows and are faster")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Local SMTP sink for testing the background email queue.
+
+Accepts every message and writes it to an .eml file instead of delivering
+it, so invitation emails can be exercised without Gmail credentials.
+
+Usage:
+    python scripts/smtp_sink.py            # listens on localhost:1025
+    SMTP_SINK_PORT=2525 python scripts/smtp_sink.py
+
+Then set SMTP_HOST=localhost and SMTP_PORT=1025 in .env and run
+`npm run worker`.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+HOST = os.getenv("SMTP_SINK_HOST", "localhost")
+PORT = int(os.getenv("SMTP_SINK_PORT", "1025"))
+OUTPUT_DIR = Path(os.getenv("SMTP_SINK_DIR", "smtp-sink"))
+
+
+class SinkSession:
+    """One SMTP conversation (plain text, no auth, no TLS)"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.mail_from = None
+        self.rcpt_to = []
+
+    async def reply(self, line):
+        self.writer.write(f"{line}\r\n".encode())
+        await self.writer.drain()
+
+    async def read_data(self):
+        lines = []
+        while True:
+            line = await self.reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+    def save(self, data):
+        OUTPUT_DIR.mkdir(exist_ok=True)
+        path = OUTPUT_DIR / f"{time.time_ns()}.eml"
+        path.write_bytes(data)
+        print(f"📨 {self.mail_from} -> {', '.join(self.rcpt_to)} ({len(data)} bytes) {path}")
+
+    async def run(self):
+        await self.reply(f"220 {HOST} smtp-sink ready")
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            command = line.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                await self.reply(f"250-{HOST}")
+                await self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                await self.reply(f"250 {HOST}")
+            elif verb == "MAIL":
+                self.mail_from = command.split(":", 1)[-1].strip()
+                self.rcpt_to = []
+                await self.reply("250 OK")
+            elif verb == "RCPT":
+                self.rcpt_to.append(command.split(":", 1)[-1].strip())
+                await self.reply("250 OK")
+            elif verb == "DATA":
+                await self.reply("354 End data with <CR><LF>.<CR><LF>")
+                self.save(await self.read_data())
+                await self.reply("250 OK: queued")
+            elif verb == "RSET":
+                self.mail_from, self.rcpt_to = None, []
+                await self.reply("250 OK")
+            elif verb == "NOOP":
+                await self.reply("250 OK")
+            elif verb == "QUIT":
+                await self.reply("221 Bye")
+                break
+            else:
+                await self.reply("502 Command not implemented")
+
+        self.writer.close()
+
+
+async def handle_client(reader, writer):
+    try:
+        await SinkSession(reader, writer).run()
+    except ConnectionError:
+        pass
+
+
+async def main():
+    server = await asyncio.start_server(handle_client, HOST, PORT)
+    print("=" * 60)
+    print(f"📬 SMTP sink listening on {HOST}:{PORT}")
+    print(f"   Writing messages to {OUTPUT_DIR.resolve()}")
+    print("=" * 60)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 SMTP sink stopped")
@@ -0,0 +1,534 @@
+"""
+Soak Test
+Drives steady mixed traffic against a running server for hours while
+sampling its memory and handle gauges from /metrics, then fails when any
+of them keeps growing. Catches leaks that a short load test never shows:
+Maps that are never pruned, sockets, timers or Socket.io rooms that are
+never released, Realtime channels that are never removed.
+
+Usage:
+    python scripts/soak_test.py                                  # 2h, 10 users
+    python scripts/soak_test.py --duration 8h --rate 20 --users 25
+    python scripts/soak_test.py --duration 15m --warmup 2m --sample-every 10s
+
+Traffic: --users virtual users (Poisson arrivals, --rate requests/s in
+total) read boards, chat, notifications and dashboards and create, move and
+delete tasks; --sockets Socket.io clients connect over long-polling, join
+and leave rooms and disconnect (some without saying goodbye, like a closed
+tab). Accounts come from REPLAY_USERS_FILE (see traffic_replay.py) or
+TEST_USER_EMAIL.
+
+Leak check: samples after --warmup are split into 4 windows. A gauge leaks
+when its median rises in every window and grows by more than
+--max-growth-pct (and a per-gauge floor that ignores allocator noise).
+After the traffic stops, Socket.io clients must drop back to the baseline.
+
+Heap snapshots: start the server with HEAP_SNAPSHOT_DIR set and one is
+written after warmup, every --snapshot-every and at the end. Load the
+first and last in Chrome DevTools (Memory > Comparison) to see what grew.
+
+Samples stream to perf-reports/soak-<time>.jsonl, so an interrupted run
+keeps its data; the verdict goes to soak-<time>.json. Exits 1 on a leak or
+when the error rate exceeds SOAK_MAX_ERROR_PCT (default 1).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import httpx
+
+from colab_client import BASE_URL, EMAIL, PASSWORD, ApiError, AuthError, ColabClient, load_env
+
+USERS_FILE = os.getenv("REPLAY_USERS_FILE")
+WORKSPACE_SLUG = os.getenv("BENCH_WORKSPACE", "engineering")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or load_env().get("METRICS_TOKEN")
+MAX_ERROR_PCT = float(os.getenv("SOAK_MAX_ERROR_PCT", "1"))
+REPORT_DIR = os.getenv("PERF_REPORT_DIR", "perf-reports")
+
+MB = 1024 * 1024
+WINDOWS = 4
+
+# (sample key, label, growth below this is noise, format)
+TRACKED = [
+    ("rss", "Resident memory", 32 * MB, "bytes"),
+    ("heapUsed", "Heap used", 16 * MB, "bytes"),
+    ("external", "External memory", 16 * MB, "bytes"),
+    ("handles", "Active handles", 25, "count"),
+    ("tcpSockets", "TCP sockets", 25, "count"),
+    ("socketClients", "Socket.io clients", 5, "count"),
+    ("socketRooms", "Socket.io rooms", 10, "count"),
+    ("rateLimitEntries", "Rate-limit entries", 200, "count"),
+    ("realtimeChannels", "Realtime channels", 5, "count"),
+]
+
+SAMPLE_LINE = re.compile(r"^([a-zA-Z_:][\w:]*)(?:\{(.*)\})?\s+(\S+)$")
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_duration(value):
+    """Seconds from '90', '90s', '30m' or '4h'"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smh]?)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value}")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def format_value(value, kind):
+    return f"{value / MB:.1f}MB" if kind == "bytes" else f"{value:.0f}"
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+def parse_metrics(text):
+    """Prometheus text format -> {name: [(labels, value)]}"""
+    series = defaultdict(list)
+    for line in text.splitlines():
+        match = SAMPLE_LINE.match(line)
+        if not match or line.startswith("#"):
+            continue
+        name, labels, value = match.groups()
+        try:
+            series[name].append((dict(LABEL.findall(labels or "")), float(value)))
+        except ValueError:
+            pass
+    return series
+
+
+def total(series, name, **labels):
+    """Sum of a metric's samples matching `labels`; None when absent"""
+    values = [
+        value for sample_labels, value in series.get(name, [])
+        if all(sample_labels.get(k) == v for k, v in labels.items())
+    ]
+    return sum(values) if values else None
+
+
+def to_sample(series, elapsed):
+    sample = {
+        "t": round(elapsed, 1),
+        "rss": total(series, "process_resident_memory_bytes"),
+        "heapUsed": total(series, "nodejs_heap_bytes", space="used"),
+        "heapTotal": total(series, "nodejs_heap_bytes", space="total"),
+        "external": total(series, "nodejs_heap_bytes", space="external"),
+        "handles": total(series, "nodejs_active_resources"),
+        "tcpSockets": total(series, "nodejs_active_resources", type="TCPSocketWrap"),
+        "socketClients": total(series, "socket_connections"),
+        "socketRooms": total(series, "socket_rooms"),
+        "rateLimitEntries": total(series, "rate_limit_store_entries"),
+        "realtimeChannels": total(series, "realtime_channels"),
+        "loopLagP99": total(series, "nodejs_eventloop_lag_seconds", quantile="0.99"),
+    }
+    return {key: value for key, value in sample.items() if value is not None}
+
+
+def detect_growth(samples, key, floor, max_growth_pct):
+    """
+    Trend of one gauge: window medians, growth from the first to the last
+    window, least-squares slope per hour, and whether it counts as a leak
+    """
+    points = [(s["t"], s[key]) for s in samples if key in s]
+    if len(points) < WINDOWS * 2:
+        return None
+    size = len(points) // WINDOWS
+    windows = [points[i * size:(i + 1) * size] for i in range(WINDOWS - 1)]
+    windows.append(points[(WINDOWS - 1) * size:])
+    medians = [statistics.median(value for _, value in window) for window in windows]
+
+    mean_t = statistics.fmean(t for t, _ in points)
+    mean_v = statistics.fmean(v for _, v in points)
+    spread = sum((t - mean_t) ** 2 for t, _ in points)
+    slope = sum((t - mean_t) * (v - mean_v) for t, v in points) / spread if spread else 0.0
+
+    growth = medians[-1] - medians[0]
+    rising = all(later > earlier for earlier, later in zip(medians, medians[1:]))
+    limit = max(floor, abs(medians[0]) * max_growth_pct / 100)
+    return {
+        "medians": medians,
+        "growth": growth,
+        "perHour": slope * 3600,
+        "rising": rising,
+        "leak": rising and growth > limit,
+    }
+
+
+# ============================================================================
+# SOCKET.IO CLIENTS
+# ============================================================================
+
+class PollingSocket:
+    """
+    Just enough of a Socket.IO v4 client over Engine.IO long-polling to
+    connect, emit events and disconnect, using the harness's httpx pool
+    """
+
+    def __init__(self, http, base_url):
+        self.http = http
+        self.url = f"{base_url}/socket.io/"
+        self.sid = None
+
+    async def _post(self, *packets):
+        await self.http.post(
+            self.url,
+            params={"EIO": "4", "transport": "polling", "sid": self.sid},
+            content="\x1e".join(packets),
+            headers={"Content-Type": "text/plain;charset=UTF-8"},
+        )
+
+    async def _poll(self):
+        res = await self.http.get(
+            self.url, params={"EIO": "4", "transport": "polling", "sid": self.sid}
+        )
+        res.raise_for_status()
+        return res.text.split("\x1e")
+
+    async def connect(self):
+        res = await self.http.get(self.url, params={"EIO": "4", "transport": "polling"})
+        res.raise_for_status()
+        # Open packet: "0" + {"sid", "pingInterval", ...}
+        self.sid = json.loads(res.text.split("\x1e")[0][1:])["sid"]
+        await self._post("40")
+        packets = await self._poll()
+        if not any(p.startswith("40") for p in packets):
+            raise RuntimeError(f"Socket.IO connect not acknowledged: {packets}")
+
+    async def emit(self, event, *args):
+        await self._post("42" + json.dumps([event, *args]))
+
+    async def close(self):
+        await self._post("1")
+
+
+# ============================================================================
+# SOAK RUN
+# ============================================================================
+
+class Soak:
+    def __init__(self, client, args, accounts):
+        self.client = client
+        self.args = args
+        self.accounts = accounts
+        self.sessions = []
+        self.context = {}
+        self.stopping = asyncio.Event()
+        self.results = defaultdict(Counter)
+        self.socket_stats = Counter()
+        self.samples = []
+        self.snapshots = []
+        self.snapshots_enabled = True
+        self.started = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    async def setup(self):
+        for email, password in self.accounts:
+            self.sessions.append(await self.client.login(email, password))
+        session = self.sessions[0]
+        projects = await session.projects.list(workspace_slug=WORKSPACE_SLUG)
+        if not projects:
+            raise RuntimeError(f"No projects in workspace '{WORKSPACE_SLUG}'. Seed the database first.")
+        members = (await session.workspaces.members(WORKSPACE_SLUG))["members"]
+        self.context = {
+            "slug": WORKSPACE_SLUG,
+            "projectIds": [p["id"] for p in projects],
+            "userIds": [m["userId"] for m in members],
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP traffic
+    # ------------------------------------------------------------------
+
+    def actions(self):
+        """(name, weight, coroutine factory) - read-heavy, like the app"""
+        ctx = self.context
+
+        def project():
+            return random.choice(ctx["projectIds"])
+
+        async def task_lifecycle(s):
+            task = await s.tasks.create(project(), f"soak-{uuid.uuid4().hex[:8]}", status="TODO", priority="LOW")
+            try:
+                await s.tasks.move(task["id"], status="IN_PROGRESS")
+            finally:
+                await s.tasks.delete(task["id"])
+
+        return [
+            ("GET /api/bootstrap", 10, lambda s: s.workspaces.bootstrap(ctx["slug"])),
+            ("GET /api/workspaces", 5, lambda s: s.workspaces.list()),
+            ("GET /api/notifications", 10, lambda s: s.notifications.list()),
+            ("GET /api/unread", 15, lambda s: s.chat.unread()),
+            ("GET /api/tasks", 15, lambda s: s.tasks.list(project())),
+            ("GET /api/tasks/my", 5, lambda s: s.tasks.mine()),
+            ("GET /api/chat", 15, lambda s: s.chat.page(project_id=project())),
+            ("GET /api/time", 5, lambda s: s.time.list()),
+            ("GET dashboard", 5, lambda s: s.workspaces.dashboard(ctx["slug"])),
+            ("task create/move/delete", 5, task_lifecycle),
+        ]
+
+    async def user(self, session, rate):
+        actions = self.actions()
+        weights = [weight for _, weight, _ in actions]
+        while not self.stopping.is_set():
+            name, _, action = random.choices(actions, weights)[0]
+            stats = self.results[name]
+            try:
+                await action(session)
+                stats["ok"] += 1
+            except (ApiError, httpx.HTTPError) as e:
+                stats["errors"] += 1
+                if stats["errors"] <= 3:
+                    print(f"   ⚠️  {name}: {e}")
+            try:
+                await asyncio.wait_for(self.stopping.wait(), random.expovariate(rate))
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Socket.io churn
+    # ------------------------------------------------------------------
+
+    async def socket_client(self):
+        ctx = self.context
+        while not self.stopping.is_set():
+            socket = PollingSocket(self.client.http, self.client.base_url)
+            try:
+                await socket.connect()
+                self.socket_stats["connected"] += 1
+                await socket.emit("join-user", random.choice(ctx["userIds"]))
+                projects = random.sample(ctx["projectIds"], min(len(ctx["projectIds"]), random.randint(1, 5)))
+                for project_id in projects:
+                    await socket.emit("join-project", project_id)
+                # Stay under the 25s ping interval so no pong is needed
+                await asyncio.sleep(random.uniform(2, 20))
+                if random.random() < 0.2:
+                    # Closed tab: the server notices at the ping timeout
+                    self.socket_stats["abandoned"] += 1
+                    continue
+                for project_id in projects[: len(projects) // 2]:
+                    await socket.emit("leave-project", project_id)
+                await socket.close()
+            except (httpx.HTTPError, RuntimeError, ValueError, KeyError) as e:
+                self.socket_stats["errors"] += 1
+                if self.socket_stats["errors"] <= 3:
+                    print(f"   ⚠️  socket: {e}")
+                await asyncio.sleep(1)
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def metrics_headers(self):
+        return {"Authorization": f"Bearer {METRICS_TOKEN}"} if METRICS_TOKEN else {}
+
+    async def sample(self, log):
+        res = await self.client.http.get(f"{self.client.base_url}/metrics", headers=self.metrics_headers())
+        res.raise_for_status()
+        sample = to_sample(parse_metrics(res.text), self.elapsed())
+        if "rss" not in sample:
+            raise RuntimeError("/metrics has no process gauges (lib/process-metrics.ts); is the server up to date?")
+        self.samples.append(sample)
+        log.write(json.dumps(sample) + "\n")
+        log.flush()
+        return sample
+
+    async def snapshot(self, label):
+        if not self.snapshots_enabled:
+            return
+        res = await self.client.http.post(
+            f"{self.client.base_url}/debug/heap-snapshot", headers=self.metrics_headers(), timeout=300
+        )
+        if res.status_code == 404:
+            print("   ℹ️  Heap snapshots disabled: start the server with HEAP_SNAPSHOT_DIR set")
+            self.snapshots_enabled = False
+            return
+        res.raise_for_status()
+        path = res.json()["file"]
+        self.snapshots.append({"label": label, "t": round(self.elapsed(), 1), "file": path})
+        print(f"   📸 Heap snapshot ({label}): {path}")
+
+    async def sampler(self, log):
+        args = self.args
+        next_snapshot = args.warmup
+        while not self.stopping.is_set():
+            sample = await self.sample(log)
+            if sample["t"] >= next_snapshot and args.snapshot_every:
+                await self.snapshot("warmup" if next_snapshot == args.warmup else f"{sample['t'] / 60:.0f}m")
+                next_snapshot += args.snapshot_every
+            print(
+                f"   {sample['t'] / 60:6.1f}m  rss {format_value(sample['rss'], 'bytes'):>8}"
+                f"  heap {format_value(sample.get('heapUsed', 0), 'bytes'):>8}"
+                f"  handles {sample.get('handles', 0):5.0f}"
+                f"  sockets {sample.get('socketClients', 0):4.0f}"
+                f"  rooms {sample.get('socketRooms', 0):4.0f}"
+            )
+            try:
+                await asyncio.wait_for(self.stopping.wait(), args.sample_every)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, log):
+        args = self.args
+        self.started = time.perf_counter()
+        per_user = args.rate / args.users
+        tasks = [
+            asyncio.create_task(self.user(self.sessions[i % len(self.sessions)], per_user))
+            for i in range(args.users)
+        ]
+        tasks += [asyncio.create_task(self.socket_client()) for _ in range(args.sockets)]
+        sampler = asyncio.create_task(self.sampler(log))
+
+        try:
+            await asyncio.wait([sampler], timeout=args.duration)
+        finally:
+            self.stopping.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        # Re-raise a sampler failure (server down, no metrics)
+        await sampler
+
+        # Let abandoned sockets time out (pingInterval + pingTimeout)
+        print(f"\n⏳ Traffic stopped; draining for {args.drain:.0f}s")
+        await asyncio.sleep(args.drain)
+        final = await self.sample(log)
+        await self.snapshot("end")
+        return final
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def load_accounts():
+    if USERS_FILE:
+        with open(USERS_FILE) as f:
+            return [(u["email"], u["password"]) for u in json.load(f)]
+    return [(EMAIL, PASSWORD)]
+
+
+def analyze(soak, args, final):
+    steady = [s for s in soak.samples[:-1] if s["t"] >= args.warmup]
+    findings = {}
+    print("\n📈 Growth after warmup (window medians, first -> last)")
+    print("-" * 60)
+    for key, label, floor, kind in TRACKED:
+        trend = detect_growth(steady, key, floor, args.max_growth_pct)
+        if trend is None:
+            continue
+        findings[key] = trend
+        flag = "❌" if trend["leak"] else ("⚠️ " if trend["rising"] else "✅")
+        print(
+            f"{flag} {label:20} {format_value(trend['medians'][0], kind):>9} -> "
+            f"{format_value(trend['medians'][-1], kind):>9}  "
+            f"({format_value(trend['perHour'], kind)}/h)"
+        )
+    if not findings:
+        print(f"⚠️  Fewer than {WINDOWS * 2} samples after warmup; run longer or sample more often")
+
+    baseline = steady[0].get("socketClients", 0) if steady else 0
+    lingering = final.get("socketClients", 0) - baseline
+    sockets_closed = lingering <= 0
+    print(
+        f"{'✅' if sockets_closed else '❌'} Socket.io clients after drain: "
+        f"{final.get('socketClients', 0):.0f} (baseline {baseline:.0f})"
+    )
+    return findings, sockets_closed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running soak test with leak detection")
+    parser.add_argument("--duration", type=parse_duration, default=parse_duration("2h"), help="total run time (default 2h)")
+    parser.add_argument("--warmup", type=parse_duration, default=parse_duration("10m"), help="ignored by the leak check (default 10m)")
+    parser.add_argument("--users", type=int, default=10, help="virtual HTTP users (default 10)")
+    parser.add_argument("--rate", type=float, default=5, help="total requests/s (default 5)")
+    parser.add_argument("--sockets", type=int, default=5, help="concurrent Socket.io clients (default 5)")
+    parser.add_argument("--sample-every", type=parse_duration, default=parse_duration("30s"), help="metrics sampling interval")
+    parser.add_argument("--snapshot-every", type=parse_duration, default=parse_duration("1h"), help="heap snapshot interval; 0 = off")
+    parser.add_argument("--drain", type=parse_duration, default=parse_duration("60s"), help="wait after traffic stops before the final sample")
+    parser.add_argument("--max-growth-pct", type=float, default=10, help="growth that counts as a leak (default 10)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧪 COLAB TASK MANAGER - SOAK TEST")
+    print("=" * 60)
+    print(f"   Target: {BASE_URL}")
+    print(
+        f"   {args.duration / 60:.0f}m at {args.rate:g} req/s over {args.users} users, "
+        f"{args.sockets} sockets, sampling every {args.sample_every:g}s"
+    )
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    stem = os.path.join(REPORT_DIR, f"soak-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+
+    async def run():
+        async with ColabClient() as client:
+            soak = Soak(client, args, load_accounts())
+            await soak.setup()
+            with open(stem + ".jsonl", "w") as log:
+                final = await soak.run(log)
+            return soak, final
+
+    try:
+        soak, final = asyncio.run(run())
+    except (RuntimeError, AuthError, httpx.HTTPError, OSError) as e:
+        print(f"❌ Soak test failed: {e}")
+        return 2
+
+    findings, sockets_closed = analyze(soak, args, final)
+
+    sent = sum(stats["ok"] + stats["errors"] for stats in soak.results.values())
+    errors = sum(stats["errors"] for stats in soak.results.values())
+    error_pct = 100 * errors / max(sent, 1)
+    print(f"\n📊 Traffic: {sent} requests, {errors} errors ({error_pct:.2f}%)")
+    for name, stats in sorted(soak.results.items(), key=lambda item: -item[1]["ok"]):
+        print(f"   {name:28} ok {stats['ok']:7}  errors {stats['errors']}")
+    print(
+        f"   Socket.io: {soak.socket_stats['connected']} connected, "
+        f"{soak.socket_stats['abandoned']} abandoned, {soak.socket_stats['errors']} errors"
+    )
+
+    leaks = [key for key, trend in findings.items() if trend["leak"]]
+    with open(stem + ".json", "w") as f:
+        json.dump({
+            "baseUrl": BASE_URL,
+            "args": vars(args),
+            "findings": findings,
+            "leaks": leaks,
+            "socketsClosed": sockets_closed,
+            "snapshots": soak.snapshots,
+            "traffic": {name: dict(stats) for name, stats in soak.results.items()},
+            "sockets": dict(soak.socket_stats),
+        }, f, indent=2)
+    print(f"\n💾 Samples in {stem}.jsonl, verdict in {stem}.json")
+
+    print("\n" + "=" * 60)
+    failed = False
+    if leaks:
+        labels = {key: label for key, label, _, _ in TRACKED}
+        print(f"❌ Monotonic growth: {', '.join(labels[key] for key in leaks)}")
+        if soak.snapshots:
+            print(f"   Compare {soak.snapshots[0]['file']} with {soak.snapshots[-1]['file']}")
+        failed = True
+    if not sockets_closed:
+        print("❌ Socket.io clients were not released after the traffic stopped")
+        failed = True
+    if error_pct > MAX_ERROR_PCT:
+        print(f"❌ Error rate {error_pct:.2f}% exceeds {MAX_ERROR_PCT}%")
+        failed = True
+    if not failed:
+        print("✅ No leaks detected")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Startup Benchmark
+Starts the custom server (server.ts) and measures how long it takes from
+process start until real requests are fast: when it listens (/healthz),
+when warmup finishes (/readyz), how slow the first authenticated request
+to each probe route is, and when every probe route has answered within
+--fast-ms.
+
+Usage:
+    python scripts/startup_bench.py                 # 3 runs with warmup
+    python scripts/startup_bench.py --compare       # warmup vs WARMUP=false
+    python scripts/startup_bench.py --runs 5 --fast-ms 150
+    python scripts/startup_bench.py --command "node dist/server.js"
+
+Build first (`npm run build`) and run with NODE_ENV=production to measure
+what a deploy sees; in development the numbers include route compilation.
+Nothing else may be listening on --port (default 3100).
+"""
+
+import argparse
+import asyncio
+import os
+import shlex
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from colab_client import ColabClient
+
+PROBE_PATHS = ["/api/workspaces", "/api/notifications", "/api/unread", "/api/time"]
+POLL_INTERVAL = 0.05
+BOOT_TIMEOUT = float(os.getenv("STARTUP_BOOT_TIMEOUT", "180"))
+
+
+def default_command():
+    command = ["npx", "tsx"]
+    if os.path.exists(".env"):
+        command.append("--env-file=.env")
+    return command + ["server.ts"]
+
+
+class StartupRun:
+    def __init__(self, command, port, warmup, fast_ms):
+        self.command = command
+        self.port = port
+        self.warmup = warmup
+        self.fast_ms = fast_ms
+        self.base_url = f"http://localhost:{port}"
+        self.process = None
+        self.started = None
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def spawn(self):
+        env = dict(os.environ, PORT=str(self.port))
+        if not self.warmup:
+            env["WARMUP"] = "false"
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(
+            self.command,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # npx -> tsx -> node: stop the whole group at the end
+            start_new_session=hasattr(os, "killpg"),
+        )
+
+    def stop(self):
+        if not self.process or self.process.poll() is not None:
+            return
+        if hasattr(os, "killpg"):
+            os.killpg(self.process.pid, signal.SIGTERM)
+        else:
+            self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+            self.process.wait()
+
+    async def wait_for(self, http, path):
+        """Poll until `path` answers 200; returns ms since spawn"""
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            if self.elapsed_ms() > BOOT_TIMEOUT * 1000:
+                raise RuntimeError(f"{path} not ready after {BOOT_TIMEOUT:.0f}s")
+            try:
+                res = await http.get(self.base_url + path, timeout=5)
+                if res.status_code == 200:
+                    return self.elapsed_ms()
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def probe(self, session):
+        """
+        Request every probe route until each has answered within fast_ms.
+        Returns the first latency per route and the time of the last
+        route's first fast response.
+        """
+        first = {}
+        pending = set(PROBE_PATHS)
+        while pending:
+            if self.elapsed_ms() > BOOT_TIMEOUT * 1000:
+                raise RuntimeError(f"Still slow after {BOOT_TIMEOUT:.0f}s: {', '.join(sorted(pending))}")
+            for path in PROBE_PATHS:
+                start = time.perf_counter()
+                res = await session.request("GET", path, retries=0, check=False)
+                latency = (time.perf_counter() - start) * 1000
+                if res.status_code >= 400:
+                    raise RuntimeError(f"GET {path}: {res.status_code}")
+                first.setdefault(path, latency)
+                if path in pending and latency <= self.fast_ms:
+                    pending.discard(path)
+        return first, self.elapsed_ms()
+
+    async def run(self, credentials):
+        async with ColabClient(self.base_url, retries=0) as client:
+            session = client.session(credentials)
+            self.spawn()
+            try:
+                listening = await self.wait_for(client.http, "/healthz")
+                ready = await self.wait_for(client.http, "/readyz")
+                first, first_fast = await self.probe(session)
+            finally:
+                self.stop()
+        return {
+            "listening": listening,
+            "ready": ready,
+            "firstRequest": max(first.values()),
+            "firstFast": first_fast,
+            "perRoute": first,
+        }
+
+
+async def run_bench(args):
+    # Sign in once up front; Supabase auth does not depend on the server
+    async with ColabClient() as client:
+        credentials = (await client.login()).credentials
+
+    modes = [True, False] if args.compare else [not args.no_warmup]
+    results = {}
+    for warmup in modes:
+        label = "warmup" if warmup else "no warmup"
+        runs = []
+        for i in range(args.runs):
+            print(f"   {label}: run {i + 1}/{args.runs}...")
+            run = StartupRun(args.command, args.port, warmup, args.fast_ms)
+            runs.append(await run.run(credentials))
+        results[label] = runs
+    return results
+
+
+def median(runs, key):
+    return statistics.median(run[key] for run in runs)
+
+
+def print_results(results, fast_ms):
+    print("\n" + "=" * 60)
+    print("🚀 STARTUP RESULTS (median ms since process start)")
+    print("=" * 60)
+    print(f"{'mode':<12}{'listen':>9}{'ready':>9}{'1st req':>10}{'fast':>9}")
+    for label, runs in results.items():
+        print(
+            f"{label:<12}{median(runs, 'listening'):>9.0f}{median(runs, 'ready'):>9.0f}"
+            f"{median(runs, 'firstRequest'):>10.0f}{median(runs, 'firstFast'):>9.0f}"
+        )
+    print("-" * 60)
+    print("First request per route (median ms):")
+    for label, runs in results.items():
+        routes = ", ".join(
+            f"{path} {statistics.median(run['perRoute'][path] for run in runs):.0f}"
+            for path in PROBE_PATHS
+        )
+        print(f"   {label}: {routes}")
+    print(f"'1st req' is the slowest first request; 'fast' is when every route answered within {fast_ms:.0f}ms")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure server cold start and warmup")
+    parser.add_argument("--runs", type=int, default=3, help="Server starts per mode (default 3)")
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--fast-ms", type=float, default=200, help="Latency that counts as fast (default 200)")
+    parser.add_argument("--command", type=shlex.split, default=default_command(), help="Server command")
+    parser.add_argument("--compare", action="store_true", help="Run with and without warmup")
+    parser.add_argument("--no-warmup", action="store_true", help="Start with WARMUP=false")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏁 COLAB TASK MANAGER - STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"   Command: {' '.join(args.command)}")
+
+    try:
+        results = asyncio.run(run_bench(args))
+    except Exception as e:
+        print(f"❌ Startup benchmark failed: {e}")
+        return 2
+
+    print_results(results, args.fast_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
 """
 Selenium UI Test Suite for Task Manager
 Tests all UI buttons, forms, and interactions
+
+By default (E2E_FIXTURES=true) a fresh workspace with a project, tasks and
+chat history is seeded through the API (e2e_fixtures.py) and the browser
+is signed in with a session cookie; E2E_FIXTURES=false logs in through the
+form as TEST_USER_EMAIL and enters the first workspace.
 """
 
 from selenium import webdriver
@@ -9,14 +14,18 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import os
 import time
 import sys
 
+from colab_client import BASE_URL, EMAIL as TEST_EMAIL, PASSWORD as TEST_PASSWORD
+from e2e_fixtures import seed_fixture, sign_in
+
 # Configuration
-BASE_URL = "http://localhost:3000"
-TEST_EMAIL = "deadlysam10@gmail.com"
-TEST_PASSWORD = "Sam@wwe20"
 WAIT_TIMEOUT = 10
+E2E_FIXTURES = os.getenv("E2E_FIXTURES", "true").lower() == "true"
+# Workspace entered after a form login (E2E_FIXTURES=false)
+WORKSPACE_NAME = os.getenv("E2E_WORKSPACE", "Agents")
 
 class Colors:
     GREEN = '\033[92m'
@@ -46,9 +55,14 @@ class TaskManagerUITest:
         self.driver = None
         self.wait = None
         self.test_results = []
+        self.fixture = None
         
     def setup(self):
-        """Initialize the browser"""
+        """Seed fixture data, then initialize the browser"""
+        if E2E_FIXTURES:
+            print_test("Seeding fixture data through the API...", "INFO")
+            self.fixture = seed_fixture(tasks=6, messages=10)
+            print_test(f"Seeded workspace {self.fixture.workspace['slug']}", "PASS")
         print_test("Initializing Chrome browser...", "INFO")
         options = webdriver.ChromeOptions()
         options.add_argument('--start-maximized')
@@ -121,8 +135,23 @@ class TaskManagerUITest:
         except TimeoutException:
             return None
     
+    def test_session_login(self):
+        """Test 1: Sign in with the fixture user's session cookie"""
+        print_header("TEST 1: Authenticated Session")
+        
+        try:
+            sign_in(self.driver, self.fixture, self.fixture.dashboard_path)
+            sidebar = self.safe_find_element(By.XPATH, "//a[.//span[normalize-space(text())='Dashboard']]", timeout=15)
+            self.record_result("Login", sidebar is not None, f"Session cookie accepted, at {self.driver.current_url}")
+            return sidebar is not None
+        except Exception as e:
+            self.record_result("Login", False, f"Exception: {str(e)}")
+            return False
+    
     def test_login(self):
         """Test 1: Login functionality"""
+        if self.fixture:
+            return self.test_session_login()
         print_header("TEST 1: Login & Authentication")
         
         try:
@@ -181,23 +210,23 @@ class TaskManagerUITest:
                 print_test("Redirected to workspace selection page", "INFO")
                 self.record_result("Login", True, f"Successfully logged in")
                 
-                # Now select the "Agents" workspace
+                # Now select the WORKSPACE_NAME workspace
                 print_test("Looking for workspace to enter...", "INFO")
                 time.sleep(2)
                 
-                # Try to find and click on "Agents" workspace
+                # Try to find and click on the workspace
                 workspace_selectors = [
-                    (By.XPATH, "//div[contains(text(), 'Agents')]//ancestor::a"),
-                    (By.XPATH, "//a[contains(@href, '/agents') or contains(@href, '/app/')]"),
-                    (By.XPATH, "//div[contains(text(), 'Agents')]//parent::div//parent::div"),
+                    (By.XPATH, f"//div[contains(text(), '{WORKSPACE_NAME}')]//ancestor::a"),
+                    (By.XPATH, "//a[contains(@href, '/app/')]"),
+                    (By.XPATH, f"//div[contains(text(), '{WORKSPACE_NAME}')]//parent::div//parent::div"),
                 ]
                 
                 workspace_clicked = False
                 for by, selector in workspace_selectors:
                     workspace = self.safe_find_element(by, selector, timeout=3)
                     if workspace:
-                        if self.safe_click(workspace, "Agents workspace"):
-                            print_test("Clicked on Agents workspace", "PASS")
+                        if self.safe_click(workspace, f"{WORKSPACE_NAME} workspace"):
+                            print_test(f"Clicked on {WORKSPACE_NAME} workspace", "PASS")
                             time.sleep(2)
                             workspace_clicked = True
                             break
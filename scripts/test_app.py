@@ -1,6 +1,12 @@
 """
 Comprehensive E2E Test Suite for Colab Task Manager
 Tests all major features including Auth, Workspaces, Tasks, Chat, Files, and Search
+
+With E2E_FIXTURES=true (default) the workspace, project, tasks and chat
+history are seeded through the API (e2e_fixtures.py) and the browser is
+signed in with a session cookie, so every test starts on its own page
+instead of depending on the previous test's clicks. E2E_FIXTURES=false
+runs the original flow through the login form and the UI.
 """
 
 import time
@@ -11,12 +17,16 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from perf_capture import PerfCollector
+from e2e_fixtures import seed_fixture, sign_in
 
 # Configuration
 BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
 TEST_USER_EMAIL = os.getenv("TEST_USER_EMAIL", "samuelhany500@gmail.com")
 TEST_USER_PASSWORD = os.getenv("TEST_USER_PASSWORD", "Sam@wwe20")
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+PERF_CAPTURE = os.getenv("PERF_CAPTURE", "true").lower() == "true"
+E2E_FIXTURES = os.getenv("E2E_FIXTURES", "true").lower() == "true"
 
 class TestRunner:
     def __init__(self):
@@ -26,6 +36,12 @@ class TestRunner:
         self.failed = 0
         self.project_name = None
         self.task_title = None
+        self.perf = None
+        self.fixture = None
+
+    def open_page(self, path):
+        """Go straight to a page of the app"""
+        self.driver.get(f"{BASE_URL}{path}")
 
     def clear_overlays(self):
         """Robustly clear any modals or overlays by pressing Escape and waiting"""
@@ -57,10 +73,19 @@ class TestRunner:
         self.driver = webdriver.Firefox(options=firefox_options)
         self.driver.implicitly_wait(10)
         self.wait = WebDriverWait(self.driver, 15)
+        if PERF_CAPTURE:
+            self.perf = PerfCollector(self.driver)
         print("✅ WebDriver ready\n")
         
+    def capture_perf(self, page_name):
+        """Record browser timings for the current page when enabled"""
+        if self.perf:
+            self.perf.capture(page_name)
+
     def teardown(self):
         """Close browser"""
+        if self.perf:
+            self.perf.write_report()
         if self.driver:
             self.driver.quit()
             
@@ -87,8 +112,18 @@ class TestRunner:
         self.driver.save_screenshot(screenshot_path)
         print(f"   📸 Screenshot saved: {screenshot_path}")
 
+    def seed(self):
+        """Create the test data through the API before the browser starts"""
+        print("🌱 Seeding fixture data...")
+        start = time.time()
+        self.fixture = seed_fixture(tasks=6, subtasks=1, messages=10)
+        self.project_name = self.fixture.project["name"]
+        print(f"✅ Seeded {self.fixture.dashboard_path} in {time.time() - start:.1f}s\n")
+
     def test_login(self):
         """Test 1: User Authentication"""
+        if self.fixture:
+            return self.test_session_login()
         try:
             print("\n📝 Test 1: User Authentication")
             self.driver.get(f"{BASE_URL}/login")
@@ -144,6 +179,7 @@ class TestRunner:
             # Wait for Dashboard (audited: "Workspace Overview" or Sidebar presence)
             print("   Waiting for Dashboard...")
             self.wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Workspace Overview')] | //span[contains(text(), 'Dashboard')]")))
+            self.capture_perf("dashboard")
             
             self.log_test("Login", "PASS")
         except Exception as e:
@@ -151,6 +187,19 @@ class TestRunner:
             self.log_test("Login", "FAIL", str(e))
             raise
 
+    def test_session_login(self):
+        """Test 1: Authenticated session (cookie from the fixture user)"""
+        try:
+            print("\n📝 Test 1: Authenticated Session")
+            sign_in(self.driver, self.fixture, self.fixture.dashboard_path)
+            self.wait.until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Workspace Overview')] | //span[contains(text(), 'Dashboard')]")))
+            self.capture_perf("dashboard")
+            self.log_test("Session Login", "PASS")
+        except Exception as e:
+            self.log_failure("Session Login")
+            self.log_test("Session Login", "FAIL", str(e))
+            raise
+
     def test_workspace_navigation(self):
         """Test 2: Sidebar & Navigation"""
         try:
@@ -168,6 +217,8 @@ class TestRunner:
         """Test 3: Project Creation"""
         try:
             print("\n📝 Test 3: Project Creation")
+            if self.fixture:
+                self.open_page(self.fixture.dashboard_path)
             
             # Audited: "Quick Start" button on Dashboard
             print("   Clicking Quick Start...")
@@ -193,6 +244,7 @@ class TestRunner:
             # Wait for redirect (Audited: Project page has "Board" tab)
             self.wait.until(EC.presence_of_element_located((By.XPATH, "//button[contains(., 'Board')]")))
             print("   Project created and loaded.")
+            self.capture_perf("kanban_board")
             
             self.project_name = project_name
             self.log_test("Project Creation", "PASS")
@@ -204,6 +256,8 @@ class TestRunner:
         """Test 4: Task Creation (Kanban)"""
         try:
             print("\n📝 Test 4: Task Creation")
+            if self.fixture:
+                self.open_page(self.fixture.board_path)
             # Audited: "Add Task" button with Plus icon
             add_task_btn = self.wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Add Task')]"))
@@ -233,10 +287,15 @@ class TestRunner:
         """Test 5: Subtask Operations"""
         try:
             print(f"\n📝 Test 5: Subtask Operations")
+            task_title = self.task_title
+            if self.fixture:
+                # A seeded task, independent of the task creation test
+                task_title = self.fixture.tasks[0]["title"]
+                self.open_page(self.fixture.board_path)
             self.clear_overlays()
             
-            # Find the task card for the task we just created
-            card_xpath = f"//h4[contains(text(), '{self.task_title}')]/ancestor::div[contains(@class, 'group')]"
+            # Find the task card
+            card_xpath = f"//h4[contains(text(), '{task_title}')]/ancestor::div[contains(@class, 'group')]"
             card = self.wait.until(EC.presence_of_element_located((By.XPATH, card_xpath)))
             
             # Hover to make menu button visible if needed, then find menu button
@@ -276,11 +335,15 @@ class TestRunner:
         """Test 6: Workspace Chat"""
         try:
             print("\n📝 Test 6: Workspace Chat")
-            # Navigate to Chat via Sidebar
-            self.driver.find_element(By.XPATH, "//a[contains(@href, '/chat')]").click()
+            if self.fixture:
+                self.open_page(self.fixture.path("chat"))
+            else:
+                # Navigate to Chat via Sidebar
+                self.driver.find_element(By.XPATH, "//a[contains(@href, '/chat')]").click()
             
             # Audited: Chat input placeholder "Type a message..."
             chat_input = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='Type a message']")))
+            self.capture_perf("chat")
             msg = f"Automation Message {int(time.time())}"
             print(f"   Sending: {msg}")
             chat_input.send_keys(msg)
@@ -320,6 +383,7 @@ class TestRunner:
                     self.js_click(first_opt)
             except Exception as e:
                 print(f"   (Project selection skip/fail: {e})")
+            self.capture_perf("files")
 
             # Create dummy file
             file_path = os.path.abspath("test_upload.txt")
@@ -387,6 +451,8 @@ class TestRunner:
         print("=" * 60)
         
         try:
+            if E2E_FIXTURES:
+                self.seed()
             self.setup_driver()
             
             self.test_login()
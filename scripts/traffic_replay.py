@@ -0,0 +1,422 @@
+"""
+Traffic Replay
+Replays a capture recorded by the server (TRAFFIC_CAPTURE_FILE) against a
+staging instance, at the original pace or sped up, so load tests follow the
+real mix of chat polling, receipts and board edits.
+
+Usage:
+    python scripts/traffic_replay.py capture.jsonl --dry-run      # summarize the capture
+    python scripts/traffic_replay.py capture.jsonl                # 1x
+    python scripts/traffic_replay.py capture.jsonl --speed 10
+    python scripts/traffic_replay.py capture.jsonl --speed 100 --duration 600
+
+Session affinity: every captured user replays on its own session, in its
+original order, logged in as one of the accounts in REPLAY_USERS_FILE (JSON
+list of {"email", "password"}; defaults to TEST_USER_EMAIL). Captured users
+are spread round-robin over the accounts, so use at least as many accounts
+as the capture has users for realistic per-user rate limits. All users run
+as asyncio tasks over one keep-alive pool (REPLAY_MAX_CONNECTIONS), so
+thousands of concurrent sessions fit in one process.
+
+ID tokens in the capture ("@12") are mapped to entities of the same kind in
+the staging workspace (REPLAY_WORKSPACE), keeping distinct tokens distinct
+as far as the staging data allows. Text is regenerated at its captured
+length. Requests whose IDs cannot be mapped are skipped and reported.
+
+Exits 1 when the replay error rate exceeds REPLAY_MAX_ERROR_PCT.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+from colab_client import BASE_URL, EMAIL, PASSWORD, ApiError, AuthError, ColabClient
+
+USERS_FILE = os.getenv("REPLAY_USERS_FILE")
+WORKSPACE_SLUG = os.getenv("REPLAY_WORKSPACE", "engineering")
+MAX_ERROR_PCT = float(os.getenv("REPLAY_MAX_ERROR_PCT", "1"))
+REPORT_DIR = os.getenv("PERF_REPORT_DIR", "perf-reports")
+# Shared keep-alive pool across all replayed users
+MAX_CONNECTIONS = int(os.getenv("REPLAY_MAX_CONNECTIONS", "1000"))
+
+# Entity kind of a token, by the body/query key it appears under...
+PARAM_KINDS = {
+    "workspaceId": "workspace", "workspaceSlug": "slug", "slug": "slug",
+    "projectId": "project", "conversationId": "conversation",
+    "receiverId": "user", "userId": "user", "assigneeId": "user",
+    "messageId": "message", "parentId": "message", "taskId": "task",
+    "fileId": "file", "folderId": "folder",
+}
+# ...or by the path segment before it (/api/tasks/@3)
+PATH_KINDS = {
+    "workspaces": "slug", "projects": "project", "tasks": "task",
+    "messages": "message", "conversations": "conversation",
+    "files": "file", "folders": "folder",
+}
+
+FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do "
+
+
+class Unmapped(Exception):
+    """A token whose kind or staging entity is unknown"""
+
+
+# ============================================================================
+# CAPTURE
+# ============================================================================
+
+def load_capture(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("v") != 1:
+            raise ValueError(f"Unsupported capture version: {header.get('v')}")
+        events = [json.loads(line) for line in f if line.strip()]
+    events.sort(key=lambda e: e["t"])
+    return header, events
+
+
+def summarize(events):
+    """Route mix and cardinality of a capture"""
+    routes = defaultdict(lambda: {"count": 0, "durations": []})
+    tokens = defaultdict(set)
+    for event in events:
+        stats = routes[f"{event['m']} {event['r']}"]
+        stats["count"] += 1
+        stats["durations"].append(event["d"])
+        collect_tokens(event.get("q"), None, tokens)
+        collect_tokens(event.get("b"), None, tokens)
+        segments = event["p"].split("/")
+        for i, segment in enumerate(segments):
+            if segment.startswith("@"):
+                tokens[PATH_KINDS.get(segments[i - 1], "unknown")].add(segment)
+    users = {e["u"] for e in events if e.get("u")}
+    span = (events[-1]["t"] - events[0]["t"]) / 1000 if events else 0
+    return routes, tokens, users, span
+
+
+def collect_tokens(shape, key, tokens):
+    if isinstance(shape, str) and shape.startswith("@"):
+        tokens[PARAM_KINDS.get(key, "unknown")].add(shape)
+    elif isinstance(shape, dict):
+        if "n" in shape and "of" in shape:
+            collect_tokens(shape["of"], key, tokens)
+        else:
+            for k, v in shape.items():
+                collect_tokens(v, k, tokens)
+
+
+# ============================================================================
+# STAGING DATA
+# ============================================================================
+
+def ids_in(data):
+    """IDs from a list response, or from the lists inside an object response"""
+    if isinstance(data, dict):
+        lists = [v for v in data.values() if isinstance(v, list)]
+        data = lists[0] if lists else []
+    return [item["id"] for item in data if isinstance(item, dict) and "id" in item]
+
+
+class EntityResolver:
+    """Maps capture tokens to staging entities of the same kind"""
+
+    def __init__(self):
+        self.pools = defaultdict(list)
+        self.assigned = {}
+        self.next_index = defaultdict(int)
+
+    async def load(self, session):
+        async def get(path, **params):
+            try:
+                return await session.get(path, params)
+            except ApiError:
+                return None
+
+        bootstrap = await get("/api/bootstrap", slug=WORKSPACE_SLUG)
+        if not bootstrap or not bootstrap.get("current"):
+            raise RuntimeError(f"Workspace '{WORKSPACE_SLUG}' not found on {BASE_URL}. Seed it first.")
+        workspace = bootstrap["current"]
+        self.pools["workspace"] = [workspace["id"]]
+        self.pools["slug"] = [workspace["slug"]]
+        self.pools["project"] = [p["id"] for p in workspace["projects"]]
+
+        members = await get(f"/api/workspaces/{WORKSPACE_SLUG}/members") or []
+        self.pools["user"] = [
+            m.get("userId") or m.get("user", {}).get("id") for m in members if isinstance(m, dict)
+        ]
+        self.pools["conversation"] = ids_in(await get("/api/conversations") or [])
+
+        for project_id in self.pools["project"][:5]:
+            self.pools["task"] += ids_in(await get("/api/tasks", projectId=project_id) or [])
+            self.pools["message"] += ids_in(await get("/api/chat", projectId=project_id) or [])
+            self.pools["file"] += ids_in(await get("/api/files", projectId=project_id) or [])
+            self.pools["folder"] += ids_in(await get(f"/api/projects/{project_id}/folders") or [])
+        self.pools["message"] += ids_in(await get("/api/chat", workspaceId=workspace["id"]) or [])
+
+        for kind in list(self.pools):
+            self.pools[kind] = [v for v in dict.fromkeys(self.pools[kind]) if v]
+        return {kind: len(pool) for kind, pool in self.pools.items()}
+
+    def resolve(self, kind, token):
+        pool = self.pools.get(kind)
+        if not pool:
+            raise Unmapped(kind or "unknown")
+        key = (kind, token)
+        if key not in self.assigned:
+            # First-seen order, wrapping when staging has fewer entities
+            self.assigned[key] = pool[self.next_index[kind] % len(pool)]
+            self.next_index[kind] += 1
+        return self.assigned[key]
+
+
+def text_of(length):
+    repeats = length // len(FILLER) + 1
+    return (FILLER * repeats)[:length].strip() or "x"
+
+
+def materialize(shape, key, resolver):
+    if isinstance(shape, str):
+        if shape.startswith("@"):
+            return resolver.resolve(PARAM_KINDS.get(key), shape)
+        if re.fullmatch(r"s:\d+", shape):
+            return text_of(int(shape[2:]))
+        return shape
+    if isinstance(shape, dict):
+        if set(shape) == {"n", "of"}:
+            return [materialize(shape["of"], key, resolver) for _ in range(shape["n"])]
+        return {k: materialize(v, k, resolver) for k, v in shape.items()}
+    return shape
+
+
+def build_request(event, resolver):
+    segments = event["p"].split("/")
+    path = "/".join(
+        resolver.resolve(PATH_KINDS.get(segments[i - 1]), s) if s.startswith("@") else s
+        for i, s in enumerate(segments)
+    )
+    params = materialize(event.get("q") or {}, None, resolver)
+    body = event.get("b")
+    json_body = materialize(body, None, resolver) if isinstance(body, dict) else None
+    return path, params, json_body
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+class Replayer:
+    def __init__(self, client, events, speed, resolver, accounts):
+        self.client = client
+        self.events = events
+        self.speed = speed
+        self.resolver = resolver
+        self.accounts = accounts
+        self.credentials = {}
+        self.sessions = {}
+        self.queues = {}
+        self.workers = []
+        self.results = defaultdict(lambda: {"count": 0, "errors": 0, "timings": [], "captured": []})
+        self.skipped = defaultdict(int)
+        self.lags = []
+
+    async def session_for(self, user):
+        """One session per captured user, logged in as its assigned account"""
+        if user not in self.sessions:
+            credentials = None
+            if user is not None:
+                email, password = self.accounts[len(self.sessions) % len(self.accounts)]
+                if email not in self.credentials:
+                    self.credentials[email] = await self.client.auth.login(email, password)
+                credentials = self.credentials[email]
+            session = self.client.session(credentials)
+            self.sessions[user] = session
+            # Single worker per user keeps the user's requests in order
+            self.queues[user] = asyncio.Queue()
+            self.workers.append(asyncio.create_task(self.worker(session, self.queues[user])))
+        return self.sessions[user]
+
+    async def worker(self, session, queue):
+        while (item := await queue.get()) is not None:
+            await self.send(session, *item)
+
+    async def send(self, session, event, due):
+        route = f"{event['m']} {event['r']}"
+        try:
+            path, params, body = build_request(event, self.resolver)
+        except Unmapped as e:
+            self.skipped[f"{route} (no staging {e})"] += 1
+            return
+
+        start = time.perf_counter()
+        lag = (start - due) * 1000
+        try:
+            # Sent once so latency and rejections match what the server did
+            res = await session.request(
+                event["m"], path, params=params, json=body, retries=0, check=False
+            )
+            status = res.status_code
+        except httpx.HTTPError:
+            status = None
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # Errors: server errors, failures, or rejections of requests that succeeded in capture
+        failed = status is None or status >= 500 or (status >= 400 and event["s"] < 400)
+        stats = self.results[route]
+        stats["count"] += 1
+        stats["errors"] += int(failed)
+        stats["timings"].append(elapsed)
+        stats["captured"].append(event["d"])
+        self.lags.append(lag)
+
+    async def run(self, duration):
+        first = self.events[0]["t"]
+        start = time.perf_counter()
+        for event in self.events:
+            offset = (event["t"] - first) / 1000
+            if duration and offset > duration:
+                break
+            due = start + offset / self.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.session_for(event.get("u"))
+            self.queues[event.get("u")].put_nowait((event, due))
+
+        for queue in self.queues.values():
+            queue.put_nowait(None)
+        await asyncio.gather(*self.workers)
+        return time.perf_counter() - start
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def load_accounts():
+    if USERS_FILE:
+        with open(USERS_FILE) as f:
+            return [(u["email"], u["password"]) for u in json.load(f)]
+    return [(EMAIL, PASSWORD)]
+
+
+def print_summary(routes, tokens, users, span):
+    total = sum(r["count"] for r in routes.values())
+    print(f"Events: {total}  users: {len(users)}  span: {span:.0f}s  rate: {total / max(span, 1):.1f} req/s")
+    print("\n📊 Route mix")
+    print("-" * 60)
+    for route, stats in sorted(routes.items(), key=lambda item: -item[1]["count"]):
+        share = 100 * stats["count"] / total
+        print(f"{route:45} {stats['count']:7} ({share:4.1f}%)  captured p50 {statistics.median(stats['durations']):.1f}ms")
+    print("\n🔢 Distinct IDs by kind")
+    for kind, values in sorted(tokens.items()):
+        print(f"   {kind:14} {len(values)}")
+
+
+async def replay(events, args):
+    resolver = EntityResolver()
+    accounts = load_accounts()
+    async with ColabClient(max_connections=MAX_CONNECTIONS) as client:
+        pools = await resolver.load(await client.login(*accounts[0]))
+        print("Staging entities: " + ", ".join(f"{k}={v}" for k, v in sorted(pools.items())))
+
+        replayer = Replayer(client, events, args.speed, resolver, accounts)
+        elapsed = await replayer.run(args.duration)
+    return replayer, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured API traffic")
+    parser.add_argument("capture", help="capture file written with TRAFFIC_CAPTURE_FILE")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression factor (1, 10, 100)")
+    parser.add_argument("--duration", type=float, help="replay only the first N seconds of the capture")
+    parser.add_argument("--routes", help="only replay routes matching this regex, e.g. '^GET /api/chat'")
+    parser.add_argument("--dry-run", action="store_true", help="summarize the capture without sending requests")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔁 TRAFFIC REPLAY")
+    print("=" * 60)
+
+    try:
+        header, events = load_capture(args.capture)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read capture: {e}")
+        return 2
+    if args.routes:
+        pattern = re.compile(args.routes)
+        events = [e for e in events if pattern.search(f"{e['m']} {e['r']}")]
+    if not events:
+        print("❌ No events to replay")
+        return 2
+
+    print(f"Capture started {header['startedAt']}")
+    print_summary(*summarize(events))
+    if args.dry_run:
+        return 0
+
+    print(f"\n🎯 Replaying against {BASE_URL} at {args.speed:g}x")
+    try:
+        replayer, elapsed = asyncio.run(replay(events, args))
+    except (RuntimeError, AuthError, httpx.HTTPError) as e:
+        print(f"❌ {e}")
+        return 2
+
+    sent = sum(r["count"] for r in replayer.results.values())
+    errors = sum(r["errors"] for r in replayer.results.values())
+    print(f"\n📊 Replay results ({sent} requests in {elapsed:.1f}s, {sent / max(elapsed, 0.001):.1f} req/s)")
+    print("-" * 60)
+    report = {}
+    for route, stats in sorted(replayer.results.items(), key=lambda item: -item[1]["count"]):
+        row = {
+            "count": stats["count"],
+            "errors": stats["errors"],
+            "p50": round(percentile(stats["timings"], 50), 1),
+            "p95": round(percentile(stats["timings"], 95), 1),
+            "capturedP95": round(percentile(stats["captured"], 95), 1),
+        }
+        report[route] = row
+        flag = "❌" if stats["errors"] else "✅"
+        print(f"{flag} {route:45} n={row['count']:6} p50 {row['p50']:7.1f}ms  p95 {row['p95']:7.1f}ms  (captured p95 {row['capturedP95']}ms)")
+
+    if replayer.skipped:
+        print("\n⚠️  Skipped (could not map IDs to staging data):")
+        for reason, count in sorted(replayer.skipped.items(), key=lambda item: -item[1]):
+            print(f"   {reason}: {count}")
+    if replayer.lags:
+        print(f"\nScheduling lag p95: {percentile(replayer.lags, 95):.1f}ms (high values mean the replayer could not keep up)")
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_path = os.path.join(REPORT_DIR, f"replay-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(report_path, "w") as f:
+        json.dump({
+            "capture": args.capture,
+            "baseUrl": BASE_URL,
+            "speed": args.speed,
+            "elapsedSeconds": round(elapsed, 1),
+            "routes": report,
+            "skipped": dict(replayer.skipped),
+        }, f, indent=2)
+    print(f"\n💾 Report written to {report_path}")
+
+    error_pct = 100 * errors / max(sent, 1)
+    print("\n" + "=" * 60)
+    if error_pct > MAX_ERROR_PCT:
+        print(f"❌ Error rate {error_pct:.1f}% exceeds {MAX_ERROR_PCT}%")
+        return 1
+    print(f"✅ Error rate {error_pct:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,11 @@
-
-import requests
+import asyncio
 import time
-import json
 
-BASE_URL = "http://localhost:3000"
+import httpx
+
+from colab_client import ColabClient
 
-def test_registration_api():
+async def test_registration_api():
     email = f"testuser{int(time.time())}@gmail.com"
     password = "password123"
     name = "API Test User"
@@ -13,11 +13,15 @@ def test_registration_api():
     print(f"Testing registration for: {email}")
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/register",
-            json={"email": email, "password": password, "name": name},
-            headers={"Content-Type": "application/json"}
-        )
+        async with ColabClient() as client:
+            # Registration is not idempotent: send it exactly once
+            response = await client.session().request(
+                "POST",
+                "/api/register",
+                json={"email": email, "password": password, "name": name},
+                retries=0,
+                check=False,
+            )
         
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
@@ -29,9 +33,9 @@ def test_registration_api():
             print("❌ Registration API Failed")
             return False
             
-    except Exception as e:
+    except httpx.HTTPError as e:
         print(f"❌ Exception: {e}")
         return False
 
 if __name__ == "__main__":
-    test_registration_api()
+    asyncio.run(test_registration_api())
@@ -1,19 +1,220 @@
 import { createServer } from "http";
 import { parse } from "url";
+import { monitorEventLoopDelay } from "perf_hooks";
 import next from "next";
 import { Server } from "socket.io";
+import {
+  QUERY_DEBUG_ENABLED,
+  finishRequestQueryMetrics,
+  getQueryMetricsContext,
+  getQueryMetricsHeaders,
+  normalizeRoute,
+  runWithQueryMetrics,
+} from "./lib/query-metrics";
+import {
+  gauge,
+  histogram,
+  registerCollector,
+  renderMetrics,
+} from "./lib/metrics";
+import { logEvent } from "./lib/logger";
+import { compressResponse } from "./lib/http-compression";
+import {
+  TRAFFIC_CAPTURE_ENABLED,
+  captureRequest,
+} from "./lib/traffic-capture";
+import { getWarmupStatus, isReady, warmup } from "./lib/warmup";
+import {
+  HEAP_SNAPSHOT_DIR,
+  HEAP_SNAPSHOT_ENABLED,
+  writeHeapSnapshotFile,
+} from "./lib/process-metrics";
 
 const dev = process.env.NODE_ENV !== "production";
 const hostname = "localhost";
 const port = parseInt(process.env.PORT || "3000", 10);
 
+// Rooms one socket may be in; joining more leaves the oldest project room
+const MAX_ROOMS_PER_SOCKET = 50;
+
 const app = next({ dev, hostname, port });
 const handle = app.getRequestHandler();
 
+// ============================================================================
+// METRICS
+// ============================================================================
+
+const httpDuration = histogram(
+  "http_request_duration_seconds",
+  "HTTP request latency by route",
+);
+const socketConnections = gauge(
+  "socket_connections",
+  "Connected Socket.io clients",
+);
+const socketRooms = gauge("socket_rooms", "Socket.io rooms by type");
+const socketBufferDepth = gauge(
+  "socket_broadcast_buffer_depth",
+  "Packets queued for delivery across all sockets",
+);
+const eventLoopLag = gauge(
+  "nodejs_eventloop_lag_seconds",
+  "Event loop delay percentiles since the last scrape",
+);
+
+const loopDelay = monitorEventLoopDelay({ resolution: 20 });
+loopDelay.enable();
+
+/**
+ * Label for the latency histogram. API routes are grouped by path with IDs
+ * collapsed; pages and assets are bucketed to keep cardinality bounded.
+ */
+function routeLabel(pathname: string): string {
+  if (pathname.startsWith("/api/")) {
+    return normalizeRoute("", pathname).trim();
+  }
+  if (pathname.startsWith("/_next/")) return "static";
+  return "page";
+}
+
+/**
+ * Optional bearer token for the metrics endpoint (METRICS_TOKEN)
+ */
+function isMetricsRequestAllowed(authorization: string | undefined): boolean {
+  const token = process.env.METRICS_TOKEN;
+  return !token || authorization === `Bearer ${token}`;
+}
+
+// /metrics exposes routes, queue depths and process internals
+if (!dev && !process.env.METRICS_TOKEN) {
+  logEvent(
+    "server.metrics_unprotected",
+    { reason: "METRICS_TOKEN is not set; /metrics is public" },
+    { level: "warn" },
+  );
+}
+
+if (HEAP_SNAPSHOT_DIR && !HEAP_SNAPSHOT_ENABLED) {
+  logEvent(
+    "server.heap_snapshot_disabled",
+    { reason: "HEAP_SNAPSHOT_DIR is set but METRICS_TOKEN is not" },
+    { level: "warn" },
+  );
+}
+
 app.prepare().then(() => {
   const httpServer = createServer((req, res) => {
     const parsedUrl = parse(req.url!, true);
-    handle(req, res, parsedUrl);
+    const pathname = parsedUrl.pathname || "/";
+
+    // Liveness, and readiness once warmup is done (lib/warmup.ts)
+    if (pathname === "/healthz" || pathname === "/readyz") {
+      const ok = pathname === "/healthz" || isReady();
+      res.writeHead(ok ? 200 : 503, {
+        "Content-Type": "application/json",
+        "Cache-Control": "no-store",
+      });
+      res.end(JSON.stringify(getWarmupStatus()));
+      return;
+    }
+
+    // Brotli/gzip for everything below; cached static assets end here
+    if (compressResponse(req, res, pathname)) return;
+
+    if (pathname === "/metrics") {
+      if (!isMetricsRequestAllowed(req.headers.authorization)) {
+        res.writeHead(401).end();
+        return;
+      }
+      renderMetrics()
+        .then((body) => {
+          res.writeHead(200, {
+            "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+          });
+          res.end(body);
+        })
+        .catch((error) => {
+          logEvent(
+            "server.metrics_failed",
+            { error: error instanceof Error ? error.message : String(error) },
+            { level: "error" },
+          );
+          res.writeHead(500).end();
+        });
+      return;
+    }
+
+    // Leak hunting: write a heap snapshot (lib/process-metrics.ts)
+    if (pathname === "/debug/heap-snapshot" && HEAP_SNAPSHOT_ENABLED) {
+      if (!isMetricsRequestAllowed(req.headers.authorization)) {
+        res.writeHead(401).end();
+        return;
+      }
+      if (req.method !== "POST") {
+        res.writeHead(405, { Allow: "POST" }).end();
+        return;
+      }
+      try {
+        const file = writeHeapSnapshotFile();
+        if (!file) {
+          res.writeHead(429, { "Retry-After": "60" }).end();
+          return;
+        }
+        logEvent("server.heap_snapshot", { file }, { sample: 1 });
+        res.writeHead(201, { "Content-Type": "application/json" });
+        res.end(JSON.stringify({ file }));
+      } catch (error) {
+        logEvent(
+          "server.heap_snapshot_failed",
+          { error: error instanceof Error ? error.message : String(error) },
+          { level: "error" },
+        );
+        res.writeHead(500).end();
+      }
+      return;
+    }
+
+    const start = process.hrtime.bigint();
+    res.on("finish", () => {
+      httpDuration.observe(
+        {
+          method: req.method || "GET",
+          route: routeLabel(pathname),
+          status: String(res.statusCode),
+        },
+        Number(process.hrtime.bigint() - start) / 1e9,
+      );
+    });
+
+    // Anonymized request shapes for load-test replay (TRAFFIC_CAPTURE_FILE)
+    if (
+      TRAFFIC_CAPTURE_ENABLED &&
+      pathname.startsWith("/api/") &&
+      !req.headers["x-warmup"]
+    ) {
+      captureRequest(req, res, pathname, parsedUrl.query);
+    }
+
+    if (!QUERY_DEBUG_ENABLED || !pathname.startsWith("/api/")) {
+      handle(req, res, parsedUrl);
+      return;
+    }
+
+    // Count Prisma queries per API request and expose them as headers
+    runWithQueryMetrics(normalizeRoute(req.method || "GET", req.url!), () => {
+      const context = getQueryMetricsContext();
+      const writeHead = res.writeHead;
+      res.writeHead = function (this: typeof res, ...args: unknown[]) {
+        const headers = getQueryMetricsHeaders(context);
+        for (const [key, value] of Object.entries(headers)) {
+          res.setHeader(key, value);
+        }
+        return (writeHead as (...a: unknown[]) => typeof res).apply(this, args);
+      } as typeof res.writeHead;
+      res.on("finish", () => finishRequestQueryMetrics(context));
+
+      handle(req, res, parsedUrl);
+    });
   });
 
   const io = new Server(httpServer, {
@@ -23,17 +224,71 @@ app.prepare().then(() => {
     },
   });
 
+  // Socket and event-loop gauges are sampled on each scrape
+  registerCollector("server", () => {
+    socketConnections.set({}, io.engine.clientsCount);
+
+    const roomCounts: Record<string, number> = { project: 0, user: 0 };
+    for (const room of io.of("/").adapter.rooms.keys()) {
+      const type = room.split(":")[0];
+      if (type in roomCounts) roomCounts[type]++;
+    }
+    for (const [type, count] of Object.entries(roomCounts)) {
+      socketRooms.set({ type }, count);
+    }
+
+    let buffered = 0;
+    for (const socket of io.of("/").sockets.values()) {
+      buffered += socket.conn.writeBuffer?.length ?? 0;
+    }
+    socketBufferDepth.set({}, buffered);
+
+    for (const quantile of [50, 90, 99]) {
+      eventLoopLag.set(
+        { quantile: String(quantile / 100) },
+        loopDelay.percentile(quantile) / 1e9,
+      );
+    }
+    eventLoopLag.set({ quantile: "max" }, loopDelay.max / 1e9);
+    loopDelay.reset();
+  });
+
   io.on("connection", (socket) => {
-    console.log("Client connected:", socket.id);
+    logEvent("socket.connect", { socketId: socket.id });
+
+    /**
+     * Join a room, keeping a long-lived socket that navigates between many
+     * projects from piling up rooms: past MAX_ROOMS_PER_SOCKET the oldest
+     * project room is left (Sets iterate in insertion order).
+     */
+    const joinRoom = (room: string, type: string) => {
+      if (socket.rooms.has(room)) return;
+      if (socket.rooms.size >= MAX_ROOMS_PER_SOCKET) {
+        for (const joined of socket.rooms) {
+          if (joined.startsWith("project:")) {
+            socket.leave(joined);
+            break;
+          }
+        }
+      }
+      socket.join(room);
+      logEvent("socket.join", { socketId: socket.id, room: type });
+    };
 
     socket.on("join-project", (projectId: string) => {
-      socket.join(`project:${projectId}`);
-      console.log(`Socket ${socket.id} joined project:${projectId}`);
+      joinRoom(`project:${projectId}`, "project");
     });
 
     socket.on("join-user", (userId: string) => {
-      socket.join(`user:${userId}`);
-      console.log(`Socket ${socket.id} joined user:${userId}`);
+      joinRoom(`user:${userId}`, "user");
+    });
+
+    socket.on("leave-project", (projectId: string) => {
+      socket.leave(`project:${projectId}`);
+    });
+
+    socket.on("leave-user", (userId: string) => {
+      socket.leave(`user:${userId}`);
     });
 
     socket.on(
@@ -68,16 +323,17 @@ app.prepare().then(() => {
           "new-notification",
           data.notification,
         );
-        console.log(`Notification sent to user:${data.userId}`);
+        logEvent("socket.notification", { userId: data.userId });
       },
     );
 
-    socket.on("disconnect", () => {
-      console.log("Client disconnected:", socket.id);
+    socket.on("disconnect", (reason) => {
+      logEvent("socket.disconnect", { socketId: socket.id, reason });
     });
   });
 
   httpServer.listen(port, () => {
     console.log(`> Ready on http://${hostname}:${port}`);
+    void warmup(`http://${hostname}:${port}`);
   });
 });
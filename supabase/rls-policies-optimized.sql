@@ -0,0 +1,431 @@
+-- ============================================================================
+-- SUPABASE ROW LEVEL SECURITY (RLS) POLICIES - OPTIMIZED
+-- Collaborative Task Manager - Production Hardening
+-- ============================================================================
+--
+-- Same access rules as rls-policies.sql, rewritten so membership is resolved
+-- once per statement instead of once per row:
+--
+--   * auth.uid() and the membership lookups live in SECURITY DEFINER helper
+--     functions (schema "private", not exposed through PostgREST). They read
+--     the membership tables without RLS, which also removes the recursive
+--     policies on WorkspaceMember / ProjectMember / ConversationMember.
+--   * Policies call the helpers as "(SELECT private.fn())", which Postgres
+--     plans as an InitPlan: evaluated once, then compared per row with
+--     "= ANY (array)".
+--   * Every policy is scoped "TO authenticated", so anon requests skip them.
+--   * Policies with identical predicates are merged (e.g. the four Task
+--     policies become one FOR ALL policy).
+--
+-- Replaces every existing policy on the app tables. Safe to re-run.
+-- Measure the difference with: python scripts/rls_profiler.py --compare
+--
+-- ROLLBACK: re-run rls-policies.sql (it drops and recreates its policies)
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: ENABLE RLS AND DROP EXISTING POLICIES
+-- ============================================================================
+
+DO $$
+DECLARE
+  tbl TEXT;
+  pol RECORD;
+BEGIN
+  FOREACH tbl IN ARRAY ARRAY[
+    'User', 'Workspace', 'WorkspaceMember', 'Project', 'ProjectMember',
+    'Task', 'Subtask', 'Comment', 'Activity', 'TimeEntry', 'Timer', 'File',
+    'FileVersion', 'Folder', 'Message', 'MessageRead', 'Reaction',
+    'Notification', 'Tag', 'Conversation', 'ConversationMember', 'Invitation'
+  ]
+  LOOP
+    EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', tbl);
+    FOR pol IN
+      SELECT policyname FROM pg_policies
+      WHERE schemaname = 'public' AND tablename = tbl
+    LOOP
+      EXECUTE format('DROP POLICY %I ON public.%I', pol.policyname, tbl);
+    END LOOP;
+  END LOOP;
+END $$;
+
+-- ============================================================================
+-- STEP 2: MEMBERSHIP HELPER FUNCTIONS
+-- ============================================================================
+-- STABLE + SECURITY DEFINER with an empty search_path. Each returns only
+-- the calling user's own memberships, so granting EXECUTE is safe.
+
+CREATE SCHEMA IF NOT EXISTS private;
+
+CREATE OR REPLACE FUNCTION private.current_user_id()
+RETURNS TEXT
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT id FROM public."User" WHERE "supabaseId" = (SELECT auth.uid())::text
+$$;
+
+CREATE OR REPLACE FUNCTION private.workspace_ids()
+RETURNS TEXT[]
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT coalesce(array_agg("workspaceId"), '{}')
+  FROM public."WorkspaceMember"
+  WHERE "userId" = private.current_user_id()
+$$;
+
+CREATE OR REPLACE FUNCTION private.owned_workspace_ids()
+RETURNS TEXT[]
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT coalesce(array_agg(id), '{}')
+  FROM public."Workspace"
+  WHERE "ownerId" = private.current_user_id()
+$$;
+
+CREATE OR REPLACE FUNCTION private.project_ids()
+RETURNS TEXT[]
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT coalesce(array_agg("projectId"), '{}')
+  FROM public."ProjectMember"
+  WHERE "userId" = private.current_user_id()
+$$;
+
+CREATE OR REPLACE FUNCTION private.owned_project_ids()
+RETURNS TEXT[]
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT coalesce(array_agg("projectId"), '{}')
+  FROM public."ProjectMember"
+  WHERE "userId" = private.current_user_id() AND role = 'OWNER'
+$$;
+
+CREATE OR REPLACE FUNCTION private.conversation_ids()
+RETURNS TEXT[]
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT coalesce(array_agg("conversationId"), '{}')
+  FROM public."ConversationMember"
+  WHERE "userId" = private.current_user_id()
+$$;
+
+-- Thread replies may carry only parentId; they are visible when the
+-- parent's channel is. Only evaluated for replies outside a known channel.
+CREATE OR REPLACE FUNCTION private.can_read_message(message_id TEXT)
+RETURNS BOOLEAN
+LANGUAGE sql STABLE SECURITY DEFINER SET search_path = ''
+AS $$
+  SELECT EXISTS (
+    SELECT 1 FROM public."Message" m
+    WHERE m.id = message_id
+      AND (
+        m."workspaceId" = ANY (private.workspace_ids())
+        OR m."projectId" = ANY (private.project_ids())
+        OR m."conversationId" = ANY (private.conversation_ids())
+        OR private.current_user_id() IN (m."senderId", m."receiverId")
+      )
+  )
+$$;
+
+REVOKE ALL ON ALL FUNCTIONS IN SCHEMA private FROM PUBLIC;
+GRANT USAGE ON SCHEMA private TO authenticated;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA private TO authenticated;
+
+-- ============================================================================
+-- STEP 3: POLICIES
+-- ============================================================================
+
+-- ----------------------------------------------------------------------------
+-- USER
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Users can read own and workspace member profiles"
+ON "User" FOR SELECT TO authenticated
+USING (
+  "supabaseId" = (SELECT auth.uid())::text
+  OR id IN (
+    SELECT "userId" FROM "WorkspaceMember"
+    WHERE "workspaceId" = ANY ((SELECT private.workspace_ids())::text[])
+  )
+);
+
+CREATE POLICY "Users can update own profile"
+ON "User" FOR UPDATE TO authenticated
+USING ("supabaseId" = (SELECT auth.uid())::text)
+WITH CHECK ("supabaseId" = (SELECT auth.uid())::text);
+
+-- ----------------------------------------------------------------------------
+-- WORKSPACE
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Workspace members can read workspace"
+ON "Workspace" FOR SELECT TO authenticated
+USING (id = ANY ((SELECT private.workspace_ids())::text[]));
+
+CREATE POLICY "Workspace owners can update workspace"
+ON "Workspace" FOR UPDATE TO authenticated
+USING ("ownerId" = (SELECT private.current_user_id()))
+WITH CHECK ("ownerId" = (SELECT private.current_user_id()));
+
+CREATE POLICY "Authenticated users can create workspaces"
+ON "Workspace" FOR INSERT TO authenticated
+WITH CHECK ("ownerId" = (SELECT private.current_user_id()));
+
+-- ----------------------------------------------------------------------------
+-- WORKSPACE MEMBER
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Workspace members can read memberships"
+ON "WorkspaceMember" FOR SELECT TO authenticated
+USING ("workspaceId" = ANY ((SELECT private.workspace_ids())::text[]));
+
+CREATE POLICY "Workspace owners can manage members"
+ON "WorkspaceMember" FOR ALL TO authenticated
+USING ("workspaceId" = ANY ((SELECT private.owned_workspace_ids())::text[]));
+
+-- ----------------------------------------------------------------------------
+-- PROJECT
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Users can read projects in their workspaces"
+ON "Project" FOR SELECT TO authenticated
+USING ("workspaceId" = ANY ((SELECT private.workspace_ids())::text[]));
+
+CREATE POLICY "Workspace members can create projects"
+ON "Project" FOR INSERT TO authenticated
+WITH CHECK ("workspaceId" = ANY ((SELECT private.workspace_ids())::text[]));
+
+CREATE POLICY "Project members can update projects"
+ON "Project" FOR UPDATE TO authenticated
+USING (id = ANY ((SELECT private.project_ids())::text[]));
+
+-- ----------------------------------------------------------------------------
+-- PROJECT MEMBER
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Users can read project memberships"
+ON "ProjectMember" FOR SELECT TO authenticated
+USING (
+  "projectId" IN (
+    SELECT id FROM "Project"
+    WHERE "workspaceId" = ANY ((SELECT private.workspace_ids())::text[])
+  )
+);
+
+CREATE POLICY "Project members with OWNER role can manage members"
+ON "ProjectMember" FOR ALL TO authenticated
+USING ("projectId" = ANY ((SELECT private.owned_project_ids())::text[]));
+
+-- ----------------------------------------------------------------------------
+-- TASK AND TASK CHILDREN
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Project members can manage tasks"
+ON "Task" FOR ALL TO authenticated
+USING ("projectId" = ANY ((SELECT private.project_ids())::text[]))
+WITH CHECK ("projectId" = ANY ((SELECT private.project_ids())::text[]));
+
+CREATE POLICY "Users can manage subtasks in accessible tasks"
+ON "Subtask" FOR ALL TO authenticated
+USING (
+  "taskId" IN (
+    SELECT id FROM "Task"
+    WHERE "projectId" = ANY ((SELECT private.project_ids())::text[])
+  )
+);
+
+CREATE POLICY "Users can manage comments in accessible tasks"
+ON "Comment" FOR ALL TO authenticated
+USING (
+  "taskId" IN (
+    SELECT id FROM "Task"
+    WHERE "projectId" = ANY ((SELECT private.project_ids())::text[])
+  )
+);
+
+CREATE POLICY "Users can read activities in accessible tasks"
+ON "Activity" FOR SELECT TO authenticated
+USING (
+  "taskId" IN (
+    SELECT id FROM "Task"
+    WHERE "projectId" = ANY ((SELECT private.project_ids())::text[])
+  )
+);
+
+CREATE POLICY "Users can create activities in accessible tasks"
+ON "Activity" FOR INSERT TO authenticated
+WITH CHECK (
+  "taskId" IN (
+    SELECT id FROM "Task"
+    WHERE "projectId" = ANY ((SELECT private.project_ids())::text[])
+  )
+);
+
+-- ----------------------------------------------------------------------------
+-- TIME TRACKING
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Users can manage own time entries"
+ON "TimeEntry" FOR ALL TO authenticated
+USING (
+  "userId" = (SELECT private.current_user_id())
+  AND "taskId" IN (
+    SELECT id FROM "Task"
+    WHERE "projectId" = ANY ((SELECT private.project_ids())::text[])
+  )
+);
+
+CREATE POLICY "Users can manage own timers"
+ON "Timer" FOR ALL TO authenticated
+USING ("userId" = (SELECT private.current_user_id()));
+
+-- ----------------------------------------------------------------------------
+-- FILES
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Project members can read files"
+ON "File" FOR SELECT TO authenticated
+USING ("projectId" = ANY ((SELECT private.project_ids())::text[]));
+
+CREATE POLICY "Project members can upload files"
+ON "File" FOR INSERT TO authenticated
+WITH CHECK ("projectId" = ANY ((SELECT private.project_ids())::text[]));
+
+CREATE POLICY "File uploader can delete files"
+ON "File" FOR DELETE TO authenticated
+USING ("uploadedById" = (SELECT private.current_user_id()));
+
+CREATE POLICY "Users can read file versions in accessible projects"
+ON "FileVersion" FOR SELECT TO authenticated
+USING (
+  "fileId" IN (
+    SELECT id FROM "File"
+    WHERE "projectId" = ANY ((SELECT private.project_ids())::text[])
+  )
+);
+
+CREATE POLICY "Project members can manage folders"
+ON "Folder" FOR ALL TO authenticated
+USING ("projectId" = ANY ((SELECT private.project_ids())::text[]));
+
+-- ----------------------------------------------------------------------------
+-- MESSAGES
+-- ----------------------------------------------------------------------------
+-- The five read policies of rls-policies.sql as one: permissive policies
+-- are OR-ed anyway, and one policy lets the planner share the InitPlans.
+
+CREATE POLICY "Users can read messages in accessible contexts"
+ON "Message" FOR SELECT TO authenticated
+USING (
+  "workspaceId" = ANY ((SELECT private.workspace_ids())::text[])
+  OR "projectId" = ANY ((SELECT private.project_ids())::text[])
+  OR "conversationId" = ANY ((SELECT private.conversation_ids())::text[])
+  OR (
+    "receiverId" IS NOT NULL
+    AND (SELECT private.current_user_id()) IN ("senderId", "receiverId")
+  )
+  OR ("parentId" IS NOT NULL AND private.can_read_message("parentId"))
+);
+
+CREATE POLICY "Users can create messages in authorized contexts"
+ON "Message" FOR INSERT TO authenticated
+WITH CHECK (
+  "senderId" = (SELECT private.current_user_id())
+  AND (
+    "workspaceId" = ANY ((SELECT private.workspace_ids())::text[])
+    OR "projectId" = ANY ((SELECT private.project_ids())::text[])
+    OR "receiverId" IS NOT NULL
+    OR "conversationId" = ANY ((SELECT private.conversation_ids())::text[])
+    OR "parentId" IS NOT NULL
+  )
+);
+
+CREATE POLICY "Users can update own messages"
+ON "Message" FOR UPDATE TO authenticated
+USING ("senderId" = (SELECT private.current_user_id()));
+
+CREATE POLICY "Users can delete own messages"
+ON "Message" FOR DELETE TO authenticated
+USING ("senderId" = (SELECT private.current_user_id()));
+
+CREATE POLICY "Users can manage own message reads"
+ON "MessageRead" FOR ALL TO authenticated
+USING ("userId" = (SELECT private.current_user_id()));
+
+CREATE POLICY "Users can manage reactions on accessible messages"
+ON "Reaction" FOR ALL TO authenticated
+USING (
+  "messageId" IN (
+    SELECT id FROM "Message"
+    -- Message visibility is enforced by Message policies
+  )
+);
+
+-- ----------------------------------------------------------------------------
+-- NOTIFICATIONS
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Users can read own notifications"
+ON "Notification" FOR SELECT TO authenticated
+USING ("userId" = (SELECT private.current_user_id()));
+
+CREATE POLICY "Users can update own notifications"
+ON "Notification" FOR UPDATE TO authenticated
+USING ("userId" = (SELECT private.current_user_id()));
+
+-- ----------------------------------------------------------------------------
+-- TAGS
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Workspace members can manage tags"
+ON "Tag" FOR ALL TO authenticated
+USING ("workspaceId" = ANY ((SELECT private.workspace_ids())::text[]));
+
+-- ----------------------------------------------------------------------------
+-- CONVERSATIONS
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Users can read conversations they are members of"
+ON "Conversation" FOR SELECT TO authenticated
+USING (id = ANY ((SELECT private.conversation_ids())::text[]));
+
+CREATE POLICY "Users can create conversations in their workspaces"
+ON "Conversation" FOR INSERT TO authenticated
+WITH CHECK ("workspaceId" = ANY ((SELECT private.workspace_ids())::text[]));
+
+-- Read and manage had the same predicate in rls-policies.sql
+CREATE POLICY "Conversation members can manage members"
+ON "ConversationMember" FOR ALL TO authenticated
+USING ("conversationId" = ANY ((SELECT private.conversation_ids())::text[]));
+
+-- ----------------------------------------------------------------------------
+-- INVITATIONS
+-- ----------------------------------------------------------------------------
+
+CREATE POLICY "Workspace members can read invitations"
+ON "Invitation" FOR SELECT TO authenticated
+USING ("workspaceId" = ANY ((SELECT private.workspace_ids())::text[]));
+
+CREATE POLICY "Workspace owners can manage invitations"
+ON "Invitation" FOR ALL TO authenticated
+USING ("workspaceId" = ANY ((SELECT private.owned_workspace_ids())::text[]));
+
+-- ============================================================================
+-- STEP 4: SUPPORTING INDEXES
+-- ============================================================================
+-- The helpers read memberships by user; these let them use index-only
+-- scans. Row-side columns ("projectId", "workspaceId", ...) are already
+-- indexed by the Prisma schema and rls-policies.sql.
+
+CREATE INDEX IF NOT EXISTS "idx_workspacemember_user_workspace"
+  ON "WorkspaceMember"("userId", "workspaceId");
+CREATE INDEX IF NOT EXISTS "idx_projectmember_user_project"
+  ON "ProjectMember"("userId", "projectId") INCLUDE (role);
+CREATE INDEX IF NOT EXISTS "idx_conversationmember_user_conversation"
+  ON "ConversationMember"("userId", "conversationId");
+CREATE INDEX IF NOT EXISTS "idx_workspace_ownerId"
+  ON "Workspace"("ownerId");
+CREATE INDEX IF NOT EXISTS "idx_message_receiverId"
+  ON "Message"("receiverId");
+CREATE INDEX IF NOT EXISTS "idx_timeentry_userId"
+  ON "TimeEntry"("userId");
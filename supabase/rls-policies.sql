@@ -367,6 +367,7 @@ USING (
 -- ----------------------------------------------------------------------------
 
 DROP POLICY IF EXISTS "Users can read activities in accessible tasks" ON "Activity";
+DROP POLICY IF EXISTS "Users can create activities in accessible tasks" ON "Activity";
 
 CREATE POLICY "Users can read activities in accessible tasks"
 ON "Activity"
@@ -895,27 +896,28 @@ CREATE INDEX IF NOT EXISTS "idx_notification_userId" ON "Notification"("userId")
 -- ============================================================================
 -- STEP 4: VERIFICATION QUERIES
 -- ============================================================================
--- Run these as a test user to verify RLS is working
+-- Run these as a test user to verify RLS is working (commented out: as the
+-- SQL editor's superuser they bypass RLS and only read whole tables)
 
 -- Test 1: User can only see their own workspaces
 -- Expected: Returns only workspaces where user is a member
-SELECT * FROM "Workspace";
+-- SELECT * FROM "Workspace";
 
 -- Test 2: User cannot see other users' notifications
 -- Expected: Returns only notifications for authenticated user
-SELECT * FROM "Notification";
+-- SELECT * FROM "Notification";
 
 -- Test 3: User can only see projects in their workspaces
 -- Expected: Returns only projects in accessible workspaces
-SELECT * FROM "Project";
+-- SELECT * FROM "Project";
 
 -- Test 4: User can only see tasks in their projects
 -- Expected: Returns only tasks in accessible projects
-SELECT * FROM "Task";
+-- SELECT * FROM "Task";
 
 -- Test 5: User can only see messages they have access to
 -- Expected: Returns only workspace/project/DM messages user can see
-SELECT * FROM "Message";
+-- SELECT * FROM "Message";
 
 -- ============================================================================
 -- STEP 5: EMERGENCY ROLLBACK (IF NEEDED)